@@ -0,0 +1,32 @@
+"""End-to-end benchmarks of the application.
+
+A deterministic generator loads a synthetic dataset of any size in a
+SQLite file or a dedicated PostgreSQL database, then every path of the
+controllers is timed as a management, sales or support user. The
+results are written as JSON and compared with a stored baseline.
+
+    python -m benchmarks run --size medium -o results.json
+    python -m benchmarks compare baseline.json results.json
+
+The micro-benchmarks time the pure Python hot paths without database
+and fail on a regression against the checked-in baseline.
+
+    python -m benchmarks micro --check benchmarks/baselines/micro.json
+
+The load test runs concurrent users, each in its own process.
+
+    python -m benchmarks load --workers 50 --duration 60
+
+The validation benchmark times the import validation, row by row
+against as columns.
+
+    python -m benchmarks validate --records 100000
+
+Modules
+    dataset     # Synthetic dataset generator and loader.
+    scenarios   # Benchmarked operations.
+    harness     # Runner and comparison of the results.
+    micro       # Micro-benchmarks of the pure Python hot paths.
+    load        # Concurrent multi-user load test.
+    validation  # Validation of the imported records.
+"""
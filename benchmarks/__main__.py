@@ -0,0 +1,261 @@
+"""Command line of the benchmarks, see the benchmarks package.
+
+Functions:
+    bench   # click.group of the benchmark commands
+    run     # Run the scenarios and write their results
+    compare # Compare results with a baseline
+    micro   # Run the micro-benchmarks, optionally against a baseline
+    load    # Run concurrent workers and report their throughput
+    validate # Time the validation of the imported records
+"""
+import json
+import sys
+import tempfile
+from dataclasses import replace
+
+import click
+
+from benchmarks.dataset import SIZES
+from benchmarks.harness import compare_results, run_benchmarks
+from benchmarks.load import run_load
+from benchmarks.micro import MICRO_BENCHMARKS, compare_micro, run_micro
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.validation import MODELS, run_validation
+
+
+@click.group(help="End-to-end benchmarks of the controllers.")
+def bench():
+    """Top level command group of the benchmarks."""
+    pass
+
+
+@bench.command(help="Load a synthetic dataset and time every scenario.")
+@click.option("-b", "--backend",
+              type=click.Choice(["sqlite", "postgresql", "memory"]),
+              default="sqlite", show_default=True,
+              help="Database of the run, memory runs the in-memory "
+                   "repositories without database.")
+@click.option("-u", "--uri",
+              help="URI of a dedicated, empty PostgreSQL database "
+                   "(ex: postgresql+psycopg://bench:pw@localhost/bench).")
+@click.option("-s", "--size",
+              type=click.Choice(sorted(SIZES)),
+              default="small", show_default=True,
+              help="Size of the dataset.")
+@click.option("--seed", type=int, help="Seed of the dataset generator.")
+@click.option("-r", "--repeat",
+              type=click.IntRange(min=1),
+              default=20, show_default=True,
+              help="Timed runs per scenario.")
+@click.option("-w", "--warmup",
+              type=click.IntRange(min=0),
+              default=2, show_default=True,
+              help="Untimed runs per scenario.")
+@click.option("--caches/--no-caches", default=False, show_default=True,
+              help="Use the entity and query caches of the CLI.")
+@click.option("-k", "--scenario", "only", multiple=True,
+              type=click.Choice([s.name for s in SCENARIOS]),
+              help="Only this scenario, repeatable.")
+@click.option("-o", "--output",
+              type=click.Path(dir_okay=False, allow_dash=True),
+              default="-", show_default=True,
+              help="Destination of the JSON results.")
+def run(backend, uri, size, seed, repeat, warmup, caches, only, output):
+    """Run the scenarios and write their results."""
+    spec = SIZES[size] if seed is None else replace(SIZES[size], seed=seed)
+
+    def progress(name, result):
+        click.echo(f"{name:<24}{result['median_ms']:>10.2f} ms"
+                   f"{result['p95_ms']:>10.2f} ms"
+                   f"{result['sql_per_run']:>7g} sql", err=True)
+
+    with tempfile.TemporaryDirectory(prefix="eecrm-bench-") as workdir:
+        results = run_benchmarks(spec, backend, workdir, uri=uri,
+                                 repeat=repeat, warmup=warmup,
+                                 caches=caches, only=set(only),
+                                 progress=progress)
+    text = json.dumps(results, indent=2)
+    if output == "-":
+        click.echo(text)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+@bench.command(help="Compare results with a baseline, exit with 1 on a "
+                    "regression.")
+@click.argument("baseline", type=click.File("r"))
+@click.argument("results", type=click.File("r"))
+@click.option("-t", "--tolerance",
+              type=click.FloatRange(min=0),
+              default=0.20, show_default=True,
+              help="Accepted relative slowdown of a median.")
+def compare(baseline, results, tolerance):
+    """Print the comparison of the common scenarios."""
+    baseline, results = json.load(baseline), json.load(results)
+    if baseline["meta"]["spec"] != results["meta"]["spec"]:
+        click.echo("Warning: the datasets of the runs differ.", err=True)
+    backends = (baseline["meta"]["backend"], results["meta"]["backend"])
+    if backends[0] != backends[1]:
+        click.echo(f"Comparing the {backends[1]} backend with "
+                   f"{backends[0]}.", err=True)
+    rows = compare_results(baseline, results, tolerance)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        click.echo(f"{row['name']:<24}{row['base_ms']:>10.2f}"
+                   f"{row['new_ms']:>10.2f} ms  x{row['ratio']:<6}"
+                   f"{row['base_sql']:>6g} ->{row['new_sql']:>4g} sql  {flag}")
+    sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+
+@bench.command(help="Time the pure Python hot paths, exit with 1 on a "
+                    "regression against the --check baseline.")
+@click.option("-n", "--samples",
+              type=click.IntRange(min=2),
+              default=20, show_default=True,
+              help="Samples per benchmark.")
+@click.option("--min-time",
+              type=click.FloatRange(min=0, min_open=True),
+              default=0.01, show_default=True,
+              help="Minimal duration of a sample, in seconds.")
+@click.option("-k", "--benchmark", "only", multiple=True,
+              type=click.Choice([b.name for b in MICRO_BENCHMARKS]),
+              help="Only this benchmark, repeatable.")
+@click.option("-o", "--output",
+              type=click.Path(dir_okay=False, allow_dash=True),
+              help="Destination of the JSON results, '-' for stdout.")
+@click.option("-c", "--check", "baseline", type=click.File("r"),
+              help="Baseline to compare the results with "
+                   "(ex: benchmarks/baselines/micro.json).")
+@click.option("-t", "--tolerance",
+              type=click.FloatRange(min=0),
+              default=0.25, show_default=True,
+              help="Accepted relative slowdown of a median.")
+def micro(samples, min_time, only, output, baseline, tolerance):
+    """Run the micro-benchmarks, then save or check their results."""
+    def progress(name, result):
+        click.echo(f"{name:<28}{result['median_us']:>12.3f} us"
+                   f" +- {result['stdev_us']:.3f}", err=True)
+
+    results = run_micro(samples=samples, min_time=min_time,
+                        only=set(only), progress=progress)
+    if output:
+        text = json.dumps(results, indent=2)
+        if output == "-":
+            click.echo(text)
+        else:
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+    if baseline is None:
+        return
+    baseline = json.load(baseline)
+    if baseline["meta"]["python"] != results["meta"]["python"]:
+        click.echo("Warning: the Python versions of the runs differ.",
+                   err=True)
+    rows = compare_micro(baseline, results, tolerance)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        click.echo(f"{row['name']:<28}{row['base_us']:>12.3f}"
+                   f"{row['new_us']:>12.3f} us  x{row['ratio']:<6} {flag}")
+    sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+
+@bench.command(help="Run concurrent users on a synthetic dataset and "
+                    "report throughput, latencies and errors.")
+@click.option("-b", "--backend",
+              type=click.Choice(["sqlite", "postgresql"]),
+              default="sqlite", show_default=True)
+@click.option("-u", "--uri",
+              help="URI of a dedicated, empty PostgreSQL database.")
+@click.option("-s", "--size",
+              type=click.Choice(sorted(SIZES)),
+              default="small", show_default=True,
+              help="Size of the dataset.")
+@click.option("--seed", type=int, default=0, show_default=True,
+              help="Seed of the operations of the workers.")
+@click.option("-n", "--workers",
+              type=click.IntRange(min=1),
+              default=8, show_default=True,
+              help="Number of worker processes.")
+@click.option("-d", "--duration",
+              type=click.FloatRange(min=0, min_open=True),
+              default=10.0, show_default=True,
+              help="Duration of the run, in seconds.")
+@click.option("-m", "--mode",
+              type=click.Choice(["controller", "cli"]),
+              default="controller", show_default=True,
+              help="Call the managers, or run the eecrm entry point.")
+@click.option("--access-lifetime", type=click.IntRange(min=1),
+              help="Lifetime of the access tokens in seconds, a short "
+                   "one makes the workers refresh their tokens.")
+@click.option("-o", "--output",
+              type=click.Path(dir_okay=False, allow_dash=True),
+              default="-", show_default=True,
+              help="Destination of the JSON report.")
+def load(backend, uri, size, seed, workers, duration, mode,
+         access_lifetime, output):
+    """Run the load test and write its report."""
+    with tempfile.TemporaryDirectory(prefix="eecrm-load-") as workdir:
+        report = run_load(SIZES[size], backend, workdir, uri=uri,
+                          workers=workers, duration=duration, mode=mode,
+                          access_lifetime=access_lifetime, seed=seed,
+                          progress=lambda step: click.echo(step, err=True))
+    for name, stats in [("TOTAL", report["totals"]),
+                        *report["operations"].items()]:
+        click.echo(f"{name:<24}{stats['operations']:>7}"
+                   f"{stats['throughput']:>9.1f}/s"
+                   f"{stats['p50_ms'] or 0:>9.1f}{stats['p95_ms'] or 0:>9.1f}"
+                   f"{stats['p99_ms'] or 0:>9.1f} ms"
+                   f"{stats['error_rate']:>8.1%}", err=True)
+    for worker in report["workers"]:
+        if worker["failure"]:
+            click.echo(f"Worker {worker['worker']} failed: "
+                       f"{worker['failure']}", err=True)
+    text = json.dumps(report, indent=2)
+    if output == "-":
+        click.echo(text)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+@bench.command(help="Time the validation of the imported records, built "
+                    "row by row against checked as columns.")
+@click.option("-n", "--records",
+              type=click.IntRange(min=1),
+              default=100_000, show_default=True,
+              help="Records per resource.")
+@click.option("-r", "--repeat",
+              type=click.IntRange(min=1),
+              default=3, show_default=True,
+              help="Timed runs of each way, the best one is kept.")
+@click.option("--seed", type=int, default=0, show_default=True,
+              help="Seed of the records.")
+@click.option("-k", "--resource", "only", multiple=True,
+              type=click.Choice(sorted(MODELS)),
+              help="Only this resource, repeatable.")
+@click.option("-o", "--output",
+              type=click.Path(dir_okay=False, allow_dash=True),
+              help="Destination of the JSON results, '-' for stdout.")
+def validate(records, repeat, seed, only, output):
+    """Run the validation benchmark and write its results."""
+    def progress(name, result):
+        click.echo(f"{name:<12}{result['rows_ms']:>10.1f} ms rows"
+                   f"{result['columns_ms']:>10.1f} ms columns"
+                   f"{result['build_ms']:>10.1f} ms build"
+                   f"  x{result['speedup']}"
+                   f" (checks x{result['checks_speedup']})", err=True)
+
+    results = run_validation(count=records, repeat=repeat, seed=seed,
+                             only=set(only), progress=progress)
+    if output:
+        text = json.dumps(results, indent=2)
+        if output == "-":
+            click.echo(text)
+        else:
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    bench()
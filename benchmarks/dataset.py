@@ -0,0 +1,322 @@
+"""Deterministic synthetic dataset of the benchmarks.
+
+The same spec (sizes and seed) always generates the same rows. The
+ownership is skewed like a real sales team: the salesmen are ranked
+and the probability of owning a client decreases with the rank
+(Zipf law of exponent 'skew'), so a few salesmen own most clients, and
+the events are spread the same way between the supports. A small share
+of the clients, contracts and events are orphans.
+
+The rows are bulk-loaded with SQLAlchemy Core executemany, with their
+primary keys, in an empty database, or stored in an in-memory store.
+
+Classes
+    DatasetSpec # Sizes, seed and skew of a dataset.
+    Dataset     # Generated rows and the ids picked by the scenarios.
+
+Functions
+    generate_dataset    # Generate the rows of a spec.
+    played_by           # Same dataset, played by other collaborators.
+    load_dataset        # Create the tables and insert the rows.
+    store_dataset       # Store the rows in an in-memory store.
+
+Constants
+    SIZES       # Named specs: small, medium, large.
+"""
+import random
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from argon2 import PasswordHasher
+from sqlalchemy import func, insert, select, text
+
+from ee_crm.adapters.orm import client_table, collaborator_table, \
+    contract_table, event_table, mapper_registry, role_table, user_table
+
+BENCH_PASSWORD = "Benchmark1"
+ROLES = ("Deactivated", "Admin", "Management", "Sales", "Support")
+MANAGEMENT, SALES, SUPPORT = 3, 4, 5
+
+_BATCH = 5000
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_FIRST_NAMES = ("Alice", "Bruno", "Chloe", "David", "Emma", "Farid", "Gaelle",
+                "Hugo", "Ines", "Jules", "Karima", "Louis", "Manon", "Nora",
+                "Oscar", "Paul", "Quentin", "Rose", "Sami", "Talia")
+_LAST_NAMES = ("Martin", "Bernard", "Thomas", "Petit", "Robert", "Richard",
+               "Durand", "Dubois", "Moreau", "Laurent", "Simon", "Michel",
+               "Lefebvre", "Leroy", "Roux", "David", "Bertrand", "Morel")
+_COMPANIES = tuple(f"{prefix}{suffix}" for prefix in
+                   ("Oloo", "Skip", "Real", "Voo", "Dab", "Roo", "Twit", "Aba")
+                   for suffix in ("pad", "blab", "lith", "list", "tz", "mbo"))
+_CITIES = ("Paris", "Lyon", "Marseille", "Lille", "Nantes", "Bordeaux",
+           "Toulouse", "Nice", "Strasbourg", "Rennes")
+_EVENT_KINDS = ("Seminar", "Wedding", "Launch", "Gala", "Workshop",
+                "Conference", "Party")
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetSpec:
+    """Sizes and randomness of a dataset.
+
+    Attributes:
+        collaborators (int): Number of collaborators, at least 3.
+        clients (int): Number of clients.
+        contracts (int): Number of contracts.
+        events (int): Number of events.
+        seed (int): Seed of the generator.
+        skew (float): Zipf exponent of the ownership, 0 is uniform.
+    """
+    collaborators: int = 50
+    clients: int = 5_000
+    contracts: int = 10_000
+    events: int = 5_000
+    seed: int = 12
+    skew: float = 1.2
+
+
+SIZES = {
+    "small": DatasetSpec(collaborators=20, clients=1_000, contracts=2_000,
+                         events=1_000),
+    "medium": DatasetSpec(),
+    "large": DatasetSpec(collaborators=300, clients=100_000,
+                         contracts=250_000, events=120_000),
+}
+
+
+@dataclass(slots=True)
+class Dataset:
+    """Rows of a dataset and the ids the scenarios act on.
+
+    Attributes:
+        spec (DatasetSpec): Spec of the dataset.
+        rows (dict[str, list[dict]]): Rows per table name, in insertion
+            order.
+        management_id (int): A management collaborator.
+        top_sales_id (int): The salesman owning the most clients.
+        top_support_id (int): The support with the most events.
+        own_clients (list[int]): Clients of the top salesman.
+        own_unsigned (list[int]): Unsigned contracts of the top salesman.
+        own_signed (list[int]): Signed contracts of the top salesman.
+        own_without_event (list[int]): Signed contracts of the top
+            salesman without event.
+        own_events (list[int]): Events of the top support.
+        support_ids (list[int]): Every support collaborator.
+    """
+    spec: DatasetSpec
+    rows: dict = field(default_factory=dict)
+    management_id: int = 0
+    top_sales_id: int = 0
+    top_support_id: int = 0
+    own_clients: list = field(default_factory=list)
+    own_unsigned: list = field(default_factory=list)
+    own_signed: list = field(default_factory=list)
+    own_without_event: list = field(default_factory=list)
+    own_events: list = field(default_factory=list)
+    support_ids: list = field(default_factory=list)
+
+
+def _zipf_picker(rng, ids, skew):
+    """Picker of ids whose probability decreases with their rank.
+
+    Returns:
+        Callable[[], int]: Draws an id.
+    """
+    cum_weights = list(accumulate(1 / (rank + 1) ** skew
+                                  for rank in range(len(ids))))
+    return lambda: rng.choices(ids, cum_weights=cum_weights)[0]
+
+
+def _date(rng, days=365):
+    return EPOCH + timedelta(days=rng.randrange(days),
+                             seconds=rng.randrange(86400))
+
+
+def generate_dataset(spec):
+    """Generate the rows of a spec.
+
+    Args:
+        spec (DatasetSpec): Sizes and seed of the dataset.
+
+    Returns:
+        Dataset: The rows and the ids used by the scenarios.
+    """
+    rng = random.Random(spec.seed)
+    dataset = Dataset(spec)
+    rows = dataset.rows
+
+    roles = [MANAGEMENT, SALES, SUPPORT] + rng.choices(
+        [MANAGEMENT, SALES, SUPPORT], weights=[1, 5, 4],
+        k=max(spec.collaborators - 3, 0))
+    rows["users"] = [{"user_id": i, "username": f"bench_{i:05d}",
+                      "password": ""} for i in range(1, len(roles) + 1)]
+    rows["collaborator"] = [
+        {"collaborator_id": i, "first_name": rng.choice(_FIRST_NAMES),
+         "last_name": rng.choice(_LAST_NAMES),
+         "email": f"collaborator{i}@epicevents.example",
+         "phone_number": f"06-{rng.randrange(10 ** 8):08d}",
+         "role_id": role, "user_id": i}
+        for i, role in enumerate(roles, start=1)]
+    by_role = {role: [c["collaborator_id"] for c in rows["collaborator"]
+                      if c["role_id"] == role]
+               for role in (MANAGEMENT, SALES, SUPPORT)}
+    sales, supports = by_role[SALES], by_role[SUPPORT]
+    rng.shuffle(sales)
+    rng.shuffle(supports)
+    pick_sales = _zipf_picker(rng, sales, spec.skew)
+    pick_support = _zipf_picker(rng, supports, spec.skew)
+
+    rows["client"] = []
+    for i in range(1, spec.clients + 1):
+        created = _date(rng)
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        rows["client"].append({
+            "client_id": i, "first_name": first, "last_name": last,
+            "email": f"{first}.{last}{i}@example.com".lower(),
+            "phone_number": f"07-{rng.randrange(10 ** 8):08d}",
+            "company": rng.choice(_COMPANIES),
+            "created_at": created,
+            "updated_at": created + timedelta(days=rng.randrange(60)),
+            "salesman_id": pick_sales() if rng.random() >= 0.02 else None})
+
+    rows["contract"] = []
+    for i in range(1, spec.contracts + 1):
+        total = round(rng.uniform(1_000, 50_000), 2)
+        signed = rng.random() < 0.6
+        rows["contract"].append({
+            "contract_id": i, "total_amount": total,
+            "paid_amount": round(total * rng.uniform(0, 0.5), 2)
+            if signed else 0.0,
+            "created_at": _date(rng), "signed": signed,
+            "client_id": rng.randint(1, spec.clients)
+            if spec.clients and rng.random() >= 0.01 else None})
+
+    # an event per contract at most, the extra events are orphans
+    signed_ids = [c["contract_id"] for c in rows["contract"] if c["signed"]]
+    event_contracts = rng.sample(signed_ids, min(spec.events,
+                                                 len(signed_ids)))
+    rows["event"] = []
+    for i in range(1, spec.events + 1):
+        start = _date(rng, days=730)
+        rows["event"].append({
+            "event_id": i,
+            "title": f"{rng.choice(_EVENT_KINDS)} {rng.choice(_COMPANIES)}",
+            "start_time": start,
+            "end_time": start + timedelta(hours=rng.randint(2, 72)),
+            "location": rng.choice(_CITIES),
+            "attendee": rng.randint(5, 500), "notes": "Generated.",
+            "supporter_id": pick_support() if rng.random() < 0.7 else None,
+            "contract_id": event_contracts[i - 1]
+            if i <= len(event_contracts) and rng.random() >= 0.01
+            else None})
+
+    dataset.management_id = by_role[MANAGEMENT][0]
+    dataset.support_ids = sorted(supports)
+    return played_by(dataset, sales[0], supports[0])
+
+
+def played_by(dataset, sales_id=None, support_id=None, management_id=None):
+    """Copy of a dataset whose scenarios are played by other
+    collaborators, their own resources are computed again.
+
+    Args:
+        dataset (Dataset): The generated dataset.
+        sales_id (int|None): Salesman of the scenarios, unchanged when
+            None.
+        support_id (int|None): Support of the scenarios, unchanged when
+            None.
+        management_id (int|None): Manager of the scenarios, unchanged
+            when None.
+
+    Returns:
+        Dataset: The dataset with the ids and resources of the players.
+    """
+    rows = dataset.rows
+    sales_id = sales_id or dataset.top_sales_id
+    support_id = support_id or dataset.top_support_id
+    played = replace(dataset, top_sales_id=sales_id,
+                     top_support_id=support_id,
+                     management_id=management_id or dataset.management_id,
+                     own_unsigned=[], own_signed=[])
+    owner = {c["client_id"]: c["salesman_id"] for c in rows["client"]}
+    played.own_clients = [c["client_id"] for c in rows["client"]
+                          if c["salesman_id"] == sales_id]
+    for contract in rows["contract"]:
+        if owner.get(contract["client_id"]) == sales_id:
+            (played.own_signed if contract["signed"]
+             else played.own_unsigned).append(contract["contract_id"])
+    with_event = {e["contract_id"] for e in rows["event"]}
+    played.own_without_event = [pk for pk in played.own_signed
+                                if pk not in with_event]
+    played.own_events = [e["event_id"] for e in rows["event"]
+                         if e["supporter_id"] == support_id]
+    return played
+
+
+def _bench_password_hash():
+    return PasswordHasher(time_cost=1, memory_cost=64,
+                          parallelism=1).hash(BENCH_PASSWORD)
+
+
+def load_dataset(engine, dataset):
+    """Create the tables and bulk-insert the rows of a dataset. The
+    users share one password hash, BENCH_PASSWORD.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Engine of an empty database,
+            with a schema_translate_map for SQLite.
+        dataset (Dataset): The generated dataset.
+
+    Raises:
+        RuntimeError: If the database already has clients.
+    """
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("CREATE SCHEMA IF NOT EXISTS auth"))
+            conn.execute(text("CREATE SCHEMA IF NOT EXISTS crm"))
+        mapper_registry.metadata.create_all(conn)
+        if conn.execute(select(func.count()).select_from(
+                client_table)).scalar():
+            raise RuntimeError("The benchmark database isn't empty, use a "
+                               "dedicated database.")
+        password = _bench_password_hash()
+        conn.execute(insert(role_table), [
+            {"role_id": i, "role": role}
+            for i, role in enumerate(ROLES, start=1)])
+        for table in (user_table, collaborator_table, client_table,
+                      contract_table, event_table):
+            rows = dataset.rows[table.name]
+            if table is user_table:
+                rows = [{**row, "password": password} for row in rows]
+            for start in range(0, len(rows), _BATCH):
+                conn.execute(insert(table), rows[start:start + _BATCH])
+        if conn.dialect.name == "postgresql":
+            for table in (user_table, role_table, collaborator_table,
+                          client_table, contract_table, event_table):
+                pk = table.primary_key.columns.values()[0].name
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence("
+                    f"'{table.schema}.{table.name}', '{pk}'), "
+                    f"(SELECT coalesce(max({pk}), 1) FROM "
+                    f"{table.schema}.{table.name}))"))
+
+
+def store_dataset(store, dataset):
+    """Store the rows of a dataset in an empty in-memory store, see
+    ee_crm.adapters.memory_store. The users share one password hash,
+    BENCH_PASSWORD.
+
+    Args:
+        store (InMemoryStore): The store.
+        dataset (Dataset): The generated dataset.
+
+    Raises:
+        RuntimeError: If the store already has clients.
+    """
+    if store.tables["client"]:
+        raise RuntimeError("The benchmark store isn't empty.")
+    password = _bench_password_hash()
+    store.load_rows("users", [{**row, "password": password}
+                              for row in dataset.rows["users"]])
+    for name in ("collaborator", "client", "contract", "event"):
+        store.load_rows(name, dataset.rows[name])
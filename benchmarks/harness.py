@@ -0,0 +1,270 @@
+"""Runner of the benchmark scenarios and comparison with a baseline.
+
+The scenarios call the managers as the CLI does, permissions included:
+the tokens of the played collaborator are stored in a temporary token
+file and verified at each call. The application is bound to the
+benchmark database for the duration of the run, the token file, the
+local logs and the shared attribute cache are redirected or disabled so
+the run never touches the configured installation. The "memory" backend
+runs the scenarios on the in-memory unit of work, without database: it
+measures the controllers, permissions and services alone.
+
+Functions
+    create_bench_engine # Engine of a SQLite or PostgreSQL benchmark.
+    application         # Bind the application to a benchmark database.
+    run_scenario        # Time the runs of a scenario.
+    run_benchmarks      # Generate, load and run every scenario.
+    compare_results     # Compare results with a baseline.
+"""
+import os
+import platform
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from statistics import fmean, median
+from time import perf_counter
+
+import sqlalchemy
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import clear_mappers, sessionmaker
+
+from ee_crm.adapters.cache import EntityCache, QueryCache
+from ee_crm.adapters.database import create_database_engine
+from ee_crm.adapters.memory_store import InMemoryStore
+from ee_crm.adapters.orm import start_mappers
+from ee_crm.config import get_database_settings
+from ee_crm.controllers.auth import permission
+from ee_crm.domain.model import Client
+from ee_crm.services.unit_of_work import InMemoryUnitOfWork, \
+    SqlAlchemyUnitOfWork
+
+from benchmarks.dataset import generate_dataset, load_dataset, store_dataset
+from benchmarks.scenarios import SCENARIOS, BenchContext
+
+_FORMAT_VERSION = 1
+_REDIRECTED = ("TOKEN_STORAGE", "LOCAL_LOG_STORAGE", "SENTRY_DSN")
+
+
+def create_bench_engine(backend, workdir, uri=None):
+    """Create the engine of a benchmark database.
+
+    Args:
+        backend (str): "sqlite" or "postgresql".
+        workdir (str): Directory of the SQLite database file.
+        uri (str|None): URI of the PostgreSQL database, required for
+            the "postgresql" backend: never the configured one.
+
+    Returns:
+        sqlalchemy.engine.Engine: The engine, SQLite is tuned as the
+            embedded backend of the application (DB_BACKEND=sqlite) and
+            maps the "auth" and "crm" schemas to its main database.
+
+    Raises:
+        ValueError: If the backend is unknown or the uri is missing.
+    """
+    if backend == "sqlite":
+        return create_database_engine({
+            **get_database_settings(), "backend": "sqlite",
+            "sqlite_path": os.path.join(workdir, "bench.db")})
+    if backend == "postgresql":
+        if not uri:
+            raise ValueError("The postgresql backend needs the uri of a "
+                             "dedicated database.")
+        return create_engine(uri)
+    raise ValueError(f"Unknown backend {backend!r}.")
+
+
+@contextmanager
+def application(engine, workdir, caches=False, store=None):
+    """Bind the application to a benchmark database.
+
+    Args:
+        engine (sqlalchemy.engine.Engine|None): Engine of the database,
+            None with a store.
+        workdir (str): Directory of the token file and the logs.
+        caches (bool): Whether the units of work use an entity and a
+            query cache, as the CLI does by default.
+        store (InMemoryStore|None): Store of the in-memory units of
+            work, used instead of the engine.
+
+    Yields:
+        Callable[[], AbstractUnitOfWork]: Factory of units of work.
+    """
+    saved_env = {name: os.environ.get(name) for name in _REDIRECTED}
+    saved_uow = permission.DEFAULT_UOW
+    saved_cache = permission.DEFAULT_ATTRIBUTE_CACHE
+    mapped = inspect(Client, raiseerr=False) is not None
+    os.environ["TOKEN_STORAGE"] = os.path.join(workdir, "jwt.json")
+    os.environ["LOCAL_LOG_STORAGE"] = os.path.join(workdir, "logs", "")
+    os.environ["SENTRY_DSN"] = ""
+    if not mapped:
+        start_mappers()
+    if store is not None:
+        uow_factory = partial(InMemoryUnitOfWork, store)
+    else:
+        uow_factory = partial(
+            SqlAlchemyUnitOfWork,
+            session_factory=sessionmaker(bind=engine, autoflush=True),
+            cache=EntityCache() if caches else None,
+            query_cache=QueryCache() if caches else None)
+    permission.DEFAULT_UOW = uow_factory
+    permission.DEFAULT_ATTRIBUTE_CACHE = None
+    try:
+        yield uow_factory
+    finally:
+        permission.DEFAULT_UOW = saved_uow
+        permission.DEFAULT_ATTRIBUTE_CACHE = saved_cache
+        if not mapped:
+            clear_mappers()
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _percentile(sorted_values, fraction):
+    index = max(round(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def run_scenario(ctx, scenario, engine, repeat=20, warmup=2):
+    """Time the runs of a scenario, after warm-up runs.
+
+    Args:
+        ctx (BenchContext): Managers and pools of the run.
+        scenario (Scenario): The scenario.
+        engine (sqlalchemy.engine.Engine|None): Engine whose statements
+            are counted, None without database.
+        repeat (int): Number of timed runs.
+        warmup (int): Number of untimed runs.
+
+    Returns:
+        dict: role, runs, min_ms, median_ms, p95_ms, mean_ms and
+            sql_per_run of the scenario.
+    """
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    ctx.login(scenario.role)
+    for _ in range(warmup):
+        scenario.run(ctx)
+    durations = []
+    if engine is not None:
+        event.listen(engine, "before_cursor_execute", count)
+    try:
+        for _ in range(repeat):
+            start = perf_counter()
+            scenario.run(ctx)
+            durations.append(perf_counter() - start)
+    finally:
+        if engine is not None:
+            event.remove(engine, "before_cursor_execute", count)
+    durations.sort()
+    return {"role": scenario.role, "runs": repeat,
+            "min_ms": round(durations[0] * 1000, 4),
+            "median_ms": round(median(durations) * 1000, 4),
+            "p95_ms": round(_percentile(durations, 0.95) * 1000, 4),
+            "mean_ms": round(fmean(durations) * 1000, 4),
+            "sql_per_run": round(statements[0] / repeat, 2)}
+
+
+def run_benchmarks(spec, backend, workdir, uri=None, repeat=20, warmup=2,
+                   caches=False, only=None, progress=None):
+    """Generate and load a dataset, then run the scenarios.
+
+    Args:
+        spec (DatasetSpec): Dataset of the run.
+        backend (str): "sqlite", "postgresql" or "memory".
+        workdir (str): Directory of the SQLite file, tokens and logs.
+        uri (str|None): URI of the PostgreSQL database.
+        repeat (int): Number of timed runs per scenario.
+        warmup (int): Number of untimed runs per scenario.
+        caches (bool): Whether the entity and query caches are used.
+        only (Iterable[str]|None): Names of the scenarios to run, every
+            scenario when None.
+        progress (Callable[[str, dict], None]|None): Called after each
+            scenario with its name and result.
+
+    Returns:
+        dict: meta (environment and parameters) and the results of the
+            scenarios, JSON serializable.
+    """
+    engine = store = None
+    if backend == "memory":
+        store = InMemoryStore()
+    else:
+        engine = create_bench_engine(backend, workdir, uri)
+    dataset = generate_dataset(spec)
+    results = {}
+    try:
+        with application(engine, workdir, caches, store) as uow_factory:
+            # the entities of a store are built once the mappers started
+            start = perf_counter()
+            if store is not None:
+                store_dataset(store, dataset)
+            else:
+                load_dataset(engine, dataset)
+            load_seconds = perf_counter() - start
+            ctx = BenchContext(dataset, uow_factory, seed=spec.seed)
+            for scenario in SCENARIOS:
+                if only and scenario.name not in only:
+                    continue
+                results[scenario.name] = run_scenario(ctx, scenario, engine,
+                                                      repeat, warmup)
+                if progress is not None:
+                    progress(scenario.name, results[scenario.name])
+    finally:
+        if engine is not None:
+            engine.dispose()
+    return {
+        "version": _FORMAT_VERSION,
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "backend": backend,
+            "server": "memory" if engine is None else engine.dialect.name,
+            "spec": {name: getattr(spec, name)
+                     for name in spec.__dataclass_fields__},
+            "repeat": repeat, "warmup": warmup, "caches": caches,
+            "load_seconds": round(load_seconds, 3),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "machine": platform.machine(), "system": platform.system(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare_results(baseline, results, tolerance=0.20, noise_ms=0.05):
+    """Compare the scenarios of two runs. A scenario regresses when its
+    median is slower than the tolerance and the noise floor, or when it
+    executes more SQL statements, which is deterministic.
+
+    Args:
+        baseline (dict): Results of the reference run.
+        results (dict): Results of the compared run.
+        tolerance (float): Accepted relative slowdown of the median.
+        noise_ms (float): Accepted absolute slowdown, in milliseconds.
+
+    Returns:
+        list[dict]: Per common scenario: name, base_ms, new_ms, ratio,
+            base_sql, new_sql and regression (bool).
+    """
+    rows = []
+    for name, new in results["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        ratio = new["median_ms"] / base["median_ms"] \
+            if base["median_ms"] else float("inf")
+        slower = (ratio > 1 + tolerance
+                  and new["median_ms"] - base["median_ms"] > noise_ms)
+        rows.append({"name": name, "base_ms": base["median_ms"],
+                     "new_ms": new["median_ms"], "ratio": round(ratio, 3),
+                     "base_sql": base["sql_per_run"],
+                     "new_sql": new["sql_per_run"],
+                     "regression": slower or (new["sql_per_run"] >
+                                              base["sql_per_run"])})
+    return rows
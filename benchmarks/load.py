@@ -0,0 +1,454 @@
+"""Concurrent multi-user load test of the application.
+
+A dataset is loaded once, then N worker processes start together, each
+logged in as a different collaborator of the dataset (the busiest
+first, 5 salesmen and 4 supports for 1 manager). During 'duration'
+seconds, every worker runs a weighted mix of the operations of its
+role. Two workers playing the same collaborator, when there are more
+workers than collaborators, share its token file as two terminals of
+the same user would.
+
+Modes
+    controller  # The workers call the managers, as the CLI commands.
+    cli         # The workers run the real 'eecrm' entry point in a
+                # subprocess, the process start-up is measured too. It
+                # needs the PostgreSQL backend, as the CLI.
+
+The report gives the throughput, the latency percentiles and the
+errors per operation and overall. On PostgreSQL, pg_stat_activity is
+sampled during the run for the wait events and the peak of
+connections; on SQLite the lock waits end up as errors once the busy
+timeout is exceeded ("database is locked").
+
+Functions
+    cast_workers    # Collaborator and role of each worker.
+    summarize       # Aggregate the records of the workers.
+    run_load        # Load a dataset and run the workers.
+
+Constants
+    MIXES           # Weighted operations of the controller mode.
+    CLI_MIXES       # Weighted commands of the cli mode.
+"""
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from collections import Counter
+from itertools import cycle
+from multiprocessing import get_context
+from queue import Empty
+from time import perf_counter
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from benchmarks.dataset import MANAGEMENT, SALES, SUPPORT, \
+    generate_dataset, load_dataset, played_by
+from benchmarks.harness import _percentile, application, \
+    create_bench_engine
+from benchmarks.scenarios import SCENARIOS, BenchContext, PoolExhausted, \
+    login
+
+_FORMAT_VERSION = 1
+_ROLE_CYCLE = ("sales", "support", "sales", "support", "sales", "support",
+               "sales", "support", "sales", "management")
+_CLI_TIMEOUT = 120
+_ERROR_NAME = re.compile(r"(?:error|warning) name : (\w+)", re.IGNORECASE)
+_ACTIVITY = text(
+    "SELECT state, wait_event_type, wait_event, count(*) AS n "
+    "FROM pg_stat_activity WHERE datname = current_database() "
+    "AND pid <> pg_backend_pid() "
+    "GROUP BY state, wait_event_type, wait_event")
+
+MIXES = {
+    "sales": {"client-mine": 20, "contract-mine": 20,
+              "contract-mine-unpaid": 10, "client-read-pk": 10,
+              "client-create": 5, "client-update": 10, "contract-pay": 15,
+              "contract-sign": 5, "contract-change-total": 5,
+              "event-create": 5},
+    "support": {"event-mine": 40, "event-read": 15, "event-filter": 15,
+                "event-update": 30},
+    "management": {"client-read": 10, "client-orphan": 10,
+                   "contract-read": 10, "contract-orphan": 10,
+                   "event-unassigned": 20, "event-orphan": 10,
+                   "collaborator-read": 5, "contract-create": 10,
+                   "event-assign-support": 15},
+}
+
+
+def _take(values, what):
+    if values is None:
+        raise PoolExhausted(f"No {what} in the dataset.")
+    return str(next(values))
+
+
+CLI_MIXES = {
+    "sales": {
+        "client show-mine": (30, lambda p: ["client", "show-mine"]),
+        "contract show-mine": (30, lambda p: ["contract", "show-mine"]),
+        "contract pay": (20, lambda p: [
+            "contract", "pay", "-pk", _take(p["signed"], "signed contract"),
+            "-a", "1"]),
+        "client update": (20, lambda p: [
+            "client", "update", "-pk", _take(p["clients"], "client"),
+            "-d", "ph", "07-11111111", "-np"]),
+    },
+    "support": {
+        "event show-mine": (60, lambda p: ["event", "show-mine"]),
+        "event update": (40, lambda p: [
+            "event", "update", "-pk", _take(p["events"], "event"),
+            "-d", "no", "Updated by the load test.", "-np"]),
+    },
+    "management": {
+        "client read": (25, lambda p: ["client", "read"]),
+        "contract orphan": (25, lambda p: ["contract", "orphan"]),
+        "event unassigned": (25, lambda p: ["event", "unassigned"]),
+        "event assign-support": (25, lambda p: [
+            "event", "assign-support",
+            "-pk", str(p["rng"].randint(1, p["event_count"])),
+            "-si", str(p["rng"].choice(p["support_ids"]))]),
+    },
+}
+
+
+def _ranked(dataset, role_id, owned_by):
+    """Collaborators of a role, the ones owning the most rows first."""
+    owned = Counter(owned_by)
+    ids = [c["collaborator_id"] for c in dataset.rows["collaborator"]
+           if c["role_id"] == role_id]
+    return sorted(ids, key=lambda pk: (-owned[pk], pk))
+
+
+def cast_workers(dataset, workers):
+    """Choose the role and the collaborator played by each worker.
+
+    Args:
+        dataset (Dataset): The generated dataset.
+        workers (int): Number of workers.
+
+    Returns:
+        list[tuple[str, int]]: Role and collaborator id per worker.
+    """
+    rows = dataset.rows
+    ranked = {
+        "sales": _ranked(dataset, SALES,
+                         (c["salesman_id"] for c in rows["client"])),
+        "support": _ranked(dataset, SUPPORT,
+                           (e["supporter_id"] for e in rows["event"])),
+        "management": _ranked(dataset, MANAGEMENT, ()),
+    }
+    seen = Counter()
+    cast = []
+    for index in range(workers):
+        role = _ROLE_CYCLE[index % len(_ROLE_CYCLE)]
+        ids = ranked[role]
+        cast.append((role, ids[seen[role] % len(ids)]))
+        seen[role] += 1
+    return cast
+
+
+def _player(dataset, role, collaborator_id):
+    key = {"sales": "sales_id", "support": "support_id",
+           "management": "management_id"}[role]
+    return played_by(dataset, **{key: collaborator_id})
+
+
+def _drive(mix, call, duration, rng):
+    """Run weighted operations until the end of the duration.
+
+    Args:
+        mix (dict[str, tuple[int, object]]): Weight and operation per
+            name.
+        call (Callable[[object], str|None]): Run an operation, returns
+            the name of its error or None.
+        duration (float): Duration of the run, in seconds.
+        rng (random.Random): Generator of the picked operations.
+
+    Returns:
+        list[tuple[str, float, float, str|None]]: Name, start (from the
+            start of the run) and duration of each operation, in
+            seconds, and its error.
+    """
+    mix = dict(mix)
+    records = []
+    start = perf_counter()
+    while mix and perf_counter() - start < duration:
+        name = rng.choices(list(mix), [w for w, _ in mix.values()])[0]
+        began = perf_counter()
+        try:
+            error = call(mix[name][1])
+        except PoolExhausted:
+            del mix[name]
+            continue
+        except Exception as err:
+            error = type(err).__name__
+        records.append((name, began - start, perf_counter() - began, error))
+    return records
+
+
+def _ready(job):
+    """Report the worker ready, then wait for the start of the run."""
+    job["queue"].put(("ready", job["index"]))
+    job["go"].wait()
+
+
+def _controller_records(job, player):
+    engine = create_bench_engine(job["backend"], job["db_dir"], job["uri"])
+    try:
+        with application(engine, job["token_dir"]) as uow_factory:
+            ctx = BenchContext(player, uow_factory, seed=job["seed"])
+            ctx.login(job["role"])
+            scenarios = {s.name: s for s in SCENARIOS}
+            mix = {name: (weight, scenarios[name])
+                   for name, weight in MIXES[job["role"]].items()}
+
+            def call(scenario):
+                scenario.run(ctx)
+
+            _ready(job)
+            return _drive(mix, call, job["duration"], ctx.rng)
+    finally:
+        engine.dispose()
+
+
+def _pools(player, seed):
+    def pool(values):
+        return cycle(values) if values else None
+    return {"rng": random.Random(seed), "signed": pool(player.own_signed),
+            "clients": pool(player.own_clients),
+            "events": pool(player.own_events),
+            "event_count": player.spec.events,
+            "support_ids": player.support_ids}
+
+
+def _cli_env(job):
+    url = make_url(job["uri"])
+    return {**os.environ,
+            "TOKEN_STORAGE": os.path.join(job["token_dir"], "jwt.json"),
+            "LOCAL_LOG_STORAGE": os.path.join(job["token_dir"], "logs", ""),
+            "SENTRY_DSN": "", "COLUMNS": "200",
+            "PG_USER": url.username or "", "PG_PASSWORD": url.password or "",
+            "PG_HOST": url.host or "localhost",
+            "PG_PORT": str(url.port or 5432), "PG_DBNAME": url.database}
+
+
+def _cli_records(job, player):
+    env = _cli_env(job)
+    os.environ.update(TOKEN_STORAGE=env["TOKEN_STORAGE"])
+    login(player, job["role"])
+    program = shutil.which("eecrm")
+    program = [program] if program else [sys.executable, "-m", "ee_crm"]
+    pools = _pools(player, job["seed"])
+
+    def call(build):
+        done = subprocess.run(program + build(pools), env=env,
+                              capture_output=True, text=True,
+                              timeout=_CLI_TIMEOUT)
+        if done.returncode:
+            return f"exit {done.returncode}"
+        found = _ERROR_NAME.search(done.stdout)
+        return found.group(1) if found else None
+
+    _ready(job)
+    return _drive(CLI_MIXES[job["role"]], call, job["duration"],
+                  pools["rng"])
+
+
+def _worker(job):
+    """Body of a worker process, puts its records in the queue."""
+    result = {"worker": job["index"], "role": job["role"],
+              "collaborator_id": job["collaborator_id"], "records": [],
+              "failure": None}
+    try:
+        if job["access_lifetime"]:
+            os.environ["ACCESS_LIFETIME"] = str(job["access_lifetime"])
+        player = _player(generate_dataset(job["spec"]), job["role"],
+                         job["collaborator_id"])
+        records = _cli_records if job["mode"] == "cli" \
+            else _controller_records
+        result["records"] = records(job, player)
+    except Exception as err:
+        result["failure"] = f"{type(err).__name__}: {err}"
+    job["queue"].put(("done", result))
+
+
+def _sample_activity(engine, stop, report, interval=0.1):
+    """Sample pg_stat_activity until stop is set."""
+    waits = Counter()
+    with engine.connect() as conn:
+        while not stop.wait(interval):
+            rows = conn.execute(_ACTIVITY).all()
+            conn.rollback()
+            report["samples"] += 1
+            report["peak_connections"] = max(
+                report["peak_connections"], sum(row.n for row in rows))
+            for row in rows:
+                if row.state == "active" and row.wait_event:
+                    waits[f"{row.wait_event_type}:{row.wait_event}"] += \
+                        row.n
+    report["wait_events"] = dict(waits.most_common())
+
+
+def _latencies(durations):
+    durations = sorted(durations)
+    if not durations:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None,
+                "max_ms": None}
+    return {f"p{p}_ms": round(_percentile(durations, p / 100) * 1000, 3)
+            for p in (50, 95, 99)} | \
+        {"max_ms": round(durations[-1] * 1000, 3)}
+
+
+def summarize(records, duration):
+    """Aggregate the records of the workers.
+
+    Args:
+        records (Iterable[tuple]): Name, start, duration and error of
+            every operation.
+        duration (float): Duration of the run, in seconds.
+
+    Returns:
+        dict: totals (operations, throughput, error rate and latency
+            percentiles) and the same per operation, with the count of
+            each error.
+    """
+    per_name = {}
+    for name, _, seconds, error in records:
+        per_name.setdefault(name, []).append((seconds, error))
+
+    def stats(items):
+        errors = Counter(error for _, error in items if error)
+        count = len(items)
+        return {"operations": count,
+                "throughput": round(count / duration, 2) if duration
+                else 0.0,
+                "error_rate": round(sum(errors.values()) / count, 4)
+                if count else 0.0,
+                **_latencies(seconds for seconds, _ in items),
+                "errors": dict(errors.most_common())}
+
+    return {"totals": stats([item for items in per_name.values()
+                             for item in items]),
+            "operations": {name: stats(items)
+                           for name, items in sorted(per_name.items())}}
+
+
+def run_load(spec, backend, workdir, uri=None, workers=8, duration=10.0,
+             mode="controller", access_lifetime=None, seed=0,
+             progress=None):
+    """Load a dataset, then run the workers concurrently.
+
+    Args:
+        spec (DatasetSpec): Dataset of the run.
+        backend (str): "sqlite" or "postgresql".
+        workdir (str): Directory of the SQLite file, tokens and logs.
+        uri (str|None): URI of the PostgreSQL database.
+        workers (int): Number of worker processes.
+        duration (float): Duration of the run, in seconds.
+        mode (str): "controller" or "cli".
+        access_lifetime (int|None): Lifetime of the access tokens, in
+            seconds, short ones make the workers refresh their tokens
+            during the run. The configured one when None.
+        seed (int): Seed of the operations picked by the workers.
+        progress (Callable[[str], None]|None): Called with the steps of
+            the run.
+
+    Returns:
+        dict: meta, totals, operations, workers and database activity
+            of the run, JSON serializable.
+
+    Raises:
+        ValueError: If the cli mode isn't run on PostgreSQL.
+        RuntimeError: If a worker failed to start.
+    """
+    if mode == "cli" and backend != "postgresql":
+        raise ValueError("The cli mode runs the real entry point, which "
+                         "needs the postgresql backend.")
+    progress = progress or (lambda step: None)
+    engine = create_bench_engine(backend, workdir, uri)
+    dataset = generate_dataset(spec)
+    progress("loading the dataset")
+    load_dataset(engine, dataset)
+
+    mp = get_context("spawn")
+    queue, go = mp.Queue(), mp.Event()
+    cast = cast_workers(dataset, workers)
+    processes = []
+    for index, (role, collaborator_id) in enumerate(cast):
+        job = {"index": index, "role": role,
+               "collaborator_id": collaborator_id, "spec": spec,
+               "backend": backend, "uri": uri, "db_dir": workdir,
+               "token_dir": os.path.join(workdir, "tokens",
+                                         str(collaborator_id)),
+               "mode": mode, "duration": duration,
+               "access_lifetime": access_lifetime,
+               "seed": seed * 1000 + index, "queue": queue, "go": go}
+        processes.append(mp.Process(target=_worker, args=(job,)))
+    progress(f"starting {workers} workers")
+    for process in processes:
+        process.start()
+
+    activity = {"samples": 0, "peak_connections": 0, "wait_events": None}
+    stop = threading.Event()
+    sampler = threading.Thread(target=_sample_activity,
+                               args=(engine, stop, activity), daemon=True) \
+        if engine.dialect.name == "postgresql" else None
+    ready, results, start = 0, {}, None
+    try:
+        while len(results) < workers:
+            try:
+                kind, payload = queue.get(timeout=1)
+            except Empty:
+                if not any(process.is_alive() for process in processes):
+                    break
+                continue
+            if kind == "ready":
+                ready += 1
+                if ready == workers:
+                    progress(f"running for {duration:g} s")
+                    start = perf_counter()
+                    go.set()
+                    if sampler is not None:
+                        sampler.start()
+            else:
+                results[payload["worker"]] = payload
+                if payload["failure"] and start is None:
+                    raise RuntimeError(f"A worker failed to start: "
+                                       f"{payload['failure']}")
+        elapsed = perf_counter() - start if start is not None else 0.0
+    finally:
+        stop.set()
+        if sampler is not None and sampler.is_alive():
+            sampler.join()
+        for process in processes:
+            if start is None:
+                process.terminate()
+            process.join()
+        engine.dispose()
+    if start is None:
+        raise RuntimeError("The workers exited before the run.")
+
+    results = [results.get(index) or {
+        "worker": index, "role": role, "collaborator_id": collaborator_id,
+        "records": [], "failure": "exited without result"}
+        for index, (role, collaborator_id) in enumerate(cast)]
+    summary = summarize((record for result in results
+                         for record in result["records"]), elapsed)
+    return {
+        "version": _FORMAT_VERSION,
+        "meta": {"mode": mode, "backend": backend, "workers": workers,
+                 "duration": duration, "elapsed": round(elapsed, 3),
+                 "access_lifetime": access_lifetime,
+                 "spec": {name: getattr(spec, name)
+                          for name in spec.__dataclass_fields__},
+                 "roles": dict(Counter(r["role"] for r in results))},
+        **summary,
+        "workers": [{"worker": r["worker"], "role": r["role"],
+                     "collaborator_id": r["collaborator_id"],
+                     "operations": len(r["records"]),
+                     "failure": r["failure"]} for r in results],
+        "database": activity,
+    }
@@ -0,0 +1,338 @@
+"""Micro-benchmarks of the pure Python hot paths, runnable offline.
+
+Each benchmark prepares its inputs once, then times a single call in
+the manner of pyperf: the number of loops of a sample is calibrated
+until a sample lasts at least 'min_time', warm-up samples are dropped
+and the time per call of every sample is kept. No database nor token
+is needed, the terminal width is pinned so the views always render
+the same table.
+
+Classes
+    MicroBench  # Name and setup of a micro-benchmark.
+
+Functions
+    time_call       # Time a callable, pyperf style.
+    run_micro       # Run the micro-benchmarks.
+    compare_micro   # Compare results with a baseline.
+
+Constants
+    MICRO_BENCHMARKS    # Every micro-benchmark.
+"""
+import os
+import platform
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import repeat
+from statistics import fmean, median, stdev
+from time import perf_counter
+from typing import Callable
+
+from ee_crm.cli_interface.app.cli_func import cli_clean
+from ee_crm.cli_interface.app.client import KEYS_MAP
+from ee_crm.cli_interface.utils import clean_input_fields, clean_sort, \
+    normalize_sort
+from ee_crm.cli_interface.views.view_base_crud import allocate_widths, \
+    column_lengths
+from ee_crm.cli_interface.views.view_client import ClientCrudView
+from ee_crm.cli_interface.views.view_event import EventCrudView
+from ee_crm.controllers.app.contract import ContractManager
+from ee_crm.controllers.app.event import EventManager
+from ee_crm.controllers.auth.permission import \
+    _map_func_signature_and_value
+from ee_crm.controllers.auth.predicate import is_management, is_sales, \
+    is_self, is_support
+from ee_crm.domain.model import Client, Contract, Event
+from ee_crm.domain.validators import BaseValidator, EventValidator
+from ee_crm.services.dto import ClientDTO, ContractDTO, EventDTO
+
+_FORMAT_VERSION = 1
+_COLUMNS = "160"
+_START = datetime(2025, 6, 1, 14, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class MicroBench:
+    """A micro-benchmarked call.
+
+    Attributes:
+        name (str): Name of the benchmark, e.g. "dto-client".
+        setup (Callable[[], Callable[[], object]]): Prepare the inputs
+            and return the timed call, without argument.
+    """
+    name: str
+    setup: Callable
+
+
+def _client():
+    client = Client.builder(last_name="Lefebvre", first_name="Karima",
+                            email="karima.lefebvre@example.com",
+                            phone_number="07-12345678",
+                            company="Skipblab", salesman_id=4)
+    client.id = 12
+    return client
+
+
+def _contract():
+    contract = Contract.builder(total_amount=12500.5, client_id=12)
+    contract.id = 7
+    contract.sign()
+    contract.register_payment(2500)
+    return contract
+
+
+def _event():
+    event = Event.builder(title="Gala Skipblab", start_time=_START,
+                          end_time=_START + timedelta(hours=6),
+                          location="Lyon", attendee=120,
+                          notes="Vegetarian menu.", contract_id=7)
+    event.id = 3
+    return event
+
+
+def _signature_mapping():
+    update = EventManager.update.__wrapped__
+    orders = ContractManager.user_associated_contracts.__wrapped__
+
+    def call():
+        _map_func_signature_and_value(update, None, 12, notes="Moved.")
+        _map_func_signature_and_value(orders, None, True, False)
+    return call
+
+
+def _predicate_tree():
+    # shape of the event update ABAC, with predicates not reading the
+    # database, none holds so the whole tree is walked.
+    tree = ((~is_support & is_sales) | is_self) | is_management
+    ctx = {"auth": {"c_id": 4, "role": 5}, "pk": 12}
+    return lambda: tree(ctx)
+
+
+def _client_builder():
+    fields = {"last_name": "Lefebvre", "first_name": "Karima",
+              "email": "karima.lefebvre@example.com",
+              "phone_number": "07-12345678", "company": "Skipblab",
+              "salesman_id": 4}
+    return lambda: Client.builder(**fields)
+
+
+def _event_validators():
+    end = _START + timedelta(hours=6)
+
+    def call():
+        EventValidator.validate_date(_START)
+        EventValidator.validate_dates_order(_START, end)
+        EventValidator.validate_attendee(120)
+        EventValidator.validate_notes("Vegetarian menu.")
+    return call
+
+
+def _batch_email():
+    emails = [f"client{i}@example.com" for i in range(1000)]
+    return lambda: BaseValidator.batch_email(emails)
+
+
+def _client_setattr():
+    client = _client()
+    return lambda: setattr(client, "company", "Oloopad")
+
+
+def _dto(dto_class, entity):
+    def setup():
+        obj = entity()
+        return lambda: dto_class.from_domain(obj)
+    return setup
+
+
+def _cli_clean():
+    filters = (("Co", "Skipblab"), ("LN", "Lefebvre"), ("nope", 1))
+    sorts = ("ln:desc", "fn", "ua:asc", "nope")
+    return lambda: cli_clean(filters, sorts, KEYS_MAP)
+
+
+def _normalize_sort():
+    sort = clean_sort(("ln:desc", "fn", "ua:asc", "co", "si:desc"))
+
+    def call():
+        clean_input_fields((("Co", "Skipblab"), ("LN", "Lefebvre")))
+        normalize_sort(sort, KEYS_MAP)
+    return call
+
+
+def _wide_rows(count):
+    return [ClientDTO(id=i, last_name="Lefebvre-Bertrand " * 2,
+                      first_name="Karima", email=f"karima{i}@example.com",
+                      phone_number="07-12345678", company="Skipblab " * 4,
+                      created_at=_START, updated_at=_START, salesman_id=4)
+            for i in range(count)]
+
+
+def _create_table():
+    rows = _wide_rows(50)
+    return lambda: ClientCrudView()._create_table(rows)
+
+
+def _wide_events(count):
+    # notes and locations of uneven lengths, as typed by the users
+    words = ("menu", "vegetarian", "stage", "sound check", "parking",
+             "badges", "cloakroom", "late arrival of the caterer")
+    return [EventDTO(id=i, title=f"Gala Skipblab {i}", start_time=_START,
+                     end_time=_START + timedelta(hours=6),
+                     location="Lyon, " + "Part-Dieu " * (i % 4),
+                     attendee=120 + i,
+                     notes=" ".join(words[(i + j) % len(words)]
+                                    for j in range(i * 7 % 23)) or None,
+                     supporter_id=i % 9 or None, contract_id=i)
+            for i in range(count)]
+
+
+def _allocate_widths():
+    view = EventCrudView()
+    rows = _wide_events(200)
+
+    def call():
+        allocate_widths(column_lengths(rows, view.instance_columns), 148)
+    return call
+
+
+def _create_table_wide():
+    rows = _wide_events(200)
+
+    def call():
+        view = EventCrudView()
+        return list(view._iter_table(rows, rows))
+    return call
+
+
+def _row_to_lines():
+    view = EventCrudView()
+    view._calculate_table_and_col_width()
+    chunk = view._prepare_object(EventDTO.from_domain(_event()))
+    return lambda: view._transform_row_to_lines(chunk)
+
+
+MICRO_BENCHMARKS = (
+    MicroBench("permission-signature", _signature_mapping),
+    MicroBench("predicate-tree", _predicate_tree),
+    MicroBench("validators-client-builder", _client_builder),
+    MicroBench("validators-event", _event_validators),
+    MicroBench("validators-batch-email", _batch_email),
+    MicroBench("client-setattr", _client_setattr),
+    MicroBench("dto-client", _dto(ClientDTO, _client)),
+    MicroBench("dto-contract", _dto(ContractDTO, _contract)),
+    MicroBench("dto-event", _dto(EventDTO, _event)),
+    MicroBench("cli-clean", _cli_clean),
+    MicroBench("cli-normalize-sort", _normalize_sort),
+    MicroBench("view-create-table", _create_table),
+    MicroBench("view-create-table-wide", _create_table_wide),
+    MicroBench("view-allocate-widths", _allocate_widths),
+    MicroBench("view-row-to-lines", _row_to_lines),
+)
+
+
+def _sample(func, loops):
+    start = perf_counter()
+    for _ in repeat(None, loops):
+        func()
+    return perf_counter() - start
+
+
+def time_call(func, samples=20, warmup=1, min_time=0.01):
+    """Time a call without argument, pyperf style.
+
+    Args:
+        func (Callable[[], object]): The timed call.
+        samples (int): Number of kept samples.
+        warmup (int): Number of dropped samples.
+        min_time (float): Minimal duration of a sample, in seconds.
+
+    Returns:
+        dict: loops per sample, samples, min_us, median_us, mean_us
+            and stdev_us, the durations of one call in microseconds.
+    """
+    loops = 1
+    while _sample(func, loops) < min_time:
+        loops *= 2
+    for _ in range(warmup):
+        _sample(func, loops)
+    values = [_sample(func, loops) / loops * 1e6 for _ in range(samples)]
+    return {"loops": loops, "samples": samples,
+            "min_us": round(min(values), 4),
+            "median_us": round(median(values), 4),
+            "mean_us": round(fmean(values), 4),
+            "stdev_us": round(stdev(values), 4) if samples > 1 else 0.0}
+
+
+def run_micro(samples=20, warmup=1, min_time=0.01, only=None,
+              progress=None):
+    """Run the micro-benchmarks.
+
+    Args:
+        samples (int): Number of kept samples per benchmark.
+        warmup (int): Number of dropped samples per benchmark.
+        min_time (float): Minimal duration of a sample, in seconds.
+        only (Iterable[str]|None): Names of the benchmarks to run,
+            every benchmark when None.
+        progress (Callable[[str, dict], None]|None): Called after each
+            benchmark with its name and result.
+
+    Returns:
+        dict: meta (environment and parameters) and the results of the
+            benchmarks, JSON serializable.
+    """
+    saved_columns = os.environ.get("COLUMNS")
+    os.environ["COLUMNS"] = _COLUMNS
+    results = {}
+    try:
+        for bench in MICRO_BENCHMARKS:
+            if only and bench.name not in only:
+                continue
+            results[bench.name] = time_call(bench.setup(), samples, warmup,
+                                            min_time)
+            if progress is not None:
+                progress(bench.name, results[bench.name])
+    finally:
+        if saved_columns is None:
+            os.environ.pop("COLUMNS", None)
+        else:
+            os.environ["COLUMNS"] = saved_columns
+    return {
+        "version": _FORMAT_VERSION,
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "samples": samples, "warmup": warmup, "min_time": min_time,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "system": platform.system(),
+        },
+        "benchmarks": results,
+    }
+
+
+def compare_micro(baseline, results, tolerance=0.25):
+    """Compare the benchmarks of two runs. A benchmark regresses when
+    its median is slower than the tolerance, and slower than the spread
+    of the baseline (two standard deviations) so noise isn't reported.
+
+    Args:
+        baseline (dict): Results of the reference run.
+        results (dict): Results of the compared run.
+        tolerance (float): Accepted relative slowdown of the median.
+
+    Returns:
+        list[dict]: Per common benchmark: name, base_us, new_us, ratio
+            and regression (bool).
+    """
+    rows = []
+    for name, new in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        ratio = new["median_us"] / base["median_us"] \
+            if base["median_us"] else float("inf")
+        slower = (ratio > 1 + tolerance
+                  and new["median_us"] - base["median_us"]
+                  > 2 * base["stdev_us"])
+        rows.append({"name": name, "base_us": base["median_us"],
+                     "new_us": new["median_us"], "ratio": round(ratio, 3),
+                     "regression": slower})
+    return rows
@@ -0,0 +1,216 @@
+"""Scenarios of the benchmarks, one per path of the controllers.
+
+A scenario is run as a role of the dataset: "management" (a manager),
+"sales" (the salesman owning the most clients) or "support" (the
+support with the most events), or the collaborators of the dataset
+returned by 'played_by'. The write scenarios pick their
+resources from pools of the dataset so every run is allowed by the
+permissions, e.g. 'contract-sign' takes a new unsigned contract of the
+salesman at each run.
+
+Classes
+    PoolExhausted   # No resource left for a write scenario.
+    Scenario        # Name, role and operation of a scenario.
+    BenchContext    # Managers and resource pools of a benchmark run.
+
+Functions
+    login           # Store the tokens of the collaborator of a role.
+
+Constants
+    SCENARIOS       # Every scenario, reads then writes.
+"""
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import cycle
+from typing import Callable
+
+from ee_crm.controllers.app.client import ClientManager
+from ee_crm.controllers.app.collaborator import CollaboratorManager
+from ee_crm.controllers.app.contract import ContractManager
+from ee_crm.controllers.app.event import EventManager
+from ee_crm.services.app.clients import ClientService
+from ee_crm.services.app.collaborators import CollaboratorService
+from ee_crm.services.app.contracts import ContractService
+from ee_crm.services.app.events import EventService
+from ee_crm.services.auth.jwt_handler import create_and_store_tokens
+
+from benchmarks.dataset import MANAGEMENT, SALES, SUPPORT, EPOCH
+
+
+class PoolExhausted(RuntimeError):
+    """A write scenario consumed every resource of its pool."""
+
+
+def login(dataset, role):
+    """Store the tokens of the collaborator playing a role in the
+    configured token file.
+
+    Args:
+        dataset (Dataset): The loaded dataset.
+        role (str): "management", "sales" or "support".
+    """
+    collaborator_id, role_id = {
+        "management": (dataset.management_id, MANAGEMENT),
+        "sales": (dataset.top_sales_id, SALES),
+        "support": (dataset.top_support_id, SUPPORT),
+    }[role]
+    create_and_store_tokens({"sub": f"bench_{collaborator_id:05d}",
+                             "c_id": collaborator_id, "role": role_id,
+                             "name": f"bench {role}"})
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    """A benchmarked operation.
+
+    Attributes:
+        name (str): Name of the scenario, e.g. "client-read".
+        role (str): "management", "sales" or "support".
+        run (Callable[[BenchContext], object]): The operation.
+        writes (bool): Whether the operation writes the database.
+    """
+    name: str
+    role: str
+    run: Callable
+    writes: bool = False
+
+
+class BenchContext:
+    """Managers bound to the benchmark unit of work, and the pools of
+    resources the scenarios act on.
+
+    Attributes:
+        dataset (Dataset): The loaded dataset.
+        rng (random.Random): Generator of the picked resources.
+        clients, contracts, events, collaborators: The managers.
+    """
+    def __init__(self, dataset, uow_factory, seed=0):
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        self.clients = ClientManager(ClientService(uow_factory()))
+        self.contracts = ContractManager(ContractService(uow_factory()))
+        self.events = EventManager(EventService(uow_factory()))
+        self.collaborators = CollaboratorManager(
+            CollaboratorService(uow_factory()))
+        half = len(dataset.own_unsigned) // 2
+        self.sign_pool = list(dataset.own_unsigned[half:])
+        self.total_pool = cycle(dataset.own_unsigned[:half] or [None])
+        self.pay_pool = cycle(dataset.own_signed or [None])
+        self.event_pool = list(dataset.own_without_event)
+        self.own_clients = cycle(dataset.own_clients or [None])
+        self.own_events = cycle(dataset.own_events or [None])
+        self._protected_events = set(dataset.own_events)
+
+    def login(self, role):
+        """Store the tokens of the collaborator playing a role, the
+        permissions of the scenarios verify them as for a real user.
+
+        Args:
+            role (str): "management", "sales" or "support".
+        """
+        login(self.dataset, role)
+
+    def random_client(self):
+        return self.rng.randint(1, self.dataset.spec.clients)
+
+    @staticmethod
+    def take(pool, what):
+        """Take a resource that a scenario consumes.
+
+        Raises:
+            PoolExhausted: If the pool is exhausted.
+        """
+        if not pool:
+            raise PoolExhausted(f"No {what} left, reduce the repeats or "
+                               f"grow the dataset.")
+        return pool.pop()
+
+    def unprotected_event(self):
+        """An event the 'event-update' scenario doesn't use."""
+        while True:
+            event_id = self.rng.randint(1, self.dataset.spec.events)
+            if event_id not in self._protected_events:
+                return event_id
+
+
+def _new_client(ctx):
+    n = ctx.rng.randrange(10 ** 6)
+    return ctx.clients.create(first_name="Bench", last_name=f"Client{n}",
+                              email=f"bench.client{n}@example.com",
+                              phone_number="07-00000000",
+                              company="Benchmark")
+
+
+def _new_event(ctx):
+    start = EPOCH + timedelta(days=ctx.rng.randrange(365))
+    return ctx.events.create(title="Bench event", start_time=start,
+                             end_time=start + timedelta(hours=4),
+                             location="Paris", attendee=50,
+                             notes="Benchmark.",
+                             contract_id=ctx.take(ctx.event_pool,
+                                                  "contract without event"))
+
+
+SCENARIOS = (
+    # Reads
+    Scenario("client-read", "management", lambda c: c.clients.read()),
+    Scenario("client-read-pk", "sales",
+             lambda c: c.clients.read(pk=c.random_client())),
+    Scenario("client-filter", "management",
+             lambda c: c.clients.read(filters={"company": "Oloopad"})),
+    Scenario("client-mine", "sales",
+             lambda c: c.clients.user_associated_resource(None, None)),
+    Scenario("client-orphan", "management",
+             lambda c: c.clients.orphan_clients(None, None)),
+    Scenario("contract-read", "management", lambda c: c.contracts.read()),
+    Scenario("contract-filter", "management",
+             lambda c: c.contracts.read(filters={"signed": "false"})),
+    Scenario("contract-mine", "sales",
+             lambda c: c.contracts.user_associated_contracts(
+                 False, False, False, None, None)),
+    Scenario("contract-mine-unpaid", "sales",
+             lambda c: c.contracts.user_associated_contracts(
+                 True, False, False, None, None)),
+    Scenario("contract-orphan", "management",
+             lambda c: c.contracts.orphan_contracts(None, None)),
+    Scenario("event-read", "support", lambda c: c.events.read()),
+    Scenario("event-filter", "support",
+             lambda c: c.events.read(filters={"location": "Lyon"})),
+    Scenario("event-mine", "support",
+             lambda c: c.events.user_associated_resource(None, None)),
+    Scenario("event-unassigned", "management",
+             lambda c: c.events.unassigned_events(None, None)),
+    Scenario("event-orphan", "management",
+             lambda c: c.events.orphan_events(None, None)),
+    Scenario("collaborator-read", "management",
+             lambda c: c.collaborators.read()),
+    # Writes, the ABAC ones check the attributes of the resource
+    Scenario("client-create", "sales", _new_client, writes=True),
+    Scenario("client-update", "sales",
+             lambda c: c.clients.update(pk=next(c.own_clients),
+                                        phone_number="07-11111111"),
+             writes=True),
+    Scenario("contract-create", "management",
+             lambda c: c.contracts.create(total_amount=1000.0,
+                                          client_id=c.random_client()),
+             writes=True),
+    Scenario("contract-change-total", "sales",
+             lambda c: c.contracts.change_total(next(c.total_pool), 2000.0),
+             writes=True),
+    Scenario("contract-sign", "sales",
+             lambda c: c.contracts.sign(
+                 c.take(c.sign_pool, "unsigned contract")), writes=True),
+    Scenario("contract-pay", "sales",
+             lambda c: c.contracts.pay(next(c.pay_pool), 1.0), writes=True),
+    Scenario("event-create", "sales", _new_event, writes=True),
+    Scenario("event-update", "support",
+             lambda c: c.events.update(pk=next(c.own_events),
+                                       notes="Updated by the benchmark."),
+             writes=True),
+    Scenario("event-assign-support", "management",
+             lambda c: c.events.change_support(
+                 c.unprotected_event(),
+                 support_id=c.rng.choice(c.dataset.support_ids)),
+             writes=True),
+)
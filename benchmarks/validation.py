@@ -0,0 +1,202 @@
+"""Benchmark of the validation of the imported records, row by row
+against columns.
+
+The records of an import are either built one by one by the domain
+builders, each failure raising, or checked as columns by the
+'validate_batch' of the domain models, then only the accepted rows are
+built by 'from_valid' (see ee_crm.services.app.imports.validate_chunk).
+Both ways are timed on the same deterministic records, about 1 % of
+them invalid, and must accept the same rows. The column checks and the
+build of the accepted rows are timed apart: the build of the entities,
+the same in both ways, bounds the speedup of a whole chunk.
+
+'speedup' compares the whole ways, 'checks_speedup' the checks alone
+(the builder loop minus the same builds). With 100k records, 5 runs,
+Python 3.12, 'from_valid' stamping each entity once, the whole ways
+are 1.4-1.6x faster, the checks 2.9-5.5x: the 10x target isn't reached.
+Building an entity (about 3 us, half of it the UTC timestamp) costs
+more than checking its fields as columns.
+
+Functions
+    generate_records    # Deterministic records of a resource.
+    validate_rows       # Validate records with the builders.
+    validate_columns    # Validate records with validate_batch.
+    run_validation      # Time both ways on every resource.
+
+Constants
+    MODELS  # Domain model of each resource.
+"""
+import gc
+import platform
+import random
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+from ee_crm.domain.model import Client, Contract, Event
+from ee_crm.exceptions import DomainError
+
+_FORMAT_VERSION = 1
+_START = datetime(2025, 6, 1, 14, tzinfo=timezone.utc)
+
+MODELS = {"clients": Client, "contracts": Contract, "events": Event}
+
+
+def _client(rng, i):
+    return {"last_name": f"Last{i}", "first_name": f"First{i}",
+            "email": f"client{i}@example.com" if rng.random() > 0.01
+            else f"client{i}.example.com",
+            "phone_number": f"06-{i:08d}", "company": f"Company {i % 500}",
+            "salesman_id": 1 + i % 40}
+
+
+def _contract(rng, i):
+    return {"total_amount": round(rng.uniform(100, 50_000), 2)
+            if rng.random() > 0.01 else -1.0,
+            "client_id": 1 + i % 5000}
+
+
+def _event(rng, i):
+    start = _START + timedelta(hours=i % 5000)
+    return {"title": f"Event {i}", "start_time": start,
+            "end_time": start + timedelta(hours=6) if rng.random() > 0.01
+            else start - timedelta(hours=1),
+            "location": "Lyon", "attendee": 1 + i % 300,
+            "notes": "Vegetarian menu.", "contract_id": 1 + i % 5000}
+
+
+_GENERATORS = {"clients": _client, "contracts": _contract,
+               "events": _event}
+
+
+def generate_records(resource, count, seed=0):
+    """Generate the deterministic records of a resource, as read from
+    an import file once converted.
+
+    Args:
+        resource (str): Key of MODELS.
+        count (int): Number of records.
+        seed (int): Seed of the generator.
+
+    Returns:
+        list[dict]: The records.
+    """
+    rng = random.Random(seed)
+    generator = _GENERATORS[resource]
+    return [generator(rng, i) for i in range(count)]
+
+
+def validate_rows(model_cls, records):
+    """Validate and build records one by one with the builder of a
+    domain model.
+
+    Args:
+        model_cls (type): Domain model class.
+        records (list[dict]): The records.
+
+    Returns:
+        list[bool]: The error mask.
+    """
+    mask = []
+    for record in records:
+        try:
+            model_cls.builder(**record)
+        except DomainError:
+            mask.append(True)
+        else:
+            mask.append(False)
+    return mask
+
+
+def validate_columns(model_cls, records):
+    """Validate records as columns with the validate_batch of a domain
+    model.
+
+    Args:
+        model_cls (type): Domain model class.
+        records (list[dict]): The records.
+
+    Returns:
+        list[bool]: The error mask.
+    """
+    columns = {name: [record.get(name) for record in records]
+               for name in model_cls._batch_map}
+    mask, _ = model_cls.validate_batch(columns)
+    return mask
+
+
+def _best(func, repeat):
+    """Best time of several calls of a function, with its last result.
+    The garbage collector is off while timing, as in timeit: the
+    entities kept by a way would otherwise be scanned at each
+    collection and charged to it."""
+    times = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = perf_counter()
+            result = func()
+            times.append(perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return min(times), result
+
+
+def run_validation(count=100_000, repeat=3, seed=0, only=None,
+                   progress=None):
+    """Time the validation of the records of every resource, built row
+    by row, and checked as columns then built when accepted.
+
+    Args:
+        count (int): Number of records per resource.
+        repeat (int): Timed runs of each way, the best one is kept.
+        seed (int): Seed of the records.
+        only (Iterable[str]|None): Resources to run, every resource
+            when None.
+        progress (Callable[[str, dict], None]|None): Called after each
+            resource with its name and result.
+
+    Returns:
+        dict: meta (environment and parameters) and the results of the
+            resources, JSON serializable.
+
+    Raises:
+        AssertionError: If both ways don't reject the same rows.
+    """
+    results = {}
+    for resource, model_cls in MODELS.items():
+        if only and resource not in only:
+            continue
+        records = generate_records(resource, count, seed)
+        rows_s, row_mask = _best(
+            lambda: validate_rows(model_cls, records), repeat)
+        columns_s, column_mask = _best(
+            lambda: validate_columns(model_cls, records), repeat)
+        assert row_mask == column_mask, f"{resource}: the masks differ"
+        accepted = [record for record, invalid in zip(records, column_mask)
+                    if not invalid]
+        build_s, _ = _best(
+            lambda: [model_cls.from_valid(**record) for record in accepted],
+            repeat)
+        results[resource] = {
+            "records": count, "rejected": sum(column_mask),
+            "rows_ms": round(rows_s * 1000, 3),
+            "columns_ms": round(columns_s * 1000, 3),
+            "build_ms": round(build_s * 1000, 3),
+            "speedup": round(rows_s / (columns_s + build_s), 2),
+            # the builders run the same builds after their checks
+            "checks_speedup": round(max(rows_s - build_s, 0) / columns_s,
+                                    2),
+        }
+        if progress is not None:
+            progress(resource, results[resource])
+    return {
+        "version": _FORMAT_VERSION,
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "count": count, "repeat": repeat, "seed": seed,
+            "python": platform.python_version(),
+        },
+        "resources": results,
+    }
@@ -39,6 +39,7 @@ CREATE TABLE crm.contract (
     total_amount DECIMAL(10, 2),
     paid_amount DECIMAL(10, 2),
     created_at TIMESTAMP,
+    updated_at TIMESTAMP,
     signed BOOLEAN NOT NULL DEFAULT FALSE,
     client_id INT REFERENCES crm.client(client_id)
 );
@@ -51,6 +52,27 @@ CREATE TABLE crm.event (
     location VARCHAR(255),
     attendee INT,
     notes TEXT,
+    updated_at TIMESTAMP,
     supporter_id INT REFERENCES crm.collaborator(collaborator_id),
     contract_id INT REFERENCES crm.contract(contract_id)
 );
+
+CREATE TABLE crm.table_version (
+    table_name VARCHAR(63) NOT NULL PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE crm.tombstone (
+    tombstone_id SERIAL NOT NULL PRIMARY KEY,
+    table_name VARCHAR(63) NOT NULL,
+    row_id INT NOT NULL,
+    deleted_at TIMESTAMP NOT NULL
+);
+CREATE INDEX ix_crm_tombstone_deleted_at ON crm.tombstone (deleted_at);
+
+CREATE INDEX ix_crm_client_updated_at ON crm.client (updated_at);
+CREATE INDEX ix_crm_contract_updated_at ON crm.contract (updated_at);
+CREATE INDEX ix_crm_event_updated_at ON crm.event (updated_at);
+
+INSERT INTO crm.table_version (table_name) VALUES
+    ('users'), ('collaborator'), ('client'), ('contract'), ('event');
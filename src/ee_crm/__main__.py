@@ -1,16 +1,20 @@
 """CLI entrypoint for ee_crm.
 
 Initialize the loggers, the ORM mappers and handle application specific
-errors.
+errors. Every invocation is recorded in the latency metrics, see
+ee_crm.metrics.
 
 Function
     __main__    # CLI entrypoint function
 """
+import sys
+
 from ee_crm.adapters.orm import start_mappers
-from ee_crm.cli_interface.commands import cli
+from ee_crm.cli_interface.commands import cli, command_path
 from ee_crm.cli_interface.views.view_errors import ErrorView
 from ee_crm.exceptions import CRMException
 from ee_crm.loggers import init_sentry, log_sentry_traceback, setup_file_logger
+from ee_crm.metrics import finish_invocation, start_invocation
 
 
 init_sentry()
@@ -20,18 +24,25 @@ def main():
     """Run the ee_crm CLI entrypoint.
 
     Configure the logger, register the mappers, invoke the Click CLI,
-    handle the errors.
+    handle the errors and record the metrics of the invocation.
 
     Raises
         Exception: Any uncatch exception raised.
     """
     logger = setup_file_logger(name=__name__, filename="ERRORS")
+    start_invocation()
+    outcome = "crash"
 
     try:
         start_mappers()
         cli()
 
+    except SystemExit as exit_:
+        outcome = "ok" if exit_.code in (None, 0) else "error"
+        raise
+
     except CRMException as err:
+        outcome = "error"
         log_msg = (f"{err.level} ::: {type(err).__name__} ::: {err} ::: "
                    f"{err.tips}")
         if err.threat == "warning":
@@ -51,6 +62,9 @@ def main():
         log_sentry_traceback(error=err)
         raise err
 
+    finally:
+        finish_invocation(command_path(sys.argv[1:]), outcome)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,145 @@
+"""Cross-process cache of the attributes read by the access control
+layer (ABAC), stored in a small memory-mapped file.
+
+Every CLI command is a new process, the file lets consecutive commands
+on the same resources skip the database lookups of the permission
+predicates. The file is a fixed size, direct-mapped table of slots:
+a slot is selected by its (kind, id) key and overwritten on collision.
+
+A slot holds the value, a stamp and an expiration time:
+* the stamp is the sum of the change counters of the tables the value
+  depends on (see ee_crm.adapters.cache), counters only increase so
+  the sum changes with any write in those tables;
+* the expiration time is a wall clock time, shared by the processes.
+Each slot ends with a CRC32 of its content, a slot being written by
+another process is read as a miss.
+
+Classes
+    SharedAttributeCache    # mmap backed cache of ABAC attributes.
+
+Constants
+    CLIENT_SALESMAN     # client -> salesman
+    CONTRACT_SALESMAN   # contract -> client -> salesman
+    CONTRACT_SIGNED     # contract -> signed
+    EVENT_SUPPORT       # event -> supporter
+    EVENT_SALESMAN      # event -> contract -> client -> salesman
+"""
+import mmap
+import os
+import struct
+from time import time
+from zlib import crc32
+
+CLIENT_SALESMAN = 1
+CONTRACT_SALESMAN = 2
+CONTRACT_SIGNED = 3
+EVENT_SUPPORT = 4
+EVENT_SALESMAN = 5
+
+_MAGIC = b"EEAB"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sII")
+# kind, key, value, stamp, expires_at
+_ENTRY = struct.Struct("<Bqqqd")
+_SLOT = struct.Struct(f"<{_ENTRY.size}sI")
+_NONE = -(2 ** 63)
+
+
+class SharedAttributeCache:
+    """Memory-mapped cache of integer attributes keyed by (kind, id).
+
+    Attributes:
+        path (str): Path of the cache file.
+        slots (int): Number of slots of the file.
+        ttl (float): Lifetime of an entry, in seconds.
+        hits (int): Number of values served by the cache.
+        misses (int): Number of lookups that must query the database.
+    """
+    def __init__(self, path, slots=4096, ttl=30.0, clock=time):
+        self.path = str(path)
+        self.slots = slots
+        self.ttl = ttl
+        self._clock = clock
+        self._map = None
+        self.hits = 0
+        self.misses = 0
+
+    def _open(self):
+        """Map the file, created or reset when its header doesn't match
+        the expected format and size.
+
+        Returns:
+            mmap.mmap: The mapped file.
+        """
+        if self._map is not None:
+            return self._map
+        size = _HEADER.size + self.slots * _SLOT.size
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, self.slots)
+        if self._map[:_HEADER.size] != header:
+            self._map[:] = bytes(size)
+            self._map[:_HEADER.size] = header
+        return self._map
+
+    def close(self):
+        """Unmap the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _offset(self, kind, key):
+        return _HEADER.size + (kind * 1_000_003 + key) % self.slots \
+            * _SLOT.size
+
+    def get(self, kind, key, stamp):
+        """Read a value.
+
+        Args:
+            kind (int): Kind of attribute, one of the module constants.
+            key (int): Primary key of the resource.
+            stamp (int): Current stamp of the tables of the value.
+
+        Returns:
+            tuple[bool, int|None]: Whether the value was found and the
+                value.
+        """
+        offset = self._offset(kind, key)
+        entry, checksum = _SLOT.unpack_from(self._open(), offset)
+        s_kind, s_key, value, s_stamp, expires_at = _ENTRY.unpack(entry)
+        if (checksum != crc32(entry) or (s_kind, s_key) != (kind, key)
+                or s_stamp != stamp or expires_at <= self._clock()):
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, None if value == _NONE else value
+
+    def put(self, kind, key, value, stamp):
+        """Write a value, replacing the content of its slot.
+
+        Args:
+            kind (int): Kind of attribute, one of the module constants.
+            key (int): Primary key of the resource.
+            value (int|None): The attribute.
+            stamp (int): Stamp of the tables read to get the value.
+        """
+        entry = _ENTRY.pack(kind, key, _NONE if value is None else value,
+                            stamp, self._clock() + self.ttl)
+        offset = self._offset(kind, key)
+        self._open()[offset:offset + _SLOT.size] = _SLOT.pack(entry,
+                                                              crc32(entry))
+
+    def stats(self):
+        """Counters of the cache for this process.
+
+        Returns:
+            dict: hits and misses of the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses}
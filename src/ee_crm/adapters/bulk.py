@@ -0,0 +1,372 @@
+"""Bulk data transfer helpers working at the SQLAlchemy Core level.
+
+The ORM mapping is bypassed on purpose: rows are streamed straight from
+the tables declared in ee_crm.adapters.orm without building domain
+entities nor DTOs. PostgreSQL connections use the native COPY protocol
+through psycopg, other dialects fall back on chunked keyset SELECT for
+exports and multi-row INSERT for imports.
+
+Constants
+    EXPORT_FORMATS  # Formats accepted by the export helpers
+    IMPORT_FORMATS  # Formats accepted by the import helpers
+
+Functions
+    is_postgresql           # Check the dialect of a connection
+    copy_table_to           # Stream a table with COPY ... TO STDOUT
+    iter_table_keyset       # Chunked keyset SELECT on the primary key
+    encode_rows             # Encode rows in the COPY text or csv format
+    read_records            # Read a csv or jsonl file as dictionaries
+    iter_chunks             # Group an iterable in lists
+    create_staging_table    # Temporary copy of a table for imports
+    copy_rows_from          # Load rows with COPY ... FROM STDIN
+    insert_rows             # Load rows with multi-row INSERT
+    merge_staging           # INSERT ... SELECT ... RETURNING from staging
+
+References
+    * COPY with psycopg 3.
+https://www.psycopg.org/psycopg3/docs/basic/copy.html
+    * COPY text and csv formats.
+https://www.postgresql.org/docs/current/sql-copy.html#id-1.9.3.55.9
+"""
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import Column, Integer, MetaData, Table, insert, select
+
+EXPORT_FORMATS = ("csv", "text", "binary")
+IMPORT_FORMATS = ("csv", "jsonl")
+
+
+def is_postgresql(connection):
+    """Check if the connection is bound to a PostgreSQL database.
+
+    Args
+        connection (sqlalchemy.engine.Connection): Open connection.
+
+    Returns
+        bool: True if the dialect is PostgreSQL.
+    """
+    return connection.dialect.name == "postgresql"
+
+
+def _format_table(connection, table):
+    """Quote the (schema qualified) name of a table for raw SQL.
+
+    Args
+        connection (sqlalchemy.engine.Connection): Open connection.
+        table (sqlalchemy.Table): Table to quote.
+
+    Returns
+        str: Quoted table name. (ex: crm.client)
+    """
+    return connection.dialect.identifier_preparer.format_table(table)
+
+
+def _format_columns(connection, table):
+    """Quote the columns of a table for raw SQL.
+
+    Args
+        connection (sqlalchemy.engine.Connection): Open connection.
+        table (sqlalchemy.Table): Table whose columns are quoted.
+
+    Returns
+        str: Comma separated quoted column names.
+    """
+    preparer = connection.dialect.identifier_preparer
+    return ", ".join(preparer.quote(col.name) for col in table.columns)
+
+
+def copy_table_to(connection, table, write, fmt="csv"):
+    """Stream the content of a table with 'COPY ... TO STDOUT'.
+    Only available on PostgreSQL connections using psycopg.
+
+    Args
+        connection (sqlalchemy.engine.Connection): Open connection.
+        table (sqlalchemy.Table): Table to export.
+        write (Callable[[bytes], Any]): Called with every data block
+            sent by the server. With the csv format the first block is
+            the header line.
+        fmt (str): One of EXPORT_FORMATS.
+
+    Returns
+        int: Number of rows copied.
+    """
+    options = f"FORMAT {fmt}"
+    if fmt == "csv":
+        options += ", HEADER true"
+    pk = list(table.primary_key.columns)[0]
+    pk_name = connection.dialect.identifier_preparer.quote(pk.name)
+    sql = (f"COPY (SELECT {_format_columns(connection, table)} "
+           f"FROM {_format_table(connection, table)} ORDER BY {pk_name}) "
+           f"TO STDOUT ({options})")
+
+    blocks = 0
+    driver_connection = connection.connection.driver_connection
+    with driver_connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            for data in copy:
+                blocks += 1
+                write(bytes(data))
+        rows = cursor.rowcount
+    if rows is None or rows < 0:
+        # libpq sends one row per block, the csv header is a block.
+        rows = blocks - 1 if fmt == "csv" else blocks
+    return rows
+
+
+def iter_table_keyset(connection, table, chunk_size=5000, where=None):
+    """Read a table by chunks ordered by primary key. Each chunk starts
+    after the last primary key of the previous one, so the cost of a
+    query does not grow with the position in the table (no OFFSET).
+
+    Args
+        connection (sqlalchemy.engine.Connection): Open connection.
+        table (sqlalchemy.Table): Table to read.
+        chunk_size (int): Maximum number of rows per chunk.
+        where (sqlalchemy.ColumnElement|None): Condition of the read
+            rows, every row when None.
+
+    Yields
+        list[sqlalchemy.engine.Row]: Chunk of rows.
+    """
+    pk = list(table.primary_key.columns)[0]
+    last_pk = None
+    while True:
+        stmt = select(table).order_by(pk).limit(chunk_size)
+        if where is not None:
+            stmt = stmt.where(where)
+        if last_pk is not None:
+            stmt = stmt.where(pk > last_pk)
+        rows = connection.execute(stmt).all()
+        if not rows:
+            return
+        yield rows
+        last_pk = rows[-1]._mapping[pk]
+        if len(rows) < chunk_size:
+            return
+
+
+def _to_copy_value(value):
+    """Convert a python value into its COPY string representation.
+
+    Args
+        value (Any): Value read from the database.
+
+    Returns
+        str|None: String representation, None stays None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value)
+
+
+def _escape_text(value):
+    """Escape a value for the COPY text format.
+
+    Args
+        value (str|None): Value to escape.
+
+    Returns
+        str: Escaped value, '\\N' for NULL.
+    """
+    if value is None:
+        return "\\N"
+    return (value.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r"))
+
+
+def encode_rows(rows, fmt="csv", header=None):
+    """Encode rows the same way COPY would for the text and csv formats.
+    Used by the fallback path so exports are identical across dialects.
+
+    Args
+        rows (Iterable[Sequence]): Rows to encode.
+        fmt (str): Either "csv" or "text".
+        header (Sequence[str]|None): Columns names, written first when
+            given and the format is csv.
+
+    Returns
+        bytes: Encoded rows, utf-8.
+    """
+    if fmt == "text":
+        lines = ["\t".join(_escape_text(_to_copy_value(v)) for v in row)
+                 for row in rows]
+        return "".join(f"{line}\n" for line in lines).encode("utf-8")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header is not None:
+        writer.writerow(header)
+    for row in rows:
+        writer.writerow(["" if v is None else _to_copy_value(v)
+                         for v in row])
+    return buffer.getvalue().encode("utf-8")
+
+
+def _open_text(path):
+    """Open a file in text mode, gzip files are detected by suffix.
+
+    Args
+        path (str): Path of the file.
+
+    Returns
+        TextIO: Opened file.
+    """
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def read_records(path, fmt="csv"):
+    """Read a csv (with header) or a jsonl file one record at a time.
+    Empty csv cells are read as None. A jsonl line that isn't valid
+    JSON is yielded as its text, the importers reject the records that
+    aren't objects.
+
+    Args
+        path (str): Path of the file, may be gzip compressed.
+        fmt (str): One of IMPORT_FORMATS.
+
+    Yields
+        tuple[int, dict|Any]: Line number in the file and the record.
+    """
+    with _open_text(path) as file:
+        if fmt == "jsonl":
+            for line_no, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError:
+                    yield line_no, line.rstrip("\r\n")
+            return
+
+        reader = csv.DictReader(file)
+        for record in reader:
+            yield reader.line_num, {k: (v if v != "" else None)
+                                    for k, v in record.items()}
+
+
+def iter_chunks(iterable, size):
+    """Group the items of an iterable in lists of a given size.
+
+    Args
+        iterable (Iterable): Items to group.
+        size (int): Maximum length of a chunk.
+
+    Yields
+        list: Chunk of items, only the last one may be shorter.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def create_staging_table(connection, table):
+    """Create a temporary table mirroring the columns of a table,
+    without its primary key and constraints. A 'line_no' column keeps
+    track of the position of each row in the imported file.
+
+    Args
+        connection (sqlalchemy.engine.Connection): Open connection.
+        table (sqlalchemy.Table): Table to mirror.
+
+    Returns
+        sqlalchemy.Table: The created staging table, dropped with the
+            connection or by the caller.
+    """
+    columns = [Column(col.name, col.type) for col in table.columns
+               if not col.primary_key]
+    staging = Table(f"staging_{table.name}",
+                    MetaData(),
+                    Column("line_no", Integer, primary_key=True,
+                           autoincrement=False),
+                    *columns,
+                    prefixes=["TEMPORARY"])
+    staging.create(connection)
+    return staging
+
+
+def copy_rows_from(connection, table, rows):
+    """Load rows with 'COPY ... FROM STDIN'.
+    Only available on PostgreSQL connections using psycopg.
+
+    Args
+        connection (sqlalchemy.engine.Connection): Open connection.
+        table (sqlalchemy.Table): Destination table.
+        rows (Iterable[dict]): Rows keyed by column names.
+
+    Returns
+        int: Number of rows loaded.
+    """
+    names = [col.name for col in table.columns]
+    sql = (f"COPY {_format_table(connection, table)} "
+           f"({_format_columns(connection, table)}) FROM STDIN")
+    count = 0
+    driver_connection = connection.connection.driver_connection
+    with driver_connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            for row in rows:
+                copy.write_row([row.get(name) for name in names])
+                count += 1
+    return count
+
+
+def insert_rows(connection, table, rows):
+    """Load rows with multi-row 'INSERT ... VALUES ... RETURNING'.
+    SQLAlchemy "insertmanyvalues" batches the rows in as few statements
+    as the database allows and compiles the statement only once.
+
+    Args
+        connection (sqlalchemy.engine.Connection): Open connection.
+        table (sqlalchemy.Table): Destination table.
+        rows (list[dict]): Rows keyed by column names, each row must
+            have every column of the table.
+
+    Returns
+        int: Number of rows loaded.
+    """
+    if not rows:
+        return 0
+    pk = list(table.primary_key.columns)[0]
+    result = connection.execute(insert(table).returning(pk), rows)
+    return len(result.all())
+
+
+def merge_staging(connection, staging, table, where=None, values=None):
+    """Move the rows of a staging table into their final table with
+    one 'INSERT ... SELECT ... RETURNING' statement, in file order.
+
+    Args
+        connection (sqlalchemy.engine.Connection): Open connection.
+        staging (sqlalchemy.Table): Table from create_staging_table.
+        table (sqlalchemy.Table): Destination table.
+        where (sqlalchemy.ColumnElement|None): Optional condition on
+            the staging rows to merge.
+        values (dict[str, sqlalchemy.ColumnElement]|None): SQL
+            expressions of the columns set by the database instead of
+            their staged values.
+
+    Returns
+        list[int]: Primary keys of the inserted rows.
+    """
+    values = values or {}
+    names = [col.name for col in table.columns if not col.primary_key]
+    source = (select(*(values[name] if name in values else staging.c[name]
+                       for name in names))
+              .order_by(staging.c.line_no))
+    if where is not None:
+        source = source.where(where)
+    pk = list(table.primary_key.columns)[0]
+    stmt = insert(table).from_select(names, source).returning(pk)
+    return list(connection.execute(stmt).scalars())
@@ -0,0 +1,379 @@
+"""Second-level cache of domain entities, shared by the units of work.
+
+Entities are cached by (model class, primary key) as a snapshot of
+their column values, never as live instances: a session owns its
+instances and the snapshot is merged in the session that reads it,
+without a SELECT. The cache is bounded in size (least recently used
+entries are evicted first) and in time (entries expire after a TTL).
+
+A session tracked by the cache invalidates the entities it writes, at
+flush time and again at commit or rollback time, so no session reads a
+stale snapshot of its own or of another committed transaction. Writes
+made by other processes are only bounded by the TTL.
+
+Query results are cached by the services with the versions of the
+tables they read. Every transaction increments, at its commit, the
+counter of the tables it wrote in the 'table_version' table; a result
+is only served while the counters read from the database are the ones
+it was cached with, so results are never stale, whichever process
+wrote the tables. A transaction reading tables it wrote doesn't use the
+cache.
+
+The counters are hot rows: two transactions writing the same table
+wait for each other while the first one commits. They are bumped once,
+right before the commit, in the order of their names, so the lock is
+only held for the commit and the writers can't deadlock on the
+counters. The counters are only tracked when something reads them (the
+query and attribute caches, the read replicas), see
+ee_crm.services.unit_of_work.TRACK_TABLE_VERSIONS. A database created
+before the counters gets them with 'eecrm admin init-db'.
+
+Classes
+    EntityCache     # LRU and TTL bounded cache of entities snapshots.
+    QueryCache      # LRU cache of query results checked by versions.
+
+Functions
+    bump_table_versions     # Increment the counters of written tables.
+    read_table_versions     # Read the counters of tables.
+    track_table_versions    # Bump the tables written by a session at
+                            # commit.
+
+References
+    * https://docs.sqlalchemy.org/en/21/orm/session_api.html#sqlalchemy.orm.Session.merge
+    * https://docs.sqlalchemy.org/en/21/orm/session_events.html
+"""
+from collections import OrderedDict
+from time import monotonic
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ee_crm.adapters.orm import table_version_table
+
+
+def bump_table_versions(connection, table_names):
+    """Increment the change counter of tables, in the transaction of
+    the connection, in the order of their names. A missing counter is
+    created.
+
+    Args:
+        connection (sqlalchemy.engine.Connection): Open connection of
+            the writing transaction.
+        table_names (Iterable[str]): Names of the written tables.
+    """
+    versions = table_version_table
+    insert = (postgresql_insert if connection.dialect.name == "postgresql"
+              else sqlite_insert)
+    for name in sorted(set(table_names)):
+        # a single upsert, two missing counters created at once don't
+        # collide on the primary key
+        connection.execute(
+            insert(versions).values(table_name=name, version=1)
+            .on_conflict_do_update(
+                index_elements=[versions.c.table_name],
+                set_={"version": versions.c.version + 1}))
+
+
+def read_table_versions(session, model_classes):
+    """Read the current versions of the tables of models, with a single
+    query.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the reader.
+        model_classes (Iterable[type]): Mapped domain models.
+
+    Returns:
+        tuple[tuple[str, int]]: Sorted (table name, version) pairs,
+            missing counters are read as 0.
+    """
+    names = sorted({inspect(model_cls).local_table.name
+                    for model_cls in model_classes})
+    versions = table_version_table
+    found = dict(session.execute(
+        select(versions.c.table_name, versions.c.version)
+        .where(versions.c.table_name.in_(names))).all())
+    return tuple((name, found.get(name, 0)) for name in names)
+
+
+def track_table_versions(session):
+    """Register the listeners that record the tables written by the
+    flushes of a session, in session.info, and bump their counters once
+    before the commit. A rollback forgets them. Every unit of work of a
+    process reading the counters must register them, readers can't
+    detect the writes of a session that doesn't.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of a unit of work.
+    """
+    written_tables = session.info.setdefault("written_tables", set())
+
+    def after_flush(flushing_session, flush_context):
+        written = [*flushing_session.new, *flushing_session.deleted,
+                   *(obj for obj in flushing_session.dirty
+                     if flushing_session.is_modified(obj))]
+        written_tables.update(inspect(obj).mapper.local_table.name
+                              for obj in written)
+
+    def before_commit(committing_session):
+        # the commit flushes after this event, its writes are counted
+        committing_session.flush()
+        if written_tables:
+            bump_table_versions(committing_session.connection(),
+                                written_tables)
+            written_tables.clear()
+
+    def after_rollback(rolled_back_session):
+        written_tables.clear()
+
+    event.listen(session, "after_flush", after_flush)
+    event.listen(session, "before_commit", before_commit)
+    event.listen(session, "after_rollback", after_rollback)
+
+
+class EntityCache:
+    """Read-through cache of entities keyed by (model class, pk).
+
+    Attributes:
+        max_size (int): Maximum number of cached entities.
+        ttl (float): Lifetime of an entry, in seconds.
+        hits (int): Number of entities served by the cache.
+        misses (int): Number of lookups that reached the database.
+        evictions (int): Number of entries dropped for size or age.
+        invalidations (int): Number of entries dropped by writes.
+    """
+    def __init__(self, max_size=1024, ttl=30.0, clock=monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(model_cls, obj_pk):
+        return model_cls, obj_pk
+
+    def get(self, session, model_cls, obj_pk):
+        """Return the cached entity, merged in the session.
+
+        Args:
+            session (sqlalchemy.orm.Session): Session receiving the
+                entity.
+            model_cls (type): Mapped domain model class.
+            obj_pk (Any): Primary key of the entity.
+
+        Returns:
+            (Any|None): Persistent entity or None on a miss.
+        """
+        key = self._key(model_cls, obj_pk)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, values = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._restore(session, model_cls, values)
+
+    def put(self, session, obj):
+        """Cache a snapshot of an entity freshly loaded by a session.
+        Entities with pending changes, or written by the session in
+        its current transaction, aren't cached.
+
+        Args:
+            session (sqlalchemy.orm.Session): Session owning the entity.
+            obj (Any): Persistent entity.
+        """
+        state = inspect(obj)
+        if (state.identity is None or state.modified
+                or state.key in session.info.get("cache_written", ())):
+            return
+        columns = state.mapper.column_attrs.keys()
+        values = {k: state.dict[k] for k in columns if k in state.dict}
+        key = self._key(state.class_, state.identity[0]
+                        if len(state.identity) == 1 else state.identity)
+        self._entries[key] = (self._clock() + self.ttl, values)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, model_cls, obj_pk):
+        """Drop the entry of an entity.
+
+        Args:
+            model_cls (type): Mapped domain model class.
+            obj_pk (Any): Primary key of the entity.
+        """
+        if self._entries.pop(self._key(model_cls, obj_pk), None):
+            self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry, the counters are kept."""
+        self._entries.clear()
+
+    def stats(self):
+        """Counters of the cache.
+
+        Returns:
+            dict: size, hits, misses, evictions, invalidations and
+                hit_ratio of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def track(self, session):
+        """Register the flush, commit and rollback listeners that
+        invalidate the entities written by a session.
+
+        Args:
+            session (sqlalchemy.orm.Session): Session of a unit of work.
+        """
+        written = session.info.setdefault("cache_written", set())
+
+        def after_flush(flushing_session, flush_context):
+            for obj in (*flushing_session.dirty, *flushing_session.deleted):
+                identity_key = inspect(obj).key
+                if identity_key is not None:
+                    written.add(identity_key)
+            self._invalidate_keys(written)
+
+        def after_transaction_end(ending_session, transaction):
+            if transaction.parent is None:
+                self._invalidate_keys(written)
+                written.clear()
+
+        event.listen(session, "after_flush", after_flush)
+        event.listen(session, "after_transaction_end",
+                     after_transaction_end)
+
+    def _invalidate_keys(self, identity_keys):
+        """Drop the entries of SQLAlchemy identity keys.
+
+        Args:
+            identity_keys (Iterable[tuple]): (class, pk tuple, token).
+        """
+        for model_cls, identity, _ in identity_keys:
+            self.invalidate(model_cls,
+                            identity[0] if len(identity) == 1 else identity)
+
+    @staticmethod
+    def _restore(session, model_cls, values):
+        """Rebuild an entity from its snapshot and merge it in the
+        session without loading it from the database.
+
+        Args:
+            session (sqlalchemy.orm.Session): Session receiving the
+                entity.
+            model_cls (type): Mapped domain model class.
+            values (dict): Column values of the entity.
+
+        Returns:
+            Any: The persistent entity.
+        """
+        obj = inspect(model_cls).class_manager.new_instance()
+        for k, v in values.items():
+            set_committed_value(obj, k, v)
+        make_transient_to_detached(obj)
+        return session.merge(obj, load=False)
+
+
+class QueryCache:
+    """Cache of query results, validated by the versions of the tables
+    they depend on. Results must be immutable, such as tuples of DTOs.
+
+    Attributes:
+        max_size (int): Maximum number of cached results.
+        hits (int): Number of results served by the cache.
+        misses (int): Number of results computed by a query.
+        stale (int): Number of results dropped for an outdated version.
+    """
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def versions(session, model_classes):
+        """See read_table_versions."""
+        return read_table_versions(session, model_classes)
+
+    def get_or_query(self, session, key, model_classes, query):
+        """Return the cached result of a key when the tables it depends
+        on haven't changed, otherwise run and cache the query. The
+        query of a session that wrote one of the tables isn't cached,
+        their counters are bumped at its commit.
+
+        Args:
+            session (sqlalchemy.orm.Session): Session of the reader.
+            key (Hashable): Identify the query and its arguments.
+            model_classes (Iterable[type]): Models read by the query.
+            query (Callable[[], Any]): Computes the result.
+
+        Returns:
+            Any: The result of the query.
+        """
+        # the read autoflushes the session, its writes are recorded
+        versions = self.versions(session, model_classes)
+        written = session.info.get("written_tables")
+        if written and not written.isdisjoint(name for name, _ in versions):
+            self.misses += 1
+            return query()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == versions:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+            self.stale += 1
+        self.misses += 1
+        result = query()
+        self._entries[key] = (versions, result)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drop every entry, the counters are kept."""
+        self._entries.clear()
+
+    def stats(self):
+        """Counters of the cache.
+
+        Returns:
+            dict: size, hits, misses, stale and hit_ratio of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
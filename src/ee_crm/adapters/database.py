@@ -0,0 +1,214 @@
+"""Engine of the configured database: a PostgreSQL server or an embedded
+SQLite file, for the single-user and offline installations.
+
+The mapped tables live in the 'auth' and 'crm' schemas of PostgreSQL.
+SQLite has no schema, the engine maps them to its main database with a
+schema_translate_map, so the tables, the repositories and the services
+are shared by both backends. Each SQLite connection is tuned when it is
+opened:
+    * the journal is written ahead (WAL): the readers don't block the
+      writer and the writer doesn't block the readers;
+    * synchronous NORMAL, the default: in WAL mode a commit may be lost
+      on a power failure, never corrupted;
+    * a larger page cache and memory mapped reads of the file;
+    * a busy timeout: a writer waits for the lock of another process
+      instead of failing at once;
+    * the foreign keys are enforced, as on PostgreSQL;
+    * the temporary tables (import staging) are kept in memory.
+
+The operations whose SQL differs between the dialects are handled where
+they are used: COPY (PostgreSQL) or chunked statements (SQLite) in
+ee_crm.adapters.bulk, the plans of the slow query log and the checks of
+the doctor. SQLite stores the times without their offset.
+
+Functions
+    sqlite_pragmas          # PRAGMA statements of a SQLite connection.
+    create_database_engine  # Engine of the configured database.
+    create_uri_engine       # Engine of another database, by URI.
+    create_schema           # Create the tables and their fixed rows.
+    is_unreachable          # Whether an error is a lost connection.
+
+References
+    * SQLite WAL.
+https://www.sqlite.org/wal.html
+    * SQLAlchemy schema translation.
+https://docs.sqlalchemy.org/en/20/core/connections.html#translation-of-schema-names
+"""
+import os
+from functools import partial
+
+from sqlalchemy import create_engine, event, insert, make_url, select, \
+    text
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+from ee_crm.adapters.orm import mapper_registry, role_table, \
+    table_version_table
+from ee_crm.config import get_database_settings
+from ee_crm.domain.model import Role
+
+# SQLite has no schema, the tables live in its main database
+SQLITE_SCHEMA_MAP = {"auth": None, "crm": None}
+
+BACKENDS = ("postgresql", "sqlite")
+_SYNCHRONOUS = ("OFF", "NORMAL", "FULL", "EXTRA")
+# Tables whose changes are counted, see ee_crm.adapters.cache
+_VERSIONED_TABLES = ("users", "collaborator", "client", "contract", "event")
+
+
+def sqlite_pragmas(settings, memory=False):
+    """Build the PRAGMA statements run on each SQLite connection.
+
+    Args
+        settings (dict): The database settings, see
+            ee_crm.config.get_database_settings.
+        memory (bool): Whether the database is in memory, it has no
+            journal to write ahead.
+
+    Returns
+        list[str]: The PRAGMA statements.
+
+    Raises
+        ValueError: If the synchronous level is unknown.
+    """
+    if settings["synchronous"] not in _SYNCHRONOUS:
+        raise ValueError(f"Unknown SQLITE_SYNCHRONOUS "
+                         f"{settings['synchronous']!r}, use one of "
+                         f"{', '.join(_SYNCHRONOUS)}.")
+    pragmas = [] if memory else ["PRAGMA journal_mode=WAL"]
+    return pragmas + [
+        f"PRAGMA synchronous={settings['synchronous']}",
+        f"PRAGMA cache_size=-{int(settings['cache_size_kib'])}",
+        f"PRAGMA mmap_size={int(settings['mmap_size'])}",
+        f"PRAGMA busy_timeout={int(settings['busy_timeout_ms'])}",
+        "PRAGMA foreign_keys=ON",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def _run_pragmas(pragmas, dbapi_connection, connection_record):
+    """Listener of the 'connect' event, run the PRAGMA statements."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def create_database_engine(settings=None, **kwargs):
+    """Create the engine of the configured database.
+
+    Args
+        settings (dict|None): The database settings, see
+            ee_crm.config.get_database_settings, the configured ones
+            when None.
+        **kwargs (Any): Additional keyword arguments of create_engine.
+            (ex: poolclass)
+
+    Returns
+        sqlalchemy.engine.Engine: The engine, SQLite maps the 'auth' and
+            'crm' schemas to its main database.
+
+    Raises
+        ValueError: If the backend or a SQLite setting is unknown.
+    """
+    settings = settings or get_database_settings()
+    backend = settings["backend"]
+    if backend == "postgresql":
+        return create_engine(settings["uri"], **kwargs)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown DB_BACKEND {backend!r}, use one of "
+                         f"{', '.join(BACKENDS)}.")
+
+    path = settings["sqlite_path"]
+    memory = path == ":memory:"
+    pragmas = sqlite_pragmas(settings, memory=memory)
+    if not memory:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"timeout": settings["busy_timeout_ms"] / 1000},
+        execution_options={"schema_translate_map": SQLITE_SCHEMA_MAP},
+        **kwargs)
+    event.listen(engine, "connect", partial(_run_pragmas, pragmas))
+    return engine
+
+
+def create_uri_engine(uri, settings=None, **kwargs):
+    """Create the engine of another database given by its URI, a read
+    replica (see ee_crm.adapters.routing) or a shard (see
+    ee_crm.adapters.sharding). A SQLite database is tuned as the
+    embedded one.
+
+    Args
+        uri (str): URI of the database, ex: 'postgresql://...' or
+            'sqlite:///path/to/replica.db'.
+        settings (dict|None): The database settings, the configured
+            ones when None.
+        **kwargs (Any): Additional keyword arguments of create_engine.
+
+    Returns
+        sqlalchemy.engine.Engine: The engine of the database.
+    """
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite":
+        return create_database_engine(
+            {**(settings or get_database_settings()), "backend": "sqlite",
+             "sqlite_path": url.database or ":memory:"}, **kwargs)
+    return create_engine(url, **kwargs)
+
+
+def create_schema(engine):
+    """Create the missing schemas and tables of the application, then
+    the missing roles and table change counters. Existing tables and
+    rows are kept, so it can run on an initialized database.
+
+    Args
+        engine (sqlalchemy.engine.Engine): Engine of the database.
+
+    Returns
+        list[str]: Names of the created tables.
+    """
+    metadata = mapper_registry.metadata
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("CREATE SCHEMA IF NOT EXISTS auth"))
+            conn.execute(text("CREATE SCHEMA IF NOT EXISTS crm"))
+        # the inspection doesn't translate the schemas
+        created = [table.name for table in metadata.sorted_tables
+                   if not conn.dialect.has_table(
+                       conn, table.name,
+                       schema=conn.schema_for_object(table))]
+        metadata.create_all(conn)
+
+        roles = set(conn.execute(select(role_table.c.role_id)).scalars())
+        missing = [{"role_id": role.value, "role": role.name.capitalize()}
+                   for role in Role if role.value not in roles]
+        if missing:
+            conn.execute(insert(role_table), missing)
+
+        versions = table_version_table
+        counted = set(conn.execute(select(versions.c.table_name)).scalars())
+        missing = [{"table_name": name, "version": 0}
+                   for name in _VERSIONED_TABLES if name not in counted]
+        if missing:
+            conn.execute(insert(versions), missing)
+    return created
+
+
+def is_unreachable(error):
+    """Whether an error of SQLAlchemy is raised because the database
+    can't be reached: the connection couldn't be opened, or was lost
+    while a statement ran. The errors of the statements themselves (a
+    constraint, a locked SQLite file...) aren't.
+
+    Args
+        error (Exception): The raised error.
+
+    Returns
+        bool: True if the database is unreachable.
+    """
+    if not isinstance(error, DBAPIError):
+        return False
+    return error.connection_invalidated or (
+        isinstance(error, OperationalError) and error.statement is None)
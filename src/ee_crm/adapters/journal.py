@@ -0,0 +1,115 @@
+"""Offline write journal, an append-only JSON lines file.
+
+While the database is unreachable, the validated writes of the managers
+are appended to the journal instead of failing (see
+ee_crm.controllers.app.journal), then replayed by 'eecrm sync --push'.
+Each entry is a line, written and flushed to the disk at once: a crash
+loses at most the line being written, which is skipped when read. The
+entries get an id, the replayed ones are removed by id, so the entries
+appended while a push runs are kept. The appends and the removals,
+read-filter-replace cycles, are serialized between processes by an
+advisory lock where the platform has one (fcntl).
+
+Classes
+    WriteJournal    # Append, read and remove the entries of a journal.
+"""
+import json
+import os
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, Windows
+    fcntl = None
+
+
+class WriteJournal:
+    """Append-only journal of the offline writes.
+
+    Attributes:
+        path (str): Path of the journal file.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        # the journal is replaced by remove, the lock has its own file
+        with open(f"{self.path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def append(self, entry):
+        """Append an entry, synced to the disk before returning.
+
+        Args:
+            entry (dict): JSON serializable entry, the datetimes are
+                written in ISO format.
+
+        Returns:
+            dict: The entry with its id.
+        """
+        entry = {"id": uuid.uuid4().hex, **entry}
+        with self._locked(), open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=_isoformat) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return entry
+
+    def read(self):
+        """Read the entries in the order they were written, the
+        unreadable lines are skipped.
+
+        Returns:
+            list[dict]: The entries, empty without journal.
+        """
+        entries = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict) and "id" in entry:
+                        entries.append(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def remove(self, ids):
+        """Remove entries, the file is replaced at once. No entry can
+        be appended between the read and the replacement.
+
+        Args:
+            ids (Iterable[str]): Ids of the removed entries.
+        """
+        ids = set(ids)
+        if not ids:
+            return
+        with self._locked():
+            kept = [entry for entry in self.read()
+                    if entry["id"] not in ids]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in kept:
+                    f.write(json.dumps(entry, default=_isoformat) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+
+def _isoformat(value):
+    """JSON encoder of the values json doesn't know, the datetimes in
+    ISO format."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
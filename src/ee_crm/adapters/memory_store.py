@@ -0,0 +1,488 @@
+"""In-memory store of the entities, the backend of the in-memory
+repositories and unit of work: no database and no SQL, for the unit
+tests, the property tests, the demos and the simulations.
+
+The entities of each table are kept by primary key, with a hash index
+on each foreign key and filterable attribute: a filter on an indexed
+attribute only reads the entities of its bucket instead of the table.
+
+The store is changed through sessions, the in-memory counterpart of the
+SQLAlchemy session used by the units of work:
+    * the added and deleted entities are visible at once, the read
+      entities are changed in place by the services, as with the ORM;
+    * flush(), also run before each query, moves the changed entities
+      to the buckets of their new values;
+    * rollback() undoes the adds and the deletes, and restores the
+      entities read since the last commit;
+    * the foreign keys and the unique columns aren't enforced.
+The sessions of a store see the changes of each other at once, they are
+meant to be used one at a time, by a single thread.
+
+The relationships followed by the services (Collaborator.user,
+Client.salesman, Contract.client, Event.contract, Event.supporter and
+the reverse AuthUser.collaborator and Contract.event) are linked on the
+entities, the collections (Client.contracts...) aren't: filter on their
+foreign key instead.
+
+The entities are the domain classes, mapped by ee_crm.adapters.orm or
+not, but an entity built before the mappers start can't be used once
+they have. The store writes the primary keys, the loaded values and the
+links in the instance dictionary, as SQLAlchemy loads them, so the
+domain setters (the modification time of a client) aren't triggered.
+
+A snapshot is a pickle of the rows of the store, with the column names
+of the tables of ee_crm.adapters.orm: only restore trusted files.
+
+Classes
+    InMemoryStore   # Entities, indexes, links and snapshots.
+    InMemorySession # Transaction of a unit of work on a store.
+"""
+import os
+import pickle
+from dataclasses import dataclass
+
+from ee_crm.domain.model import AuthUser, Collaborator, Client, Contract, Event
+
+_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class _TableSpec:
+    """Table of the store.
+
+    Attributes:
+        name (str): Name of the table, as in ee_crm.adapters.orm.
+        model_cls (type): Domain class of its entities.
+        columns (dict[str, str]): Column names mapped to the attributes
+            of the entities, the primary key first.
+        indexed (tuple[str]): Indexed attributes.
+    """
+    name: str
+    model_cls: type
+    columns: dict
+    indexed: tuple
+
+
+def _table_spec(name, model_cls, columns, foreign_keys=()):
+    """Build the spec of a table, its filterable fields and foreign keys
+    are indexed."""
+    aliases = model_cls._private_aliases
+    filterable = sorted(model_cls.filterable_fields() - {"id"})
+    indexed = [aliases.get(field, field) for field in filterable]
+    indexed += [fk for fk in foreign_keys if fk not in indexed]
+    return _TableSpec(name, model_cls, columns, tuple(indexed))
+
+
+_TABLES = {spec.name: spec for spec in (
+    _table_spec("users", AuthUser, {
+        "user_id": "id", "username": "_username", "password": "_password"}),
+    _table_spec("collaborator", Collaborator, {
+        "collaborator_id": "id", "last_name": "last_name",
+        "first_name": "first_name", "email": "email",
+        "phone_number": "phone_number", "role_id": "_role_id",
+        "user_id": "_user_id"}),
+    _table_spec("client", Client, {
+        "client_id": "id", "last_name": "last_name",
+        "first_name": "first_name", "email": "email",
+        "phone_number": "phone_number", "company": "company",
+        "created_at": "_created_at", "updated_at": "_updated_at",
+        "salesman_id": "_salesman_id"}),
+    _table_spec("contract", Contract, {
+        "contract_id": "id", "total_amount": "_total_amount",
+        "paid_amount": "_paid_amount", "created_at": "created_at",
+        "updated_at": "_updated_at", "signed": "_signed",
+        "client_id": "_client_id"}),
+    _table_spec("event", Event, {
+        "event_id": "id", "title": "title", "start_time": "start_time",
+        "end_time": "end_time", "location": "location",
+        "attendee": "attendee", "notes": "notes", "updated_at": "_updated_at",
+        "supporter_id": "supporter_id", "contract_id": "_contract_id"},
+        foreign_keys=("supporter_id",)),
+)}
+_TABLE_OF = {spec.model_cls: spec for spec in _TABLES.values()}
+
+# Linked relationships: (table, attribute, target table, foreign key),
+# the reverse attribute of the one-to-one ones is linked on the target
+_RELATIONS = (
+    ("collaborator", "user", "users", "_user_id"),
+    ("client", "salesman", "collaborator", "_salesman_id"),
+    ("contract", "client", "client", "_client_id"),
+    ("event", "contract", "contract", "_contract_id"),
+    ("event", "supporter", "collaborator", "supporter_id"),
+)
+_REVERSES = {
+    ("collaborator", "_user_id"): "collaborator",
+    ("event", "_contract_id"): "event",
+}
+
+
+def table_spec(model_cls):
+    """Spec of the table of a domain class.
+
+    Args:
+        model_cls (type): The domain class.
+
+    Returns:
+        _TableSpec: Its table.
+
+    Raises:
+        TypeError: If the class isn't stored.
+    """
+    try:
+        return _TABLE_OF[model_cls]
+    except KeyError:
+        raise TypeError(f"{model_cls.__name__} isn't stored in memory.") \
+            from None
+
+
+class InMemoryStore:
+    """Entities of the tables, indexed and linked.
+
+    Attributes:
+        tables (dict[str, dict[int, object]]): Entities per table name,
+            by primary key.
+    """
+    def __init__(self):
+        self.tables = {name: {} for name in _TABLES}
+        # attribute -> value -> {primary key: entity}
+        self._indexes = {name: {attr: {} for attr in spec.indexed}
+                         for name, spec in _TABLES.items()}
+        # primary key -> values of the indexed attributes, as indexed
+        self._keys = {name: {} for name in _TABLES}
+        self._next_pk = dict.fromkeys(_TABLES, 1)
+
+    def __len__(self):
+        return sum(len(table) for table in self.tables.values())
+
+    def _key(self, spec, obj):
+        # the loaded values are in the instance dictionary, mapped or not
+        return tuple(map(obj.__dict__.get, spec.indexed))
+
+    def _index(self, spec, obj, key):
+        indexes = self._indexes[spec.name]
+        for attr, value in zip(spec.indexed, key):
+            indexes[attr].setdefault(value, {})[obj.id] = obj
+        self._keys[spec.name][obj.id] = key
+
+    def _unindex(self, spec, pk):
+        key = self._keys[spec.name].pop(pk)
+        for attr, value in zip(spec.indexed, key):
+            buckets = self._indexes[spec.name][attr]
+            bucket = buckets[value]
+            del bucket[pk]
+            if not bucket:
+                del buckets[value]
+        return key
+
+    def select(self, model_cls, within=None, **filters):
+        """Select the entities whose attributes equal the filters, the
+        most selective indexed filter gives the candidates.
+
+        Args:
+            model_cls (type): Domain class of the entities.
+            within (tuple[str, Iterable]|None): Optional attribute and
+                its accepted values. (ex: ("_client_id", {1, 5}))
+            **filters (dict): Values by attribute name, as mapped.
+                (ex: {"_salesman_id": 4})
+
+        Returns:
+            list[object]: The entities, ordered by primary key.
+
+        Raises:
+            AttributeError: If a filter isn't an attribute of the class.
+        """
+        spec = table_spec(model_cls)
+        table = self.tables[spec.name]
+        indexes = self._indexes[spec.name]
+        fields = model_cls.__dataclass_fields__
+        attrs = [*filters, *(within[:1] if within is not None else ())]
+        for attr in attrs:
+            if attr not in fields:
+                raise AttributeError(f"{model_cls.__name__} has no "
+                                     f"attribute {attr!r}.")
+
+        sources = [indexes[attr].get(value, {})
+                   for attr, value in filters.items() if attr in indexes]
+        if "id" in filters:
+            obj = table.get(filters["id"])
+            sources.append({} if obj is None else {obj.id: obj})
+        accepted = None
+        if within is not None:
+            attr, accepted = within[0], set(within[1])
+            if attr == "id":
+                sources.append({pk: table[pk] for pk in accepted
+                                if pk in table})
+            elif attr in indexes:
+                union = {}
+                for value in accepted:
+                    union.update(indexes[attr].get(value, {}))
+                sources.append(union)
+        candidates = min(sources, key=len) if sources else table
+
+        rows = [obj for obj in candidates.values()
+                if all(obj.__dict__.get(attr) == value
+                       for attr, value in filters.items())
+                and (accepted is None
+                     or obj.__dict__.get(within[0]) in accepted)]
+        # nearly sorted already, the buckets keep their insertion order
+        rows.sort(key=lambda obj: obj.id)
+        return rows
+
+    def _link(self, spec, obj):
+        """Link the relationships of an entity, from its foreign keys
+        and the index of the reverse one-to-one relationships."""
+        state = obj.__dict__
+        for table, attr, target, fk in _RELATIONS:
+            if table == spec.name:
+                state[attr] = self.tables[target].get(getattr(obj, fk))
+            elif target == spec.name and (table, fk) in _REVERSES:
+                sources = self._indexes[table][fk].get(obj.id, {})
+                state[_REVERSES[table, fk]] = next(iter(sources.values()),
+                                                   None)
+
+    def _link_around(self, spec, obj, key, referenced=True):
+        """Link the entities related to an entity: the targets of its
+        one-to-one relationships, for the foreign keys of 'key', and
+        the entities referencing it."""
+        values = dict(zip(spec.indexed, key))
+        for table, attr, target, fk in _RELATIONS:
+            if table == spec.name and (table, fk) in _REVERSES:
+                other = self.tables[target].get(values[fk])
+                if other is not None:
+                    self._link(_TABLES[target], other)
+            elif referenced and target == spec.name:
+                value = self.tables[target].get(obj.id)
+                for source in self._indexes[table][fk].get(obj.id,
+                                                           {}).values():
+                    source.__dict__[attr] = value
+
+    def insert(self, obj):
+        """Store an entity, a primary key is given to the new ones.
+
+        Args:
+            obj (object): Entity of a stored domain class.
+        """
+        spec = table_spec(type(obj))
+        pk = obj.__dict__.get("id")
+        if pk is None:
+            pk = obj.__dict__["id"] = self._next_pk[spec.name]
+        self._next_pk[spec.name] = max(self._next_pk[spec.name], pk + 1)
+        table = self.tables[spec.name]
+        if pk in table:
+            self._unindex(spec, pk)
+        table[pk] = obj
+        key = self._key(spec, obj)
+        self._index(spec, obj, key)
+        self._link(spec, obj)
+        self._link_around(spec, obj, key)
+
+    def remove(self, obj):
+        """Remove an entity, the entities referencing it keep their
+        foreign key.
+
+        Args:
+            obj (object): A stored entity.
+        """
+        spec = table_spec(type(obj))
+        if self.tables[spec.name].get(obj.id) is not obj:
+            return
+        del self.tables[spec.name][obj.id]
+        key = self._unindex(spec, obj.id)
+        self._link_around(spec, obj, key)
+
+    def reindex(self, obj):
+        """Move an entity changed in place to the buckets of its new
+        values, and link its new relationships.
+
+        Args:
+            obj (object): An entity, ignored unless it is stored.
+        """
+        spec = table_spec(type(obj))
+        if self.tables[spec.name].get(obj.id) is not obj:
+            return
+        key = self._key(spec, obj)
+        if key == self._keys[spec.name][obj.id]:
+            return
+        old_key = self._unindex(spec, obj.id)
+        self._index(spec, obj, key)
+        self._link(spec, obj)
+        self._link_around(spec, obj, old_key, referenced=False)
+        self._link_around(spec, obj, key, referenced=False)
+
+    def load_rows(self, table_name, rows):
+        """Store entities built from rows, as a database loads them:
+        without validation nor domain setters.
+
+        Args:
+            table_name (str): Name of the table. (ex: "client")
+            rows (Iterable[dict]): Values by column name, the primary
+                key included.
+        """
+        spec = _TABLES[table_name]
+        columns = spec.columns.items()
+        for row in rows:
+            values = {attr: row[column] for column, attr in columns
+                      if column in row}
+            pk = values.pop("id", None)
+            obj = spec.model_cls(**values)
+            # the modification time of a client is set by its setters
+            obj.__dict__.update(values, id=pk)
+            self.insert(obj)
+
+    def rows(self, table_name):
+        """Rows of the entities of a table, ordered by primary key.
+
+        Args:
+            table_name (str): Name of the table. (ex: "client")
+
+        Returns:
+            list[dict]: Values by column name.
+        """
+        spec = _TABLES[table_name]
+        table = self.tables[table_name]
+        return [{column: getattr(table[pk], attr)
+                 for column, attr in spec.columns.items()}
+                for pk in sorted(table)]
+
+    def clear(self):
+        """Remove every entity, the primary keys start again at 1."""
+        self.__init__()
+
+    def snapshot(self, path):
+        """Write the rows of every table in a file, atomically.
+
+        Args:
+            path (str): Path of the snapshot file.
+        """
+        payload = {"version": _FORMAT_VERSION,
+                   "tables": {name: self.rows(name) for name in _TABLES}}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def restore(self, path):
+        """Replace the entities of the store by those of a snapshot.
+
+        Args:
+            path (str): Path of a snapshot file written by snapshot().
+
+        Raises:
+            ValueError: If the file isn't a snapshot of this version.
+        """
+        with open(path, "rb") as file:
+            payload = pickle.load(file)
+        if not isinstance(payload, dict) or \
+                payload.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"{path} isn't a snapshot of the in-memory "
+                             f"store (version {_FORMAT_VERSION}).")
+        self.clear()
+        for name in _TABLES:
+            self.load_rows(name, payload["tables"].get(name, ()))
+
+
+class InMemorySession:
+    """Transaction of a unit of work on an in-memory store, see the
+    module docstring.
+
+    Attributes:
+        store (InMemoryStore): The store.
+    """
+    def __init__(self, store):
+        self.store = store
+        # ("add" | "delete", entity), in order
+        self._journal = []
+        # id(entity) -> (entity, its attributes when first read)
+        self._read = {}
+
+    def _track(self, obj):
+        if obj is not None and id(obj) not in self._read:
+            self._read[id(obj)] = (obj, dict(obj.__dict__))
+        return obj
+
+    def add(self, obj):
+        """Add an entity to the store, a new one is given its primary
+        key at once.
+
+        Args:
+            obj (object): Entity of a stored domain class.
+        """
+        self.store.insert(obj)
+        self._journal.append(("add", obj))
+        # flushed as the read entities when changed after the add
+        self._track(obj)
+
+    def get(self, model_cls, obj_pk):
+        """Fetch an entity by primary key.
+
+        Args:
+            model_cls (type): Domain class of the entity.
+            obj_pk (int): Primary key.
+
+        Returns:
+            object|None: The entity.
+        """
+        table = self.store.tables[table_spec(model_cls).name]
+        return self._track(table.get(obj_pk))
+
+    def delete(self, obj):
+        """Remove an entity from the store.
+
+        Args:
+            obj (object): A stored entity.
+        """
+        self.store.remove(obj)
+        self._journal.append(("delete", obj))
+
+    def query(self, model_cls, within=None, **filters):
+        """Fetch the entities matching the filters, the session is
+        flushed first. See InMemoryStore.select.
+
+        Args:
+            model_cls (type): Domain class of the entities.
+            within (tuple[str, Iterable]|None): Optional attribute and
+                its accepted values.
+            **filters (dict): Values by attribute name, as mapped.
+
+        Returns:
+            list[object]: The entities, ordered by primary key.
+        """
+        self.flush()
+        return [self._track(obj)
+                for obj in self.store.select(model_cls, within, **filters)]
+
+    def flush(self):
+        """Move the read entities changed in place to the buckets of
+        their new values."""
+        for obj, _ in self._read.values():
+            self.store.reindex(obj)
+
+    def commit(self):
+        """Flush, then forget the changes: they can't be rolled back."""
+        self.flush()
+        self._journal.clear()
+        self._read.clear()
+
+    def rollback(self):
+        """Restore the read entities, then undo the deletes and the
+        adds since the last commit."""
+        restored = []
+        for obj, state in self._read.values():
+            if obj.__dict__ != state:
+                obj.__dict__.clear()
+                obj.__dict__.update(state)
+                restored.append(obj)
+        for action, obj in reversed(self._journal):
+            if action == "add":
+                self.store.remove(obj)
+            else:
+                self.store.insert(obj)
+        for obj in restored:
+            self.store.reindex(obj)
+            self.store._link(table_spec(type(obj)), obj)
+        self._journal.clear()
+        self._read.clear()
+
+    def close(self):
+        """Roll back the changes that aren't committed."""
+        self.rollback()
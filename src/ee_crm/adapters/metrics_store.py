@@ -0,0 +1,241 @@
+"""Local store of the latency histograms of the commands.
+
+Every invocation of a command is recorded in a small JSON state file,
+in histograms of its duration and of its number of SQL statements. The
+histograms are kept per time window (one hour by default) and per
+series (command, role, outcome); the windows older than the retention
+are dropped at each write, so the file stays small.
+
+The histograms use HDR-style log-linear buckets: values are exact up to
+2^SUB_BITS, then every power of two is split in 2^(SUB_BITS - 1)
+buckets, so the relative error of a quantile stays under 2^-(SUB_BITS
+- 1), about 3%. Merging two histograms only adds the counts of their
+buckets.
+
+Writes are read-merge-replace cycles, serialized between processes by
+an advisory lock where the platform has one (fcntl), and atomic thanks
+to os.replace.
+
+Classes
+    Histogram       # Log-linear histogram of positive integers.
+    MetricsStore    # Rolling windows of histograms in a state file.
+"""
+import json
+import os
+from contextlib import contextmanager
+from time import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, Windows
+    fcntl = None
+
+SUB_BITS = 5
+_HALF = 1 << (SUB_BITS - 1)
+_FORMAT_VERSION = 1
+
+
+class Histogram:
+    """Histogram of positive integers in log-linear buckets.
+
+    Attributes:
+        counts (dict[int, int]): Number of values per bucket index.
+        total (int): Number of recorded values.
+        sum (int): Sum of the recorded values.
+    """
+    def __init__(self, counts=None, total=0, value_sum=0):
+        self.counts = dict(counts or {})
+        self.total = total
+        self.sum = value_sum
+
+    @staticmethod
+    def bucket_of(value):
+        """Index of the bucket of a value.
+
+        Args:
+            value (int): Positive value.
+
+        Returns:
+            int: Index of the bucket.
+        """
+        shift = max(value.bit_length() - SUB_BITS, 0)
+        return shift * _HALF + (value >> shift)
+
+    @staticmethod
+    def bounds_of(index):
+        """Bounds of the values of a bucket.
+
+        Args:
+            index (int): Index of the bucket.
+
+        Returns:
+            tuple[int, int]: Lowest and highest value of the bucket.
+        """
+        if index < 2 * _HALF:
+            return index, index
+        shift = index // _HALF - 1
+        mantissa = index - shift * _HALF
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value, count=1):
+        """Add a value.
+
+        Args:
+            value (int): Positive value, negative ones are counted as 0.
+            count (int): Number of occurrences of the value.
+        """
+        value = max(int(value), 0)
+        index = self.bucket_of(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self.sum += value * count
+
+    def merge(self, other):
+        """Add the values of another histogram.
+
+        Args:
+            other (Histogram): The merged histogram.
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+
+    def quantile(self, q):
+        """Value under which a fraction of the values fall, the middle
+        of its bucket.
+
+        Args:
+            q (float): Fraction, between 0 and 1.
+
+        Returns:
+            float: The quantile, 0 for an empty histogram.
+        """
+        if not self.total:
+            return 0.0
+        rank = max(q * self.total, 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self.bounds_of(index)
+                return (low + high) / 2
+        return float(self.bounds_of(max(self.counts))[1])
+
+    def to_dict(self):
+        return {"counts": {str(k): v for k, v in self.counts.items()},
+                "total": self.total, "sum": self.sum}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls({int(k): v for k, v in data["counts"].items()},
+                   data["total"], data["sum"])
+
+
+class MetricsStore:
+    """Rolling windows of histograms, persisted in a JSON file.
+
+    The file maps a window start (epoch seconds) to its series, a
+    series key being "command|role|outcome" and its value the
+    'duration_us' and 'sql' histograms.
+
+    Attributes:
+        path (str): Path of the state file.
+        retention (float): Age of the dropped windows, in seconds.
+        window (int): Duration of a window, in seconds.
+    """
+    def __init__(self, path, retention=7 * 86400, window=3600, clock=time):
+        self.path = str(path)
+        self.retention = retention
+        self.window = window
+        self._clock = clock
+
+    @staticmethod
+    def series_key(command, role, outcome):
+        return f"{command}|{role}|{outcome}"
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self):
+        """Read the windows of the file, an unreadable file is empty.
+
+        Returns:
+            dict: window start (str) -> series -> histograms dicts.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != _FORMAT_VERSION:
+            return {}
+        return data.get("windows", {})
+
+    def _write(self, windows):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": _FORMAT_VERSION, "windows": windows}, f,
+                      separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def record(self, command, role, outcome, seconds, sql_count):
+        """Record an invocation in the window of the current time and
+        drop the expired windows.
+
+        Args:
+            command (str): Name of the command, e.g. "client read".
+            role (str): Role of the user, "-" when unauthenticated.
+            outcome (str): "ok", "error" or "crash".
+            seconds (float): Duration of the invocation.
+            sql_count (int): Number of SQL statements executed.
+        """
+        now = self._clock()
+        start = str(int(now // self.window * self.window))
+        key = self.series_key(command, role, outcome)
+        with self._locked():
+            windows = {w: series for w, series in self._read().items()
+                       if int(w) + self.window > now - self.retention}
+            series = windows.setdefault(start, {}).setdefault(key, {})
+            for name, value in (("duration_us", round(seconds * 1e6)),
+                                ("sql", sql_count)):
+                histogram = (Histogram.from_dict(series[name])
+                             if name in series else Histogram())
+                histogram.record(value)
+                series[name] = histogram.to_dict()
+            self._write(windows)
+
+    def merged(self, since=None):
+        """Merge the windows of each series.
+
+        Args:
+            since (float|None): Only the windows ending after this
+                epoch time, the whole retention when None.
+
+        Returns:
+            dict[tuple[str, str, str], dict[str, Histogram]]:
+                (command, role, outcome) -> 'duration_us' and 'sql'
+                histograms.
+        """
+        merged = {}
+        now = self._clock()
+        for start, series in self._read().items():
+            end = int(start) + self.window
+            if end <= now - self.retention or (since and end <= since):
+                continue
+            for key, histograms in series.items():
+                target = merged.setdefault(tuple(key.split("|", 2)), {})
+                for name, data in histograms.items():
+                    target.setdefault(name, Histogram()).merge(
+                        Histogram.from_dict(data))
+        return merged
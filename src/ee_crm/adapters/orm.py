@@ -10,6 +10,9 @@ Functions
     start_event_mapper          # Map class 'Event'
     start_mappers               # Initialize all mappings
 
+Classes
+    utc_now     # SQL expression of the UTC time of the database server.
+
 References
     * imperative mapping.
 https://docs.sqlalchemy.org/en/21/orm/mapping_styles.html#orm-imperative-mapping
@@ -20,8 +23,11 @@ https://docs.sqlalchemy.org/en/20/orm/mapped_attributes.html#codecell15
 https://docs.sqlalchemy.org/en/21/orm/mapped_sql_expr.html#using-column-property
 """
 from sqlalchemy import Table, Column, Boolean, Integer, String, ForeignKey, \
-    DateTime, Float, Text
-from sqlalchemy.orm import registry, relationship, synonym, column_property
+    DateTime, Float, Text, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import registry, relationship, synonym, column_property, \
+    object_session
+from sqlalchemy.sql.functions import FunctionElement
 
 from ee_crm.domain.model import AuthUser, Collaborator, Client, Contract, Event
 
@@ -72,7 +78,7 @@ client_table = Table(
     Column('phone_number', String(20)),
     Column('company', String(255)),
     Column('created_at', DateTime(timezone=True)),
-    Column('updated_at', DateTime(timezone=True)),
+    Column('updated_at', DateTime(timezone=True), index=True),
     Column('salesman_id', Integer,
            ForeignKey('crm.collaborator.collaborator_id')),
     schema='crm'
@@ -86,6 +92,7 @@ contract_table = Table(
     Column('total_amount', Float),
     Column('paid_amount', Float),
     Column('created_at', DateTime(timezone=True)),
+    Column('updated_at', DateTime(timezone=True), index=True),
     Column('signed', Boolean, nullable=False, default=False),
     Column('client_id', Integer, ForeignKey('crm.client.client_id')),
     schema='crm'
@@ -102,6 +109,7 @@ event_table = Table(
     Column('location', String(255)),
     Column('attendee', Integer),
     Column('notes', Text),
+    Column('updated_at', DateTime(timezone=True), index=True),
     Column('supporter_id', Integer,
            ForeignKey('crm.collaborator.collaborator_id')),
     Column('contract_id', Integer,
@@ -109,6 +117,76 @@ event_table = Table(
     schema='crm'
 )
 
+# Not mapped, one change counter per table, see ee_crm.adapters.cache
+table_version_table = Table(
+    'table_version',
+    mapper_registry.metadata,
+    Column('table_name', String(63), primary_key=True, nullable=False),
+    Column('version', Integer, nullable=False, default=0),
+    schema='crm'
+)
+
+# Not mapped, the deleted rows, see ee_crm.adapters.replica
+tombstone_table = Table(
+    'tombstone',
+    mapper_registry.metadata,
+    Column('tombstone_id', Integer, primary_key=True,
+           nullable=False, autoincrement=True),
+    Column('table_name', String(63), nullable=False),
+    Column('row_id', Integer, nullable=False),
+    Column('deleted_at', DateTime(timezone=True), nullable=False,
+           index=True),
+    schema='crm'
+)
+
+
+class utc_now(FunctionElement):
+    """Current UTC time of the database server, without offset, as
+    stored by the DateTime columns. The 'updated_at' times are set by
+    the database, not by the clocks of the machines writing the rows:
+    the sync of the replica and the versions of the offline journal
+    compare them (see ee_crm.adapters.replica).
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_now)
+def _utc_now(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utc_now, "postgresql")
+def _pg_utc_now(element, compiler, **kw):
+    return "TIMEZONE('utc', STATEMENT_TIMESTAMP())"
+
+
+@compiles(utc_now, "sqlite")
+def _sqlite_utc_now(element, compiler, **kw):
+    # the storage format of the SQLite DateTime, in microseconds
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def _stamp_insert(mapper, connection, target):
+    """Listener of the 'before_insert' event, the database sets the
+    'updated_at' of the row."""
+    target._updated_at = utc_now()
+
+
+def _stamp_update(mapper, connection, target):
+    """Listener of the 'before_update' event, the database sets the
+    'updated_at' of a row whose columns changed."""
+    if object_session(target).is_modified(target,
+                                          include_collections=False):
+        target._updated_at = utc_now()
+
+
+def _track_updates(mapper):
+    """Register the listeners stamping the 'updated_at' of the rows
+    written through a mapper."""
+    event.listen(mapper, "before_insert", _stamp_insert)
+    event.listen(mapper, "before_update", _stamp_update)
+
 
 def start_user_mapper():
     """Map the AuthUser entity.
@@ -199,7 +277,7 @@ def start_client_mapper():
         'contracts' back_populate create an attribute Client.contracts
             -> (list(Contract))
     """
-    mapper_registry.map_imperatively(
+    mapper = mapper_registry.map_imperatively(
         Client,
         client_table,
         properties={
@@ -220,6 +298,7 @@ def start_client_mapper():
             )
         },
     )
+    _track_updates(mapper)
 
 
 def start_contract_mapper():
@@ -229,6 +308,7 @@ def start_contract_mapper():
         contract_table.c.contract_id    -> Contract.id
         contract_table.c.total_amount   -> Contract._total_amount
         contract_table.c.paid_amount    -> Contract._paid_amount
+        contract_table.c.updated_at     -> Contract._updated_at
         contract_table.c.signed         -> Contract._signed
         contract_table.c.client_id      -> Contract._client_id
 
@@ -246,13 +326,14 @@ def start_contract_mapper():
         'event' back_populate create an attribute Contract.event
             -> (Event)
     """
-    mapper_registry.map_imperatively(
+    mapper = mapper_registry.map_imperatively(
         Contract,
         contract_table,
         properties={
             "id": contract_table.c.contract_id,
             "_total_amount": contract_table.c.total_amount,
             "_paid_amount": contract_table.c.paid_amount,
+            "_updated_at": contract_table.c.updated_at,
             "_signed": contract_table.c.signed,
             "signed_sql": synonym("_signed"),
             "_client_id": contract_table.c.client_id,
@@ -270,6 +351,7 @@ def start_contract_mapper():
             )
         },
     )
+    _track_updates(mapper)
 
 
 def start_event_mapper():
@@ -277,6 +359,7 @@ def start_event_mapper():
 
     columns -> attributes:
         event_table.c.event_id      -> Event.id
+        event_table.c.updated_at    -> Event._updated_at
         event_table.c.contract_id   -> Event._contract_id
 
     relationships:
@@ -285,11 +368,12 @@ def start_event_mapper():
         'supporter' back_populate create an attribute Event.supporter
             -> (Collaborator)
     """
-    mapper_registry.map_imperatively(
+    mapper = mapper_registry.map_imperatively(
         Event,
         event_table,
         properties={
             "id": event_table.c.event_id,
+            "_updated_at": event_table.c.updated_at,
             "_contract_id": event_table.c.contract_id,
             "contract": relationship(
                 Contract,
@@ -303,6 +387,7 @@ def start_event_mapper():
             )
         },
     )
+    _track_updates(mapper)
 
 
 def start_mappers():
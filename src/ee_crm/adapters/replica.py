@@ -0,0 +1,296 @@
+"""Local replica of the tables, a SQLite file read by the commands when
+the connection to the database is slow or missing, see 'eecrm sync'.
+
+The changes are pulled incrementally. The client, contract and event
+rows changed since the last sync are found by their 'updated_at'
+column, the deleted ones in the 'tombstone' table, where the flushes of
+the units of work record every row they delete (see track_tombstones).
+The collaborator table has no change column, it is small and copied in
+full at each sync.
+
+The 'updated_at' and 'deleted_at' times are set by the database, in
+UTC (see ee_crm.adapters.orm.utc_now), whatever the clocks of the
+machines writing the rows, and a row is only visible once its
+transaction is committed. The changes are pulled from the newest time
+already pulled minus an overlap, so the late commits aren't missed; the
+rows are upserted, pulling a row twice is harmless. The rows whose 'updated_at'
+is NULL, written before the column existed, are only pulled by a full
+copy.
+
+The replica has the tables of the application, without their foreign
+keys (the users aren't replicated, the tables are pulled one at a time)
+and a 'replica_state' table: the newest times pulled, the collaborator,
+the local time of the last sync and the number of rows of each table.
+
+Constants
+    REPLICATED_TABLES   # Replicated tables by name, parents first.
+
+Functions
+    track_tombstones        # Record the rows deleted by a session.
+    create_replica_engine   # Engine of a replica file.
+    create_replica_schema   # Create the tables of a replica.
+    read_replica_state      # Sync state of the tables of a replica.
+    write_replica_state     # Save the sync state of a table.
+    copy_table              # Replace the rows of a replica table.
+    upsert_changes          # Upsert the rows changed since a time.
+    delete_tombstoned       # Delete the rows deleted since a time.
+    newest_tombstone        # Time of the newest deletion of a table.
+    row_version             # Version of a row, its 'updated_at'.
+
+References
+    * SQLite upsert.
+https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#insert-on-conflict-upsert
+"""
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, \
+    delete, event, func, insert, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ee_crm.adapters.bulk import iter_chunks, iter_table_keyset
+from ee_crm.adapters.database import create_database_engine, create_schema
+from ee_crm.adapters.orm import client_table, collaborator_table, \
+    contract_table, event_table, tombstone_table, utc_now
+from ee_crm.config import get_database_settings
+
+REPLICATED_TABLES = {table.name: table for table in (
+    collaborator_table, client_table, contract_table, event_table)}
+
+# Tables pulled by their changes, the others are copied in full
+_TRACKED_TABLES = {name for name, table in REPLICATED_TABLES.items()
+                   if "updated_at" in table.c}
+
+_replica_metadata = MetaData()
+
+replica_state_table = Table(
+    'replica_state',
+    _replica_metadata,
+    Column('table_name', String(63), primary_key=True, nullable=False),
+    Column('collaborator_id', Integer),
+    Column('changed_at', DateTime),
+    Column('deleted_at', DateTime),
+    Column('synced_at', DateTime, nullable=False),
+    Column('rows', Integer, nullable=False, default=0),
+)
+
+
+def _newest(times, newest=None):
+    """Newest of the times and of newest, None ones are ignored."""
+    return max((t for t in (newest, *times) if t is not None), default=None)
+
+
+def _pk(table):
+    """Primary key column of a table."""
+    return list(table.primary_key.columns)[0]
+
+
+def track_tombstones(session):
+    """Register the flush listener that records the rows of the
+    incrementally replicated tables deleted by a session, in the
+    transaction that deletes them.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of a unit of work.
+    """
+    def after_flush(flushing_session, flush_context):
+        rows = []
+        for obj in flushing_session.deleted:
+            state = inspect(obj)
+            name = state.mapper.local_table.name
+            if name in _TRACKED_TABLES:
+                rows.append({"table_name": name,
+                             "row_id": state.identity[0]})
+        if rows:
+            flushing_session.connection().execute(
+                insert(tombstone_table).values(deleted_at=utc_now()), rows)
+
+    event.listen(session, "after_flush", after_flush)
+
+
+def _foreign_keys_off(dbapi_connection, connection_record):
+    """Listener of the 'connect' event, the foreign keys of a replica
+    aren't enforced."""
+    dbapi_connection.execute("PRAGMA foreign_keys=OFF")
+
+
+def create_replica_engine(path, settings=None, **kwargs):
+    """Create the engine of a replica file, tuned as the embedded SQLite
+    backend, see ee_crm.adapters.database.
+
+    Args:
+        path (str): Path of the replica file.
+        settings (dict|None): The database settings, the configured ones
+            when None.
+        **kwargs (Any): Additional keyword arguments of create_engine.
+
+    Returns:
+        sqlalchemy.engine.Engine: The engine of the replica.
+    """
+    settings = {**(settings or get_database_settings()),
+                "backend": "sqlite", "sqlite_path": path}
+    engine = create_database_engine(settings, **kwargs)
+    event.listen(engine, "connect", _foreign_keys_off)
+    return engine
+
+
+def create_replica_schema(engine):
+    """Create the missing tables of a replica, the existing ones are
+    kept.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Engine of the replica.
+    """
+    create_schema(engine)
+    _replica_metadata.create_all(engine)
+
+
+def read_replica_state(connection):
+    """Read the sync state of the tables of a replica.
+
+    Args:
+        connection (sqlalchemy.engine.Connection): Connection to the
+            replica.
+
+    Returns:
+        dict[str, sqlalchemy.engine.Row]: The state of each synced
+            table, empty if the replica has never been synced.
+    """
+    if not inspect(connection).has_table(replica_state_table.name):
+        return {}
+    return {row.table_name: row
+            for row in connection.execute(select(replica_state_table))}
+
+
+def write_replica_state(connection, table_name, **values):
+    """Save the sync state of a table, without values its state is
+    dropped.
+
+    Args:
+        connection (sqlalchemy.engine.Connection): Connection to the
+            replica.
+        table_name (str): Name of the synced table.
+        **values (Any): collaborator_id, changed_at, deleted_at,
+            synced_at and rows of the table.
+    """
+    state = replica_state_table
+    connection.execute(delete(state).where(state.c.table_name == table_name))
+    if values:
+        connection.execute(insert(state).values(table_name=table_name,
+                                                **values))
+
+
+def copy_table(source, replica, table, chunk_size=5000):
+    """Replace the rows of a replica table by the rows of the source.
+
+    Args:
+        source (sqlalchemy.engine.Connection): Connection to the source.
+        replica (sqlalchemy.engine.Connection): Connection to the
+            replica.
+        table (sqlalchemy.Table): The copied table.
+        chunk_size (int): Maximum number of rows per query.
+
+    Returns:
+        tuple[int, datetime|None]: The number of copied rows and their
+            newest 'updated_at', None without change column.
+    """
+    replica.execute(delete(table))
+    count, newest = 0, None
+    tracked = "updated_at" in table.c
+    for chunk in iter_table_keyset(source, table, chunk_size):
+        replica.execute(insert(table), [row._asdict() for row in chunk])
+        count += len(chunk)
+        if tracked:
+            newest = _newest([row.updated_at for row in chunk], newest)
+    return count, newest
+
+
+def upsert_changes(source, replica, table, since, chunk_size=5000):
+    """Upsert in the replica the rows of the source changed since a
+    time, included.
+
+    Args:
+        source (sqlalchemy.engine.Connection): Connection to the source.
+        replica (sqlalchemy.engine.Connection): Connection to the
+            replica.
+        table (sqlalchemy.Table): The synced table, with an 'updated_at'
+            column.
+        since (datetime): Oldest change pulled.
+        chunk_size (int): Maximum number of rows per query.
+
+    Returns:
+        tuple[int, datetime|None]: The number of upserted rows and their
+            newest 'updated_at'.
+    """
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_pk(table)],
+        set_={col.name: stmt.excluded[col.name] for col in table.columns
+              if not col.primary_key})
+    count, newest = 0, None
+    for chunk in iter_table_keyset(source, table, chunk_size,
+                                   where=table.c.updated_at >= since):
+        replica.execute(stmt, [row._asdict() for row in chunk])
+        count += len(chunk)
+        newest = _newest([row.updated_at for row in chunk], newest)
+    return count, newest
+
+
+def delete_tombstoned(source, replica, table, since, chunk_size=5000):
+    """Delete from the replica the rows deleted from the source since a
+    time, included.
+
+    Args:
+        source (sqlalchemy.engine.Connection): Connection to the source.
+        replica (sqlalchemy.engine.Connection): Connection to the
+            replica.
+        table (sqlalchemy.Table): The synced table.
+        since (datetime): Oldest deletion pulled.
+        chunk_size (int): Maximum number of rows per statement.
+
+    Returns:
+        tuple[int, datetime|None]: The number of rows deleted from the
+            replica and the newest deletion pulled.
+    """
+    tombstones = tombstone_table
+    rows = source.execute(
+        select(tombstones.c.row_id, tombstones.c.deleted_at)
+        .where(tombstones.c.table_name == table.name,
+               tombstones.c.deleted_at >= since)).all()
+    pk = _pk(table)
+    count = 0
+    for chunk in iter_chunks((row.row_id for row in rows), chunk_size):
+        count += replica.execute(delete(table).where(pk.in_(chunk))).rowcount
+    return count, _newest([row.deleted_at for row in rows])
+
+
+def newest_tombstone(source, table):
+    """Time of the newest deletion of a table.
+
+    Args:
+        source (sqlalchemy.engine.Connection): Connection to the source.
+        table (sqlalchemy.Table): The table.
+
+    Returns:
+        datetime|None: The newest 'deleted_at', None without deletion.
+    """
+    tombstones = tombstone_table
+    return source.execute(
+        select(func.max(tombstones.c.deleted_at))
+        .where(tombstones.c.table_name == table.name)).scalar()
+
+
+def row_version(connection, table, row_id):
+    """Version of a row, its 'updated_at'.
+
+    Args:
+        connection (sqlalchemy.engine.Connection): Connection to the
+            source or to the replica.
+        table (sqlalchemy.Table): The table, with an 'updated_at'
+            column.
+        row_id (int): Primary key of the row.
+
+    Returns:
+        tuple[bool, datetime|None]: Whether the row exists and its
+            'updated_at'.
+    """
+    row = connection.execute(select(table.c.updated_at)
+                             .where(_pk(table) == row_id)).first()
+    return row is not None, row.updated_at if row is not None else None
@@ -9,13 +9,29 @@ Classes
     SqlAlchemyClientRepository          # SQLAlchemy implementation
     SqlAlchemyContractRepository        # SQLAlchemy implementation
     SqlAlchemyEventRepository           # SQLAlchemy implementation
+    ShardedRepository                   # Sharded shared implementation
+    ShardedClientRepository             # Sharded implementation
+    ShardedContractRepository           # Sharded implementation
+    ShardedEventRepository              # Sharded implementation
+    InMemoryRepository                  # In-memory shared implementation
+    InMemoryUserRepository              # In-memory implementation
+    InMemoryCollaboratorRepository      # In-memory implementation
+    InMemoryClientRepository            # In-memory implementation
+    InMemoryContractRepository          # In-memory implementation
+    InMemoryEventRepository             # In-memory implementation
 
 References
     * Architecture Patterns with Python.
 https://www.cosmicpython.com/book/chapter_02_repository.html
 """
 from abc import ABC, abstractmethod
+from bisect import bisect_left
+from itertools import chain
 
+from sqlalchemy import and_, false, or_
+from sqlalchemy.exc import MultipleResultsFound
+
+from ee_crm.adapters.sharding import allocate_id, merge_sorted
 from ee_crm.domain.model import AuthUser, Collaborator, Client, Contract, Event
 
 
@@ -30,6 +46,7 @@ class AbstractRepository(ABC):
         list(sort=None)
         filter(sort=None, **filters)
         filter_one(**filters)
+        page(sort=None, after=None, limit=50, **filters)
     """
     def add(self, model_obj):
         """Add a new object.
@@ -100,6 +117,26 @@ class AbstractRepository(ABC):
         """
         return self._filter_one(**filters)
 
+    def page(self, sort=None, after=None, limit=50, **filters):
+        """Fetch a page of objects based on filters, after a keyset
+        cursor. The objects are ordered by the sort then by primary key,
+        null values last.
+        Delegate implementation to private method.
+
+        Args:
+            sort (Iterable[tuple(str, bool)]|None): Optional sorting
+                criteria.
+            after (tuple|None): Values of the sorted fields then the
+                primary key of the last object of the previous page,
+                None for the first page.
+            limit (int): Maximum number of objects.
+            **filters (dict): Optional filter criteria.
+
+        Returns:
+            (list[Any]): List of objects retrieved.
+        """
+        return self._page(sort=sort, after=after, limit=limit, **filters)
+
     @abstractmethod
     def _add(self, model_obj):
         raise NotImplementedError
@@ -124,6 +161,10 @@ class AbstractRepository(ABC):
     def _filter_one(self, **filters):
         raise NotImplementedError
 
+    @abstractmethod
+    def _page(self, sort=None, after=None, limit=50, **filters):
+        raise NotImplementedError
+
 
 class ContractAbstractRepository(ABC):
     """Extension of AbstractRepository to provide specific additional
@@ -144,12 +185,15 @@ class SqlAlchemyRepository(AbstractRepository):
     Attributes:
         model_cls (Class): Domain model class added in subclasses.
         session: SQLAlchemy session object. (Already mapped).
+        cache (EntityCache|None): Optional second-level cache read by
+            get(), see ee_crm.adapters.cache.
     """
     model_cls = None
 
-    def __init__(self, session):
+    def __init__(self, session, cache=None):
         super().__init__()
         self.session = session
+        self.cache = cache
 
     def _translate_filters(self, filters):
         """Helper used to map public fields name to private attributes.
@@ -206,8 +250,25 @@ class SqlAlchemyRepository(AbstractRepository):
     def _get(self, obj_pk):
         """Implementation using SQLAlchemy get.
         For signature details, refer to AbsractRepository.get().
+
+        With a cache, the entities already in the session are returned
+        first, then the cached ones, the database is only queried on a
+        miss and the loaded entity is cached.
         """
-        return self.session.get(self.model_cls, obj_pk)
+        if self.cache is None or obj_pk is None:
+            return self.session.get(self.model_cls, obj_pk)
+
+        identity = self.session.identity_key(self.model_cls, obj_pk)
+        obj = self.session.identity_map.get(identity)
+        if obj is not None:
+            return obj
+        obj = self.cache.get(self.session, self.model_cls, obj_pk)
+        if obj is not None:
+            return obj
+        obj = self.session.get(self.model_cls, obj_pk)
+        if obj is not None:
+            self.cache.put(self.session, obj)
+        return obj
 
     def _delete(self, obj_pk):
         """Implementation using SQLAlchemy delete.
@@ -245,6 +306,72 @@ class SqlAlchemyRepository(AbstractRepository):
         query = self.session.query(self.model_cls).filter_by(**orm_filters)
         return query.one_or_none()
 
+    def _keyset_columns(self, sort):
+        """Helper used to list the columns of a keyset: the sorted
+        attributes then the primary key, unless it is already sorted.
+
+        Args:
+            sort (Iterable[tuple(str, bool)]|None): Optional sorting
+                criteria.
+
+        Returns:
+            (list[tuple(InstrumentedAttribute, bool)]): The attributes
+                and their direction, True is descending.
+        """
+        aliases = getattr(self.model_cls, "_private_aliases", {})
+        columns = [(getattr(self.model_cls, aliases.get(field, field)),
+                    is_desc) for field, is_desc in sort or ()]
+        if not any(field == "id" for field, _ in sort or ()):
+            columns.append((self.model_cls.id, False))
+        return columns
+
+    @staticmethod
+    def _keyset_condition(columns, after):
+        """Helper used to select the rows after a keyset cursor, for
+        any mix of directions with null values last.
+
+        A row is after the cursor when, for one of the columns, it is
+        beyond the cursor value while equal on all previous columns.
+        Nothing is beyond a null value, a null value is beyond any
+        other value.
+
+        Args:
+            columns (list[tuple(InstrumentedAttribute, bool)]): The
+                attributes and their direction.
+            after (tuple): The values of the cursor, in columns order.
+
+        Returns:
+            (ColumnElement[bool]): SQLAlchemy condition.
+
+        References:
+            * https://use-the-index-luke.com/no-offset
+        """
+        clauses, equal = [], []
+        for (attr, is_desc), value in zip(columns, after):
+            if value is not None:
+                beyond = attr < value if is_desc else attr > value
+                clauses.append(and_(*equal, or_(beyond, attr.is_(None))))
+                equal.append(attr == value)
+            else:
+                equal.append(attr.is_(None))
+        return or_(*clauses) if clauses else false()
+
+    def _page(self, sort=None, after=None, limit=50, **filters):
+        """Implementation using SQLAlchemy query and keyset pagination.
+        For signature details, refer to AbsractRepository.page().
+
+        Unlike an OFFSET, the cursor is a condition on indexed columns,
+        each page costs the same whatever its depth.
+        """
+        orm_filters = self._translate_filters(filters)
+        columns = self._keyset_columns(sort)
+        query = self.session.query(self.model_cls).filter_by(**orm_filters)
+        if after is not None:
+            query = query.filter(self._keyset_condition(columns, after))
+        order = [(attr.desc() if is_desc else attr.asc()).nulls_last()
+                 for attr, is_desc in columns]
+        return query.order_by(*order).limit(limit).all()
+
 
 class SqlAlchemyUserRepository(SqlAlchemyRepository):
     """SQLAlchemy user repository implementation."""
@@ -320,3 +447,413 @@ class SqlAlchemyContractRepository(SqlAlchemyRepository,
 class SqlAlchemyEventRepository(SqlAlchemyRepository):
     """SQLAlchemy event repository implementation."""
     model_cls = Event
+
+
+class ShardedRepository(AbstractRepository):
+    """Sharded implementation of the repository interface, routing to
+    the SQLAlchemy repositories of the shards, see
+    ee_crm.adapters.sharding. A new object is added to the shard of its
+    parent with an id of the range of the shard, an object is read or
+    deleted from the shard of its id. The lists are read from every
+    shard in turn, then merged on the sort, as ordered by the database.
+
+    Attributes:
+        model_cls (Class): Domain model class added in subclasses.
+        table_name (str): Name of the sharded table, added in
+            subclasses.
+        parent_key (str|None): Field of the id of the parent, in the
+            same shard, added in subclasses.
+        repositories (list[SqlAlchemyRepository]): Repositories of the
+            shards, in the order of the shard map.
+        shard_map (ShardMap): The shards.
+    """
+    model_cls = None
+    table_name = None
+    parent_key = None
+
+    def __init__(self, repositories, shard_map):
+        super().__init__()
+        self.repositories = repositories
+        self.shard_map = shard_map
+
+    def _shard_of_new(self, model_obj):
+        """Helper giving the index of the shard of a new object."""
+        raise NotImplementedError
+
+    def _repository_of(self, obj_pk):
+        """Helper giving the repository of the shard of an id, the
+        first one for an id out of the shards, it doesn't hold it."""
+        index = self.shard_map.for_id(obj_pk)
+        return self.repositories[index or 0]
+
+    def _repositories_for(self, filters):
+        """Helper giving the repositories to scatter a query to, a
+        single one for a query by id or by id of the parent."""
+        for key in ("id", self.parent_key):
+            if self.shard_map.for_id(filters.get(key)) is not None:
+                return [self._repository_of(filters[key])]
+        return self.repositories
+
+    def _merge_keys(self, sort, nulls_last=None):
+        """Helper used to list the merge keys of a sort, see
+        ee_crm.adapters.sharding.merge_sorted.
+
+        Args:
+            sort (Iterable[tuple(str, bool)]): Sorting criteria.
+            nulls_last (bool|None): Whether the null values are last in
+                both directions, None to order them as the database:
+                larger than any value on PostgreSQL, smaller on SQLite.
+
+        Returns:
+            (list[tuple(str, bool, bool)]): The merge keys.
+        """
+        aliases = getattr(self.model_cls, "_private_aliases", {})
+        nulls_high = (self.repositories[0].session.get_bind().dialect.name
+                      == "postgresql")
+        return [(aliases.get(field, field), is_desc,
+                 nulls_last if nulls_last is not None
+                 else nulls_high != is_desc)
+                for field, is_desc in sort]
+
+    def _merged(self, lists, sort):
+        """Helper merging the lists of the shards on the sort, chained
+        without sort."""
+        if sort is None:
+            return list(chain.from_iterable(lists))
+        return merge_sorted(lists, self._merge_keys(sort))
+
+    def _add(self, model_obj):
+        """Implementation allocating the id in the shard of the object.
+        For signature details, refer to AbsractRepository.add().
+        """
+        repository = self.repositories[self._shard_of_new(model_obj)]
+        if model_obj.id is None:
+            model_obj.id = allocate_id(repository.session, self.table_name)
+        repository.add(model_obj)
+
+    def _get(self, obj_pk):
+        """Implementation reading the shard of the id.
+        For signature details, refer to AbsractRepository.get().
+        """
+        return self._repository_of(obj_pk).get(obj_pk)
+
+    def _delete(self, obj_pk):
+        """Implementation deleting from the shard of the id.
+        For signature details, refer to AbsractRepository.delete().
+        """
+        self._repository_of(obj_pk).delete(obj_pk)
+
+    def _list(self, sort=None):
+        """Implementation merging the lists of the shards.
+        For signature details, refer to AbsractRepository.list().
+        """
+        return self._merged([repository.list(sort=sort)
+                             for repository in self.repositories], sort)
+
+    def _filter(self, sort=None, **filters):
+        """Implementation merging the lists of the shards.
+        For signature details, refer to AbsractRepository.filter().
+        """
+        return self._merged([repository.filter(sort=sort, **filters)
+                             for repository in
+                             self._repositories_for(filters)], sort)
+
+    def _filter_one(self, **filters):
+        """Implementation reading the shards.
+        For signature details, refer to AbsractRepository.filter_one().
+
+        Raises:
+            MultipleResultsFound: If several objects match, in one or
+                several shards.
+        """
+        objs = [obj for repository in self._repositories_for(filters)
+                if (obj := repository.filter_one(**filters)) is not None]
+        if len(objs) > 1:
+            raise MultipleResultsFound("Multiple rows were found when one "
+                                       "or none was required")
+        return objs[0] if objs else None
+
+    def _page(self, sort=None, after=None, limit=50, **filters):
+        """Implementation merging the pages of the shards, the page is
+        the first objects of the merge.
+        For signature details, refer to AbsractRepository.page().
+        """
+        keyset = list(sort or ())
+        if not any(field == "id" for field, _ in keyset):
+            keyset.append(("id", False))
+        pages = [repository.page(sort=sort, after=after, limit=limit,
+                                 **filters)
+                 for repository in self._repositories_for(filters)]
+        return merge_sorted(pages, self._merge_keys(keyset,
+                                                    nulls_last=True))[:limit]
+
+
+class ShardedClientRepository(ShardedRepository):
+    """Sharded client repository implementation, a client is in the
+    shard of its salesman."""
+    model_cls = Client
+    table_name = "client"
+
+    def _shard_of_new(self, model_obj):
+        return self.shard_map.for_salesman(model_obj.salesman_id)
+
+
+class ShardedContractRepository(ShardedRepository,
+                                ContractAbstractRepository):
+    """Sharded contract repository implementation, a contract is in the
+    shard of its client."""
+    model_cls = Contract
+    table_name = "contract"
+    parent_key = "client_id"
+
+    def _shard_of_new(self, model_obj):
+        return self.shard_map.for_id(model_obj.client_id) or 0
+
+    def get_contracts_collaborator(self,
+                                   collaborator_id,
+                                   only_unpaid=False,
+                                   only_unsigned=False,
+                                   only_no_event=False,
+                                   sort=None, **filters):
+        """Sharded implementation of method specific to contracts,
+        merging the contracts of the salesman in every shard.
+
+        For the arguments, refer to
+        SqlAlchemyContractRepository.get_contracts_collaborator().
+
+        Returns:
+            (list(Contract|None)): List of contracts.
+        """
+        return self._merged([
+            repository.get_contracts_collaborator(
+                collaborator_id, only_unpaid=only_unpaid,
+                only_unsigned=only_unsigned, only_no_event=only_no_event,
+                sort=sort, **filters)
+            for repository in self.repositories], sort)
+
+
+class ShardedEventRepository(ShardedRepository):
+    """Sharded event repository implementation, an event is in the
+    shard of its contract."""
+    model_cls = Event
+    table_name = "event"
+    parent_key = "contract_id"
+
+    def _shard_of_new(self, model_obj):
+        return self.shard_map.for_id(model_obj.contract_id) or 0
+
+
+class InMemoryRepository(AbstractRepository):
+    """In-memory implementation of the repository interface, on a
+    session of an InMemoryStore (see ee_crm.adapters.memory_store). The
+    filters are served by the hash indexes of the store, the entities
+    are ordered as by the SQLAlchemy implementation, null values last.
+
+    Attributes:
+        model_cls (Class): Domain model class added in subclasses.
+        session (InMemorySession): Transaction on the store.
+    """
+    model_cls = None
+
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+
+    def _attribute(self, field):
+        """Helper used to map a public field name to its private
+        attribute, as the SQLAlchemy implementation does.
+
+        Args:
+            field (str): Public field name. (ex: "salesman_id")
+
+        Returns:
+            (str): Attribute name. (ex: "_salesman_id")
+
+        Raises:
+            AttributeError: If the model has no such field.
+        """
+        aliases = getattr(self.model_cls, "_private_aliases", {})
+        attr = aliases.get(field, field)
+        if attr not in self.model_cls.__dataclass_fields__:
+            raise AttributeError(f"{self.model_cls.__name__} has no "
+                                 f"attribute {field!r}")
+        return attr
+
+    def _translate_filters(self, filters):
+        """Helper used to map public fields name to private attributes.
+
+        Args:
+            filters (dict): filter criteria.
+
+        Returns:
+            (dict): remapped dict.
+        """
+        return {self._attribute(k): v for k, v in filters.items()}
+
+    def _sorted(self, objs, sort):
+        """Helper used to sort objects on several fields, null values
+        last in both directions, one stable sort per field from the
+        last one.
+
+        Args:
+            objs (list[Any]): Objects to sort, sorted in place.
+            sort (Iterable[tuple(str, bool)]|None): Optional sorting
+                criteria.
+
+        Returns:
+            (list[Any]): The sorted objects.
+        """
+        for field, is_desc in reversed(list(sort or ())):
+            attr = self._attribute(field)
+
+            def key(obj, attr=attr, is_desc=is_desc):
+                value = getattr(obj, attr)
+                return (value is None) != is_desc, value
+            objs.sort(key=key, reverse=is_desc)
+        return objs
+
+    def _add(self, model_obj):
+        """Implementation adding to the store, a primary key is given at
+        once. For signature details, refer to AbsractRepository.add().
+        """
+        self.session.add(model_obj)
+
+    def _get(self, obj_pk):
+        """Implementation reading the store by primary key.
+        For signature details, refer to AbsractRepository.get().
+        """
+        return self.session.get(self.model_cls, obj_pk)
+
+    def _delete(self, obj_pk):
+        """Implementation removing from the store.
+        For signature details, refer to AbsractRepository.delete().
+        """
+        obj = self.session.get(self.model_cls, obj_pk)
+        if obj is not None:
+            self.session.delete(obj)
+
+    def _list(self, sort=None):
+        """Implementation reading every entity of the store.
+        For signature details, refer to AbsractRepository.list().
+        """
+        return self._sorted(self.session.query(self.model_cls), sort)
+
+    def _filter(self, sort=None, **filters):
+        """Implementation reading the indexes of the store.
+        For signature details, refer to AbsractRepository.filter().
+        """
+        objs = self.session.query(self.model_cls,
+                                  **self._translate_filters(filters))
+        return self._sorted(objs, sort)
+
+    def _filter_one(self, **filters):
+        """Implementation reading the indexes of the store.
+        For signature details, refer to AbsractRepository.filter_one().
+
+        Raises:
+            MultipleResultsFound: If several objects match, as with
+                SQLAlchemy one_or_none().
+        """
+        objs = self.session.query(self.model_cls,
+                                  **self._translate_filters(filters))
+        if len(objs) > 1:
+            raise MultipleResultsFound("Multiple rows were found when one "
+                                       "or none was required")
+        return objs[0] if objs else None
+
+    def _page(self, sort=None, after=None, limit=50, **filters):
+        """Implementation sorting the filtered entities, then bisecting
+        the keyset cursor.
+        For signature details, refer to AbsractRepository.page().
+        """
+        keyset = list(sort or ())
+        if not any(field == "id" for field, _ in keyset):
+            keyset.append(("id", False))
+        attrs = [self._attribute(field) for field, _ in keyset]
+        objs = self._filter(sort=keyset, **filters)
+        if after is None:
+            return objs[:limit]
+
+        def beyond(obj):
+            """Whether an object is after the cursor, null values are
+            beyond any other value."""
+            for attr, (_, is_desc), other in zip(attrs, keyset, after):
+                value = getattr(obj, attr)
+                if value == other:
+                    continue
+                if value is None or other is None:
+                    return value is None
+                return value < other if is_desc else value > other
+            return False
+
+        start = bisect_left(objs, True, key=beyond)
+        return objs[start:start + limit]
+
+
+class InMemoryUserRepository(InMemoryRepository):
+    """In-memory user repository implementation."""
+    model_cls = AuthUser
+
+
+class InMemoryCollaboratorRepository(InMemoryRepository):
+    """In-memory collaborator repository implementation."""
+    model_cls = Collaborator
+
+
+class InMemoryClientRepository(InMemoryRepository):
+    """In-memory client repository implementation."""
+    model_cls = Client
+
+
+class InMemoryContractRepository(InMemoryRepository,
+                                 ContractAbstractRepository):
+    """In-memory contract repository implementation."""
+    model_cls = Contract
+
+    def get_contracts_collaborator(self,
+                                   collaborator_id,
+                                   only_unpaid=False,
+                                   only_unsigned=False,
+                                   only_no_event=False,
+                                   sort=None, **filters):
+        """In-memory implementation of method specific to contracts.
+        Return contracts belonging to a salesman, read from the indexes
+        of the clients by salesman then of the contracts by client.
+
+        For the arguments, refer to
+        SqlAlchemyContractRepository.get_contracts_collaborator().
+
+        Returns:
+            (list(Contract|None)): List of contracts.
+        """
+        orm_filters = self._translate_filters(filters)
+        self.session.flush()
+        # only the keys of the clients are read, they aren't tracked
+        clients = self.session.store.select(Client,
+                                            _salesman_id=collaborator_id)
+        contracts = self.session.query(
+            self.model_cls, within=("_client_id", [c.id for c in clients]),
+            **orm_filters)
+
+        if only_unpaid:
+            # NULL amounts are excluded, as by the SQL comparison
+            contracts = [c for c in contracts
+                         if c.total_amount is not None
+                         and c.paid_amount is not None
+                         and c.total_amount - c.paid_amount > 0]
+
+        if only_unsigned is True:
+            contracts = [c for c in contracts if c.signed is False]
+
+        if only_no_event is True:
+            events = self.session.query(
+                Event, within=("_contract_id", [c.id for c in contracts]))
+            with_event = {e.contract_id for e in events}
+            contracts = [c for c in contracts if c.id not in with_event]
+
+        return self._sorted(contracts, sort)
+
+
+class InMemoryEventRepository(InMemoryRepository):
+    """In-memory event repository implementation."""
+    model_cls = Event
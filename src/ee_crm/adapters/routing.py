@@ -0,0 +1,239 @@
+"""Routing of the read-only queries to the read replicas of the
+database, the streaming replicas of the PostgreSQL server for example.
+
+The services mark their read-only operations with read_only (the
+listings, the retrievals and the lookups of the permissions). The
+statements they run in a RoutingSession are sent to a replica, the
+other ones to the database, the primary:
+    * the flushes and the statements writing rows;
+    * every statement of a transaction once it has written, it reads
+      its own writes;
+    * the reads while no replica is fresh enough.
+A transaction reads a single replica, chosen at its first read.
+
+The lag of a replica is checked against the change counters of the
+tables (see ee_crm.adapters.cache), replicated with the tables: a
+replica is caught up when its counters are the ones of the primary. The
+ReplicaRouter checks the replicas at most every check_interval seconds,
+and uses the ones caught up less than max_lag seconds ago. A replica
+that can't be reached isn't caught up, the reads fall back to the other
+replicas, then to the primary. Once a transaction of the process has
+written, the replicas are only used again after they caught up with it,
+so the process reads its own writes.
+
+The entities read from a replica are cached by the entity cache as the
+ones of another process, bounded by its TTL.
+
+Classes
+    ReplicaRouter   # Choose a replica fresh enough for the reads.
+    RoutingSession  # Session sending its read-only queries to it.
+
+Functions
+    reading     # Context of the read-only operations.
+    read_only   # Decorator of the read-only service methods.
+
+References
+    * Custom vertical partitioning, Session.get_bind.
+https://docs.sqlalchemy.org/en/20/orm/persistence_techniques.html#custom-vertical-partitioning
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from time import monotonic
+
+from sqlalchemy import event, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ee_crm.adapters.orm import table_version_table
+
+# Set while a read-only operation runs, see reading
+_reading = ContextVar("routing_reading", default=False)
+
+
+@contextmanager
+def reading():
+    """Context of a read-only operation, the queries of the routing
+    sessions may be sent to a replica."""
+    token = _reading.set(True)
+    try:
+        yield
+    finally:
+        _reading.reset(token)
+
+
+def read_only(method):
+    """Decorator of the service methods that don't write, their queries
+    may be sent to a replica.
+
+    Args:
+        method (Callable): The read-only method.
+
+    Returns:
+        Callable: The wrapped method.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with reading():
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def _read_versions(engine):
+    """Change counters of the tables of a database."""
+    versions = table_version_table
+    with engine.connect() as conn:
+        return dict(conn.execute(
+            select(versions.c.table_name, versions.c.version)).all())
+
+
+class _ReplicaState:
+    """Lag of a replica, the times of the clock of the router."""
+    __slots__ = ("checked_at", "caught_up_at")
+
+    def __init__(self):
+        self.checked_at = None
+        self.caught_up_at = None
+
+
+class ReplicaRouter:
+    """Choose the replica serving the reads, among the ones fresh
+    enough, in turn.
+
+    Attributes:
+        primary (sqlalchemy.engine.Engine): Engine of the database.
+        replicas (list[sqlalchemy.engine.Engine]): Engines of the
+            replicas.
+        max_lag (float): Seconds a replica may be behind the primary.
+        check_interval (float): Seconds between two checks of the lag
+            of a replica.
+        written_at (float|None): Time of the last transaction of the
+            process that wrote, None before.
+    """
+    def __init__(self, primary, replicas, max_lag=5.0, check_interval=1.0,
+                 clock=monotonic):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.written_at = None
+        self._clock = clock
+        self._states = {replica: _ReplicaState() for replica in self.replicas}
+        self._turn = 0
+        self._lock = Lock()
+
+    def note_write(self):
+        """Record a committed write, the replicas are used again once
+        they caught up with it."""
+        self.written_at = self._clock()
+
+    def _check(self, replicas):
+        """Check whether the replicas caught up with the primary."""
+        started = self._clock()
+        primary = _read_versions(self.primary)
+        for replica in replicas:
+            state = self._states[replica]
+            state.checked_at = started
+            try:
+                versions = _read_versions(replica)
+            except SQLAlchemyError:
+                continue
+            if all(versions.get(name, -1) >= version
+                   for name, version in primary.items()):
+                state.caught_up_at = started
+
+    def lag(self, replica):
+        """Seconds since the replica was last seen caught up with the
+        primary.
+
+        Args:
+            replica (sqlalchemy.engine.Engine): Engine of a replica.
+
+        Returns:
+            float|None: The lag, None if it never caught up.
+        """
+        caught_up_at = self._states[replica].caught_up_at
+        if caught_up_at is None:
+            return None
+        return self._clock() - caught_up_at
+
+    def _is_fresh(self, replica):
+        """Whether the replica is within the lag and has the writes of
+        the process."""
+        caught_up_at = self._states[replica].caught_up_at
+        return (caught_up_at is not None
+                and self._clock() - caught_up_at <= self.max_lag
+                and (self.written_at is None
+                     or caught_up_at > self.written_at))
+
+    def choose(self):
+        """Choose the replica of a transaction, the lags not checked
+        for check_interval seconds are checked first.
+
+        Returns:
+            sqlalchemy.engine.Engine|None: The replica, None when no
+                replica is fresh enough, the primary serves the reads.
+        """
+        with self._lock:
+            now = self._clock()
+            due = [replica for replica, state in self._states.items()
+                   if state.checked_at is None
+                   or now - state.checked_at >= self.check_interval]
+            if due:
+                try:
+                    self._check(due)
+                except SQLAlchemyError:
+                    # the primary is unreachable, the reads will fail too
+                    return None
+            fresh = [replica for replica in self.replicas
+                     if self._is_fresh(replica)]
+            if not fresh:
+                return None
+            self._turn += 1
+            return fresh[self._turn % len(fresh)]
+
+
+class RoutingSession(Session):
+    """Session sending the queries of the read-only operations to a
+    replica chosen by its router, the other ones to its bind, the
+    primary.
+
+    Attributes:
+        router (ReplicaRouter|None): The router, None sends every query
+            to the primary.
+    """
+    def __init__(self, *args, router=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """Engine of a statement, a replica for the reads of the
+        read-only operations that didn't write."""
+        if clause is not None and getattr(clause, "is_dml", False):
+            self.info["wrote"] = True
+        if (self.router is None or self._flushing or not _reading.get()
+                or self.info.get("wrote")):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if "replica" not in self.info:
+            self.info["replica"] = self.router.choose()
+        return (self.info["replica"]
+                or super().get_bind(mapper, clause=clause, **kwargs))
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+    if session.info.pop("wrote", False) and session.router is not None:
+        session.router.note_write()
+    session.info.pop("replica", None)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("wrote", None)
+    session.info.pop("replica", None)
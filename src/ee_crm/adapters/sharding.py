@@ -0,0 +1,345 @@
+"""Horizontal sharding of the clients, with their contracts and events,
+over several databases, by region of their salesman.
+
+A shard is a database with every table of the application. The clients
+are written in the shard of their salesman: the shard (the region) the
+salesman is mapped to, else the salesman id modulo the number of
+shards, the first shard for a client without salesman. The salesman of
+a client isn't updatable, a client never moves. The contracts are
+written in the shard of their client and the events in the shard of
+their contract, so the joins of a client, its contracts and its events
+stay in one database.
+
+The ids of the sharded tables give their shard: each shard allocates
+the ids of its range, the ids of the shard i are in
+]i * SHARD_ID_RANGE, (i + 1) * SHARD_ID_RANGE], from its
+'shard_sequence' table, in the transaction of the write. A row is read
+or deleted from its shard alone, the lists are read from every shard
+then merged (see ee_crm.adapters.repositories.ShardedRepository). The
+order of the shards gives their ranges, a new shard is appended.
+
+The users and collaborators are reference tables: read from the first
+shard, their writes are copied to the other shards at commit (see
+track_reference_writes), the foreign keys of the sharded tables hold in
+every shard.
+
+The shards are committed one after another, a commit isn't atomic
+across the shards: a failure once the first shards committed keeps
+their writes.
+
+Constants
+    SHARD_ID_RANGE      # Ids allocated by each shard.
+    SHARDED_TABLES      # Sharded tables by name.
+    REFERENCE_TABLES    # Tables copied to every shard, parents first.
+
+Classes
+    ShardMap    # Engines of the shards and shard of the salesmen.
+
+Functions
+    create_shard_map        # Shard map of the configured shards.
+    create_shard_schema     # Create the tables and ranges of a shard.
+    allocate_id             # Next id of a sharded table in a shard.
+    merge_sorted            # Merge the sorted lists of the shards.
+    track_reference_writes  # Record the reference rows a session writes.
+    copy_reference_writes   # Copy them to the other shards.
+
+References
+    * Horizontal sharding, SQLAlchemy example.
+https://docs.sqlalchemy.org/en/20/orm/examples.html#module-examples.sharding
+"""
+from heapq import merge
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, event, \
+    func, insert, inspect, select, update
+
+from ee_crm.adapters.database import create_schema, create_uri_engine
+from ee_crm.adapters.orm import client_table, collaborator_table, \
+    contract_table, event_table, user_table
+from ee_crm.config import get_shard_settings
+
+SHARD_ID_RANGE = 100_000_000
+
+SHARDED_TABLES = {table.name: table for table in (
+    client_table, contract_table, event_table)}
+
+REFERENCE_TABLES = (user_table, collaborator_table)
+
+_shard_metadata = MetaData()
+
+shard_sequence_table = Table(
+    'shard_sequence',
+    _shard_metadata,
+    Column('table_name', String(63), primary_key=True, nullable=False),
+    Column('last_id', Integer, nullable=False),
+    schema='crm'
+)
+
+
+def _pk(table):
+    """Primary key column of a table."""
+    return list(table.primary_key.columns)[0]
+
+
+class ShardMap:
+    """Engines of the shards, in order, and shard of the clients of the
+    salesmen.
+
+    Attributes:
+        names (list[str]): Names of the shards, their regions.
+        engines (list[sqlalchemy.engine.Engine]): Engines of the shards.
+        salesmen (dict[int, int]): Index of the shard of the clients of
+            a salesman, by salesman id.
+    """
+    def __init__(self, shards, salesmen=None):
+        self.names = [name for name, _ in shards]
+        self.engines = [engine for _, engine in shards]
+        if not self.engines:
+            raise ValueError("A shard map needs at least one shard")
+        self.salesmen = {int(salesman_id): self.names.index(name)
+                         for salesman_id, name in (salesmen or {}).items()}
+
+    def for_salesman(self, salesman_id):
+        """Shard of a new client of a salesman.
+
+        Args:
+            salesman_id (int|None): Id of the salesman, None for a
+                client without salesman.
+
+        Returns:
+            int: Index of the shard.
+        """
+        if salesman_id is None:
+            return 0
+        if salesman_id in self.salesmen:
+            return self.salesmen[salesman_id]
+        return salesman_id % len(self.engines)
+
+    def for_id(self, obj_id):
+        """Shard holding a row of a sharded table, from its id.
+
+        Args:
+            obj_id (int): Id of the row.
+
+        Returns:
+            int|None: Index of the shard, None if no shard allocates
+                the id.
+        """
+        if isinstance(obj_id, bool) or not isinstance(obj_id, int) \
+                or obj_id < 1:
+            return None
+        index = (obj_id - 1) // SHARD_ID_RANGE
+        return index if index < len(self.engines) else None
+
+
+def create_shard_map(settings=None, **kwargs):
+    """Create the shard map of the configured shards.
+
+    Args:
+        settings (dict|None): The shard settings, see
+            ee_crm.config.get_shard_settings, the configured ones when
+            None.
+        **kwargs (Any): Additional keyword arguments of the engines.
+
+    Returns:
+        ShardMap|None: The shard map, None without shard.
+    """
+    settings = settings or get_shard_settings()
+    if not settings["shards"]:
+        return None
+    return ShardMap([(name, create_uri_engine(uri, **kwargs))
+                     for name, uri in settings["shards"]],
+                    settings["salesmen"])
+
+
+def _upsert(conn, table, values):
+    """Update a row by primary key, insert it when it's missing."""
+    pk = _pk(table)
+    result = conn.execute(update(table).where(pk == values[pk.key])
+                          .values(values))
+    if result.rowcount == 0:
+        conn.execute(insert(table).values(values))
+
+
+def create_shard_schema(engine, index, home=None):
+    """Create the missing tables of a shard and the counters of its
+    ranges of ids, see ee_crm.adapters.database.create_schema. A
+    counter starts after the ids of its range already in the shard, so
+    it can run on an initialized shard.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Engine of the shard.
+        index (int): Index of the shard, in the shard map.
+        home (sqlalchemy.engine.Engine|None): Engine of the first
+            shard, its users and collaborators are copied to an
+            appended shard.
+
+    Returns:
+        list[str]: Names of the created tables.
+    """
+    created = create_schema(engine)
+    sequence = shard_sequence_table
+    first = index * SHARD_ID_RANGE
+    with engine.begin() as conn:
+        schema = conn.schema_for_object(sequence)
+        if not conn.dialect.has_table(conn, sequence.name, schema=schema):
+            created.append(sequence.name)
+        _shard_metadata.create_all(conn)
+
+        counted = set(conn.execute(select(sequence.c.table_name)).scalars())
+        for name, table in SHARDED_TABLES.items():
+            if name in counted:
+                continue
+            pk = _pk(table)
+            last_id = conn.execute(
+                select(func.max(pk))
+                .where(pk > first, pk <= first + SHARD_ID_RANGE)).scalar()
+            conn.execute(insert(sequence).values(table_name=name,
+                                                 last_id=last_id or first))
+
+        if home is not None:
+            with home.connect() as source:
+                for table in REFERENCE_TABLES:
+                    for row in source.execute(select(table)):
+                        _upsert(conn, table, row._asdict())
+    return created
+
+
+def allocate_id(session, table_name):
+    """Allocate the next id of a sharded table in the transaction of a
+    session of its shard.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the shard.
+        table_name (str): Name of the sharded table.
+
+    Returns:
+        int: The allocated id.
+    """
+    sequence = shard_sequence_table
+    # the connection of the transaction, without flushing the session
+    return session.connection().execute(
+        update(sequence)
+        .where(sequence.c.table_name == table_name)
+        .values(last_id=sequence.c.last_id + 1)
+        .returning(sequence.c.last_id)).scalar_one()
+
+
+class _MergeKey:
+    """Sort key of an object in the merge of the lists of the shards,
+    for any mix of directions and placement of the null values."""
+    __slots__ = ("values", "order")
+
+    def __init__(self, values, order):
+        self.values = values
+        self.order = order
+
+    def __lt__(self, other):
+        for value, other_value, (is_desc, nulls_last) in zip(
+                self.values, other.values, self.order):
+            if value == other_value:
+                continue
+            if value is None:
+                return not nulls_last
+            if other_value is None:
+                return nulls_last
+            return value > other_value if is_desc else value < other_value
+        return False
+
+
+def merge_sorted(lists, keys):
+    """Merge lists of objects sorted the same way, the lists of the
+    shards, in a single sorted list. The ties keep the order of the
+    lists.
+
+    Args:
+        lists (Iterable[list[Any]]): The sorted lists.
+        keys (list[tuple(str, bool, bool)]): Attribute, direction (True
+            is descending) and whether the null values are last, of
+            each sorted field.
+
+    Returns:
+        list[Any]: The merged list.
+    """
+    attrs = [attr for attr, _, _ in keys]
+    order = [(is_desc, nulls_last) for _, is_desc, nulls_last in keys]
+
+    def key(obj):
+        return _MergeKey([getattr(obj, attr) for attr in attrs], order)
+    return list(merge(*lists, key=key))
+
+
+def track_reference_writes(session):
+    """Register the flush listener that records the users and
+    collaborators written and deleted by the session of the first
+    shard, in session.info, see copy_reference_writes. A rollback
+    forgets them.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the first shard.
+    """
+    writes = session.info.setdefault("reference_writes", [])
+    ranks = {table.name: rank for rank, table in enumerate(REFERENCE_TABLES)}
+
+    def rank(obj):
+        return ranks.get(inspect(obj).mapper.local_table.name)
+
+    def after_flush(flushing_session, flush_context):
+        written = [obj for obj in (*flushing_session.new,
+                                   *flushing_session.dirty)
+                   if rank(obj) is not None]
+        for obj in sorted(written, key=rank):
+            writes.append(("write", obj))
+        deleted = [obj for obj in flushing_session.deleted
+                   if rank(obj) is not None]
+        for obj in sorted(deleted, key=rank, reverse=True):
+            state = inspect(obj)
+            writes.append(("delete", state.mapper.local_table,
+                           state.identity[0]))
+
+    def after_rollback(rolled_back_session):
+        writes.clear()
+
+    event.listen(session, "after_flush", after_flush)
+    event.listen(session, "after_rollback", after_rollback)
+
+
+def _row(obj):
+    """Values of the columns of the table of a mapped object."""
+    mapper = inspect(obj).mapper
+    table = mapper.local_table
+    return {column.key: getattr(obj, prop.key)
+            for prop in mapper.column_attrs for column in prop.columns
+            if column.table is table}
+
+
+def copy_reference_writes(home, others):
+    """Flush the session of the first shard, then copy the users and
+    collaborators it wrote and deleted to the other shards, in the
+    transactions of their sessions. The sharded rows referencing a
+    deleted row lose the reference, as in the first shard.
+
+    Args:
+        home (sqlalchemy.orm.Session): Session of the first shard,
+            tracked by track_reference_writes.
+        others (list[sqlalchemy.orm.Session]): Sessions of the other
+            shards.
+    """
+    home.flush()
+    writes = home.info.get("reference_writes", [])
+    for write in writes:
+        # the connections don't flush the sessions, the copied rows are
+        # written before the sharded rows referencing them
+        for conn in (session.connection() for session in others):
+            if write[0] == "write":
+                _upsert(conn, inspect(write[1]).mapper.local_table,
+                        _row(write[1]))
+                continue
+            _, table, row_id = write
+            for sharded in SHARDED_TABLES.values():
+                for fk in sharded.foreign_keys:
+                    if fk.column.table is table:
+                        conn.execute(update(sharded)
+                                     .where(fk.parent == row_id)
+                                     .values({fk.parent.key: None}))
+            conn.execute(table.delete().where(_pk(table) == row_id))
+    writes.clear()
@@ -0,0 +1,250 @@
+"""Slow query log, fed by the events of the SQLAlchemy engine.
+
+A statement slower than the threshold is appended, as a JSON line, to a
+dedicated log with:
+    * its duration and the time it ended;
+    * its parameters, redacted: only numbers, booleans and NULL are
+      kept, the other values may be personal data;
+    * the repository method that executed it, or the first frame of the
+      application for the lazy loads of relationships;
+    * optionally its plan: EXPLAIN on PostgreSQL, EXPLAIN (ANALYZE,
+      BUFFERS) for the SELECT statements when asked (ANALYZE runs the
+      statement again, before the control returns to the caller),
+      EXPLAIN QUERY PLAN on SQLite.
+
+The plan is read on the connection of the statement, in its
+transaction, so it sees the rows the transaction wrote. On PostgreSQL a
+failed statement aborts the transaction: the EXPLAIN runs in a
+savepoint, rolled back when it fails.
+
+The statements are grouped by 'eecrm admin slow-queries' once
+normalized: their literals and lists of parameters are replaced by a
+placeholder.
+
+Classes
+    SlowQueryLog    # Engine listeners writing the slow statements.
+
+Functions
+    normalize_statement     # Statement without its literals.
+    read_slow_query_log     # Entries of the log.
+"""
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from time import perf_counter
+
+from sqlalchemy import event
+
+_REPOSITORY_MODULE = "ee_crm.adapters.repositories"
+_KEPT_TYPES = (bool, int, float, type(None))
+_EXPLAINED = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+_SAVEPOINT = "ee_crm_slow_query_plan"
+
+
+def _redact(parameters):
+    """Replace the parameters that may hold personal data.
+
+    Args:
+        parameters (tuple|list|dict|None): DBAPI parameters.
+
+    Returns:
+        list|dict|None: JSON serializable parameters.
+    """
+    if isinstance(parameters, dict):
+        return {k: v if isinstance(v, _KEPT_TYPES) else
+                f"<{type(v).__name__}>" for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact(p) if isinstance(p, (list, tuple, dict)) else
+                p if isinstance(p, _KEPT_TYPES) else f"<{type(p).__name__}>"
+                for p in parameters]
+    return None
+
+
+def _caller():
+    """Name the code that executed the statement: the outermost
+    repository method of the stack, otherwise the first frame of the
+    application outside of this module.
+
+    Returns:
+        str: "Class.method" or "module:function", "?" if unknown.
+    """
+    frame = sys._getframe(2)
+    repository, application = None, None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == _REPOSITORY_MODULE:
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            repository = (f"{type(owner).__name__}.{name}"
+                          if owner is not None else name)
+        elif repository is not None:
+            break
+        elif (application is None and module.startswith("ee_crm")
+              and module != __name__):
+            application = f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return repository or application or "?"
+
+
+def normalize_statement(statement):
+    """Remove the literals of a statement, so the executions of a same
+    query are grouped.
+
+    Args:
+        statement (str): The SQL statement.
+
+    Returns:
+        str: The statement on one line, without literals.
+    """
+    statement = " ".join(statement.split())
+    statement = re.sub(r"'(?:[^']|'')*'", "?", statement)
+    statement = re.sub(r"\b\d+(?:\.\d+)?\b", "?", statement)
+    statement = re.sub(r"%\(\w+\)s|%s|:\w+|\$\d+", "?", statement)
+    return re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", statement)
+
+
+class SlowQueryLog:
+    """Listeners of an engine that log the slow statements.
+
+    Attributes:
+        path (str): Path of the log, JSON lines.
+        threshold (float): Minimum duration of a logged statement, in
+            seconds.
+        explain (bool|str): Whether the plan of the statements is
+            captured, "analyze" for EXPLAIN (ANALYZE, BUFFERS) on
+            PostgreSQL.
+    """
+    def __init__(self, path, threshold_ms=200, explain=False):
+        self.path = str(path)
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+
+    def install(self, engine):
+        """Listen to the statements of an engine.
+
+        Args:
+            engine (sqlalchemy.engine.Engine): The engine.
+        """
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def uninstall(self, engine):
+        """Stop listening to the statements of an engine.
+
+        Args:
+            engine (sqlalchemy.engine.Engine): The engine.
+        """
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+
+    @staticmethod
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context,
+               executemany):
+        starts = conn.info.get("slow_query_start")
+        if not starts:
+            return
+        elapsed = perf_counter() - starts.pop()
+        if elapsed < self.threshold:
+            return
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "ms": round(elapsed * 1000, 3),
+            "statement": " ".join(statement.split()),
+            "parameters": _redact(parameters),
+            "caller": _caller(),
+        }
+        if (self.explain and not executemany
+                and statement.lstrip().upper().startswith(_EXPLAINED)):
+            entry["plan"] = self._plan(conn, statement, parameters,
+                                       analyze=self.explain == "analyze")
+        self._write(entry)
+
+    @staticmethod
+    def _plan(conn, statement, parameters, analyze=False):
+        """Plan of a statement, with a raw DBAPI cursor so the engine
+        events and the transaction state of the session are untouched.
+        On PostgreSQL, within a transaction, the EXPLAIN runs in a
+        savepoint so its failure doesn't abort the transaction.
+
+        Args:
+            conn (sqlalchemy.engine.Connection): Connection of the
+                statement.
+            statement (str): The statement.
+            parameters (tuple|list|dict|None): DBAPI parameters.
+            analyze (bool): Whether a SELECT is run again by EXPLAIN
+                (ANALYZE, BUFFERS) on PostgreSQL.
+
+        Returns:
+            list[str]|str: Lines of the plan or the error message.
+        """
+        dbapi_connection = conn.connection.dbapi_connection
+        savepoint = False
+        if conn.dialect.name == "postgresql":
+            is_select = statement.lstrip()[:6].upper() == "SELECT"
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze and is_select \
+                else "EXPLAIN "
+            savepoint = not getattr(dbapi_connection, "autocommit", False)
+        elif conn.dialect.name == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            prefix = "EXPLAIN "
+        cursor = dbapi_connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute(f"SAVEPOINT {_SAVEPOINT}")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                plan = [" ".join(str(col) for col in row)
+                        for row in cursor.fetchall()]
+            except Exception:
+                if savepoint:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {_SAVEPOINT}")
+                raise
+            if savepoint:
+                cursor.execute(f"RELEASE SAVEPOINT {_SAVEPOINT}")
+            return plan
+        except Exception as e:
+            return f"EXPLAIN failed: {type(e).__name__}: {e}"
+        finally:
+            cursor.close()
+
+    def _write(self, entry):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        except OSError:
+            pass
+
+
+def read_slow_query_log(path, since=None):
+    """Read the entries of a slow query log, the unreadable lines are
+    skipped.
+
+    Args:
+        path (str): Path of the log.
+        since (datetime|None): Only the entries after this aware time.
+
+    Returns:
+        list[dict]: The entries.
+    """
+    entries = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    at = datetime.fromisoformat(entry["at"])
+                except (ValueError, KeyError):
+                    continue
+                if since is None or at >= since:
+                    entries.append(entry)
+    except FileNotFoundError:
+        pass
+    return entries
+
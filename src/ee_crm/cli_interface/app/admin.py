@@ -0,0 +1,99 @@
+"""Click implementation of the administration commands.
+
+Functions:
+    admin           # click.group to organize commands under 'admin'
+    calibrate_hash  # Suggest argon2 parameters for a login latency
+    slow_queries    # Summarize the slow query log
+    init_db         # Create the tables and the first account
+"""
+import click
+
+from ee_crm.cli_interface.views.view_admin import AdminView
+from ee_crm.controllers.app.database import init_database
+from ee_crm.controllers.app.slow_queries import read_slow_queries
+from ee_crm.controllers.auth.hashing import calibrate_hash as calibrate
+
+
+@click.group(help="Commands to administrate the installation.")
+def admin():
+    """Top level command group for administration."""
+    pass
+
+
+@click.command(help="Benchmark the password hasher on this machine and "
+                    "suggest argon2 parameters for a target login latency.")
+@click.option("-t", "--target-ms",
+              type=click.IntRange(min=1),
+              default=250, show_default=True,
+              help="Target duration of a password hash, in milliseconds.")
+@click.option("-m", "--memory-cost",
+              type=click.IntRange(min=8),
+              help="Memory of a hash in KiB. (default: configured one)")
+@click.option("-p", "--parallelism",
+              type=click.IntRange(min=1),
+              help="Number of lanes. (default: configured one)")
+@click.option("-s", "--samples",
+              type=click.IntRange(min=1),
+              default=3, show_default=True,
+              help="Hashes measured per candidate.")
+def calibrate_hash(target_ms, memory_cost, parallelism, samples):
+    """Measure the configured hasher and display suggested parameters.
+
+    Args:
+        target_ms (int): Target duration of a hash.
+        memory_cost (int|None): Memory of a hash in KiB.
+        parallelism (int|None): Number of lanes.
+        samples (int): Hashes measured per candidate.
+    """
+    configured, suggested = calibrate(target_ms, memory_cost=memory_cost,
+                                      parallelism=parallelism,
+                                      samples=samples)
+    AdminView.display_calibration(configured, suggested, target_ms)
+
+
+@click.command(name="slow-queries",
+               help="Group the statements of the slow query log by "
+                    "normalized statement, slowest total first.")
+@click.option("-H", "--hours",
+              type=click.IntRange(min=1),
+              help="Only the statements of the last hours. "
+                   "(default: whole log)")
+@click.option("-n", "--limit",
+              type=click.IntRange(min=1),
+              default=10, show_default=True,
+              help="Number of displayed statements.")
+def slow_queries(hours, limit):
+    """Display the slowest statements of the log.
+
+    Args:
+        hours (int|None): Only the last hours.
+        limit (int): Number of displayed statements.
+    """
+    AdminView.display_slow_queries(read_slow_queries(hours, limit))
+
+
+@click.command(name="init-db",
+               help="Create the missing tables of the configured database "
+                    "(a SQLite file with DB_BACKEND=sqlite) and, on a new "
+                    "database, its first management account.")
+@click.option("-u", "--username",
+              help="Username of the first management account, its "
+                   "password is prompted. (default: no account)")
+def init_db(username):
+    """Create the tables and display them with the created account.
+
+    Args:
+        username (str|None): Username of the first account.
+    """
+    password = None
+    if username is not None:
+        password = click.prompt("Password", hide_input=True,
+                                confirmation_prompt=True)
+    created, account = init_database(username, password)
+    AdminView.display_init_db(created, account)
+
+
+# Administration commands
+admin.add_command(calibrate_hash)
+admin.add_command(slow_queries)
+admin.add_command(init_db)
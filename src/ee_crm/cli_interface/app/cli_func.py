@@ -7,6 +7,8 @@ Functions:
     cli_confirm # Prompt confirmation and throw expected error if not
     cli_create  #
     cli_read    #
+    cli_reader  # Controller reading the local replica while offline
+    cli_browse  # Browse the result of a query full screen
     cli_update  #
     cli_delete  #
     cli_mine    #
@@ -15,6 +17,9 @@ import click
 
 from ee_crm.cli_interface.utils import clean_input_fields, normalize_fields, \
     clean_sort, normalize_sort
+from ee_crm.cli_interface.views.view_browser import TableBrowser
+from ee_crm.cli_interface.views.view_sync import SyncView
+from ee_crm.controllers.app.replica import replica_reader
 
 
 def cli_clean(filters, sorts, keys_map):
@@ -136,6 +141,55 @@ def cli_read(pk, filters, sorts, ctrl_class, keys_map):
     return controller.read(pk, norm_filters, norm_sorts)
 
 
+def cli_reader(ctrl_class, offline=False):
+    """Controller of a read command, reading the local replica (see
+    'eecrm sync') while the database is unreachable or when offline is
+    asked, the database otherwise.
+
+    Args:
+        ctrl_class (BaseManager): Controller class, specific for each
+            resource.
+        offline (bool): Read the replica, even if the database is
+            reachable.
+
+    Returns:
+        tuple[BaseManager, str|None]: The controller instance and the
+            note of the table read from the replica, None when the
+            database is read.
+    """
+    controller, state = replica_reader(ctrl_class, offline=offline)
+    return controller, SyncView.source_note(state)
+
+
+def cli_browse(pk, filters, sorts, ctrl_class, keys_map, view,
+               remove_col=None):
+    """Format data received and browse the result of the query full
+    screen, the pages being read from the controller layer as the user
+    scrolls.
+
+    Args:
+        pk (int): The primary key of the resource, must be None.
+        filters (iter(tuple[str, str])): Each tuples contains a pairs of
+            value that will be used as key-value pairs for a dict.
+        sorts (tuple[str]): Ordered keyword to use for sorting.
+            Processed to extract direction of sorting (asc vs desc)
+        ctrl_class (BaseManager): Controller class, specific for each
+            resource.
+        keys_map (dict): Injection of accepted keyword to map value
+            to a keyword usable by the controller layer.
+        view (CrudView): View of the resource table.
+        remove_col (list[str]|None): Columns hidden from the table.
+
+    Raises:
+        click.UsageError: If a primary key is given.
+    """
+    if pk:
+        raise click.UsageError("-pk can't be used with --interactive.")
+    norm_filters, norm_sorts = cli_clean(filters, sorts, keys_map)
+    TableBrowser(view, ctrl_class(), keys_map, norm_filters, norm_sorts,
+                 remove_col).run()
+
+
 def cli_update(pk, data_input, no_prompt, ctrl_class, prompt_field, keys_map):
     """Format data received and gives it to the controller layer to
     update a specific resource.
@@ -12,7 +12,8 @@ Functions:
 import click
 
 from ee_crm.cli_interface.app.cli_func import cli_create, cli_read, \
-    cli_update, cli_delete, cli_clean
+    cli_update, cli_delete, cli_clean, cli_browse, \
+    cli_reader
 from ee_crm.cli_interface.utils import map_accepted_key, \
     normalize_remove_columns
 from ee_crm.cli_interface.views.view_base import BaseView
@@ -93,7 +94,13 @@ def create(data_client, no_prompt):
               multiple=True,
               help="Keyword to hide columns from output. "
                    "(ex: --remove-column email)")
-def read(pk, filters, sorts, remove_columns):
+@click.option("-i", "--interactive", is_flag=True, default=False,
+              help="Browse the clients full screen, the rows are read "
+                   "page by page as you scroll.")
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def read(pk, filters, sorts, remove_columns, interactive, offline):
     """Queries clients and print them in a formatted table.
 
     Args:
@@ -104,11 +111,18 @@ def read(pk, filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        interactive (bool): Browse the table full screen.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    output = cli_read(pk, filters, sorts, ClientManager,
-                      KEYS_MAP)
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    ClientCrudView().render(output, remove_col=remove_col)
+    if interactive:
+        cli_browse(pk, filters, sorts, ClientManager, KEYS_MAP,
+                   ClientCrudView(), remove_col)
+        return
+    controller, note = cli_reader(ClientManager, offline)
+    output = cli_read(pk, filters, sorts, lambda: controller, KEYS_MAP)
+    ClientCrudView().render(output, remove_col=remove_col, note=note)
 
 
 @click.command(help="Update a specific client information in the "
@@ -169,7 +183,10 @@ def delete(pk):
               type=click.STRING,
               multiple=True,
               help="Disable interactive prompting for missing fields.")
-def show_mine(filters, sorts, remove_columns):
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def show_mine(filters, sorts, remove_columns, offline):
     """Display the information of clients linked to the user.
 
     Args:
@@ -179,12 +196,14 @@ def show_mine(filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    controller = ClientManager()
+    controller, note = cli_reader(ClientManager, offline)
     norm_filters, norm_sorts = cli_clean(filters, sorts, KEYS_MAP)
     output = controller.user_associated_resource(norm_filters, norm_sorts)
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    ClientCrudView().render(output, remove_col=remove_col)
+    ClientCrudView().render(output, remove_col=remove_col, note=note)
 
 
 @click.command(help="Display clients without linked users.")
@@ -203,7 +222,10 @@ def show_mine(filters, sorts, remove_columns):
               type=click.STRING,
               multiple=True,
               help="Disable interactive prompting for missing fields.")
-def orphan(filters, sorts, remove_columns):
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def orphan(filters, sorts, remove_columns, offline):
     """Display orphan clients without linked users to the database.
 
     Args:
@@ -213,12 +235,14 @@ def orphan(filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    controller = ClientManager()
+    controller, note = cli_reader(ClientManager, offline)
     norm_filters, norm_sorts = cli_clean(filters, sorts, KEYS_MAP)
     output = controller.orphan_clients(norm_filters, norm_sorts)
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    ClientCrudView().render(output, remove_col=remove_col)
+    ClientCrudView().render(output, remove_col=remove_col, note=note)
 
 
 # Client resource commands
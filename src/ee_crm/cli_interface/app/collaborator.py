@@ -9,16 +9,20 @@ Functions:
     update          # Update a specific collaborator
     delete          # Delete a specific collaborator
     assign_role     # Change a specific collaborator role
+    import_collaborators    # Provision collaborators from a csv or
+                            # jsonl file
 """
 import click
 
 from ee_crm.cli_interface.app.cli_func import cli_prompt, cli_read, \
-    cli_update, cli_delete
+    cli_update, cli_delete, cli_browse, cli_reader
 from ee_crm.cli_interface.utils import clean_input_fields, normalize_fields, \
     map_accepted_key, normalize_remove_columns
 from ee_crm.cli_interface.views.view_base import BaseView
 from ee_crm.cli_interface.views.view_collaborator import CollaboratorCrudView
+from ee_crm.cli_interface.views.view_import import ImportView
 from ee_crm.controllers.app.collaborator import CollaboratorManager
+from ee_crm.controllers.app.importer import ImportManager
 from ee_crm.controllers.app.user import UserManager
 
 _EXPAND_ACCEPTED_KEYS = {
@@ -113,7 +117,10 @@ def create(data_collaborator, no_prompt):
               multiple=True,
               help="Keyword to hide columns from output. "
                    "(ex: --remove-column role)")
-def read(pk, filters, sorts, remove_columns):
+@click.option("-i", "--interactive", is_flag=True, default=False,
+              help="Browse the collaborators full screen, the rows are read "
+                   "page by page as you scroll.")
+def read(pk, filters, sorts, remove_columns, interactive):
     """Queries collaborators and print them in a formatted table.
 
     Args:
@@ -124,10 +131,16 @@ def read(pk, filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        interactive (bool): Browse the table full screen.
     """
-    output = cli_read(pk, filters, sorts, CollaboratorManager, KEYS_MAP)
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    CollaboratorCrudView().render(output, remove_col=remove_col)
+    if interactive:
+        cli_browse(pk, filters, sorts, CollaboratorManager, KEYS_MAP,
+                   CollaboratorCrudView(), remove_col)
+        return
+    controller, note = cli_reader(CollaboratorManager)
+    output = cli_read(pk, filters, sorts, lambda: controller, KEYS_MAP)
+    CollaboratorCrudView().render(output, remove_col=remove_col, note=note)
 
 
 @click.command(help="Update a specific collaborators information.")
@@ -207,9 +220,50 @@ def assign_role(pk, role):
         f"Collaborator successfully assigned to new role : {role}")
 
 
+@click.command(name="import",
+               help="Create collaborators and their user credentials from a "
+                    "csv or jsonl file with username and password columns.")
+@click.argument("path",
+                type=click.Path(exists=True, dir_okay=False, readable=True))
+@click.option("-fm", "--format", "fmt",
+              type=click.Choice(["csv", "jsonl"]),
+              help="Format of the file. (default: guessed from its suffix)")
+@click.option("-cs", "--chunk-size",
+              type=click.IntRange(min=1),
+              default=50, show_default=True,
+              help="Records hashed by a process and inserted at once.")
+@click.option("-w", "--workers",
+              type=click.IntRange(min=1),
+              help="Processes used to hash the passwords. "
+                   "(default: number of CPU)")
+@click.option("-r", "--rejects",
+              type=click.Path(dir_okay=False, writable=True),
+              help="Destination of the rejected records, passwords are "
+                   "never written. (default: <path>.rejects.jsonl)")
+def import_collaborators(path, fmt, chunk_size, workers, rejects):
+    """Provision collaborators, report the progress on stderr and
+    display the throughput.
+
+    Args:
+        path (str): Path of the csv or jsonl file, may be gzip
+            compressed.
+        fmt (str|None): One of csv, jsonl.
+        chunk_size (int): Records hashed and inserted at once.
+        workers (int|None): Processes used to hash the passwords.
+        rejects (str|None): Destination of the rejects file.
+    """
+    controller = ImportManager()
+    report = controller.import_collaborators(
+        path, fmt=fmt, chunk_size=chunk_size, workers=workers,
+        rejects_path=rejects, progress=ImportView.display_progress)
+    ImportView.end_progress()
+    ImportView.display_report(report)
+
+
 # Collaborator resource commands
 collaborator.add_command(create)
 collaborator.add_command(read)
 collaborator.add_command(update)
 collaborator.add_command(delete)
 collaborator.add_command(assign_role)
+collaborator.add_command(import_collaborators)
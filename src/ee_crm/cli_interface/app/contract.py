@@ -20,7 +20,7 @@ from math import trunc
 import click
 
 from ee_crm.cli_interface.app.cli_func import cli_clean, cli_create, \
-    cli_delete, cli_read
+    cli_delete, cli_read, cli_browse, cli_reader
 from ee_crm.cli_interface.utils import normalize_remove_columns, \
     map_accepted_key
 from ee_crm.cli_interface.views.view_base import BaseView
@@ -95,7 +95,13 @@ def create(data_contract, no_prompt):
               multiple=True,
               help="Keyword to hide columns from output. "
                    "(ex: --remove-column email)")
-def read(pk, filters, sorts, remove_columns):
+@click.option("-i", "--interactive", is_flag=True, default=False,
+              help="Browse the contracts full screen, the rows are read "
+                   "page by page as you scroll.")
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def read(pk, filters, sorts, remove_columns, interactive, offline):
     """Queries for contracts and print them in a formatted table.
 
     Args:
@@ -106,10 +112,18 @@ def read(pk, filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        interactive (bool): Browse the table full screen.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    output = cli_read(pk, filters, sorts, ContractManager, KEYS_MAP)
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    ContractCrudView().render(output, remove_col=remove_col)
+    if interactive:
+        cli_browse(pk, filters, sorts, ContractManager, KEYS_MAP,
+                   ContractCrudView(), remove_col)
+        return
+    controller, note = cli_reader(ContractManager, offline)
+    output = cli_read(pk, filters, sorts, lambda: controller, KEYS_MAP)
+    ContractCrudView().render(output, remove_col=remove_col, note=note)
 
 
 @click.command(help="Delete a specific contract.")
@@ -215,7 +229,11 @@ def pay(pk, amount):
               type=click.STRING,
               multiple=True,
               help="Columns names to remove from result")
-def show_mine(unpaid, unsigned, no_event, filters, sorts, remove_columns):
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def show_mine(unpaid, unsigned, no_event, filters, sorts, remove_columns,
+              offline):
     """Display contract linked to the logged user.
 
     Args:
@@ -228,15 +246,17 @@ def show_mine(unpaid, unsigned, no_event, filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    controller = ContractManager()
+    controller, note = cli_reader(ContractManager, offline)
     norm_filters, norm_sorts = cli_clean(filters, sorts, KEYS_MAP)
     output = controller.user_associated_contracts(unpaid, unsigned, no_event,
                                                   norm_filters, norm_sorts)
 
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
 
-    ContractCrudView().render(output, remove_col=remove_col)
+    ContractCrudView().render(output, remove_col=remove_col, note=note)
 
 
 @click.command(help="Display contract not linked to a client.")
@@ -254,7 +274,10 @@ def show_mine(unpaid, unsigned, no_event, filters, sorts, remove_columns):
               type=click.STRING,
               multiple=True,
               help="Columns names to remove from result")
-def orphan(filters, sorts, remove_columns):
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def orphan(filters, sorts, remove_columns, offline):
     """Display contract not linked to a client.
 
     Args:
@@ -264,13 +287,15 @@ def orphan(filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    controller = ContractManager()
+    controller, note = cli_reader(ContractManager, offline)
     norm_filters, norm_sorts = cli_clean(filters, sorts, KEYS_MAP)
     output = controller.orphan_contracts(norm_filters, norm_sorts)
 
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    ContractCrudView().render(output, remove_col=remove_col)
+    ContractCrudView().render(output, remove_col=remove_col, note=note)
 
 
 # Contract resource commands
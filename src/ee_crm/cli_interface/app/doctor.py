@@ -0,0 +1,35 @@
+"""Click implementation of the diagnostics command.
+
+Functions:
+    doctor  # Report the probable causes of slowness on this machine.
+"""
+import click
+
+from ee_crm.cli_interface.views.view_doctor import DoctorView
+from ee_crm.controllers.app.doctor import run_diagnostics
+
+
+@click.command(help="Diagnose why the application is slow on this machine: "
+                    "database connection and round-trip, server settings, "
+                    "missing indexes, bloat, top statements, token file "
+                    "and password hashing.")
+@click.option("-s", "--samples",
+              type=click.IntRange(min=1),
+              default=5, show_default=True,
+              help="Measures of the timed checks.")
+@click.option("-j", "--json", "json_path",
+              type=click.Path(dir_okay=False, allow_dash=True),
+              help="Also write the checks as JSON, '-' prints only the "
+                   "JSON (ex: doctor.json).")
+def doctor(samples, json_path):
+    """Run the checks and display their report.
+
+    Args:
+        samples (int): Measures of the timed checks.
+        json_path (str|None): Destination of the JSON document.
+    """
+    checks = run_diagnostics(samples)
+    if json_path != "-":
+        DoctorView.display_report(checks)
+    if json_path is not None:
+        DoctorView.save_json(json_path, checks)
@@ -14,7 +14,8 @@ Functions:
 import click
 
 from ee_crm.cli_interface.app.cli_func import cli_create, cli_read, \
-    cli_update, cli_delete, cli_mine, cli_clean
+    cli_update, cli_delete, cli_mine, cli_clean, cli_browse, \
+    cli_reader
 from ee_crm.cli_interface.utils import map_accepted_key, \
     normalize_remove_columns
 from ee_crm.cli_interface.views.view_base import BaseView
@@ -106,7 +107,13 @@ def create(data_event, no_prompt):
               multiple=True,
               help="Keyword to hide columns from output. "
                    "(ex: --remove-column title)")
-def read(pk, filters, sorts, remove_columns):
+@click.option("-i", "--interactive", is_flag=True, default=False,
+              help="Browse the events full screen, the rows are read "
+                   "page by page as you scroll.")
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def read(pk, filters, sorts, remove_columns, interactive, offline):
     """Queries events and print them in a formatted table.
 
     Args:
@@ -117,10 +124,18 @@ def read(pk, filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        interactive (bool): Browse the table full screen.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    output = cli_read(pk, filters, sorts, EventManager, KEYS_MAP)
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    EventCrudView().render(output, remove_col=remove_col)
+    if interactive:
+        cli_browse(pk, filters, sorts, EventManager, KEYS_MAP,
+                   EventCrudView(), remove_col)
+        return
+    controller, note = cli_reader(EventManager, offline)
+    output = cli_read(pk, filters, sorts, lambda: controller, KEYS_MAP)
+    EventCrudView().render(output, remove_col=remove_col, note=note)
 
 
 @click.command(help="Update a specific event information in the database.")
@@ -206,7 +221,10 @@ def assign_support(event_id, supporter, unassign):
               type=click.STRING,
               multiple=True,
               help="Disable interactive prompting for missing fields.")
-def show_mine(filters, sorts, remove_columns):
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def show_mine(filters, sorts, remove_columns, offline):
     """Display the information of events linked to the user.
 
     Args:
@@ -216,10 +234,13 @@ def show_mine(filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    output = cli_mine(filters, sorts, EventManager, KEYS_MAP)
+    controller, note = cli_reader(EventManager, offline)
+    output = cli_mine(filters, sorts, lambda: controller, KEYS_MAP)
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    EventCrudView().render(output, remove_col=remove_col)
+    EventCrudView().render(output, remove_col=remove_col, note=note)
 
 
 @click.command(help="Display events without support.")
@@ -238,7 +259,10 @@ def show_mine(filters, sorts, remove_columns):
               type=click.STRING,
               multiple=True,
               help="Disable interactive prompting for missing fields.")
-def unassigned(filters, sorts, remove_columns):
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def unassigned(filters, sorts, remove_columns, offline):
     """Display the information of events without support.
 
     Args:
@@ -248,13 +272,15 @@ def unassigned(filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    controller = EventManager()
+    controller, note = cli_reader(EventManager, offline)
     norm_filters, norm_sorts = cli_clean(filters, sorts, KEYS_MAP)
     output = controller.unassigned_events(norm_filters, norm_sorts)
 
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    EventCrudView().render(output, remove_col=remove_col)
+    EventCrudView().render(output, remove_col=remove_col, note=note)
 
 
 @click.command(help="Display events without linked contract.")
@@ -273,7 +299,10 @@ def unassigned(filters, sorts, remove_columns):
               type=click.STRING,
               multiple=True,
               help="Disable interactive prompting for missing fields.")
-def orphan(filters, sorts, remove_columns):
+@click.option("--offline", is_flag=True, default=False,
+              help="Read the local replica (see: eecrm sync), even if the "
+                   "database is reachable.")
+def orphan(filters, sorts, remove_columns, offline):
     """Display the information of events without linked contract.
 
     Args:
@@ -283,13 +312,15 @@ def orphan(filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        offline (bool): Read the local replica, even if the database
+            is reachable.
     """
-    controller = EventManager()
+    controller, note = cli_reader(EventManager, offline)
     norm_filters, norm_sorts = cli_clean(filters, sorts, KEYS_MAP)
     output = controller.orphan_events(norm_filters, norm_sorts)
 
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
-    EventCrudView().render(output, remove_col=remove_col)
+    EventCrudView().render(output, remove_col=remove_col, note=note)
 
 
 # Event resource commands
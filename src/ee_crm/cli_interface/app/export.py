@@ -0,0 +1,50 @@
+"""Click implementation of the bulk export command.
+
+Functions:
+    export  # Stream a resource table to a gzip file
+"""
+import click
+
+from ee_crm.cli_interface.views.view_export import ExportView
+from ee_crm.controllers.app.export import ExportManager
+
+_EXTENSIONS = {
+    "csv": "csv",
+    "text": "tsv",
+    "binary": "bin",
+}
+
+
+@click.command(help="Export every client, contract or event to a gzip file.")
+@click.argument("resource",
+                type=click.Choice(["clients", "contracts", "events"]))
+@click.option("-o", "--output",
+              type=click.Path(dir_okay=False, writable=True),
+              help="Destination file. (default: <resource>.<format>.gz)")
+@click.option("-fm", "--format", "fmt",
+              type=click.Choice(["csv", "text", "binary"]),
+              default="csv", show_default=True,
+              help="Format of the exported rows, binary is only available "
+                   "with PostgreSQL.")
+@click.option("-cs", "--chunk-size",
+              type=click.IntRange(min=1),
+              default=5000, show_default=True,
+              help="Rows read per query when COPY isn't available.")
+def export(resource, output, fmt, chunk_size):
+    """Export a resource table and display the throughput.
+
+    Args:
+        resource (str): One of clients, contracts, events.
+        output (str|None): Destination file.
+        fmt (str): One of csv, text, binary.
+        chunk_size (int): Rows read per query on the fallback path.
+    """
+    output = output or f"{resource}.{_EXTENSIONS[fmt]}.gz"
+    controller = ExportManager()
+    export_func = {
+        "clients": controller.export_clients,
+        "contracts": controller.export_contracts,
+        "events": controller.export_events,
+    }[resource]
+    report = export_func(output, fmt=fmt, chunk_size=chunk_size)
+    ExportView.display_report(report)
@@ -0,0 +1,54 @@
+"""Click implementation of the bulk import command.
+
+Functions:
+    import_resources    # Load a resource from a csv or jsonl file
+"""
+import click
+
+from ee_crm.cli_interface.views.view_import import ImportView
+from ee_crm.controllers.app.importer import ImportManager
+
+
+@click.command(name="import",
+               help="Create clients, contracts or events from a csv or jsonl "
+                    "file.")
+@click.argument("resource",
+                type=click.Choice(["clients", "contracts", "events"]))
+@click.argument("path",
+                type=click.Path(exists=True, dir_okay=False, readable=True))
+@click.option("-fm", "--format", "fmt",
+              type=click.Choice(["csv", "jsonl"]),
+              help="Format of the file. (default: guessed from its suffix)")
+@click.option("-cs", "--chunk-size",
+              type=click.IntRange(min=1),
+              default=1000, show_default=True,
+              help="Records validated and loaded at once.")
+@click.option("-w", "--workers",
+              type=click.IntRange(min=1),
+              default=1, show_default=True,
+              help="Processes used to validate the records.")
+@click.option("-r", "--rejects",
+              type=click.Path(dir_okay=False, writable=True),
+              help="Destination of the rejected records. "
+                   "(default: <path>.rejects.jsonl)")
+def import_resources(resource, path, fmt, chunk_size, workers, rejects):
+    """Import a resource file and display the throughput.
+
+    Args:
+        resource (str): One of clients, contracts, events.
+        path (str): Path of the csv or jsonl file, may be gzip
+            compressed.
+        fmt (str|None): One of csv, jsonl.
+        chunk_size (int): Records validated and loaded at once.
+        workers (int): Processes used to validate the records.
+        rejects (str|None): Destination of the rejects file.
+    """
+    controller = ImportManager()
+    import_func = {
+        "clients": controller.import_clients,
+        "contracts": controller.import_contracts,
+        "events": controller.import_events,
+    }[resource]
+    report = import_func(path, fmt=fmt, chunk_size=chunk_size,
+                         workers=workers, rejects_path=rejects)
+    ImportView.display_report(report)
@@ -0,0 +1,37 @@
+"""Click implementation of the metrics command.
+
+Functions:
+    metrics # Display the latency of the commands.
+"""
+import click
+
+from ee_crm.cli_interface.views.view_metrics import MetricsView
+from ee_crm.controllers.app.metrics import read_metrics
+
+
+@click.command(help="Display the latency quantiles of the commands run on "
+                    "this machine, per command and role.")
+@click.option("-H", "--hours",
+              type=click.IntRange(min=1),
+              help="Only the invocations of the last hours. "
+                   "(default: whole retention)")
+@click.option("-c", "--command", "command",
+              help="Only the commands starting with this name "
+                   "(ex: 'client' or 'contract read').")
+@click.option("-p", "--prometheus", "prometheus_path",
+              type=click.Path(dir_okay=False),
+              help="Also write the metrics in a Prometheus textfile "
+                   "(ex: /var/lib/node_exporter/eecrm.prom).")
+def metrics(hours, command, prometheus_path):
+    """Display the latency of the commands.
+
+    Args:
+        hours (int|None): Only the last hours.
+        command (str|None): Only the commands starting with this name.
+        prometheus_path (str|None): Destination of the textfile.
+    """
+    summaries = read_metrics(hours, command, prometheus_path)
+    MetricsView.display_summaries(summaries)
+    if prometheus_path is not None:
+        MetricsView.success(f"Prometheus textfile written to "
+                            f"{prometheus_path}")
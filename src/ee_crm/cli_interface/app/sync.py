@@ -0,0 +1,45 @@
+"""Click implementation of the command syncing the local replica.
+
+The read commands use the replica while it is fresher than
+REPLICA_MAX_AGE seconds, see ee_crm.controllers.app.replica. The writes
+journaled while the database was unreachable are replayed by --push.
+
+Functions:
+    sync    # Pull the tables the user can read into the local replica
+"""
+import click
+
+from ee_crm.cli_interface.views.view_sync import SyncView
+from ee_crm.controllers.app.replica import ReplicaManager
+
+
+@click.command(help="Pull the tables you can read into the local replica.")
+@click.option("--full", is_flag=True, default=False,
+              help="Copy the tables in full instead of pulling their "
+                   "changes.")
+@click.option("--status", is_flag=True, default=False,
+              help="Display the state of the replica without syncing.")
+@click.option("--push", is_flag=True, default=False,
+              help="Replay the writes journaled offline before syncing.")
+@click.option("-cs", "--chunk-size",
+              type=click.IntRange(min=1),
+              default=5000, show_default=True,
+              help="Rows read per query.")
+def sync(full, status, push, chunk_size):
+    """Sync the local replica, or display its state.
+
+    Args:
+        full (bool): Copy the tables in full.
+        status (bool): Only display the state of the replica.
+        push (bool): Replay the journaled writes first.
+        chunk_size (int): Rows read per query.
+    """
+    controller = ReplicaManager()
+    if status:
+        SyncView.display_status(controller.status(), controller.service.path,
+                                pending=controller.pending())
+        return
+    if push:
+        SyncView.display_push(controller.push())
+    report = controller.sync(full=full, chunk_size=chunk_size)
+    SyncView.display_report(report)
@@ -8,7 +8,7 @@ Functions:
 """
 import click
 
-from ee_crm.cli_interface.app.cli_func import cli_read
+from ee_crm.cli_interface.app.cli_func import cli_read, cli_browse
 from ee_crm.cli_interface.utils import normalize_remove_columns, \
     map_accepted_key
 from ee_crm.cli_interface.views.view_base import BaseView
@@ -48,7 +48,10 @@ def user():
               multiple=True,
               help="Keyword to hide columns from output. "
                    "(ex: --remove-column username)")
-def read(pk, filters, sorts, remove_columns):
+@click.option("-i", "--interactive", is_flag=True, default=False,
+              help="Browse the users full screen, the rows are read "
+                   "page by page as you scroll.")
+def read(pk, filters, sorts, remove_columns, interactive):
     """Queries users and print them in a formatted table.
 
     Args:
@@ -59,9 +62,14 @@ def read(pk, filters, sorts, remove_columns):
         sorts (tuple[str]): Ordered keyword to use for sorting.
         remove_columns (tuple[str]): List of columns name to remove from
             the table.
+        interactive (bool): Browse the table full screen.
     """
-    output = cli_read(pk, filters, sorts, UserManager, KEYS_MAP)
     remove_col = normalize_remove_columns(remove_columns, KEYS_MAP)
+    if interactive:
+        cli_browse(pk, filters, sorts, UserManager, KEYS_MAP,
+                   UserCrudView(), remove_col)
+        return
+    output = cli_read(pk, filters, sorts, UserManager, KEYS_MAP)
     UserCrudView().render(output, remove_col=remove_col)
 
 
@@ -1,8 +1,13 @@
 """Contains the list of commands added to the terminal
 interface using Click, represented by the click group 'cli'.
 
+The '--profile' option of the group profiles the invoked command, see
+ee_crm.profiling.
+
 Functions:
-    cli # click.group to organize commands under the entrypoint "eecrm"
+    cli             # click.group to organize commands under the
+                    # entrypoint "eecrm"
+    command_path    # Name of the command invoked by arguments
 
 Commands (eecrm <keyword>):
     login
@@ -14,21 +19,56 @@ Commands (eecrm <keyword>):
     client
     contract
     event
+
+    export
+    import
+    sync
+
+    admin
+    metrics
+    doctor
 """
 import click
 
+from ee_crm.cli_interface.app.admin import admin
 from ee_crm.cli_interface.app.client import client
 from ee_crm.cli_interface.app.collaborator import collaborator
 from ee_crm.cli_interface.app.contract import contract
+from ee_crm.cli_interface.app.doctor import doctor
 from ee_crm.cli_interface.app.event import event
+from ee_crm.cli_interface.app.export import export
+from ee_crm.cli_interface.app.importer import import_resources
+from ee_crm.cli_interface.app.metrics import metrics
+from ee_crm.cli_interface.app.sync import sync
 from ee_crm.cli_interface.app.user import user, who_am_i
 from ee_crm.cli_interface.authentication import login, logout
+from ee_crm.cli_interface.views.view_profile import ProfileView
+from ee_crm.profiling import start_profiling, stop_profiling
 
 
 @click.group(help="EECRM CLI interface")
-def cli():
+@click.option("--profile", "profile", is_flag=True, default=False,
+              help="Print the time spent in each layer, the SQL statements "
+                   "and the memory peak of the command on stderr.")
+@click.option("--profile-json", "profile_json", type=click.Path(),
+              default=None,
+              help="Write the profile of the command to a JSON file.")
+@click.pass_context
+def cli(ctx, profile, profile_json):
     """Click group to organize commands under the entrypoint "eecrm"."""
-    pass
+    if not (profile or profile_json):
+        return
+    command = ctx.invoked_subcommand
+
+    def report():
+        profile_report = stop_profiling()
+        if profile:
+            ProfileView.display_profile(command, profile_report)
+        if profile_json:
+            ProfileView.save_profile(profile_json, command, profile_report)
+
+    start_profiling()
+    ctx.call_on_close(report)
 
 
 # Authentication commands
@@ -42,3 +82,34 @@ cli.add_command(collaborator)
 cli.add_command(client)
 cli.add_command(contract)
 cli.add_command(event)
+
+# Bulk commands
+cli.add_command(export)
+cli.add_command(import_resources)
+cli.add_command(sync)
+
+# Administration commands
+cli.add_command(admin)
+cli.add_command(metrics)
+cli.add_command(doctor)
+
+
+def command_path(args):
+    """Name of the command invoked by command line arguments, without
+    its options and arguments.
+
+    Args:
+        args (list[str]): The arguments, without the program name.
+
+    Returns:
+        str|None: The name (ex: "client read"), None without command.
+    """
+    names = []
+    command = cli
+    for arg in args:
+        if not isinstance(command, click.Group):
+            break
+        if arg in command.commands:
+            command = command.commands[arg]
+            names.append(arg)
+    return " ".join(names) or None
@@ -0,0 +1,68 @@
+"""Class that implement the view for the administration commands.
+
+Class:
+    AdminView   # Display the hasher calibration, the slow queries and
+                # the database initialization.
+"""
+from ee_crm.cli_interface.views.view_base import BaseView
+
+
+class AdminView(BaseView):
+    """View for the administration commands."""
+    @classmethod
+    def display_calibration(cls, configured, suggested, target_ms):
+        """Print the latency of the configured and suggested hasher
+        parameters, then the environment variables to set.
+
+        Args:
+            configured (HasherProfileDTO): The configured parameters.
+            suggested (HasherProfileDTO): The suggested parameters.
+            target_ms (int): Target duration of a hash.
+        """
+        for label, profile in (("configured", configured),
+                               ("suggested", suggested)):
+            cls.echo(f"  {label:<10} : t={profile.time_cost} "
+                     f"m={profile.memory_cost} KiB "
+                     f"p={profile.parallelism} -> "
+                     f"{profile.milliseconds:.0f} ms")
+        if suggested.milliseconds > target_ms:
+            cls.warning(f"No parameters reach {target_ms} ms on this "
+                        f"machine, the fastest ones are suggested.")
+        cls.success("Set in the environment (.env):")
+        cls.echo(f"ARGON2_TIME_COST={suggested.time_cost}\n"
+                 f"ARGON2_MEMORY_COST={suggested.memory_cost}\n"
+                 f"ARGON2_PARALLELISM={suggested.parallelism}")
+
+    @classmethod
+    def display_slow_queries(cls, summaries):
+        """Print each normalized statement with its durations and the
+        code that executed it.
+
+        Args:
+            summaries (tuple[SlowQueryDTO]): The grouped statements.
+        """
+        if not summaries:
+            cls.warning("No slow query logged.")
+            return
+        for s in summaries:
+            cls.echo(f"{s.count:>5} x  total {s.total_ms:.0f} ms  "
+                     f"mean {s.mean_ms:.0f} ms  max {s.max_ms:.0f} ms")
+            cls.echo(f"  {s.statement}")
+            for caller, count in s.callers:
+                cls.echo(f"    {count:>5}  {caller}")
+
+    @classmethod
+    def display_init_db(cls, created, account):
+        """Print the created tables and the first account.
+
+        Args:
+            created (tuple[str]): Names of the created tables.
+            account (CollaboratorDTO|None): The created account.
+        """
+        if created:
+            cls.success(f"Created tables: {', '.join(created)}.")
+        else:
+            cls.warning("Every table already exists.")
+        if account is not None:
+            cls.success(f"Management account {account.id} created, log in "
+                        f"with its username.")
@@ -4,6 +4,8 @@ using the click module.
 Classes:
     BaseView    # Simple class to implement methods for printing text.
 """
+import sys
+
 import click
 
 
@@ -17,6 +19,20 @@ class BaseView:
         """Wrap the click echo function."""
         click.echo(text, nl=nl)
 
+    @staticmethod
+    def is_terminal():
+        """Whether the standard output is an interactive terminal."""
+        return sys.stdout.isatty()
+
+    @staticmethod
+    def page(lines):
+        """Wrap the click pager, $PAGER, fed line by line.
+
+        Args:
+            lines (Iterable[str]): The lines, without line break.
+        """
+        click.echo_via_pager(f"{line}\n" for line in lines)
+
     @classmethod
     def success(cls, msg, nl=True):
         """Color the success message. Green."""
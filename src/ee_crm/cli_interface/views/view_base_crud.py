@@ -1,14 +1,154 @@
 """Implementation of a class that mainly transform list of object into
 printable tables.
 
-Main interface is through the CrudView.render method.
+Main interface is through the CrudView.render method. The table is
+streamed: the columns are sized once, from the terminal and a sample of
+the first rows, then each row is formatted and written as it is read
+from the data. Tables taller than the terminal go through $PAGER.
+
+The columns are sized from the length of the cells of the sample: the
+widths are chosen to wrap the cells over as few lines as possible.
 
 Classes:
     CrudView    # Data manipulation to present information to terminal.
+
+Functions:
+    column_lengths  # Measure the cells of rows.
+    allocate_widths # Share a width between columns, wrapping few lines.
 """
+from itertools import batched, chain, islice
+from math import ceil
 from shutil import get_terminal_size
 
 from ee_crm.cli_interface.views.view_base import BaseView
+from ee_crm.config import get_table_settings
+from ee_crm.profiling import profiled
+
+# Lines written per echo when the table isn't paged
+_PRINT_BATCH = 256
+
+# Quantiles of the cell lengths each column is fitted on
+_QUANTILES = (0.5, 0.75, 0.9, 1.0)
+# Iterations of the bisection of the lines per cell
+_FIT_STEPS = 16
+
+
+def column_lengths(rows, columns):
+    """Measure the cells of the rows, in a single pass.
+
+    Args:
+        rows (Iterable[Object]): The rows, ideally DTO.
+        columns (list[str]): The measured columns.
+
+    Returns:
+        dict[str, list[int]]: For each column, the length of its name
+            followed by the length of its cells (0 for None).
+    """
+    lengths = {col: [len(col)] for col in columns}
+    measures = [(col, lengths[col].append) for col in columns]
+    for obj in rows:
+        for col, append in measures:
+            value = getattr(obj, col)
+            append(0 if value is None else len(str(value)))
+    return lengths
+
+
+def _count_lines(cells, widths, widest):
+    """Count the lines of the rows once their cells are wrapped, only
+    the columns narrower than their widest cell are read."""
+    wrapped = [[-(-length // width) for length in lengths]
+               for lengths, width, top in zip(cells, widths, widest)
+               if width < top]
+    if not wrapped:
+        return len(cells[0])
+    return sum(max(row) or 1 for row in zip(*wrapped))
+
+
+def _fit_widths(stats, floors, widest, available):
+    """Find the widths holding each statistic in the fewest lines,
+    every column holding it in the same number of lines, within the
+    available width."""
+    def widths_at(lines):
+        return [min(top, max(floor, ceil(stat / lines)))
+                for stat, floor, top in zip(stats, floors, widest)]
+
+    low = 1.0
+    high = max(max(stat / floor for stat, floor in zip(stats, floors)), low)
+    if sum(widths_at(low)) <= available:
+        return widths_at(low)
+    for _ in range(_FIT_STEPS):
+        middle = (low + high) / 2
+        if sum(widths_at(middle)) <= available:
+            high = middle
+        else:
+            low = middle
+    return widths_at(high)
+
+
+def _spread_widths(widths, widest, available):
+    """Spread the width left to the columns narrower than their widest
+    cell, those nearest to their widest cell first."""
+    extra = available - sum(widths)
+    for i in sorted(range(len(widths)), key=lambda i: widest[i] - widths[i]):
+        grow = min(widest[i] - widths[i], extra)
+        widths[i] += grow
+        extra -= grow
+
+
+def _trim_widths(widths, ordered, floors, widest):
+    """Narrow the wrapped columns to the smallest width wrapping none of
+    their cells over more lines."""
+    return [width if width >= top else
+            max(floor, *(-(-length // -(-length // width))
+                         for length in lengths if length))
+            for width, lengths, floor, top
+            in zip(widths, ordered, floors, widest)]
+
+
+def allocate_widths(lengths, available, min_width=3):
+    """Share the available width between columns, for their cells to
+    wrap over as few lines as possible.
+
+    Every column is as wide as its widest cell when they all fit.
+    Otherwise, for several quantiles of the cell lengths, the widths
+    holding the quantile of each column in the same number of lines
+    are found, the leftover width is spread, and the widths giving the
+    fewest lines in total are kept. The width the kept widths don't
+    need to wrap their cells is finally spread again.
+
+    Args:
+        lengths (dict[str, list[int]]): For each column, the length of
+            its cells, as given by column_lengths. The lists are the
+            same length.
+        available (int): The width shared between the columns.
+        min_width (int): The width under which a column isn't narrowed.
+
+    Returns:
+        dict[str, int]: The width of each column.
+    """
+    columns = list(lengths)
+    cells = [lengths[col] for col in columns]
+    ordered = [sorted(lengths) for lengths in cells]
+    widest = [max(lengths[-1], 1) for lengths in ordered]
+    if sum(widest) <= available:
+        return dict(zip(columns, widest))
+    floors = [min(top, min_width) for top in widest]
+    if sum(floors) >= available:
+        return dict(zip(columns, floors))
+
+    last = len(ordered[0]) - 1
+    best_lines, best = None, None
+    for quantile in _QUANTILES:
+        stats = [max(lengths[int(quantile * last)], 1)
+                 for lengths in ordered]
+        widths = _fit_widths(stats, floors, widest, available)
+        _spread_widths(widths, widest, available)
+        lines = _count_lines(cells, widths, widest)
+        if best_lines is None or lines < best_lines:
+            best_lines, best = lines, widths
+    best = _trim_widths(best, ordered, floors, widest)
+    _spread_widths(best, widest, available)
+    return dict(zip(columns, best))
 
 
 class CrudView(BaseView):
@@ -32,9 +172,12 @@ class CrudView(BaseView):
         instance_columns: Effective columns names requested.
         sum_weight: Cache to avoid multiple calculations of instance
             columns weight.
+        note: Shown after the title, ex: where the rows were read.
+            May be None.
 
     Interface:
-        render(data, remove_col=None): Method used to process data.
+        render(data, remove_col=None, note=None): Method used to process
+            data.
     """
     label: str
     columns: list[str]
@@ -60,6 +203,7 @@ class CrudView(BaseView):
         self.allocated_width = {}
         self.instance_columns = list(self.columns)
         self.sum_weight = None
+        self.note = None
 
     @staticmethod
     def _prepare_chunks(text, size):
@@ -179,29 +323,43 @@ class CrudView(BaseView):
                 if self.allocated_width[col] >= self.max_width_allocation[col]:
                     candidates.remove(col)
 
-    def _calculate_table_and_col_width(self):
+    def _calculate_table_and_col_width(self, sample=None, width=None):
         """Calculate width of elements based on available width and weight of
         columns. If space wasn't used it can be redistributed to columns that
         have not reached their cap.
 
+        When a sample of the rows is given, the widths are instead
+        allocated from the length of its cells (see allocate_widths),
+        the weights and caps of the columns are not used.
+
         Due to Windows PowserShell, a space is left unused at the end of
         every line to avoid auto-wrapper shenanigans.
 
+        Args:
+            sample (list[Object]|None): The first rows of the table, the
+                columns are sized from their content when given.
+            width (int|None): The available width, the width of the
+                terminal when None.
+
         Returns:
             Int: The table width.
         """
-        width = get_terminal_size().columns
+        width = width or get_terminal_size().columns
         left_padding, right_padding = 2, 2
         padding = left_padding + right_padding
         separators = len(self.instance_columns) - 1
         # -1 to avoid PowserShell auto-wrapper
         available_width = width - padding - separators - 1
 
-        self.allocated_width = \
-            {k: self._calculate_col_width(k, available_width)
-             for k in self.instance_columns}
-
-        self._spread_extra_space(available_width)
+        if sample:
+            self.allocated_width = allocate_widths(
+                column_lengths(sample, self.instance_columns),
+                available_width)
+        else:
+            self.allocated_width = \
+                {k: self._calculate_col_width(k, available_width)
+                 for k in self.instance_columns}
+            self._spread_extra_space(available_width)
 
         # Reset cache
         self.weight = None
@@ -223,6 +381,8 @@ class CrudView(BaseView):
             str: The string representing the top line.
         """
         table_label = f" {self.label} Table "
+        if self.note:
+            table_label = f" {self.label} Table ({self.note}) "
         width_label = len(table_label)
         width_line = (table_width - 2 - width_label) // 2
         width_leftover = (table_width - 2 - width_label) % 2
@@ -273,81 +433,120 @@ class CrudView(BaseView):
 
         return lines
 
-    def _create_table(self, data):
-        """Create the table from a list of object.
+    def _format_row(self, obj):
+        """Create the printable lines of an object. A row whose cells
+        all fit in their column is formatted in a single line, without
+        splitting the cells into chunks.
+
+        Args:
+            obj (Object): The object, ideally DTO.
+
+        Returns:
+            list[str]: A list of printable lines.
+        """
+        widths = self.allocated_width
+        cells = []
+        for col in self.instance_columns:
+            value = getattr(obj, col)
+            text = '' if value is None else str(value)
+            if len(text) > widths[col]:
+                return self._transform_row_to_lines(self._prepare_object(obj))
+            cells.append(text.ljust(widths[col]))
+        return [f"{self.separator['dlv']}"
+                f" {self.separator['lv'].join(cells)} "
+                f"{self.separator['dlv']}"]
+
+    def _iter_table(self, data, sample=None):
+        """Yield the lines of the table while the objects are read.
         Each column of the table correspond to an attribute of the
         objects. Some attribute may not be used if they are not part of
         the instance columns (self.instance_columns).
 
         Args:
-            data (list[Object]): A list of objects, ideally DTO.
+            data (Iterable[Object]): The objects, ideally DTO.
+            sample (list[Object]|None): The first objects, used to size
+                the columns.
 
-        Returns:
-            list[str]: A list of printable lines to display the content.
+        Yields:
+            str: A printable line.
         """
         # calculate width
-        table_width = self._calculate_table_and_col_width()
-
-        lines = list()
+        table_width = self._calculate_table_and_col_width(sample)
 
         # top line
-        lines.append(self._construct_top_line(table_width))
+        yield self._construct_top_line(table_width)
 
         # blank line
-        blank_line = (f"{self.separator['dlv']}"
-                      f"{(table_width - 2) * ' '}"
-                      f"{self.separator['dlv']}")
-        lines.append(blank_line)
+        yield (f"{self.separator['dlv']}"
+               f"{(table_width - 2) * ' '}"
+               f"{self.separator['dlv']}")
 
         # headers line
-        header_chunk = self._prepare_header()
-        for line in self._transform_row_to_lines(header_chunk):
-            lines.append(line)
+        yield from self._transform_row_to_lines(self._prepare_header())
 
-        # prepare separator line
+        # add a separator after header, then between objects
         separator_line = self._make_separator()
-
-        # add a separator after header
-        lines.append(separator_line)
+        yield separator_line
 
         # body
         for i, obj in enumerate(data):
-            # obj lines
-            obj_chunk = self._prepare_object(obj)
-            obj_lines = self._transform_row_to_lines(obj_chunk)
-            lines.extend(obj_lines)
-
-            if i < len(data) - 1:
-                # separator line
-                lines.append(separator_line)
+            if i:
+                yield separator_line
+            yield from self._format_row(obj)
 
         # bot line
-        lines.append(f"{self.separator['dcbl']}"
-                     f"{(table_width - 2) * self.separator['dlh']}"
-                     f"{self.separator['dcbr']}")
+        yield (f"{self.separator['dcbl']}"
+               f"{(table_width - 2) * self.separator['dlh']}"
+               f"{self.separator['dcbr']}")
 
-        return lines
+    def _create_table(self, data):
+        """Create the table from a list of object.
+
+        Args:
+            data (list[Object]): A list of objects, ideally DTO.
+
+        Returns:
+            list[str]: A list of printable lines to display the content.
+        """
+        return list(self._iter_table(data))
 
     def _print(self, lines):
-        """Print the lines.
+        """Print the lines as they are created. When the output is a
+        terminal and the lines don't fit in it, they are given to the
+        pager.
 
         Args:
-            lines (list[str]): A list of printable lines.
+            lines (Iterable[str]): The printable lines.
         """
-        for line in lines:
-            self.echo(line)
-
-    def render(self, data, remove_col=None):
-        """Interface to transform a list of object into a printed
-        output.
+        lines = iter(lines)
+        if get_table_settings()["pager"] and self.is_terminal():
+            height = get_terminal_size().lines
+            head = list(islice(lines, height))
+            if len(head) == height:
+                self.page(chain(head, lines))
+                return
+            lines = iter(head)
+        for batch in batched(lines, _PRINT_BATCH):
+            self.echo("\n".join(batch))
+
+    @profiled("render")
+    def render(self, data, remove_col=None, note=None):
+        """Interface to transform objects into a printed output. The
+        objects are read once, as the table is printed, so data can be
+        any iterable.
         If no data is given, print a small error message.
 
         Args:
-            data (list[Object]): A list of objects, ideally DTO.
+            data (Iterable[Object]): The objects, ideally DTO.
             remove_col (list[str]): A list of column names to remove.
                 It must be an iterable.
+            note (str|None): Shown after the title of the table.
         """
-        if not data:
+        self.note = note
+        sample_rows = get_table_settings()["sample_rows"]
+        rows = iter(data or ())
+        sample = list(islice(rows, max(sample_rows, 1)))
+        if not sample:
             self.error(f"No {self.label.lower()} found.")
             return
 
@@ -356,5 +555,5 @@ class CrudView(BaseView):
                 if col in self.columns:
                     self.instance_columns.remove(col)
 
-        lines = self._create_table(data)
-        self._print(lines)
+        self._print(self._iter_table(chain(sample, rows),
+                                     sample if sample_rows else None))
@@ -0,0 +1,375 @@
+"""Full-screen browser of a resource table, built on the column model of
+the CrudView.
+
+The rows are read page by page through a keyset cursor, as the user
+scrolls: only the pages reached are read and, while a page is read, the
+next one is already fetched in a background thread. Changing the sort
+or the filters of the view re-issues the query to the database, from
+its first page.
+
+Every page is read by the same single background worker, so the unit
+of work of the manager is never used by two threads at once.
+
+Classes:
+    PageLoader      # Rows of a query read page by page.
+    TableBrowser    # Curses browser of a CrudView table.
+
+Functions:
+    parse_sort      # Read a sort typed in the browser.
+    parse_filters   # Read filters typed in the browser.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from ee_crm.cli_interface.utils import clean_input_fields, clean_sort, \
+    normalize_fields, normalize_sort
+from ee_crm.exceptions import CRMException
+
+try:
+    import curses
+except ImportError:  # pragma: no cover, Windows without windows-curses
+    curses = None
+
+# Rows read per query
+PAGE_SIZE = 100
+
+_HELP = "q quit  s sort  f filter  g/G first/last read row"
+
+
+def parse_sort(text, keys_map):
+    """Read a sort typed in the browser, as the --sort option.
+
+    Args:
+        text (str): Space or comma separated keys, each may end with
+            ':asc' or ':desc'. (ex: "ln:desc fn")
+        keys_map (dict): Accepted keys mapped to the resource fields.
+
+    Returns:
+        tuple[tuple[str, bool]]|None: The sort, None if empty.
+    """
+    keys = text.replace(",", " ").split()
+    return normalize_sort(clean_sort(keys), keys_map) or None
+
+
+def parse_filters(text, keys_map):
+    """Read filters typed in the browser, as the --filter option.
+
+    Args:
+        text (str): Comma separated 'key=value' pairs.
+            (ex: "company=Skipblab, si=4")
+        keys_map (dict): Accepted keys mapped to the resource fields.
+
+    Returns:
+        dict|None: The filters, None if empty.
+    """
+    pairs = [tuple(part.strip() for part in pair.split("=", 1))
+             for pair in text.split(",") if "=" in pair]
+    return normalize_fields(clean_input_fields(pairs), keys_map) or None
+
+
+class PageLoader:
+    """Rows of a query read page by page, the page following the last
+    read one being prefetched in the background.
+
+    Attributes:
+        rows (list[Object]): The rows read so far.
+        done (bool): Whether the last page has been read.
+
+    Args:
+        fetch (Callable[[tuple|None], tuple[tuple, tuple|None]]): Read
+            the page after a cursor (None for the first page), returns
+            its rows and the cursor of the next page, None after the
+            last page.
+    """
+    def __init__(self, fetch):
+        self.rows = []
+        self.done = False
+        self._fetch = fetch
+        self._cursor = None
+        self._pending = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ee_crm-browser")
+
+    def _prefetch(self):
+        """Submit the read of the next page, unless it is already
+        submitted or there is no next page."""
+        if not self.done and self._pending is None:
+            self._pending = self._executor.submit(self._fetch, self._cursor)
+
+    def _collect(self):
+        """Wait for the next page and add its rows, then prefetch the
+        following one.
+
+        Raises:
+            Exception: Any error raised while reading the page, the read
+                is submitted again on the next call.
+        """
+        self._prefetch()
+        pending, self._pending = self._pending, None
+        rows, cursor = pending.result()
+        self.rows.extend(rows)
+        self._cursor = cursor
+        self.done = cursor is None
+        self._prefetch()
+
+    def _drain(self):
+        """Wait for the submitted read, its result is discarded."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            try:
+                pending.result()
+            except Exception:
+                pass
+
+    def start(self):
+        """Read the first page of the query.
+
+        Returns:
+            PageLoader: The loader.
+        """
+        self._collect()
+        return self
+
+    def ensure(self, count):
+        """Read the pages until 'count' rows are read or the last page
+        is reached.
+
+        Args:
+            count (int): Number of rows needed.
+        """
+        while len(self.rows) < count and not self.done:
+            self._collect()
+
+    def reset(self, fetch):
+        """Replace the query and read its first page. The previous
+        rows are kept if the first page can't be read.
+
+        Args:
+            fetch (Callable[[tuple|None], tuple[tuple, tuple|None]]):
+                The new query, see the class arguments.
+        """
+        self._drain()
+        previous = (self.rows, self.done, self._fetch, self._cursor)
+        self.rows, self.done = [], False
+        self._fetch, self._cursor = fetch, None
+        try:
+            self._collect()
+        except Exception:
+            self._drain()
+            self.rows, self.done, self._fetch, self._cursor = previous
+            raise
+
+    def close(self):
+        """Stop the background worker, a running read is awaited."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class TableBrowser:
+    """Curses browser of the table of a resource. Each row holds on a
+    single line, the cells too wide for their column are truncated. The
+    columns are sized from the first page.
+
+    Attributes:
+        view (CrudView): The view of the resource, its columns and
+            their widths are used.
+        manager (BaseManager): Manager whose browse method reads the
+            pages.
+        keys_map (dict): Accepted keys of the sort and the filters.
+        filters (dict|None): Current filters.
+        sort (tuple[tuple[str, bool]]|None): Current sort.
+        top (int): Index of the first displayed row.
+        message (str): Message of the status line.
+    """
+    def __init__(self, view, manager, keys_map, filters=None, sort=None,
+                 remove_col=None):
+        self.view = view
+        self.manager = manager
+        self.keys_map = keys_map
+        self.filters = filters
+        self.sort = sort
+        self.top = 0
+        self.message = ""
+        self.screen = None
+        if remove_col is not None:
+            for col in remove_col:
+                if col in view.columns:
+                    view.instance_columns.remove(col)
+        self.loader = PageLoader(self._query(filters, sort))
+
+    def _query(self, filters, sort):
+        """Build the page reader of a query."""
+        def fetch(after):
+            return self.manager.browse(filters=filters, sort=sort,
+                                       after=after, limit=PAGE_SIZE)
+        return fetch
+
+    def _line(self, obj):
+        """Format an object on a single table line."""
+        cells = []
+        for col in self.view.instance_columns:
+            value = getattr(obj, col)
+            width = self.view.allocated_width[col]
+            text = '' if value is None else str(value)
+            cells.append(text[:width].ljust(width))
+        sep = self.view.separator
+        return f"{sep['dlv']} {sep['lv'].join(cells)} {sep['dlv']}"
+
+    def _status(self, body_height):
+        """Build the status line: position, query and message."""
+        count = len(self.loader.rows)
+        last = min(self.top + body_height, count)
+        total = f"{count}" if self.loader.done else f"{count}+"
+        sort = " ".join(f"{field}:{'desc' if is_desc else 'asc'}"
+                        for field, is_desc in self.sort or ()) or "-"
+        filters = ", ".join(f"{k}={v}" for k, v in
+                            (self.filters or {}).items()) or "-"
+        return (f" {self.top + 1 if count else 0}-{last} of {total} | "
+                f"sort: {sort} | filter: {filters} | "
+                f"{self.message or _HELP}")
+
+    def _draw(self):
+        """Draw the table header, the visible rows and the status
+        line, reading the pages needed to fill the screen."""
+        height, width = self.screen.getmaxyx()
+        body_height = max(height - 4, 1)
+        self.loader.ensure(self.top + body_height)
+        table_width = self.view._calculate_table_and_col_width(
+            self.loader.rows[:PAGE_SIZE], width=width)
+
+        self.screen.erase()
+        header = self.view._prepare_header()
+        head = {col: chunks[:1] for col, chunks in header.items()}
+        lines = [self.view._construct_top_line(table_width),
+                 *self.view._transform_row_to_lines(head),
+                 self.view._make_separator()]
+        rows = self.loader.rows[self.top:self.top + body_height]
+        lines.extend(self._line(obj) for obj in rows)
+        for y, line in enumerate(lines[:height - 1]):
+            self.screen.addnstr(y, 0, line, width - 1)
+        self.screen.addnstr(height - 1, 0,
+                            self._status(body_height).ljust(width - 1),
+                            width - 1, curses.A_REVERSE)
+        self.screen.refresh()
+
+    def _prompt(self, label):
+        """Read a line typed on the status line."""
+        height, width = self.screen.getmaxyx()
+        self.screen.move(height - 1, 0)
+        self.screen.clrtoeol()
+        self.screen.addnstr(height - 1, 0, label, width - 1)
+        curses.echo()
+        try:
+            raw = self.screen.getstr(height - 1, len(label),
+                                     max(width - len(label) - 1, 1))
+        finally:
+            curses.noecho()
+        return raw.decode(errors="replace").strip()
+
+    def requery(self, filters, sort):
+        """Re-issue the query with a new sort or new filters, the
+        current query is kept if the new one fails.
+
+        Args:
+            filters (dict|None): The filters.
+            sort (tuple[tuple[str, bool]]|None): The sort.
+        """
+        try:
+            self.loader.reset(self._query(filters, sort))
+        except CRMException as err:
+            self.message = f"{err} {err.tips}".strip()
+            return
+        self.filters, self.sort, self.top = filters, sort, 0
+        self.message = "" if self.loader.rows else "No row found."
+
+    def scroll(self, delta, body_height):
+        """Move the displayed rows, within the rows that can be read.
+
+        Args:
+            delta (int): Number of rows, negative to go up.
+            body_height (int): Number of displayed rows.
+        """
+        self.loader.ensure(self.top + delta + body_height)
+        last_top = max(len(self.loader.rows) - body_height, 0)
+        self.top = min(max(self.top + delta, 0), last_top)
+
+    def handle_key(self, key, body_height):
+        """Apply a key press.
+
+        Args:
+            key (int): The key code, as returned by getch.
+            body_height (int): Number of displayed rows.
+
+        Returns:
+            bool: False when the browser must be closed.
+        """
+        self.message = ""
+        if key in (ord("q"), 27):
+            return False
+        moves = {curses.KEY_DOWN: 1, ord("j"): 1,
+                 curses.KEY_UP: -1, ord("k"): -1,
+                 curses.KEY_NPAGE: body_height, ord(" "): body_height,
+                 curses.KEY_PPAGE: -body_height}
+        if key in moves:
+            self.scroll(moves[key], body_height)
+        elif key in (ord("g"), curses.KEY_HOME):
+            self.top = 0
+        elif key in (ord("G"), curses.KEY_END):
+            self.top = max(len(self.loader.rows) - body_height, 0)
+        elif key == ord("s"):
+            text = self._prompt("sort (ex: ln:desc fn), empty clears: ")
+            sort = parse_sort(text, self.keys_map)
+            if text and sort is None:
+                self.message = f"No valid sort key in '{text}'."
+            else:
+                self.requery(self.filters, sort)
+        elif key == ord("f"):
+            text = self._prompt("filter (ex: co=Acme, si=4), empty clears: ")
+            filters = parse_filters(text, self.keys_map)
+            if text and filters is None:
+                self.message = f"No valid filter in '{text}'."
+            else:
+                self.requery(filters, self.sort)
+        return True
+
+    def _loop(self, screen):
+        """Main loop of the browser, run by curses.wrapper."""
+        self.screen = screen
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        while True:
+            self._draw()
+            body_height = max(self.screen.getmaxyx()[0] - 4, 1)
+            key = self.screen.getch()
+            if key == curses.KEY_RESIZE:
+                continue
+            try:
+                if not self.handle_key(key, body_height):
+                    return
+            except CRMException as err:
+                self.message = f"{err} {err.tips}".strip()
+
+    def run(self):
+        """Read the first page, then browse the table full screen.
+        Errors of the first page are raised before the screen is
+        taken, as by the read command.
+
+        Raises:
+            click.UsageError: If the output isn't a terminal or curses
+                isn't available.
+        """
+        if curses is None:
+            raise click.UsageError("--interactive needs the curses module "
+                                   "(windows-curses on Windows).")
+        if not self.view.is_terminal():
+            raise click.UsageError("--interactive needs a terminal.")
+        try:
+            self.loader.start()
+            if not self.loader.rows:
+                self.view.error(f"No {self.view.label.lower()} found.")
+                return
+            curses.wrapper(self._loop)
+        finally:
+            self.loader.close()
@@ -0,0 +1,71 @@
+"""Class that implement the view for the diagnostics of the doctor.
+
+Class:
+    DoctorView  # Print the report or the JSON of the checks.
+"""
+import json
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+import click
+
+from ee_crm.cli_interface.views.view_base import BaseView
+
+
+class DoctorView(BaseView):
+    """View for the report of 'eecrm doctor'."""
+    _colors = {"ok": "green", "warn": "bright_yellow", "fail": "bright_red",
+               "skip": "bright_black"}
+
+    @classmethod
+    def display_report(cls, checks):
+        """Print a line per check, then the suggested index creations
+        and the top statements.
+
+        Args:
+            checks (tuple[DiagnosticDTO]): Results of the checks.
+        """
+        for check in checks:
+            status = click.style(f"[{check.status:^4}]",
+                                 fg=cls._colors[check.status])
+            cls.echo(f"{status} {check.name:<20} {check.summary}")
+            for statement in check.details.get("suggested", ()):
+                cls.echo(f"         {statement}")
+            for entry in check.details.get("top", ()):
+                cls.echo(f"         {entry['total_ms']:>10.0f} ms "
+                         f"{entry['calls']:>8} calls  "
+                         f"{entry['query'][:60]}")
+        problems = sum(check.status in ("warn", "fail") for check in checks)
+        if problems:
+            cls.warning(f"{problems} check(s) need attention.")
+        else:
+            cls.success("No problem found.")
+
+    @staticmethod
+    def to_json(checks):
+        """Serialize the checks, with the time of the diagnostics.
+
+        Args:
+            checks (tuple[DiagnosticDTO]): Results of the checks.
+
+        Returns:
+            str: The JSON document.
+        """
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        return json.dumps({"generated_at": now,
+                           "checks": [asdict(check) for check in checks]},
+                          indent=2, default=str)
+
+    @classmethod
+    def save_json(cls, path, checks):
+        """Write the checks as a JSON document, on stdout for '-'.
+
+        Args:
+            path (str): Destination file or '-'.
+            checks (tuple[DiagnosticDTO]): Results of the checks.
+        """
+        if path == "-":
+            cls.echo(cls.to_json(checks))
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(cls.to_json(checks) + "\n")
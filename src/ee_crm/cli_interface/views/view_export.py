@@ -0,0 +1,24 @@
+"""Class that implement the view for the bulk exports.
+
+Class:
+    ExportView  # Display the summary of an export.
+"""
+from ee_crm.cli_interface.views.view_base import BaseView
+
+
+class ExportView(BaseView):
+    """View for the summary of a bulk export."""
+    @classmethod
+    def display_report(cls, report):
+        """Print the summary and the throughput of an export.
+
+        Args:
+            report (ExportReportDTO): Summary of the export.
+        """
+        cls.success(f"{report.rows} {report.resource} exported to "
+                    f"{report.path} ({report.fmt}, gzip)")
+        cls.echo(f"  duration   : {report.seconds:.3f} s")
+        cls.echo(f"  throughput : {report.rows_per_second:,.0f} rows/s, "
+                 f"{report.mb_per_second:.2f} MB/s")
+        cls.echo(f"  size       : {report.raw_bytes:,} bytes raw, "
+                 f"{report.file_bytes:,} bytes compressed")
@@ -0,0 +1,45 @@
+"""Class that implement the view for the bulk imports.
+
+Class:
+    ImportView  # Display the progress and the summary of an import.
+"""
+import click
+
+from ee_crm.cli_interface.views.view_base import BaseView
+
+
+class ImportView(BaseView):
+    """View for the summary of a bulk import."""
+    @staticmethod
+    def display_progress(created, rejected):
+        """Overwrite a progress line on stderr, so the output stays
+        readable when stdout is redirected.
+
+        Args:
+            created (int): Number of created resources so far.
+            rejected (int): Number of rejected records so far.
+        """
+        click.echo(f"\r  {created:,} created, {rejected:,} rejected",
+                   err=True, nl=False)
+
+    @staticmethod
+    def end_progress():
+        """Terminate the progress line."""
+        click.echo("", err=True)
+
+    @classmethod
+    def display_report(cls, report):
+        """Print the summary and the throughput of an import.
+
+        Args:
+            report (ImportReportDTO): Summary of the import.
+        """
+        cls.success(f"{report.rows_imported} {report.resource} imported "
+                    f"from {report.path}")
+        cls.echo(f"  read       : {report.rows_read:,} records")
+        cls.echo(f"  duration   : {report.seconds:.3f} s")
+        cls.echo(f"  throughput : {report.rows_per_second:,.0f} rows/s")
+        if report.rows_rejected:
+            cls.warning(f"{report.rows_rejected} records rejected, see "
+                        f"{report.rejects_path} for the error and tips of "
+                        f"each line.")
@@ -0,0 +1,30 @@
+"""Class that implement the view for the latency metrics.
+
+Class:
+    MetricsView # Display the quantiles of the commands.
+"""
+from ee_crm.cli_interface.views.view_base import BaseView
+
+
+class MetricsView(BaseView):
+    """View for the latency metrics of the commands."""
+    @classmethod
+    def display_summaries(cls, summaries):
+        """Print a line per command and role, durations in ms.
+
+        Args:
+            summaries (tuple[MetricsSummaryDTO]): The summaries.
+        """
+        if not summaries:
+            cls.warning("No invocation recorded.")
+            return
+        width = max(len(s.command) for s in summaries)
+        cls.echo(f"{'command':<{width}}  {'role':<10}{'count':>7}"
+                 f"{'errors':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+                 f"{'sql p50':>9}{'sql p95':>9}")
+        for s in summaries:
+            cls.echo(f"{s.command:<{width}}  {s.role:<10}"
+                     f"{s.invocations:>7}{s.errors:>7}"
+                     f"{s.p50 * 1000:>10.1f}{s.p95 * 1000:>10.1f}"
+                     f"{s.p99 * 1000:>10.1f}"
+                     f"{s.sql_p50:>9g}{s.sql_p95:>9g}")
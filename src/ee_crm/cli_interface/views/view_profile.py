@@ -0,0 +1,64 @@
+"""Class that implement the view for the profile of a command.
+
+Class:
+    ProfileView # Print or save the profile of a command.
+"""
+import json
+
+import click
+
+from ee_crm.cli_interface.views.view_base import BaseView
+
+
+class ProfileView(BaseView):
+    """View for the report of 'eecrm --profile'. The report is printed
+    on stderr, so it never mixes with the output of the command."""
+    _layers = ("permission", "manager", "service", "sql", "render")
+
+    @staticmethod
+    def _line(label, calls, seconds, self_seconds):
+        return (f"  {label:<11}{calls:>7}{seconds * 1000:>12.2f}"
+                f"{self_seconds * 1000:>12.2f}")
+
+    @classmethod
+    def display_profile(cls, command, report):
+        """Print the compact breakdown of a profile.
+
+        Args:
+            command (str|None): Name of the profiled command.
+            report (dict): Report of ee_crm.profiling.Profiler.
+        """
+        lines = [click.style(f"profile of 'eecrm {command or ''}' : "
+                             f"{report['seconds'] * 1000:.2f} ms, "
+                             f"memory peak "
+                             f"{report['memory_peak_bytes'] / 1024:,.0f} KiB",
+                             fg="bright_yellow"),
+                 f"  {'layer':<11}{'calls':>7}{'total ms':>12}{'self ms':>12}"]
+        layers = report["layers"]
+        for name in (*cls._layers, *sorted(set(layers) - set(cls._layers))):
+            if name in layers:
+                layer = layers[name]
+                lines.append(cls._line(name, layer["calls"], layer["seconds"],
+                                       layer["self_seconds"]))
+        lines.append(cls._line("other", 1, report["other_seconds"],
+                               report["other_seconds"]))
+        sql = report["sql"]
+        lines.append(f"  {sql['statements']} statements "
+                     f"({sql['distinct']} distinct), slowest :")
+        for statement in sql["slowest"]:
+            lines.append(f"  {statement['seconds'] * 1000:>9.2f} ms "
+                         f"x{statement['executions']:<4} "
+                         f"{statement['statement'][:60]}")
+        click.echo("\n".join(lines), err=True)
+
+    @staticmethod
+    def save_profile(path, command, report):
+        """Write the profile as a JSON document.
+
+        Args:
+            path (str): Destination file.
+            command (str|None): Name of the profiled command.
+            report (dict): Report of ee_crm.profiling.Profiler.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"command": command, **report}, f, indent=2)
@@ -0,0 +1,114 @@
+"""Class that implement the view for the local replica.
+
+Class:
+    SyncView    # Display the sync, the push and the state of the
+                # replica.
+
+Functions:
+    format_age  # Short text of a duration, ex: 4 min.
+"""
+from datetime import datetime
+
+from ee_crm.cli_interface.views.view_base import BaseView
+
+
+def format_age(delta):
+    """Short text of a duration, rounded down.
+
+    Args:
+        delta (datetime.timedelta): The duration.
+
+    Returns:
+        str: The text, ex: "42 s", "4 min", "2 h 05 min", "3 d".
+    """
+    seconds = max(int(delta.total_seconds()), 0)
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes = seconds // 60
+    if minutes < 60:
+        return f"{minutes} min"
+    hours = minutes // 60
+    if hours < 24:
+        return f"{hours} h {minutes % 60:02d} min"
+    return f"{hours // 24} d"
+
+
+class SyncView(BaseView):
+    """View for the sync, the push of the offline journal and the state
+    of the local replica."""
+    @staticmethod
+    def source_note(state, now=None):
+        """Note of a table read from the replica, shown in its title.
+
+        Args:
+            state (ReplicaTableDTO|None): State of the replicated table,
+                None when the table is read from the database.
+            now (datetime|None): Current time, now when None.
+
+        Returns:
+            str|None: The note, None without state.
+        """
+        if state is None:
+            return None
+        return f"replica, synced {format_age(state.age(now))} ago"
+
+    @classmethod
+    def display_report(cls, report):
+        """Print the summary of a sync, one line per table.
+
+        Args:
+            report (SyncReportDTO): Summary of the sync.
+        """
+        cls.success(f"{report.rows_pulled} rows pulled into {report.path}")
+        for table in report.tables:
+            cls.echo(f"  {table.table:<12} : {table.mode:<11} "
+                     f"+{table.upserted} -{table.deleted}, "
+                     f"{table.rows} rows")
+        cls.echo(f"  duration     : {report.seconds:.3f} s")
+
+    @classmethod
+    def display_push(cls, report):
+        """Print the summary of the replay of the offline journal, one
+        line per conflict.
+
+        Args:
+            report (PushReportDTO): Summary of the replay.
+        """
+        cls.success(f"{report.applied} journaled writes pushed")
+        for conflict in report.conflicts:
+            row = (f" {conflict['row_id']}" if conflict["row_id"] is not None
+                   else "")
+            cls.warning(f"  {conflict['resource']}{row} {conflict['call']}, "
+                        f"recorded {conflict['recorded_at']} : "
+                        f"{conflict['reason']}")
+        if report.conflicts:
+            cls.warning(f"{len(report.conflicts)} conflicts not pushed, "
+                        f"reported in {report.conflicts_path}")
+        if report.kept:
+            cls.echo(f"  {report.kept} writes of other collaborators kept "
+                     f"in the journal")
+        cls.echo(f"  duration     : {report.seconds:.3f} s")
+
+    @classmethod
+    def display_status(cls, tables, path, pending=0):
+        """Print the state of the replicated tables.
+
+        Args:
+            tables (tuple[ReplicaTableDTO]): The synced tables.
+            path (str): Path of the replica file.
+            pending (int): Number of journaled writes not pushed yet.
+        """
+        if pending:
+            cls.warning(f"{pending} journaled writes, run 'eecrm sync "
+                        f"--push'.")
+        if not tables:
+            cls.warning(f"No replica in {path}, run 'eecrm sync'.")
+            return
+        now = datetime.now()
+        cls.echo(f"Replica {path}")
+        for table in tables:
+            changed = (table.changed_at.isoformat(" ", "seconds")
+                       if table.changed_at else "-")
+            cls.echo(f"  {table.table:<12} : {table.rows} rows, synced "
+                     f"{format_age(table.age(now))} ago, last change "
+                     f"{changed}")
@@ -2,16 +2,26 @@
 
 Function
     get_postgre_uri             # construct postgre uri
+    get_database_settings       # retrieve backend and sqlite settings
+    get_read_replica_settings   # retrieve read replicas and their lag
+    get_shard_settings          # retrieve shards and salesmen regions
+    get_replica_settings        # retrieve local replica settings
+    get_journal_settings        # retrieve offline write journal settings
     get_secret_key              # retrieve secret key
     get_token_store_path        # construct store absolute path
     get_token_access_lifetime   # retrieve jwt access lifetime
     get_token_refresh_lifetime  # retrieve jwt refresh lifetime
     get_sentry_dsn              # retrieve sentry dsn url
     get_local_log_dir           # construct local log dir
+    get_password_hasher_parameters  # retrieve argon2 parameters
+    get_entity_cache_settings   # retrieve entity cache bounds
+    get_query_cache_size        # retrieve query cache bound
+    get_table_settings          # retrieve table pager and sampling
 """
 import os
 from pathlib import Path
 
+import argon2
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,6 +42,135 @@ def get_postgres_uri():
     return f"postgresql+psycopg://{user}:{password}@{host}:{port}/{dbname}"
 
 
+def get_database_settings():
+    """Helper that retrieve the database backend and the settings of
+    the embedded SQLite database from the environment variables. The
+    SQLite file is relative to the package, as the token store.
+
+    Returns
+        dict: backend ('postgresql' or 'sqlite'), uri of the PostgreSQL
+            database, sqlite_path (absolute), busy_timeout_ms (wait for
+            a locked database), synchronous (PRAGMA level),
+            cache_size_kib (page cache per connection) and mmap_size
+            (bytes of the file read through memory mapping, 0 disables
+            it).
+    """
+    return {
+        "backend": os.getenv('DB_BACKEND', 'postgresql').lower(),
+        "uri": get_postgres_uri(),
+        "sqlite_path": str(Path(__file__).resolve().parent /
+                           os.getenv('SQLITE_PATH', '.storage/eecrm.db')),
+        "busy_timeout_ms": int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        "synchronous": os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL').upper(),
+        "cache_size_kib": int(os.getenv('SQLITE_CACHE_SIZE_KIB', 65536)),
+        "mmap_size": int(os.getenv('SQLITE_MMAP_SIZE', 268435456)),
+    }
+
+
+def get_read_replica_settings():
+    """Helper that retrieve the read replicas of the database, see
+    ee_crm.adapters.routing, from the environment variables. Without
+    URI every query is sent to the database.
+
+    Returns
+        dict: uris of the replicas, max_lag (seconds a replica may be
+            behind the database while it serves the reads) and
+            check_interval (seconds between two checks of the lag of a
+            replica).
+    """
+    uris = os.getenv('DB_READ_REPLICA_URIS', '')
+    return {
+        "uris": [uri.strip() for uri in uris.split(",") if uri.strip()],
+        "max_lag": float(os.getenv('DB_READ_REPLICA_MAX_LAG', 5)),
+        "check_interval": float(os.getenv('DB_READ_REPLICA_CHECK_INTERVAL',
+                                          1)),
+    }
+
+
+def get_shard_settings():
+    """Helper that retrieve the shards of the clients, with their
+    contracts and events, see ee_crm.adapters.sharding, from the
+    environment variables. Without shard the database isn't sharded.
+
+    DB_SHARDS lists the shards as 'name=uri' pairs separated by commas,
+    their order gives their range of ids, a new shard is appended.
+    DB_SHARD_MAP gives the shard (the region) of the clients of the
+    salesmen, as 'salesman_id=name' pairs.
+
+    Returns
+        dict: shards (list of (name, uri) tuples, in order) and
+            salesmen (dict of the shard name by salesman id).
+
+    Raises
+        ValueError: If a pair is malformed or a salesman is mapped to
+            an unknown shard.
+    """
+    shards, salesmen = [], {}
+    for item in os.getenv('DB_SHARDS', '').split(","):
+        if not item.strip():
+            continue
+        name, sep, uri = item.partition("=")
+        if not sep or not name.strip() or not uri.strip():
+            raise ValueError(f"Malformed shard {item.strip()!r}, "
+                             f"expected 'name=uri'")
+        shards.append((name.strip(), uri.strip()))
+
+    names = {name for name, _ in shards}
+    for item in os.getenv('DB_SHARD_MAP', '').split(","):
+        if not item.strip():
+            continue
+        salesman_id, _, name = item.partition("=")
+        if not salesman_id.strip().isdigit() or name.strip() not in names:
+            raise ValueError(f"Malformed shard of salesman {item.strip()!r}"
+                             f", expected 'salesman_id=shard name'")
+        salesmen[int(salesman_id)] = name.strip()
+    return {"shards": shards, "salesmen": salesmen}
+
+
+def get_replica_settings():
+    """Helper that retrieve the settings of the local replica, see
+    'eecrm sync', from the environment variables. The replica file is
+    relative to the package, as the token store. A max_age of 0 only
+    reads the replica when it's asked (--offline).
+
+    Returns
+        dict: path (absolute) of the replica, max_age (seconds since
+            the last sync while the reads are served by the replica
+            when the database is unreachable)
+            and overlap (seconds of changes pulled again at each sync,
+            for the late commits).
+    """
+    return {
+        "path": str(Path(__file__).resolve().parent /
+                    os.getenv('REPLICA_PATH', '.storage/replica.db')),
+        "max_age": float(os.getenv('REPLICA_MAX_AGE', 0)),
+        "overlap": float(os.getenv('REPLICA_SYNC_OVERLAP', 300)),
+    }
+
+
+def get_journal_settings():
+    """Helper that retrieve the settings of the offline write journal,
+    see 'eecrm sync --push', from the environment variables. The files
+    are relative to the package, as the token store. The journal is
+    disabled by default.
+
+    Returns
+        dict: enabled, whether the writes are journaled while the
+            database is unreachable, path (absolute) of the journal and
+            conflicts_path (absolute) of the report of the writes that
+            couldn't be replayed.
+    """
+    package = Path(__file__).resolve().parent
+    return {
+        "enabled": os.getenv('OFFLINE_JOURNAL', '0').lower()
+        in ('1', 'true', 'yes'),
+        "path": str(package / os.getenv('OFFLINE_JOURNAL_PATH',
+                                        '.storage/journal.jsonl')),
+        "conflicts_path": str(package / os.getenv(
+            'OFFLINE_CONFLICTS_PATH', '.storage/journal.conflicts.jsonl')),
+    }
+
+
 def get_secret_key():
     """Helper that get the secret key from the environment variables.
 
@@ -88,3 +227,116 @@ def get_local_log_dir():
     """
     return str(Path(__file__).resolve().parent /
                os.getenv('LOCAL_LOG_STORAGE'))
+
+
+def get_password_hasher_parameters():
+    """Helper that retrieve the argon2 parameters of the password hasher
+    from the environment variables, argon2-cffi defaults are used for
+    the missing ones. See 'eecrm admin calibrate-hash' to choose them.
+
+    Returns
+        dict: time_cost (iterations), memory_cost (KiB) and parallelism
+            (lanes) keyword arguments of argon2.PasswordHasher.
+    """
+    return {
+        "time_cost": int(os.getenv('ARGON2_TIME_COST',
+                                   argon2.DEFAULT_TIME_COST)),
+        "memory_cost": int(os.getenv('ARGON2_MEMORY_COST',
+                                     argon2.DEFAULT_MEMORY_COST)),
+        "parallelism": int(os.getenv('ARGON2_PARALLELISM',
+                                     argon2.DEFAULT_PARALLELISM)),
+    }
+
+
+def get_entity_cache_settings():
+    """Helper that retrieve the bounds of the entity cache from the
+    environment variables. A size of 0, the default, disables the cache.
+
+    Returns
+        dict: max_size (entities) and ttl (seconds) of the cache.
+    """
+    return {
+        "max_size": int(os.getenv('ENTITY_CACHE_SIZE', 0)),
+        "ttl": float(os.getenv('ENTITY_CACHE_TTL', 30)),
+    }
+
+
+def get_query_cache_size():
+    """Helper that retrieve the maximum number of cached query results
+    from the environment variables. A size of 0, the default, disables
+    the cache.
+
+    Returns
+        int: Maximum number of cached results.
+    """
+    return int(os.getenv('QUERY_CACHE_SIZE', 0))
+
+
+def get_attribute_cache_settings():
+    """Helper that retrieve the settings of the access control attributes
+    cache from the environment variables. The cache file sits next to
+    the token store. A ttl of 0, the default, disables the cache.
+
+    Returns
+        dict: path (absolute), slots (number of entries) and ttl
+            (seconds) of the cache.
+    """
+    return {
+        "path": str(Path(get_token_store_path()).parent /
+                    os.getenv('ABAC_CACHE_FILE', 'abac.cache')),
+        "slots": int(os.getenv('ABAC_CACHE_SLOTS', 4096)),
+        "ttl": float(os.getenv('ABAC_CACHE_TTL', 0)),
+    }
+
+
+def get_metrics_settings():
+    """Helper that retrieve the settings of the local latency metrics
+    from the environment variables. The state file sits in the local
+    log directory. A retention of 0 disables the recording.
+
+    Returns
+        dict: path (absolute) of the state file and retention_days of
+            the recorded invocations.
+    """
+    return {
+        "path": str(Path(get_local_log_dir()) /
+                    os.getenv('METRICS_STORAGE', 'metrics.json')),
+        "retention_days": float(os.getenv('METRICS_RETENTION_DAYS', 7)),
+    }
+
+
+def get_table_settings():
+    """Helper that retrieve the settings of the rendering of the tables
+    from the environment variables.
+
+    Returns
+        dict: pager (bool, page the tables taller than a terminal) and
+            sample_rows (rows read to size the columns, 0 sizes them
+            from the terminal only).
+    """
+    return {
+        "pager": os.getenv('TABLE_PAGER', '1').lower()
+        in ('1', 'true', 'yes'),
+        "sample_rows": int(os.getenv('TABLE_SAMPLE_ROWS', 200)),
+    }
+
+
+def get_slow_query_settings():
+    """Helper that retrieve the settings of the slow query log from
+    the environment variables. The log sits in the local log directory.
+    A threshold of 0 disables the log.
+
+    Returns
+        dict: path (absolute) of the log, threshold_ms of a logged
+            statement and explain, whether its plan is captured,
+            "analyze" to run the SELECT statements again with EXPLAIN
+            ANALYZE.
+    """
+    explain = os.getenv('SLOW_QUERY_EXPLAIN', '0').lower()
+    return {
+        "path": str(Path(get_local_log_dir()) /
+                    os.getenv('SLOW_QUERY_LOG', 'slow_queries.jsonl')),
+        "threshold_ms": float(os.getenv('SLOW_QUERY_MS', 200)),
+        "explain": ("analyze" if explain == "analyze"
+                    else explain in ('1', 'true', 'yes')),
+    }
@@ -6,6 +6,7 @@ Classes
 """
 from ee_crm.controllers.utils import InputError, verify_positive_int
 from ee_crm.exceptions import BaseManagerError
+from ee_crm.profiling import profile_methods
 from ee_crm.services.app.base import BaseService
 
 
@@ -33,6 +34,12 @@ class BaseManager:
     def __init__(self, service=None):
         self.service = service or self._default_service
 
+    def __init_subclass__(cls, **kwargs):
+        """Profile the public methods of the managers, see
+        ee_crm.profiling."""
+        super().__init_subclass__(**kwargs)
+        profile_methods(cls, "manager")
+
     def _validate_pk_type(self, pk):
         """Helper method to verify that given pk is a positive integer.
 
@@ -135,6 +142,27 @@ class BaseManager:
 
         return output_dto
 
+    def browse(self, filters=None, sort=None, after=None, limit=50):
+        """Start the browse operation. It reads one page of the query,
+        the next pages are read with the returned cursor.
+
+        Args
+            filters (dict): The keywords filters parameters to apply to
+                the query.
+            sort (iter(tuple[str, str])): The sort to apply to the
+                query.
+            after (tuple|None): The cursor returned with the previous
+                page, None for the first page.
+            limit (int): The maximum number of resources in the page.
+
+        Returns
+            tuple[tuple[dataclass], tuple|None]: The page and the
+                cursor of the next page, None after the last page.
+        """
+        validated_filters = self._validate_fields(filters) if filters else {}
+        return self.service.page(sort=sort, after=after, limit=limit,
+                                 **validated_filters)
+
     def update(self, pk, **kwargs):
         """Start the update operation. It updates an existing resource
         and persist the modification.
@@ -157,3 +185,6 @@ class BaseManager:
         """
         pk = self._validate_pk_type(pk)
         self.service.remove(pk)
+
+
+profile_methods(BaseManager, "manager")
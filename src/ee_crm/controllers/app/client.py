@@ -7,6 +7,7 @@ Classes
 from typing import override
 
 from ee_crm.controllers.app.base import BaseManager
+from ee_crm.controllers.app.journal import journaled
 from ee_crm.controllers.auth.permission import permission
 from ee_crm.controllers.auth.predicate import is_client_associated_salesman, \
     is_management, client_has_salesman
@@ -45,6 +46,7 @@ class ClientManager(BaseManager):
     error_cls = ClientManagerError
 
     @override
+    @journaled
     @permission("client:create")
     def create(self, **kwargs):
         """See BaseManager.create
@@ -71,6 +73,14 @@ class ClientManager(BaseManager):
         return super().read(pk=pk, filters=filters, sort=sort)
 
     @override
+    @permission("client:read")
+    def browse(self, filters=None, sort=None, after=None, limit=50):
+        """See BaseManager.browse"""
+        return super().browse(filters=filters, sort=sort, after=after,
+                              limit=limit)
+
+    @override
+    @journaled
     @permission("client:update_own", "client:update_unassigned",
                 abac=(is_client_associated_salesman |
                       (is_management & ~client_has_salesman)))
@@ -91,6 +101,7 @@ class ClientManager(BaseManager):
         return super().update(pk=pk, **update_data)
 
     @override
+    @journaled
     @permission("client:delete_own", "client:delete_unassigned",
                 abac=(is_client_associated_salesman |
                       (is_management & ~client_has_salesman)))
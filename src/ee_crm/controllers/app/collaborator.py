@@ -155,6 +155,13 @@ class CollaboratorManager(BaseManager):
         """See BaseManager.read"""
         return super().read(pk=pk, filters=filters, sort=sort)
 
+    @override
+    @permission("collaborator:read")
+    def browse(self, filters=None, sort=None, after=None, limit=50):
+        """See BaseManager.browse"""
+        return super().browse(filters=filters, sort=sort, after=after,
+                              limit=limit)
+
     @override
     @permission("collaborator:update_any", "collaborator:update_self",
                 abac=(is_management | is_self))
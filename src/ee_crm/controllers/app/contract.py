@@ -11,6 +11,7 @@ from math import trunc
 from typing import override
 
 from ee_crm.controllers.app.base import BaseManager
+from ee_crm.controllers.app.journal import journaled
 from ee_crm.controllers.auth.permission import permission
 from ee_crm.controllers.auth.predicate import \
     is_contract_associated_salesman, is_management, contract_is_signed, \
@@ -117,6 +118,7 @@ class ContractManager(BaseManager):
         return filters
 
     @override
+    @journaled
     @permission("contract:create")
     def create(self, **kwargs):
         """See BaseManager.create
@@ -143,6 +145,19 @@ class ContractManager(BaseManager):
             filters = self._validate_signed(filters)
         return super().read(pk=pk, filters=filters, sort=sort)
 
+    @override
+    @permission("contract:read")
+    def browse(self, filters=None, sort=None, after=None, limit=50):
+        """See BaseManager.browse
+
+        Differences
+            * Transform input for the signed key in a bool.
+        """
+        if filters:
+            filters = self._validate_signed(filters)
+        return super().browse(filters=filters, sort=sort, after=after,
+                              limit=limit)
+
     @override
     def update(self, *args, **kwargs):
         """Raise an error if used, contract should be modified through
@@ -157,6 +172,7 @@ class ContractManager(BaseManager):
         raise err
 
     @override
+    @journaled
     @permission("contract:delete_own", "contract:delete_unassigned",
                 abac=(is_contract_associated_salesman |
                       (is_management & ~contract_has_salesman)))
@@ -164,6 +180,7 @@ class ContractManager(BaseManager):
         """See BaseManager.delete"""
         return super().delete(pk=pk)
 
+    @journaled
     @permission("contract:sign_own",
                 abac=is_contract_associated_salesman)
     def sign(self, pk, **kwargs):
@@ -189,6 +206,7 @@ class ContractManager(BaseManager):
                                        "Contract signed",
                                        extra={"contract_id": pk})
 
+    @journaled
     @permission("contract:modify_total_own",
                 abac=(is_contract_associated_salesman & ~contract_is_signed))
     def change_total(self, pk, total):
@@ -204,6 +222,7 @@ class ContractManager(BaseManager):
         total = trunc(total * 100) / 100
         self.service.modify_total_amount(pk, total)
 
+    @journaled
     @permission("contract:pay_own",
                 abac=(is_contract_associated_salesman & contract_is_signed))
     def pay(self, pk, amount):
@@ -0,0 +1,73 @@
+"""The function responsible for the initialization of the configured
+database, 'eecrm admin init-db'.
+
+A PostgreSQL database is usually created with the scripts of 'db_reset',
+an embedded SQLite database (DB_BACKEND=sqlite) has no server to run
+them: its tables are created by the application. No one can log in to a
+new database, so the first management account is created without
+permission, only while the database has no collaborator.
+
+A sharded database (DB_SHARDS) is initialized shard by shard, the
+appended shards get the users and collaborators of the first one, see
+ee_crm.adapters.sharding.
+
+Functions
+    init_database   # Create the tables and the first account.
+"""
+from ee_crm.adapters.database import create_schema
+from ee_crm.adapters.sharding import create_shard_schema
+from ee_crm.controllers.default_uow import DEFAULT_UOW
+from ee_crm.domain.model import Role
+from ee_crm.exceptions import CollaboratorManagerError
+from ee_crm.services.app.collaborators import CollaboratorService
+from ee_crm.services.unit_of_work import DEFAULT_ENGINE, DEFAULT_SHARD_MAP
+
+
+def init_database(username=None, plain_password=None, engine=None,
+                  uow=None, shard_map=None):
+    """Create the missing tables of the configured database and,
+    optionally, its first management account.
+
+    Args
+        username (str|None): Username of the first account, no account
+            is created when None.
+        plain_password (str|None): Password of the first account.
+        engine (sqlalchemy.engine.Engine|None): Engine of the database,
+            the configured one when None.
+        uow (AbstractUnitOfWork|None): Unit of work of the database, the
+            default one when None.
+        shard_map (ShardMap|None): Shards of the database, the
+            configured ones when None and no engine is given.
+
+    Returns
+        tuple[tuple[str], CollaboratorDTO|None]: Names of the created
+            tables and the created account.
+
+    Raises
+        CollaboratorManagerError: If an account is asked while the
+            database already has collaborators.
+    """
+    if shard_map is None and engine is None:
+        shard_map = DEFAULT_SHARD_MAP
+    if shard_map is not None:
+        home = shard_map.engines[0]
+        created = tuple(dict.fromkeys(
+            name for index, shard in enumerate(shard_map.engines)
+            for name in create_shard_schema(shard, index,
+                                            home=home if index else None)))
+    else:
+        created = tuple(create_schema(engine or DEFAULT_ENGINE))
+    if username is None:
+        return created, None
+
+    service = CollaboratorService(uow or DEFAULT_UOW())
+    collaborators, _ = service.page(limit=1)
+    if collaborators:
+        err = CollaboratorManagerError("database already has collaborators")
+        err.tips = ("The first account can only be created on a new "
+                    "database, log in with a management account to create "
+                    "collaborators.")
+        raise err
+    collaborator, = service.create(username, plain_password,
+                                   role=Role.MANAGEMENT)
+    return created, collaborator
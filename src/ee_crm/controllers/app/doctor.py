@@ -0,0 +1,68 @@
+"""The function responsible for the diagnostics of 'eecrm doctor'.
+It opens its own pool-less engine on the configured database, so the
+connection setup is measured, and only reads.
+
+Functions
+    run_diagnostics # Run every check of the doctor.
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from ee_crm.adapters.database import create_database_engine
+from ee_crm.adapters.orm import mapper_registry
+from ee_crm.config import get_password_hasher_parameters, \
+    get_token_store_path
+from ee_crm.controllers.utils import verify_positive_int
+from ee_crm.services.app.doctor import check_bloat, check_connection, \
+    check_foreign_key_indexes, check_password_verify, check_round_trip, \
+    check_server, check_token_store, check_top_statements, run_check
+from ee_crm.services.dto import DiagnosticDTO
+
+_DATABASE_CHECKS = ("round-trip", "server", "foreign-key-indexes", "bloat",
+                    "pg-stat-statements")
+
+
+def run_diagnostics(samples=5, uri=None):
+    """Measure the database, the token store and the password hasher.
+
+    Args
+        samples (int): Number of measures of the timed checks.
+        uri (str|None): Database URI, the configured one when None.
+
+    Returns
+        tuple[DiagnosticDTO]: Results of the checks, in report order.
+
+    Raises
+        InputError: If samples isn't a positive integer.
+    """
+    samples = verify_positive_int(samples)
+    metadata = mapper_registry.metadata
+    schemas = sorted({table.schema for table in metadata.tables.values()
+                      if table.schema})
+    engine = (create_engine(uri, poolclass=NullPool) if uri
+              else create_database_engine(poolclass=NullPool))
+    try:
+        checks = [run_check("connection", check_connection, engine,
+                            samples)]
+        if checks[0].status == "fail":
+            checks += [DiagnosticDTO(name, "skip", "no connection")
+                       for name in _DATABASE_CHECKS]
+        else:
+            with engine.connect() as conn:
+                for name, check, args in (
+                        ("round-trip", check_round_trip, (samples * 4,)),
+                        ("server", check_server, ()),
+                        ("foreign-key-indexes", check_foreign_key_indexes,
+                         (metadata,)),
+                        ("bloat", check_bloat, (schemas,)),
+                        ("pg-stat-statements", check_top_statements, ())):
+                    checks.append(run_check(name, check, conn, *args))
+                    conn.rollback()
+    finally:
+        engine.dispose()
+    checks.append(run_check("token-store", check_token_store,
+                            get_token_store_path()))
+    checks.append(run_check("argon2-verify", check_password_verify,
+                            samples=min(samples, 3),
+                            **get_password_hasher_parameters()))
+    return tuple(checks)
@@ -7,6 +7,7 @@ Classes
 from typing import override
 
 from ee_crm.controllers.app.base import BaseManager
+from ee_crm.controllers.app.journal import journaled
 from ee_crm.controllers.auth.permission import permission
 from ee_crm.controllers.auth.predicate import event_has_support, \
     is_event_associated_salesman, is_event_associated_support, is_management
@@ -45,6 +46,7 @@ class EventManager(BaseManager):
     error_cls = EventManagerError
 
     @override
+    @journaled
     @permission("event:create")
     def create(self, **kwargs):
         """See BaseManager.create
@@ -71,6 +73,14 @@ class EventManager(BaseManager):
         return super().read(pk=pk, filters=filters, sort=sort)
 
     @override
+    @permission("event:read")
+    def browse(self, filters=None, sort=None, after=None, limit=50):
+        """See BaseManager.browse"""
+        return super().browse(filters=filters, sort=sort, after=after,
+                              limit=limit)
+
+    @override
+    @journaled
     @permission("event:update_own", "event:update_unassigned",
                 abac=((~event_has_support & is_event_associated_salesman) |
                       is_event_associated_support))
@@ -92,6 +102,7 @@ class EventManager(BaseManager):
         return super().update(pk=pk, **update_data)
 
     @override
+    @journaled
     @permission("event:delete_unassigned", "event:delete",
                 abac=((~event_has_support & is_event_associated_salesman) |
                       is_management))
@@ -99,6 +110,7 @@ class EventManager(BaseManager):
         """See BaseManager.delete"""
         return super().delete(pk=pk)
 
+    @journaled
     @permission("event:modify_support")
     def change_support(self, pk, support_id=None, unassign_flag=False):
         """Method that pilot the modification of the support of an
@@ -0,0 +1,97 @@
+"""Controller class for the bulk export of resources.
+
+An export is a read of a whole table, it requires the same permissions
+as the read operations of the exported resource.
+
+Classes
+    ExportManager   # Validate inputs and start the export service.
+"""
+from ee_crm.adapters.bulk import EXPORT_FORMATS
+from ee_crm.controllers.auth.permission import permission
+from ee_crm.controllers.default_uow import DEFAULT_UOW
+from ee_crm.controllers.utils import verify_positive_int
+from ee_crm.exceptions import ExportManagerError, InputError
+from ee_crm.services.app.exports import ExportService
+
+
+class ExportManager:
+    """Controller for the bulk exports.
+
+    Attributes
+        label (str): (class attribute) Name of the resource.
+        error_cls (ExportManagerError): (class attribute) Exception class
+            raised when an error occurs.
+        service (ee_crm.services.app.exports.ExportService): The service
+            class to start operations with.
+    """
+    label = "Export"
+    _default_service = ExportService(DEFAULT_UOW())
+    error_cls = ExportManagerError
+
+    def __init__(self, service=None):
+        self.service = service or self._default_service
+
+    def _validate_options(self, fmt, chunk_size):
+        """Helper method to verify the export options.
+
+        Args
+            fmt (str): The requested format.
+            chunk_size (int): Number of rows read per query.
+
+        Returns
+            tuple[str, int]: The validated options.
+
+        Raises
+            ExportManagerError: If an option isn't valid.
+        """
+        fmt = str(fmt).lower()
+        if fmt not in EXPORT_FORMATS:
+            err = self.error_cls(f"Invalid format <{fmt}>")
+            err.threat = "warning"
+            err.tips = (f"The format must be one of : "
+                        f"{', '.join(EXPORT_FORMATS)}.")
+            raise err
+        try:
+            chunk_size = verify_positive_int(chunk_size)
+        except InputError as e:
+            err = self.error_cls(f"{e.args[0]}. Input <chunk_size: "
+                                 f"{chunk_size}>.")
+            err.threat = e.threat
+            err.tips = e.tips
+            raise err
+        return fmt, chunk_size or 1
+
+    def _export(self, resource, path, fmt, chunk_size):
+        """Validate the options and start the export.
+
+        Returns
+            ExportReportDTO: Summary of the export.
+        """
+        fmt, chunk_size = self._validate_options(fmt, chunk_size)
+        return self.service.export(resource, path, fmt=fmt,
+                                   chunk_size=chunk_size)
+
+    @permission("client:read")
+    def export_clients(self, path, fmt="csv", chunk_size=5000):
+        """Export the clients table.
+
+        Args
+            path (str): Destination of the gzip file.
+            fmt (str): One of "csv", "text", "binary".
+            chunk_size (int): Number of rows read per query on the
+                keyset fallback.
+
+        Returns
+            ExportReportDTO: Summary of the export.
+        """
+        return self._export("clients", path, fmt, chunk_size)
+
+    @permission("contract:read")
+    def export_contracts(self, path, fmt="csv", chunk_size=5000):
+        """Export the contracts table. See export_clients."""
+        return self._export("contracts", path, fmt, chunk_size)
+
+    @permission("event:read")
+    def export_events(self, path, fmt="csv", chunk_size=5000):
+        """Export the events table. See export_clients."""
+        return self._export("events", path, fmt, chunk_size)
@@ -0,0 +1,211 @@
+"""Controller class for the bulk import of resources.
+
+An import creates resources, it requires the same permissions as the
+create operations of the imported resource. The records of the file go
+through the same type conversions as the inputs of the resource
+managers.
+
+Classes
+    ImportManager   # Validate inputs and start the import service.
+"""
+from ee_crm.adapters.bulk import IMPORT_FORMATS
+from ee_crm.controllers.app.client import ClientManager
+from ee_crm.controllers.app.collaborator import CollaboratorManager
+from ee_crm.controllers.app.contract import ContractManager
+from ee_crm.controllers.app.event import EventManager
+from ee_crm.controllers.auth.permission import permission
+from ee_crm.controllers.default_uow import DEFAULT_UOW
+from ee_crm.controllers.utils import verify_positive_int
+from ee_crm.exceptions import ImportManagerError, InputError
+from ee_crm.loggers import setup_file_logger
+from ee_crm.services.app.imports import ImportService
+
+
+class ImportManager:
+    """Controller for the bulk imports.
+
+    Attributes
+        label (str): (class attribute) Name of the resource.
+        _types_maps (dict): (class attribute) mapping between resource
+            and the validation helpers of its manager.
+        error_cls (ImportManagerError): (class attribute) Exception class
+            raised when an error occurs.
+        service (ee_crm.services.app.imports.ImportService): The service
+            class to start operations with.
+    """
+    label = "Import"
+    _types_maps = {
+        "clients": ClientManager._validate_types_map,
+        "contracts": ContractManager._validate_types_map,
+        "events": EventManager._validate_types_map,
+        "collaborators": CollaboratorManager._validate_types_map,
+    }
+    _default_service = ImportService(DEFAULT_UOW())
+    error_cls = ImportManagerError
+
+    def __init__(self, service=None):
+        self.service = service or self._default_service
+
+    @staticmethod
+    def _local_logging_import(resource, report, accountable_id):
+        """Local logging setup for logging bulk imports.
+
+        Args
+            resource (str): The imported resource. (ex: clients).
+            report (ImportReportDTO): Summary of the import.
+            accountable_id (int): The id of the collaborator who
+                imported the resources.
+        """
+        logger = setup_file_logger(name=__name__, filename="ACID")
+        logger.info(f'controller ::: Import ::: {resource} ::: '
+                    f'By collaborator ({accountable_id}) ::: '
+                    f'{report.rows_imported} created, '
+                    f'{report.rows_rejected} rejected ({report.path})')
+
+    def _validate_positive_option(self, name, value):
+        """Helper method to verify a numeric option.
+
+        Args
+            name (str): Name of the option.
+            value (Any): Value of the option.
+
+        Returns
+            int: The value converted to a strictly positive integer.
+
+        Raises
+            ImportManagerError: If the value isn't a positive integer.
+        """
+        try:
+            value = verify_positive_int(value)
+        except InputError as e:
+            err = self.error_cls(f"{e.args[0]}. Input <{name}: {value}>.")
+            err.threat = e.threat
+            err.tips = e.tips
+            raise err
+        return value or 1
+
+    def _validate_format(self, path, fmt):
+        """Helper method to verify the format of the file, guessed from
+        its suffix when not given.
+
+        Args
+            path (str): Path of the imported file.
+            fmt (str|None): The requested format.
+
+        Returns
+            str: The validated format.
+
+        Raises
+            ImportManagerError: If the format isn't valid.
+        """
+        if fmt is None:
+            name = str(path).removesuffix(".gz")
+            return "jsonl" if name.endswith(".jsonl") else "csv"
+        fmt = str(fmt).lower()
+        if fmt not in IMPORT_FORMATS:
+            err = self.error_cls(f"Invalid format <{fmt}>")
+            err.threat = "warning"
+            err.tips = (f"The format must be one of : "
+                        f"{', '.join(IMPORT_FORMATS)}.")
+            raise err
+        return fmt
+
+    def _import(self, resource, path, fmt, chunk_size, workers, rejects_path,
+                auth, salesman_id=None):
+        """Validate the options and start the import.
+
+        Returns
+            ImportReportDTO: Summary of the import.
+        """
+        fmt = self._validate_format(path, fmt)
+        chunk_size = self._validate_positive_option("chunk_size", chunk_size)
+        workers = self._validate_positive_option("workers", workers)
+        report = self.service.import_file(
+            resource, path,
+            fmt=fmt,
+            types_map=self._types_maps[resource],
+            salesman_id=salesman_id,
+            chunk_size=chunk_size,
+            workers=workers,
+            rejects_path=rejects_path)
+        self._local_logging_import(resource, report, auth["c_id"])
+        return report
+
+    @permission("client:create")
+    def import_clients(self, path, fmt=None, chunk_size=1000, workers=1,
+                       rejects_path=None, **kwargs):
+        """Import clients, every client is linked to the user.
+
+        Args
+            path (str): Path of the csv or jsonl file.
+            fmt (str|None): One of "csv", "jsonl", guessed from the
+                suffix of the file when None.
+            chunk_size (int): Number of records validated and loaded
+                at once.
+            workers (int): Number of validation processes.
+            rejects_path (str|None): Destination of the rejects file.
+            **kwargs (dict): Keyword arguments, contains the 'auth'
+                payload injected by the permission decorator.
+
+        Returns
+            ImportReportDTO: Summary of the import.
+        """
+        auth = kwargs["auth"]
+        return self._import("clients", path, fmt, chunk_size, workers,
+                            rejects_path, auth, salesman_id=auth["c_id"])
+
+    @permission("contract:create")
+    def import_contracts(self, path, fmt=None, chunk_size=1000, workers=1,
+                         rejects_path=None, **kwargs):
+        """Import contracts. See import_clients."""
+        return self._import("contracts", path, fmt, chunk_size, workers,
+                            rejects_path, kwargs["auth"])
+
+    @permission("event:create")
+    def import_events(self, path, fmt=None, chunk_size=1000, workers=1,
+                      rejects_path=None, **kwargs):
+        """Import events. See import_clients."""
+        return self._import("events", path, fmt, chunk_size, workers,
+                            rejects_path, kwargs["auth"])
+
+    @permission("collaborator:create")
+    def import_collaborators(self, path, fmt=None, chunk_size=50,
+                             workers=None, rejects_path=None, progress=None,
+                             **kwargs):
+        """Provision collaborators and their user account, the
+        passwords are hashed in a pool of processes.
+
+        Args
+            path (str): Path of the csv or jsonl file, every record
+                needs a username and a password.
+            fmt (str|None): One of "csv", "jsonl", guessed from the
+                suffix of the file when None.
+            chunk_size (int): Number of records hashed by a process and
+                inserted at once.
+            workers (int|None): Number of hashing processes, every CPU
+                is used when None.
+            rejects_path (str|None): Destination of the rejects file.
+            progress (Callable[[int, int], Any]|None): Called with the
+                number of created and rejected collaborators after each
+                chunk.
+            **kwargs (dict): Keyword arguments, contains the 'auth'
+                payload injected by the permission decorator.
+
+        Returns
+            ImportReportDTO: Summary of the import.
+        """
+        fmt = self._validate_format(path, fmt)
+        chunk_size = self._validate_positive_option("chunk_size", chunk_size)
+        if workers is not None:
+            workers = self._validate_positive_option("workers", workers)
+        report = self.service.import_collaborators(
+            path,
+            fmt=fmt,
+            types_map=self._types_maps["collaborators"],
+            chunk_size=chunk_size,
+            workers=workers,
+            rejects_path=rejects_path,
+            progress=progress)
+        self._local_logging_import("collaborators", report,
+                                   kwargs["auth"]["c_id"])
+        return report
@@ -0,0 +1,181 @@
+"""Offline write journal of the managers, replayed by
+'eecrm sync --push', see ee_crm.controllers.app.replica.
+
+When OFFLINE_JOURNAL is enabled and the database is unreachable (see
+ee_crm.adapters.database.is_unreachable), a journaled write method of a
+manager runs again offline: the attributes of the permissions (ABAC)
+are read from the local replica, the fields are validated as usual,
+then the write handed to the service is appended to the journal
+instead of running. The entry keeps the call of the manager, for the
+replay, the validated write, and the version of the row ('updated_at')
+read from the replica, for the optimistic check of the replay. The user
+gets a warning: the write isn't done yet.
+
+Constants
+    JOURNALED_WRITES    # Service methods recorded by the journal.
+
+Functions
+    journaled       # Decorator journaling a write method offline.
+    replaying       # Context of the replay, nothing is journaled.
+    same_version    # Whether two versions of a row are the same.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ee_crm.adapters.database import is_unreachable
+from ee_crm.adapters.journal import WriteJournal
+from ee_crm.adapters.replica import REPLICATED_TABLES, row_version
+from ee_crm.config import get_journal_settings
+from ee_crm.controllers.auth.permission import checked_on_replica
+from ee_crm.controllers.default_uow import REPLICA_ENGINE, REPLICA_UOW
+
+# Service methods writing a row, the others run as usual
+JOURNALED_WRITES = frozenset({
+    "create", "modify", "remove", "sign_contract", "modify_total_amount",
+    "pay_amount", "assign_support"})
+
+# Set while the journal is replayed, a failed write isn't journaled again
+_replaying = ContextVar("journal_replaying", default=False)
+
+
+@contextmanager
+def replaying():
+    """Context of the replay of the journal, the journaled methods
+    raise their errors instead of journaling the write again."""
+    token = _replaying.set(True)
+    try:
+        yield
+    finally:
+        _replaying.reset(token)
+
+
+def same_version(first, second):
+    """Whether two versions ('updated_at') of a row are the same. The
+    versions are compared without their offset, SQLite stores the times
+    without it, and may be given in ISO format.
+
+    Args
+        first (datetime|str|None): A version.
+        second (datetime|str|None): The other version.
+
+    Returns
+        bool: True if they are the same.
+    """
+    first, second = (datetime.fromisoformat(v) if isinstance(v, str)
+                     else v for v in (first, second))
+    if first is None or second is None:
+        return first is second
+    return first.replace(tzinfo=None) == second.replace(tzinfo=None)
+
+
+def _replica_version(table_name, row_id):
+    """Whether a row was read in the replica and its version, None for
+    a NULL 'updated_at', the rows written before the column existed.
+    A row missing from the replica, or a replica that can't be read,
+    gives (False, None)."""
+    try:
+        with REPLICA_ENGINE.connect() as conn:
+            return row_version(conn, REPLICATED_TABLES[table_name], row_id)
+    except SQLAlchemyError:
+        return False, None
+
+
+class _JournalingService:
+    """Service of a manager running offline, its writes are appended
+    to the journal and its reads run on the local replica, see
+    journaled.
+
+    Attributes
+        service (BaseService): The service of the resource, reading the
+            local replica.
+        entry (dict): The call of the manager, completed by the write.
+        journal (WriteJournal): The offline journal.
+        checked (dict): The context of the permission checks, see
+            checked_on_replica.
+        written (bool): Whether the write has been journaled.
+    """
+    def __init__(self, service, entry, journal, checked):
+        self.service = service
+        self.entry = entry
+        self.journal = journal
+        self.checked = checked
+        self.written = False
+
+    def __getattr__(self, name):
+        if name not in JOURNALED_WRITES:
+            return getattr(self.service, name)
+
+        def write(*args, **kwargs):
+            row_id = None
+            if name != "create":
+                row_id = kwargs.get("obj_id", args[0] if args else None)
+            read, expected = False, None
+            if row_id is not None:
+                read, expected = _replica_version(self.entry["table"],
+                                                  row_id)
+            self.journal.append({
+                **self.entry, "c_id": self.checked["auth"]["c_id"],
+                "write": name, "write_args": list(args),
+                "write_kwargs": kwargs, "row_id": row_id,
+                "expected": expected, "expected_read": read})
+            self.written = True
+        return write
+
+
+def journaled(method):
+    """Decorator of the write methods of the client, contract and event
+    managers: while the database is unreachable, the write is appended
+    to the offline journal when it's enabled. It must decorate the
+    permission, to check it again offline.
+
+    Args
+        method (Callable): Write method of a manager.
+
+    Returns
+        Callable: The wrapped method.
+
+    Raises
+        BaseManagerError: A warning, once the write is journaled.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except SQLAlchemyError as e:
+            settings = get_journal_settings()
+            if (_replaying.get() or not settings["enabled"]
+                    or not is_unreachable(e)):
+                raise
+
+        entry = {"resource": self.label, "table": self.label.lower(),
+                 "call": method.__name__, "args": list(args),
+                 "kwargs": kwargs, "recorded_at": datetime.now()}
+        journal = WriteJournal(settings["path"])
+        try:
+            with checked_on_replica() as checked:
+                service = _JournalingService(
+                    type(self.service)(REPLICA_UOW()), entry, journal,
+                    checked)
+                method(type(self)(service), *args, **kwargs)
+        except SQLAlchemyError:
+            # the replica misses a table or a row of the permissions
+            pass
+        if not service.written:
+            err = self.error_cls("Database unreachable, the write can't be "
+                                 "checked on the local replica")
+            err.tips = ("Run 'eecrm sync' while the database is reachable, "
+                        "the replica must have the rows you write offline.")
+            raise err
+
+        err = self.error_cls(f"Database unreachable, the {method.__name__} "
+                             f"of the {self.label.lower()} is journaled")
+        err.threat = "warning"
+        err.tips = ("The write is kept in the offline journal, run 'eecrm "
+                    "sync --push' once the database is reachable. It is "
+                    "only done if nobody changed the row meanwhile.")
+        raise err
+    return wrapper
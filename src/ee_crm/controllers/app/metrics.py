@@ -0,0 +1,41 @@
+"""The functions responsible for the latency metrics of the commands.
+The metrics are local to the machine, they don't read nor write the
+database.
+
+Functions
+    read_metrics    # Summaries of the recorded invocations.
+"""
+from time import time
+
+from ee_crm.adapters.metrics_store import MetricsStore
+from ee_crm.config import get_metrics_settings
+from ee_crm.controllers.utils import verify_positive_int
+from ee_crm.services.app.metrics import prometheus_text, \
+    summarize_metrics, write_textfile
+
+
+def read_metrics(hours=None, command=None, prometheus_path=None):
+    """Summarize the recorded invocations and optionally export them
+    as a Prometheus textfile (node-exporter textfile collector).
+
+    Args
+        hours (int|None): Only the last hours, the whole retention when
+            None or 0.
+        command (str|None): Only the commands starting with this name.
+        prometheus_path (str|None): Destination of the textfile.
+
+    Returns
+        tuple[MetricsSummaryDTO]: Summaries per command and role.
+
+    Raises
+        InputError: If hours isn't a positive integer.
+    """
+    hours = 0 if hours is None else verify_positive_int(hours)
+    since = time() - hours * 3600 if hours else None
+    settings = get_metrics_settings()
+    store = MetricsStore(settings["path"],
+                         retention=settings["retention_days"] * 86400)
+    summaries = summarize_metrics(store, since=since, command=command)
+    if prometheus_path is not None:
+        write_textfile(prometheus_path, prometheus_text(summaries))
+    return summaries
@@ -0,0 +1,294 @@
+"""Controller of the local replica, 'eecrm sync', and of the reads it
+serves offline.
+
+A collaborator replicates the tables of the resources their role can
+read (RBAC). The read permissions have no attribute based predicate
+(ABAC), a collaborator reading a resource reads all its rows, so the
+replica holds the whole tables; the credentials of the users are never
+replicated.
+
+The replica misses the writes committed since the last sync, it is only
+read while the database is unreachable, or when the user asks for it:
+the reads of the database see the writes of the user.
+
+The writes journaled while the database was unreachable (see
+ee_crm.controllers.app.journal) are replayed by 'eecrm sync --push', in
+a single transaction. A write is only replayed if its row hasn't changed
+since it was read in the replica, the others are reported as conflicts
+instead of overwriting the changes of other collaborators.
+
+Classes
+    ReplicaManager  # Start the sync and read the state of the replica.
+
+Functions
+    replica_reader  # Manager of a resource, reading the replica offline.
+"""
+from datetime import datetime
+from time import perf_counter
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ee_crm.adapters.database import is_unreachable
+from ee_crm.adapters.journal import WriteJournal
+from ee_crm.adapters.replica import REPLICATED_TABLES, row_version
+from ee_crm.config import get_journal_settings, get_replica_settings
+from ee_crm.controllers.app.client import ClientManager
+from ee_crm.controllers.app.contract import ContractManager
+from ee_crm.controllers.app.event import EventManager
+from ee_crm.controllers.app.journal import replaying, same_version
+from ee_crm.controllers.auth.permission import permission
+from ee_crm.controllers.auth.rbac import PERMS
+from ee_crm.controllers.default_uow import DEFAULT_UOW, REPLICA_ENGINE, \
+    REPLICA_UOW
+from ee_crm.domain.model import Role
+from ee_crm.exceptions import CRMException, ReplicaManagerError
+from ee_crm.services.app.replica import ReplicaService
+from ee_crm.services.dto import PushReportDTO
+from ee_crm.services.unit_of_work import DEFAULT_ENGINE, JoinedUnitOfWork
+
+# A replicated table is read by the permission '<table>:read'
+_READ_PERMISSIONS = tuple(f"{name}:read" for name in REPLICATED_TABLES)
+
+# Managers replaying the journaled writes, by resource
+_JOURNALED_MANAGERS = {manager.label: manager for manager
+                       in (ClientManager, ContractManager, EventManager)}
+
+
+def _unreachable(engine=None):
+    """Whether a connection to the database can't be opened, the
+    connection opened is given back to the pool of the engine."""
+    try:
+        with (engine or DEFAULT_ENGINE).connect():
+            return False
+    except SQLAlchemyError as e:
+        return is_unreachable(e)
+
+
+def replica_reader(manager_cls, max_age=None, service=None, offline=False,
+                   engine=None):
+    """Build the manager of a resource reading from the replica, when
+    the database can't be reached and the table has been synced less
+    than max_age seconds ago, or when offline is asked, whatever its
+    age. Otherwise, or if the replica can't be read, the manager reads
+    the database.
+
+    Args
+        manager_cls (type[BaseManager]): Manager of the resource.
+        max_age (float|None): Maximum age of the replica in seconds,
+            the configured one when None, 0 only reads the replica when
+            offline is asked.
+        service (ReplicaService|None): Service of the replica, the
+            default one when None.
+        offline (bool): Read the replica, even if the database is
+            reachable.
+        engine (sqlalchemy.engine.Engine|None): Engine of the database
+            checked, the default one when None.
+
+    Returns
+        tuple[BaseManager, ReplicaTableDTO|None]: The manager and the
+            state of the table read from the replica, None when the
+            manager reads the database.
+    """
+    if max_age is None:
+        max_age = get_replica_settings()["max_age"]
+    table = manager_cls.label.lower()
+    if table not in REPLICATED_TABLES or not (
+            offline or (max_age > 0 and _unreachable(engine))):
+        return manager_cls(), None
+
+    service = service or ReplicaService(None, REPLICA_ENGINE)
+    try:
+        states = service.status()
+    except SQLAlchemyError:
+        return manager_cls(), None
+    # the tables are synced together, the reads may join any of them
+    state = next((s for s in states if s.table == table), None)
+    now = datetime.now()
+    if state is None or (
+            not offline and
+            max(s.age(now) for s in states).total_seconds() > max_age):
+        return manager_cls(), None
+
+    resource_service = type(manager_cls._default_service)
+    return manager_cls(resource_service(REPLICA_UOW())), state
+
+
+class ReplicaManager:
+    """Controller for the local replica.
+
+    Attributes
+        label (str): (class attribute) Name of the resource.
+        error_cls (ReplicaManagerError): (class attribute) Exception
+            class raised when an error occurs.
+        service (ee_crm.services.app.replica.ReplicaService): The
+            service class to start operations with.
+        journal (WriteJournal): The offline journal.
+    """
+    label = "Replica"
+    error_cls = ReplicaManagerError
+
+    def __init__(self, service=None, journal=None):
+        self.service = service or ReplicaService(DEFAULT_UOW(),
+                                                 REPLICA_ENGINE)
+        self.journal = journal or WriteJournal(
+            get_journal_settings()["path"])
+
+    @permission(*_READ_PERMISSIONS)
+    def sync(self, full=False, chunk_size=5000, **kwargs):
+        """Pull the changes of the tables the user can read into the
+        replica.
+
+        Args
+            full (bool): Copy the tables in full.
+            chunk_size (int): Maximum number of rows per query.
+            **kwargs (dict): Keyword arguments to pass the context.
+
+        Returns
+            SyncReportDTO: Summary of the sync.
+        """
+        auth = kwargs['auth']
+        perms = PERMS[Role(auth['role']).name]
+        tables = [name for name, perm
+                  in zip(REPLICATED_TABLES, _READ_PERMISSIONS)
+                  if perm in perms]
+        return self.service.sync(tables, auth['c_id'], full=full,
+                                 overlap=get_replica_settings()["overlap"],
+                                 chunk_size=chunk_size)
+
+    @permission(*_READ_PERMISSIONS)
+    def status(self):
+        """Read the state of the tables of the replica.
+
+        Returns
+            tuple[ReplicaTableDTO]: The synced tables.
+        """
+        return self.service.status()
+
+    @permission(*_READ_PERMISSIONS)
+    def pending(self, **kwargs):
+        """Count the journaled writes of the user, not pushed yet.
+
+        Args
+            **kwargs (dict): Keyword arguments to pass the context.
+
+        Returns
+            int: Number of journaled writes.
+        """
+        c_id = kwargs['auth']['c_id']
+        return sum(entry.get("c_id") == c_id
+                   for entry in self.journal.read())
+
+    @permission(*_READ_PERMISSIONS)
+    def push(self, conflicts_path=None, **kwargs):
+        """Replay the writes the user journaled offline, in a single
+        transaction. Each write runs its manager method again, with its
+        permission and its validation, in a savepoint: a write whose
+        row changed or was deleted since it was journaled, or failing,
+        is a conflict and isn't done. The writes of a row following a
+        conflict are conflicts too, they build on it.
+
+        The replayed writes are removed from the journal, the conflicts
+        are appended to the conflicts report. The writes of other
+        collaborators stay in the journal.
+
+        Args
+            conflicts_path (str|None): Path of the conflicts report, the
+                configured one when None.
+            **kwargs (dict): Keyword arguments to pass the context.
+
+        Returns
+            PushReportDTO: Summary of the replay.
+
+        Raises
+            ReplicaManagerError: If the transaction fails or the
+                database is sharded, nothing is done and the journal is
+                kept.
+        """
+        if getattr(self.service.uow, "shard_map", None) is not None:
+            err = ReplicaManagerError("The offline journal isn't supported "
+                                      "on a sharded database")
+            err.tips = ("The replay checks the rows in a single database, "
+                        "the shards of DB_SHARDS aren't supported.")
+            raise err
+        start = perf_counter()
+        conflicts_path = (conflicts_path
+                          or get_journal_settings()["conflicts_path"])
+        c_id = kwargs['auth']['c_id']
+        entries = self.journal.read()
+        mine = [entry for entry in entries if entry.get("c_id") == c_id]
+        applied, conflicts = 0, []
+        verified, failed = set(), set()
+        uow = self.service.uow
+        try:
+            with replaying(), uow:
+                for entry in mine:
+                    key = (entry["table"], entry["row_id"])
+                    reason = None
+                    if key in failed:
+                        reason = "a previous write of the row failed"
+                    elif key not in verified and entry["row_id"] is not None:
+                        reason = self._check_version(uow, entry)
+                    if reason is None:
+                        reason = self._replay(uow, entry)
+                    if reason is None:
+                        applied += 1
+                        verified.add(key)
+                    else:
+                        conflicts.append({**entry, "reason": reason})
+                        if entry["row_id"] is not None:
+                            failed.add(key)
+                uow.commit()
+        except SQLAlchemyError as e:
+            err = self.error_cls(f"The journal can't be pushed: {e}")
+            err.tips = ("Nothing was written, the journal is kept, retry "
+                        "once the database is reachable.")
+            raise err from e
+
+        if conflicts:
+            report = WriteJournal(conflicts_path)
+            for conflict in conflicts:
+                report.append({k: v for k, v in conflict.items()
+                               if k != "id"})
+        self.journal.remove(entry["id"] for entry in mine)
+        return PushReportDTO(applied=applied, conflicts=tuple(conflicts),
+                             kept=len(entries) - len(mine),
+                             conflicts_path=(conflicts_path if conflicts
+                                             else None),
+                             seconds=perf_counter() - start)
+
+    @staticmethod
+    def _check_version(uow, entry):
+        """Reason of the conflict of a journaled write whose row changed
+        since it was read in the replica, None without conflict. A NULL
+        version is a version: the row is unchanged only if it is still
+        NULL. A write whose row wasn't read in the replica can't be
+        checked, it is a conflict."""
+        exists, version = row_version(
+            uow.session.connection(), REPLICATED_TABLES[entry["table"]],
+            entry["row_id"])
+        if not exists:
+            return "the row was deleted"
+        if not entry.get("expected_read"):
+            return "the row wasn't read in the replica"
+        if not same_version(entry["expected"], version):
+            return "the row was changed"
+        return None
+
+    @staticmethod
+    def _replay(uow, entry):
+        """Run a journaled write again in a savepoint of the transaction
+        of the unit of work, the reason of its failure or None."""
+        manager_cls = _JOURNALED_MANAGERS[entry["resource"]]
+        service_cls = type(manager_cls._default_service)
+        manager = manager_cls(service_cls(JoinedUnitOfWork(uow)))
+        savepoint = uow.session.begin_nested()
+        try:
+            getattr(manager, entry["call"])(*entry["args"],
+                                            **entry["kwargs"])
+        except (CRMException, SQLAlchemyError) as e:
+            if is_unreachable(e):
+                raise
+            savepoint.rollback()
+            return str(e).splitlines()[0]
+        savepoint.commit()
+        return None
@@ -0,0 +1,35 @@
+"""The functions responsible for the summary of the slow query log.
+The log is local to the machine, reading it doesn't touch the database.
+
+Functions
+    read_slow_queries   # Slow statements grouped by normalized form.
+"""
+from datetime import datetime, timedelta, timezone
+
+from ee_crm.adapters.slow_queries import read_slow_query_log
+from ee_crm.config import get_slow_query_settings
+from ee_crm.controllers.utils import verify_positive_int
+from ee_crm.services.app.slow_queries import group_slow_queries
+
+
+def read_slow_queries(hours=None, limit=None):
+    """Group the logged slow statements by normalized statement.
+
+    Args
+        hours (int|None): Only the last hours, the whole log when None
+            or 0.
+        limit (int|None): Only the groups of the slowest total duration.
+
+    Returns
+        tuple[SlowQueryDTO]: The groups, slowest total duration first.
+
+    Raises
+        InputError: If hours or limit isn't a positive integer.
+    """
+    hours = 0 if hours is None else verify_positive_int(hours)
+    limit = None if limit is None else verify_positive_int(limit)
+    since = (datetime.now(timezone.utc) - timedelta(hours=hours)
+             if hours else None)
+    entries = read_slow_query_log(get_slow_query_settings()["path"],
+                                  since=since)
+    return group_slow_queries(entries, limit=limit)
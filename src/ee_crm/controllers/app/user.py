@@ -60,6 +60,13 @@ class UserManager(BaseManager):
         """See BaseManager.read"""
         return super().read(pk=pk, filters=filters, sort=sort)
 
+    @override
+    @permission("user:read")
+    def browse(self, filters=None, sort=None, after=None, limit=50):
+        """See BaseManager.browse"""
+        return super().browse(filters=filters, sort=sort, after=after,
+                              limit=limit)
+
     @override
     def update(self, *args, **kwargs):
         """Raise an error if used, contract should be modified through
@@ -0,0 +1,35 @@
+"""The functions responsible for the calibration of the password
+hasher. The calibration only measures the local machine, it doesn't
+read nor write the database.
+
+Functions
+    calibrate_hash  # Measure the configured hasher and suggest one.
+"""
+from ee_crm.config import get_password_hasher_parameters
+from ee_crm.services.auth.hashing import calibrate, measure_hasher
+
+
+def calibrate_hash(target_ms, memory_cost=None, parallelism=None,
+                   samples=3):
+    """Measure the configured argon2 parameters and suggest new ones
+    for a target login latency.
+
+    Args
+        target_ms (int): Target duration of a hash, in milliseconds.
+        memory_cost (int|None): Memory of a hash in KiB, the configured
+            one when None.
+        parallelism (int|None): Number of lanes, the configured one
+            when None.
+        samples (int): Number of measured hashes per candidate.
+
+    Returns
+        tuple[HasherProfileDTO, HasherProfileDTO]: The configured and
+            the suggested parameters, with their latency.
+    """
+    current = get_password_hasher_parameters()
+    configured = measure_hasher(samples=samples, **current)
+    suggested = calibrate(target_ms / 1000,
+                          memory_cost or current["memory_cost"],
+                          parallelism or current["parallelism"],
+                          samples=samples)
+    return configured, suggested
@@ -5,19 +5,48 @@ executed. It checks for 'authentication', 'role-based access control'
 (RBAC) and 'attribute-based access control' (ABAC).
 
 Functions
-    permission  # combine auth, rbac and abac in one decorator.
+    permission          # combine auth, rbac and abac in one decorator.
+    checked_on_replica  # check the abac attributes on the local replica.
 """
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
 from inspect import signature, Parameter
 
 from ee_crm.controllers.auth.predicate import is_authenticated
 from ee_crm.controllers.auth.rbac import PERMS
-from ee_crm.controllers.default_uow import DEFAULT_UOW
+from ee_crm.controllers.default_uow import DEFAULT_ATTRIBUTE_CACHE, \
+    DEFAULT_UOW, REPLICA_UOW
 from ee_crm.domain.model import Role
 from ee_crm.exceptions import AuthorizationDenied
+from ee_crm.metrics import note_role
+from ee_crm.profiling import profile_span
 from ee_crm.services.auth.permissions import PermissionService
 
 
+# Set while the database is unreachable, see checked_on_replica
+_on_replica = ContextVar("abac_on_replica", default=None)
+
+
+@contextmanager
+def checked_on_replica():
+    """Context in which the attributes (ABAC) of the permissions are
+    read from the local replica, see 'eecrm sync', instead of the
+    database. Used while the database is unreachable, to journal the
+    writes, see ee_crm.controllers.app.journal.
+
+    Yields
+        dict: The context of the checks, its 'auth' is the JWT payload
+            of the user once authenticated.
+    """
+    checked = {}
+    token = _on_replica.set(checked)
+    try:
+        yield checked
+    finally:
+        _on_replica.reset(token)
+
+
 def _map_func_signature_and_value(func, *args, **kwargs):
     """This helper map the given args and kwargs to the signature of
     a function, in order to dynamically create a context dictionary
@@ -114,8 +143,10 @@ def permission(*rbac, abac=None, kw_auth=True):
     It follows the pattern:
         * (AUTH) Verify if user is authenticated.
         * (RBAC) Verify if the user's role allows it to perform action.
-        * (ABAC) Verify if resource based permissions are respected.
+        * (ABAC) Verify if resource based permissions are respected,
+          on the local replica in checked_on_replica.
         * if flag is raised, pass the JWT payload to the wrapped func.
+    The checks are recorded as a 'permission' span when profiling.
 
     Args
         *rbac (tuple[str]): The packed RBAC tags. If the user respect
@@ -134,44 +165,54 @@ def permission(*rbac, abac=None, kw_auth=True):
         @wraps(func)
         def wrapper(*args, **kwargs):
 
-            # AUTH
-            auth = is_authenticated()
-            ctx = {'auth': auth}
-
-            # RBAC
-            role_name = Role(auth['role']).name
-            any_perm = set(rbac).intersection(PERMS[role_name])
-            if not any_perm:
-                err = AuthorizationDenied(
-                    f'Permission error (RBAC) in {rbac}.')
-                err.tips = \
-                    (f"This command isn't available to your account, "
-                     f"you didn't have a Role with the necessary "
-                     f"permissions. This command is available to Roles "
-                     f"with the permissions : {rbac}")
-                raise err
-
-            # ABAC
-            if abac is not None:
-                ctx.update(
-                    _map_func_signature_and_value(func, *args, **kwargs))
-
-                # TODO: Ideally the uow should be opened deeper in the
-                #  service layer. The current design avoid to open
-                #  multiple uow. Need refactoring/rework.
-                with DEFAULT_UOW() as uow:
-                    service = PermissionService(uow)
-                    ctx["perm_service"] = service
-
-                    if not abac(ctx):
-                        err = AuthorizationDenied(
-                            f'Permission error (ABAC) in {abac}')
-                        err.tips = \
-                            (f"This command isn't available to your account, "
-                             f"you didn't satisfy at least one of the "
-                             f"following required authorizations : "
-                             f"{abac}")
-                        raise err
+            with profile_span("permission"):
+                # AUTH
+                auth = is_authenticated()
+                ctx = {'auth': auth}
+                on_replica = _on_replica.get()
+                if on_replica is not None:
+                    on_replica['auth'] = auth
+
+                # RBAC
+                role_name = Role(auth['role']).name
+                note_role(role_name)
+                any_perm = set(rbac).intersection(PERMS[role_name])
+                if not any_perm:
+                    err = AuthorizationDenied(
+                        f'Permission error (RBAC) in {rbac}.')
+                    err.tips = \
+                        (f"This command isn't available to your account, "
+                         f"you didn't have a Role with the necessary "
+                         f"permissions. This command is available to Roles "
+                         f"with the permissions : {rbac}")
+                    raise err
+
+                # ABAC
+                if abac is not None:
+                    ctx.update(
+                        _map_func_signature_and_value(func, *args, **kwargs))
+
+                    # TODO: Ideally the uow should be opened deeper in the
+                    #  service layer. The current design avoid to open
+                    #  multiple uow. Need refactoring/rework.
+                    if on_replica is not None:
+                        uow_factory, cache = REPLICA_UOW, None
+                    else:
+                        uow_factory = DEFAULT_UOW
+                        cache = DEFAULT_ATTRIBUTE_CACHE
+                    with uow_factory() as uow:
+                        service = PermissionService(uow, cache=cache)
+                        ctx["perm_service"] = service
+
+                        if not abac(ctx):
+                            err = AuthorizationDenied(
+                                f'Permission error (ABAC) in {abac}')
+                            err.tips = \
+                                (f"This command isn't available to your "
+                                 f"account, you didn't satisfy at least "
+                                 f"one of the following required "
+                                 f"authorizations : {abac}")
+                            raise err
 
             # if flag is raised and func accept **kwargs can pass payload
             if kw_auth and _accept_kwargs(func):
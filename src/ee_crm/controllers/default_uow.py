@@ -1,9 +1,52 @@
 """Settings for the unit_of_work used by controller layer.
 
 Constants
-    DEFAULT_UOW # Unit of work implementation
+    DEFAULT_ATTRIBUTE_CACHE # Access control attributes cache shared by
+                            # the processes, None when disabled
+    DEFAULT_ENTITY_CACHE    # Entity cache shared by the default units
+                            # of work, None when disabled
+    DEFAULT_QUERY_CACHE     # Query results cache shared by the default
+                            # units of work, None when disabled
+    DEFAULT_UOW             # Unit of work implementation, sharded
+                            # when shards are configured
+    REPLICA_ENGINE          # Engine of the local replica file
+    REPLICA_UOW             # Unit of work reading the local replica
 """
-from ee_crm.services.unit_of_work import SqlAlchemyUnitOfWork
+from functools import partial
 
+from sqlalchemy.orm import sessionmaker
 
-DEFAULT_UOW = SqlAlchemyUnitOfWork
+from ee_crm.adapters.attribute_cache import SharedAttributeCache
+from ee_crm.adapters.cache import EntityCache, QueryCache
+from ee_crm.adapters.replica import create_replica_engine
+from ee_crm.config import get_attribute_cache_settings, \
+    get_entity_cache_settings, get_query_cache_size, get_replica_settings
+from ee_crm.services.unit_of_work import DEFAULT_SHARD_MAP, \
+    ShardedUnitOfWork, SqlAlchemyUnitOfWork
+
+
+_cache_settings = get_entity_cache_settings()
+DEFAULT_ENTITY_CACHE = (EntityCache(**_cache_settings)
+                        if _cache_settings["max_size"] > 0 else None)
+
+_query_cache_size = get_query_cache_size()
+DEFAULT_QUERY_CACHE = (QueryCache(max_size=_query_cache_size)
+                       if _query_cache_size > 0 else None)
+
+DEFAULT_UOW = partial(SqlAlchemyUnitOfWork, cache=DEFAULT_ENTITY_CACHE,
+                      query_cache=DEFAULT_QUERY_CACHE)
+
+_attribute_cache_settings = get_attribute_cache_settings()
+DEFAULT_ATTRIBUTE_CACHE = (SharedAttributeCache(**_attribute_cache_settings)
+                           if _attribute_cache_settings["ttl"] > 0 else None)
+
+# The caches stamped with the versions of the tables need one database
+if DEFAULT_SHARD_MAP is not None:
+    DEFAULT_UOW = partial(ShardedUnitOfWork, DEFAULT_SHARD_MAP,
+                          cache=DEFAULT_ENTITY_CACHE)
+    DEFAULT_ATTRIBUTE_CACHE = None
+
+# The replica has its own entities, the caches of the database aren't used
+REPLICA_ENGINE = create_replica_engine(get_replica_settings()["path"])
+REPLICA_UOW = partial(SqlAlchemyUnitOfWork,
+                      session_factory=sessionmaker(bind=REPLICA_ENGINE))
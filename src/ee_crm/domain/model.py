@@ -12,16 +12,22 @@ Each entity implements:
 * Validation at construction through a 'builder()' factory method.
 * Pure domain methods.
 * Private attributes to avoid careless manipulation of data.
+* Batch validation of columns through 'validate_batch()', the rows it
+  accepts are built by 'from_valid()' without being validated again.
 
 Errors are raised up as DomainError subclasses.
+
+Passwords are hashed and verified by a single argon2 hasher,
+PASSWORD_HASHER, configured from the environment.
 """
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import IntEnum
 from math import trunc
 
 from argon2 import PasswordHasher, exceptions
 
+from ee_crm.config import get_password_hasher_parameters
 from ee_crm.domain.validators import (
     AuthUserValidator as AuthVal,
     CollaboratorValidator as ColVal,
@@ -32,6 +38,32 @@ from ee_crm.domain.validators import (
 from ee_crm.exceptions import AuthUserDomainError, CollaboratorDomainError, \
     ClientDomainError, ContractDomainError, EventDomainError
 
+PASSWORD_HASHER = PasswordHasher(**get_password_hasher_parameters())
+
+
+def _utc_now():
+    """Current UTC time, without offset as the stored times."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _batch_missing(columns, field, error_factory):
+    """Batch counterpart of the builders mandatory link check.
+
+    Args:
+        columns (dict[str, Sequence]): Values of each field.
+        field (str): The mandatory field.
+        error_factory (Callable): Returns the error of a missing link.
+
+    Returns:
+        dict[int, DomainError]: Errors keyed by row index.
+    """
+    size = max((len(values) for values in columns.values()), default=0)
+    values = columns.get(field, (None,) * size)
+    if all(values):
+        return {}
+    return {row: error_factory()
+            for row, value in enumerate(values) if not value}
+
 
 @dataclass(kw_only=True)
 class AuthUser:
@@ -82,8 +114,7 @@ class AuthUser:
         Returns:
             str: hashed password.
         """
-        ph = PasswordHasher()
-        return ph.hash(plain_password)
+        return PASSWORD_HASHER.hash(plain_password)
 
     @staticmethod
     def filterable_fields():
@@ -117,9 +148,8 @@ class AuthUser:
             AuthUserDomainError: Raised if user's password does not
                 match
         """
-        ph = PasswordHasher()
         try:
-            ph.verify(self._password, plain_password)
+            PASSWORD_HASHER.verify(self._password, plain_password)
         except exceptions.VerifyMismatchError:
             err = AuthUserDomainError("Password mismatch")
             err.tips = ("The provided password doesn't match with the password"
@@ -127,6 +157,29 @@ class AuthUser:
                         "and try again.")
             raise err
 
+    def password_needs_rehash(self):
+        """Check if the stored hash was made with other parameters than
+        the ones of the configured hasher.
+
+        Returns:
+            bool: True if the password should be hashed again, False
+                for an up-to-date or an unreadable hash.
+        """
+        try:
+            return PASSWORD_HASHER.check_needs_rehash(self._password)
+        except exceptions.InvalidHashError:
+            return False
+
+    def rehash_password(self, plain_password):
+        """Hash again an already verified password with the configured
+        hasher. The password policy isn't applied, the password is the
+        current one of the user.
+
+        Args:
+            plain_password (str): Verified plain-text password.
+        """
+        self._password = self.hash_plain_password(plain_password)
+
     @classmethod
     def builder(cls, username, plain_password):
         """Method to safely build a new instance of AuthUser.
@@ -226,6 +279,16 @@ class Collaborator:
     _private_aliases = {"user_id": "_user_id",
                         "role": "_role_id"}
 
+    # Validators used by the builder, built once
+    _val_map = {
+        "last_name": ColVal.validate_str,
+        "first_name": ColVal.validate_str,
+        "email": ColVal.validate_email,
+        "phone_number": ColVal.validate_phone_number,
+        "role": ColVal.validate_role,
+        "user_id": ColVal.validate_positive_int
+    }
+
     @property
     def user_id(self):
         """ID of Collaborator's AuthUser, public property.
@@ -307,34 +370,57 @@ class Collaborator:
                         'database, critical error, contact support.')
             raise err
 
+        ColVal.validate_positive_int(user_id)
+        data = cls.validate_profile(last_name=last_name,
+                                    first_name=first_name,
+                                    email=email,
+                                    phone_number=phone_number,
+                                    role=role)
+
+        return cls(last_name=data["last_name"],
+                   first_name=data["first_name"],
+                   email=data["email"],
+                   phone_number=data["phone_number"],
+                   _role_id=data["role"],
+                   _user_id=user_id)
+
+    @classmethod
+    def validate_profile(cls, *,
+                         last_name=None,
+                         first_name=None,
+                         email=None,
+                         phone_number=None,
+                         role=Role.DEACTIVATED):
+        """Validate the fields of a collaborator that isn't linked to a
+        user yet. Used by the builder and by the bulk provisioning,
+        where users are created in the same batch as their
+        collaborators.
+
+        Args:
+            last_name (str): Collaborator's last name.
+            first_name (str): Collaborator's first name.
+            email (str): Collaborator's email address.
+            phone_number (str): Collaborator's phone number.
+            role (Role): Collaborator's role.
+
+        Returns:
+            dict: The validated fields, role converted to a Role.
+
+        Raises:
+            CollaboratorValidatorError: If any validation fails.
+        """
         data = {
             "last_name": last_name,
             "first_name": first_name,
             "email": email,
             "phone_number": phone_number,
             "role": Role.sanitizer(role),
-            "user_id": user_id
-        }
-
-        val_map = {
-            "last_name": ColVal.validate_str,
-            "first_name": ColVal.validate_str,
-            "email": ColVal.validate_email,
-            "phone_number": ColVal.validate_phone_number,
-            "role": ColVal.validate_role,
-            "user_id": ColVal.validate_positive_int
         }
 
         for k, v in data.items():
             if v is not None:
-                val_map[k](v)
-
-        return cls(last_name=data["last_name"],
-                   first_name=data["first_name"],
-                   email=data["email"],
-                   phone_number=data["phone_number"],
-                   _role_id=data["role"],
-                   _user_id=data["user_id"])
+                cls._val_map[k](v)
+        return data
 
 
 @dataclass(kw_only=True)
@@ -358,8 +444,8 @@ class Client:
     email: str | None = None
     phone_number: str | None = None
     company: str | None = None
-    _created_at: datetime = datetime.now()
-    _updated_at: datetime = datetime.now()
+    _created_at: datetime = field(default_factory=_utc_now)
+    _updated_at: datetime = field(default_factory=_utc_now)
     _salesman_id: int | None = None
 
     # Hacky way to link public properties to private properties
@@ -367,6 +453,24 @@ class Client:
                         "updated_at": "_updated_at",
                         "salesman_id": "_salesman_id", }
 
+    # Validators used by the builder and validate_batch, built once
+    _val_map = {
+        "last_name": CliVal.validate_str,
+        "first_name": CliVal.validate_str,
+        "email": CliVal.validate_email,
+        "phone_number": CliVal.validate_phone_number,
+        "company": CliVal.validate_str,
+        "salesman_id": CliVal.validate_positive_int
+    }
+    _batch_map = {
+        "last_name": CliVal.batch_str,
+        "first_name": CliVal.batch_str,
+        "email": CliVal.batch_email,
+        "phone_number": CliVal.batch_phone_number,
+        "company": CliVal.batch_str,
+        "salesman_id": CliVal.batch_positive_int
+    }
+
     @property
     def created_at(self):
         """Creation timestamp public property.
@@ -395,18 +499,6 @@ class Client:
         """
         return self._salesman_id
 
-    def __setattr__(self, name, value):
-        """Change 'Modification timestamp' whenever an attribute is set.
-        Except for self._updated_at to avoid recursion.
-
-        Args:
-            name (str): Attribute name.
-            value (Any): Attribute value.
-        """
-        super().__setattr__(name, value)
-        if name != "_updated_at":
-            super().__setattr__("_updated_at", datetime.now())
-
     @staticmethod
     def updatable_fields():
         """Set of keywords to get the accepted public updatable fields.
@@ -426,6 +518,35 @@ class Client:
         return {'id', "last_name", "first_name", "email", "phone_number",
                 "company", "created_at", "updated_at", "salesman_id"}
 
+    @staticmethod
+    def _missing_salesman_error():
+        """Error of a client built without salesman.
+
+        Returns:
+            ClientDomainError: The error, not raised.
+        """
+        err = ClientDomainError("Client must have a linked salesman")
+        err.tips = ("The given salesman_id isn't linked to a collaborator "
+                    "with the SALES role.")
+        return err
+
+    @classmethod
+    def validate_batch(cls, columns):
+        """Batch counterpart of the builder validation. Check columns
+        of values without building entities nor raising.
+
+        Args:
+            columns (dict[str, Sequence]): Values of each builder
+                argument, one value per row.
+
+        Returns:
+            tuple[list[bool], list[list[DomainError]|None]]: The error
+                mask and the errors of every row.
+        """
+        missing = _batch_missing(columns, "salesman_id",
+                                 cls._missing_salesman_error)
+        return CliVal.validate_batch(columns, cls._batch_map, (missing,))
+
     @classmethod
     def builder(cls, *,
                 last_name=None,
@@ -452,10 +573,7 @@ class Client:
             ClientValidatorError: If any validation fails.
         """
         if not salesman_id:
-            err = ClientDomainError("Client must have a linked salesman")
-            err.tips = ("The given salesman_id isn't linked to a collaborator "
-                        "with the SALES role.")
-            raise err
+            raise cls._missing_salesman_error()
 
         data = {
             "last_name": last_name,
@@ -466,25 +584,38 @@ class Client:
             "salesman_id": salesman_id
         }
 
-        val_map = {
-            "last_name": CliVal.validate_str,
-            "first_name": CliVal.validate_str,
-            "email": CliVal.validate_email,
-            "phone_number": CliVal.validate_phone_number,
-            "company": CliVal.validate_str,
-            "salesman_id": CliVal.validate_positive_int
-        }
-
         for k, v in data.items():
             if v is not None:
-                val_map[k](v)
+                cls._val_map[k](v)
 
-        return cls(last_name=data["last_name"],
-                   first_name=data["first_name"],
-                   email=data["email"],
-                   phone_number=data["phone_number"],
-                   company=data["company"],
-                   _salesman_id=data["salesman_id"])
+        return cls.from_valid(**data)
+
+    @classmethod
+    def from_valid(cls, *,
+                   last_name=None,
+                   first_name=None,
+                   email=None,
+                   phone_number=None,
+                   company=None,
+                   salesman_id=None):
+        """Build a new instance of Client from values already checked
+        by the builder or validate_batch, they aren't validated again.
+        Its creation and modification timestamps share a single stamp.
+
+        For the arguments, refer to Client.builder().
+
+        Returns:
+            Client: New Client instance.
+        """
+        now = _utc_now()
+        return cls(last_name=last_name,
+                   first_name=first_name,
+                   email=email,
+                   phone_number=phone_number,
+                   company=company,
+                   _created_at=now,
+                   _updated_at=now,
+                   _salesman_id=salesman_id)
 
 
 @dataclass(kw_only=True)
@@ -497,22 +628,35 @@ class Contract:
         _total_amount (float): Total amount of the contract.
         _paid_amount (float): Paid amount of the contract.
         created_at (datetime): Creation timestamp.
+        _updated_at (datetime): Modification timestamp.
         _signed (bool): True if contract is signed.
         _client_id (int): ID of Client who is linked to this contract.
     """
     id: int | None = field(init=False, default=None)
     _total_amount: float | None = 0.00
     _paid_amount: float | None = 0.00
-    created_at: datetime = datetime.now()
+    created_at: datetime = field(default_factory=_utc_now)
+    _updated_at: datetime = field(default_factory=_utc_now)
     _signed: bool | None = False
     _client_id: int | None = None
 
     # Hacky way to link public properties to private properties
     _private_aliases = {"total_amount": "_total_amount",
                         "paid_amount": "_paid_amount",
+                        "updated_at": "_updated_at",
                         "signed": "_signed",
                         "client_id": "_client_id"}
 
+    # Validators used by the builder and validate_batch, built once
+    _val_map = {
+        "total_amount": ConVal.validate_price,
+        "client_id": ConVal.validate_positive_int
+    }
+    _batch_map = {
+        "total_amount": ConVal.batch_price,
+        "client_id": ConVal.batch_positive_int
+    }
+
     @property
     def total_amount(self):
         """Total amount of the contract, public property.
@@ -561,6 +705,15 @@ class Contract:
         """
         return self._client_id
 
+    @property
+    def updated_at(self):
+        """Modification timestamp public property.
+
+        Returns:
+            datetime: Modification timestamp.
+        """
+        return self._updated_at
+
     def sign(self):
         """Sign contract."""
         self._signed = True
@@ -652,6 +805,35 @@ class Contract:
         return {"id", "total_amount", "paid_amount", "created_at", "signed",
                 "client_id"}
 
+    @staticmethod
+    def _missing_client_error():
+        """Error of a contract built without client.
+
+        Returns:
+            ContractDomainError: The error, not raised.
+        """
+        err = ContractDomainError("Contract must have a linked client")
+        err.tips = ("The given client_id isn't linked to a client in the "
+                    "database, verify your input and try again.")
+        return err
+
+    @classmethod
+    def validate_batch(cls, columns):
+        """Batch counterpart of the builder validation. Check columns
+        of values without building entities nor raising.
+
+        Args:
+            columns (dict[str, Sequence]): Values of each builder
+                argument, one value per row.
+
+        Returns:
+            tuple[list[bool], list[list[DomainError]|None]]: The error
+                mask and the errors of every row.
+        """
+        missing = _batch_missing(columns, "client_id",
+                                 cls._missing_client_error)
+        return ConVal.validate_batch(columns, cls._batch_map, (missing,))
+
     @classmethod
     def builder(cls, total_amount=None, client_id=None):
         """Method to safely build a new instance of Contract.
@@ -669,32 +851,41 @@ class Contract:
             ContractValidatorError: If any validation fails.
         """
         if not client_id:
-            err = ContractDomainError("Contract must have a linked client")
-            err.tips = ("The given client_id isn't linked to a client in the "
-                        "database, verify your input and try again.")
-            raise err
+            raise cls._missing_client_error()
 
         data = {
             "total_amount": total_amount,
             "client_id": client_id
         }
 
-        val_map = {
-            "total_amount": ConVal.validate_price,
-            "client_id": ConVal.validate_positive_int
-        }
-
         for k, v in data.items():
             if v is not None:
-                val_map[k](v)
+                cls._val_map[k](v)
+
+        return cls.from_valid(**data)
 
+    @classmethod
+    def from_valid(cls, total_amount=None, client_id=None):
+        """Build a new instance of Contract from values already checked
+        by the builder or validate_batch, they aren't validated again.
+        Its creation and modification timestamps share a single stamp.
+        Normalize total amount, trunc price to the 2nd digit.
+
+        For the arguments, refer to Contract.builder().
+
+        Returns:
+            Contract: New Contract instance.
+        """
         if total_amount is not None:
-            data["total_amount"] = trunc(total_amount * 100) / 100
+            total_amount = trunc(total_amount * 100) / 100
         else:
-            data["total_amount"] = 0
+            total_amount = 0
 
-        return cls(_total_amount=data["total_amount"],
-                   _client_id=data["client_id"])
+        now = _utc_now()
+        return cls(_total_amount=total_amount,
+                   _client_id=client_id,
+                   created_at=now,
+                   _updated_at=now)
 
 
 @dataclass(kw_only=True)
@@ -711,6 +902,7 @@ class Event:
         notes (str): Notes about the event, limited at 9999 characters.
         supporter_id (int): ID of Collaborator who is the supporter of
             the event.
+        _updated_at (datetime): Modification timestamp.
         _contract_id (int): Contract ID of the event.
     """
     id: int | None = field(init=False, default=None)
@@ -721,10 +913,32 @@ class Event:
     attendee: int | None = None
     notes: str | None = None
     supporter_id: int | None = None
+    _updated_at: datetime = field(default_factory=_utc_now)
     _contract_id: int | None = None
 
     # Hacky way to link public properties to private properties
-    _private_aliases = {"contract_id": "_contract_id"}
+    _private_aliases = {"updated_at": "_updated_at",
+                        "contract_id": "_contract_id"}
+
+    # Validators used by the builder and validate_batch, built once
+    _val_map = {
+        "title": EveVal.validate_str,
+        "start_time": EveVal.validate_date,
+        "end_time": EveVal.validate_date,
+        "location": EveVal.validate_str,
+        "attendee": EveVal.validate_positive_int,
+        "notes": EveVal.validate_notes,
+        "contract_id": EveVal.validate_positive_int,
+    }
+    _batch_map = {
+        "title": EveVal.batch_str,
+        "start_time": EveVal.batch_date,
+        "end_time": EveVal.batch_date,
+        "location": EveVal.batch_str,
+        "attendee": EveVal.batch_positive_int,
+        "notes": EveVal.batch_notes,
+        "contract_id": EveVal.batch_positive_int,
+    }
 
     @property
     def contract_id(self):
@@ -735,6 +949,24 @@ class Event:
         """
         return self._contract_id
 
+    @property
+    def updated_at(self):
+        """Modification timestamp public property.
+
+        Returns:
+            datetime: Modification timestamp.
+        """
+        return self._updated_at
+
+    def validate_dates_order(self):
+        """Check that the event, once modified, doesn't end before it
+        starts.
+
+        Raises:
+            EventValidatorError: if the end precedes the start.
+        """
+        EveVal.validate_dates_order(self.start_time, self.end_time)
+
     @staticmethod
     def updatable_fields():
         """Set of keywords to get the accepted public updatable fields.
@@ -755,6 +987,38 @@ class Event:
         return {"id", "title", "start_time", "end_time", "location",
                 "attendee", "notes", "supporter_id", "contract_id"}
 
+    @staticmethod
+    def _missing_contract_error():
+        """Error of an event built without contract.
+
+        Returns:
+            EventDomainError: The error, not raised.
+        """
+        err = EventDomainError("Contract must have a linked client")
+        err.tips = ("The given contract_id isn't linked to a contract in "
+                    "the database, verify your input and try again.")
+        return err
+
+    @classmethod
+    def validate_batch(cls, columns):
+        """Batch counterpart of the builder validation. Check columns
+        of values without building entities nor raising.
+
+        Args:
+            columns (dict[str, Sequence]): Values of each builder
+                argument, one value per row.
+
+        Returns:
+            tuple[list[bool], list[list[DomainError]|None]]: The error
+                mask and the errors of every row.
+        """
+        failures = [_batch_missing(columns, "contract_id",
+                                   cls._missing_contract_error)]
+        if "start_time" in columns and "end_time" in columns:
+            failures.append(EveVal.batch_dates_order(columns["start_time"],
+                                                     columns["end_time"]))
+        return EveVal.validate_batch(columns, cls._batch_map, failures)
+
     @classmethod
     def builder(cls,
                 title=None,
@@ -784,10 +1048,7 @@ class Event:
             EventValidatorError: If any validation fails.
         """
         if not contract_id:
-            err = EventDomainError("Contract must have a linked client")
-            err.tips = ("The given contract_id isn't linked to a contract in "
-                        "the database, verify your input and try again.")
-            raise err
+            raise cls._missing_contract_error()
 
         data = {
             "title": title,
@@ -799,24 +1060,34 @@ class Event:
             "contract_id": contract_id
         }
 
-        val_map = {
-            "title": EveVal.validate_str,
-            "start_time": EveVal.validate_date,
-            "end_time": EveVal.validate_date,
-            "location": EveVal.validate_str,
-            "attendee": EveVal.validate_positive_int,
-            "notes": EveVal.validate_notes,
-            "contract_id": EveVal.validate_positive_int,
-        }
-
         for k, v in data.items():
             if v is not None:
-                val_map[k](v)
-
-        return cls(title=data["title"],
-                   start_time=data["start_time"],
-                   end_time=data["end_time"],
-                   location=data["location"],
-                   attendee=data["attendee"],
-                   notes=data["notes"],
-                   _contract_id=data["contract_id"])
+                cls._val_map[k](v)
+        EveVal.validate_dates_order(start_time, end_time)
+
+        return cls.from_valid(**data)
+
+    @classmethod
+    def from_valid(cls,
+                   title=None,
+                   start_time=None,
+                   end_time=None,
+                   location=None,
+                   attendee=None,
+                   notes=None,
+                   contract_id=None):
+        """Build a new instance of Event from values already checked by
+        the builder or validate_batch, they aren't validated again.
+
+        For the arguments, refer to Event.builder().
+
+        Returns:
+            Event: New Event instance.
+        """
+        return cls(title=title,
+                   start_time=start_time,
+                   end_time=end_time,
+                   location=location,
+                   attendee=attendee,
+                   notes=notes,
+                   _contract_id=contract_id)
@@ -10,14 +10,50 @@ Classes
 
 Each validator sets a 'cls_error' to its own 'NameValidatorError'
 subclass. Errors are raised as ValidatorError subclasses.
+
+The 'validate_x' checks of the imported columns have a 'batch_x'
+counterpart working on a whole column of values. A column is first
+checked as a whole with builtins running in C (type set, min/max, map
+of the compiled regex).
+Only when this fast path fails, the column is scanned row by row and
+the failing rows go through the raising validator to build their
+error, so the messages and tips are the same in both APIs.
+'validate_batch' combines the batch checks of several columns into an
+error mask and the list of errors of every row, nothing is raised.
 """
 from abc import ABC
 from datetime import datetime
-from re import search, match
+from functools import partial
+from itertools import compress, count, repeat
+from operator import gt, is_, is_not, lt, or_
+from re import compile as regex_compile, search
 
 from ee_crm.exceptions import AuthUserValidatorError, \
     CollaboratorValidatorError, ContractValidatorError, ClientValidatorError, \
-    EventValidatorError
+    EventValidatorError, ValidatorError
+
+# Compiled once, shared by validate_email and batch_email.
+EMAIL_REGEX = regex_compile(r'^[^@]+@[^@]+$')
+
+_is_not_none = partial(is_not, None)
+
+
+def _present(values):
+    """Values of a column that aren't None, and their types.
+
+    Args:
+        values (Sequence): A column of values.
+
+    Returns:
+        tuple[Sequence, set[type]]: The values without None, and the
+            set of their exact types. Subclasses (ex: bool for int)
+            are reported as other types and left to the slow path.
+    """
+    types = set(map(type, values))
+    if type(None) in types:
+        types.discard(type(None))
+        values = list(filter(_is_not_none, values))
+    return values, types
 
 
 class BaseValidator(ABC):
@@ -93,8 +129,7 @@ class BaseValidator(ABC):
         """
         cls.validate_str(email)
 
-        regex = r'^[^@]+@[^@]+$'
-        if not match(regex, email):
+        if not EMAIL_REGEX.match(email):
             err = "Email format invalid"
             tips = (f'The provided email "{email}" isn\'t valid. it must at '
                     f'least contains a sign "@".')
@@ -138,6 +173,152 @@ class BaseValidator(ABC):
             tips = f"The pk \"{k_id}\" isn't valid."
             cls._raise(err, tips)
 
+    @staticmethod
+    def _scan(validator, values, predicate):
+        """Slow path of the batch checks. Find the rows matching a
+        predicate, then run the raising validator on them to keep the
+        errors.
+
+        Args:
+            validator (Callable): Single value validator.
+            values (Sequence): The column of values.
+            predicate (Callable[[Any], bool]): True for a value that
+                the validator rejects.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        return BaseValidator._failures(
+            validator, values,
+            (row for row, value in enumerate(values)
+             if value is not None and predicate(value)))
+
+    @staticmethod
+    def _failures(validator, values, rows):
+        """Run the raising validator on some rows of a column to keep
+        their errors.
+
+        Args:
+            validator (Callable): Single value validator.
+            values (Sequence): The column of values.
+            rows (Iterable[int]): Index of the rows to validate.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        failures = {}
+        for row in rows:
+            try:
+                validator(values[row])
+            except ValidatorError as e:
+                failures[row] = e
+        return failures
+
+    @classmethod
+    def batch_str(cls, values, length=255):
+        """Batch counterpart of validate_str, None values are skipped.
+
+        Args:
+            values (Sequence): Column of strings to check.
+            length (int): Maximum length of a string.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        present, types = _present(values)
+        if types <= {str} and max(map(len, present), default=0) <= length:
+            return {}
+        return cls._scan(cls.validate_str, values,
+                         lambda v: not isinstance(v, str) or len(v) > length)
+
+    @classmethod
+    def batch_email(cls, values):
+        """Batch counterpart of validate_email, None values are skipped.
+
+        Args:
+            values (Sequence): Column of emails to check.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        present, types = _present(values)
+        if types <= {str} and len(present) == len(values):
+            # only strings, the failing rows are found in C in one pass
+            unmatched = map(is_, map(EMAIL_REGEX.match, values), repeat(None))
+            too_long = map(gt, map(len, values), repeat(255))
+            rows = list(compress(count(), map(or_, unmatched, too_long)))
+            return cls._failures(cls.validate_email, values, rows)
+        if (types <= {str} and max(map(len, present), default=0) <= 255
+                and all(map(EMAIL_REGEX.match, present))):
+            return {}
+        return cls._scan(cls.validate_email, values,
+                         lambda v: (not isinstance(v, str) or len(v) > 255
+                                    or EMAIL_REGEX.match(v) is None))
+
+    @classmethod
+    def batch_phone_number(cls, values):
+        """Batch counterpart of validate_phone_number, None values are
+        skipped.
+
+        Args:
+            values (Sequence): Column of phone numbers to check.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        present, types = _present(values)
+        if types <= {str} and max(map(len, present), default=0) <= 20:
+            return {}
+        return cls._scan(cls.validate_phone_number, values,
+                         lambda v: not isinstance(v, str) or len(v) > 20)
+
+    @classmethod
+    def batch_positive_int(cls, values):
+        """Batch counterpart of validate_positive_int, None values are
+        skipped.
+
+        Args:
+            values (Sequence): Column of keys to check.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        present, types = _present(values)
+        if types <= {int} and min(present, default=1) > 0:
+            return {}
+        return cls._scan(cls.validate_positive_int, values,
+                         lambda v: not isinstance(v, int) or v <= 0)
+
+    @staticmethod
+    def validate_batch(columns, rules, failures=()):
+        """Check whole columns at once without raising.
+
+        Args:
+            columns (dict[str, Sequence]): Values of each field, every
+                column has one value per row.
+            rules (dict[str, Callable]): mapping between field and
+                batch check, fields without rule are ignored.
+            failures (Iterable[dict[int, CRMException]]): Additional
+                errors keyed by row index, computed by the caller.
+
+        Returns:
+            tuple[list[bool], list[list[CRMException]|None]]: The error
+                mask, True for invalid rows, and the errors of every
+                row, None for valid rows.
+        """
+        size = max((len(values) for values in columns.values()), default=0)
+        mask = [False] * size
+        errors = [None] * size
+        checked = [rules[field](values) for field, values in columns.items()
+                   if field in rules]
+        for column_failures in (*checked, *failures):
+            for row, error in column_failures.items():
+                if errors[row] is None:
+                    mask[row] = True
+                    errors[row] = []
+                errors[row].append(error)
+        return mask, errors
+
 
 class AuthUserValidator(BaseValidator):
     """Class for AuthUser Validators.
@@ -267,6 +448,22 @@ class ContractValidator(BaseValidator):
                     f"positive number.")
             cls._raise(err, tips)
 
+    @classmethod
+    def batch_price(cls, values):
+        """Batch counterpart of validate_price, None values are skipped.
+
+        Args:
+            values (Sequence): Column of prices to check.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        present, types = _present(values)
+        if types <= {float, int} and min(present, default=0) >= 0:
+            return {}
+        return cls._scan(cls.validate_price, values,
+                         lambda v: not isinstance(v, (float, int)) or v < 0)
+
 
 class EventValidator(BaseValidator):
     """Class for Event Validators.
@@ -296,6 +493,27 @@ class EventValidator(BaseValidator):
                     f'"YYYY-MM-DD HH:MM:SS".')
             cls._raise(err, tips)
 
+    @classmethod
+    def validate_dates_order(cls, start_time, end_time):
+        """Check that an event doesn't end before it starts.
+
+        Args:
+            start_time (datetime|None): Start of the event.
+            end_time (datetime|None): End of the event.
+
+        Raises:
+            EventValidatorError: if both dates are given and the end
+                precedes the start.
+        """
+        if not (isinstance(start_time, datetime) and
+                isinstance(end_time, datetime)):
+            return
+        if end_time < start_time:
+            err = "Invalid dates, the event ends before it starts"
+            tips = (f'The end time "{end_time}" is before the start time '
+                    f'"{start_time}". Verify the dates and try again.')
+            cls._raise(err, tips)
+
     @classmethod
     def validate_attendee(cls, attendee):
         """Check if attendee respect several conditions.
@@ -332,3 +550,61 @@ class EventValidator(BaseValidator):
             tips = ("The added notes are too long, it mustn't exceed 9999 "
                     "characters. Notes : \"{notes}\".")
             cls._raise(err, tips)
+
+    @classmethod
+    def batch_date(cls, values):
+        """Batch counterpart of validate_date, None values are skipped.
+
+        Args:
+            values (Sequence): Column of dates to check.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        _, types = _present(values)
+        if types <= {datetime}:
+            return {}
+        return cls._scan(cls.validate_date, values,
+                         lambda v: not isinstance(v, datetime))
+
+    @classmethod
+    def batch_dates_order(cls, start_times, end_times):
+        """Batch counterpart of validate_dates_order.
+
+        Args:
+            start_times (Sequence): Column of start times.
+            end_times (Sequence): Column of end times.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        if (set(map(type, start_times)) == set(map(type, end_times))
+                == {datetime} and not any(map(lt, end_times, start_times))):
+            return {}
+        rows = range(len(start_times))
+        if set(map(type, start_times)) == set(map(type, end_times)) \
+                == {datetime}:
+            rows = compress(count(), map(lt, end_times, start_times))
+        failures = {}
+        for row in rows:
+            try:
+                cls.validate_dates_order(start_times[row], end_times[row])
+            except ValidatorError as e:
+                failures[row] = e
+        return failures
+
+    @classmethod
+    def batch_notes(cls, values):
+        """Batch counterpart of validate_notes, None values are skipped.
+
+        Args:
+            values (Sequence): Column of notes to check.
+
+        Returns:
+            dict[int, ValidatorError]: Errors keyed by row index.
+        """
+        present, types = _present(values)
+        if types <= {str} and max(map(len, present), default=0) < 9999:
+            return {}
+        return cls._scan(cls.validate_notes, values,
+                         lambda v: not isinstance(v, str) or len(v) >= 9999)
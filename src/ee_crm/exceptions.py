@@ -30,7 +30,10 @@ CRMException
 │   ├── CollaboratorServiceError
 │   ├── ContractServiceError
 │   ├── EventServiceError
-│   └── UserServiceError
+│   ├── UserServiceError
+│   ├── ExportServiceError
+│   ├── ImportServiceError
+│   └── ReplicaServiceError
 └── ControllerError
     ├── InputError
     ├── AuthorizationDenied
@@ -39,7 +42,10 @@ CRMException
         ├── CollaboratorManagerError
         ├── ContractManagerError
         ├── EventManagerError
-        └── UserManagerError
+        ├── UserManagerError
+        ├── ExportManagerError
+        ├── ImportManagerError
+        └── ReplicaManagerError
 """
 
 
@@ -171,6 +177,21 @@ class UserServiceError(ServiceError):
     pass
 
 
+class ExportServiceError(ServiceError):
+    """Service exception for the export service errors."""
+    pass
+
+
+class ImportServiceError(ServiceError):
+    """Service exception for the import service errors."""
+    pass
+
+
+class ReplicaServiceError(ServiceError):
+    """Service exception for the replica service errors."""
+    pass
+
+
 class ControllerError(CRMException):
     """Base exception for the controller errors."""
     level = "controller"
@@ -215,3 +236,18 @@ class EventManagerError(BaseManagerError):
 class UserManagerError(BaseManagerError):
     """Controller exception for the user manager errors."""
     pass
+
+
+class ExportManagerError(BaseManagerError):
+    """Controller exception for the export manager errors."""
+    pass
+
+
+class ImportManagerError(BaseManagerError):
+    """Controller exception for the import manager errors."""
+    pass
+
+
+class ReplicaManagerError(BaseManagerError):
+    """Controller exception for the replica manager errors."""
+    pass
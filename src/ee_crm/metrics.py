@@ -0,0 +1,82 @@
+"""Recording of the latency metrics of each invocation of the CLI.
+
+The entrypoint starts a recorder before running a command and finishes
+it with the command name and its outcome. The recorder counts the SQL
+statements through the engine events, the permission decorator gives
+it the role of the user. The measures are added to the histograms of
+ee_crm.adapters.metrics_store, read by 'eecrm metrics'.
+
+Recording never fails a command: an unwritable state file is ignored.
+
+Functions
+    start_invocation    # Start the recorder of the current command.
+    note_role           # Give the role of the user to the recorder.
+    finish_invocation   # Store the measures of the current command.
+"""
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ee_crm.adapters.metrics_store import MetricsStore
+from ee_crm.config import get_metrics_settings
+
+_invocation = None
+
+
+class _Invocation:
+    """Measures of the running command."""
+    def __init__(self):
+        self.start = perf_counter()
+        self.role = "-"
+        self.sql_count = 0
+
+    def count_statement(self, *args):
+        self.sql_count += 1
+
+
+def start_invocation():
+    """Start recording the current command, when the metrics are
+    enabled."""
+    global _invocation
+    if get_metrics_settings()["retention_days"] <= 0:
+        return
+    _invocation = _Invocation()
+    event.listen(Engine, "before_cursor_execute",
+                 _invocation.count_statement)
+
+
+def note_role(role):
+    """Give the role of the authenticated user to the recorder.
+
+    Args:
+        role (str): Name of the role, e.g. "SALES".
+    """
+    if _invocation is not None:
+        _invocation.role = role
+
+
+def finish_invocation(command, outcome, store=None):
+    """Stop recording and store the measures of the command.
+
+    Args:
+        command (str): Name of the command, e.g. "client read".
+        outcome (str): "ok", "error" or "crash".
+        store (MetricsStore|None): Destination, the configured store
+            when None.
+    """
+    global _invocation
+    invocation, _invocation = _invocation, None
+    if invocation is None:
+        return
+    seconds = perf_counter() - invocation.start
+    event.remove(Engine, "before_cursor_execute", invocation.count_statement)
+    if store is None:
+        settings = get_metrics_settings()
+        store = MetricsStore(settings["path"],
+                             retention=settings["retention_days"] * 86400)
+    try:
+        store.record(command or "-", invocation.role, outcome, seconds,
+                     invocation.sql_count)
+    except OSError:
+        pass
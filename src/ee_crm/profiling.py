@@ -0,0 +1,231 @@
+"""Per-invocation profiler of the layers of the application.
+
+The profiler is off by default, the instrumented functions then only
+check a global. Once started ('eecrm --profile'), it measures:
+    * the spans of the layers: permission checks, manager methods,
+      service methods and table rendering;
+    * every SQL statement, through the engine events;
+    * the peak of the memory allocated by Python (tracemalloc).
+
+Spans nest, each layer reports its inclusive time and its self time
+(minus the nested spans), so the self times add up to the total. A
+span reentering its own layer (a manager method calling another one) is
+merged with the running span. The memory tracing slows the allocations
+down, the timings are meant to be compared between runs, not taken as
+absolute.
+
+Classes
+    Profiler            # Record the spans and statements of a run.
+
+Functions
+    profiled            # Decorator recording a span of a layer.
+    profile_span        # Context manager recording a span of a layer.
+    profile_methods     # Decorate the public methods of a class.
+    start_profiling     # Start the global profiler.
+    stop_profiling      # Stop the global profiler, return its report.
+"""
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from inspect import isfunction
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_profiler = None
+
+
+class Profiler:
+    """Record the spans of the layers and the SQL statements of a run.
+
+    Attributes:
+        layers (dict[str, list]): layer -> [calls, seconds, self seconds].
+        statements (dict[str, list]): SQL -> [executions, seconds].
+    """
+    def __init__(self, clock=perf_counter):
+        self._clock = clock
+        self._stack = []
+        self._started = None
+        self.seconds = 0.0
+        self.memory_peak = 0
+        self.layers = {}
+        self.statements = {}
+
+    def enter(self, layer):
+        """Open a span.
+
+        Args:
+            layer (str): Name of the layer.
+
+        Returns:
+            bool: False when the span is merged with a running span of
+                the same layer, 'leave' must not be called.
+        """
+        if self._stack and self._stack[-1][0] == layer:
+            return False
+        self._stack.append([layer, self._clock(), 0.0])
+        return True
+
+    def leave(self):
+        """Close the last opened span.
+
+        Returns:
+            float: Inclusive duration of the span, in seconds.
+        """
+        layer, start, children = self._stack.pop()
+        elapsed = self._clock() - start
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        record = self.layers.setdefault(layer, [0, 0.0, 0.0])
+        record[0] += 1
+        record[1] += elapsed
+        record[2] += elapsed - children
+        return elapsed
+
+    def _before_execute(self, conn, cursor, statement, *args):
+        self._stack.append(["sql", self._clock(), 0.0])
+
+    def _after_execute(self, conn, cursor, statement, *args):
+        if not self._stack or self._stack[-1][0] != "sql":
+            return
+        elapsed = self.leave()
+        record = self.statements.setdefault(statement, [0, 0.0])
+        record[0] += 1
+        record[1] += elapsed
+
+    def _on_error(self, exception_context):
+        if self._stack and self._stack[-1][0] == "sql":
+            self.leave()
+
+    def start(self):
+        """Start the memory tracing, the clock and the SQL listeners."""
+        event.listen(Engine, "before_cursor_execute", self._before_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_execute)
+        event.listen(Engine, "handle_error", self._on_error)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._started = self._clock()
+
+    def stop(self):
+        """Stop the recording, the spans left open are closed."""
+        while self._stack:
+            self.leave()
+        self.seconds = self._clock() - self._started
+        self.memory_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        event.remove(Engine, "before_cursor_execute", self._before_execute)
+        event.remove(Engine, "after_cursor_execute", self._after_execute)
+        event.remove(Engine, "handle_error", self._on_error)
+
+    def report(self, top=5):
+        """Summary of the run, serializable as JSON.
+
+        Args:
+            top (int): Number of the slowest statements to report.
+
+        Returns:
+            dict: total seconds, memory peak (bytes), layers (calls,
+                seconds, self_seconds), unattributed self time (other)
+                and the statements count, time and slowest ones.
+        """
+        layers = {name: {"calls": calls, "seconds": seconds,
+                         "self_seconds": self_seconds}
+                  for name, (calls, seconds, self_seconds)
+                  in self.layers.items()}
+        attributed = sum(layer["self_seconds"] for layer in layers.values())
+        slowest = sorted(self.statements.items(), key=lambda item: -item[1][1])
+        return {
+            "seconds": self.seconds,
+            "memory_peak_bytes": self.memory_peak,
+            "layers": layers,
+            "other_seconds": max(self.seconds - attributed, 0.0),
+            "sql": {
+                "statements": sum(c for c, _ in self.statements.values()),
+                "distinct": len(self.statements),
+                "seconds": sum(s for _, s in self.statements.values()),
+                "slowest": [{"statement": " ".join(statement.split()),
+                             "executions": count, "seconds": seconds}
+                            for statement, (count, seconds)
+                            in slowest[:top]],
+            },
+        }
+
+
+def start_profiling():
+    """Start a global profiler, recording until 'stop_profiling'.
+
+    Returns:
+        Profiler: The started profiler.
+    """
+    global _profiler
+    _profiler = Profiler()
+    _profiler.start()
+    return _profiler
+
+
+def stop_profiling():
+    """Stop the global profiler.
+
+    Returns:
+        dict|None: The report of the profiler, None if not started.
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    profiler.stop()
+    return profiler.report()
+
+
+@contextmanager
+def profile_span(layer):
+    """Record the enclosed block as a span of a layer, when profiling.
+
+    Args:
+        layer (str): Name of the layer.
+    """
+    profiler = _profiler
+    if profiler is None or not profiler.enter(layer):
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.leave()
+
+
+def profiled(layer):
+    """Decorator recording the calls of a function as spans of a layer.
+
+    Args:
+        layer (str): Name of the layer.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return func(*args, **kwargs)
+            with profile_span(layer):
+                return func(*args, **kwargs)
+        wrapper.__profiled__ = layer
+        return wrapper
+    return decorator
+
+
+def profile_methods(cls, layer):
+    """Decorate the public functions defined in a class body.
+
+    Args:
+        cls (type): The class.
+        layer (str): Name of the layer.
+    """
+    for name, value in list(vars(cls).items()):
+        if (name.startswith("_") or not isfunction(value)
+                or hasattr(value, "__profiled__")):
+            continue
+        setattr(cls, name, profiled(layer)(value))
@@ -1,8 +1,16 @@
 """Service class for basic implementation of CRUD methods.
 
+The listings (retrieve_all, filter) go through the query cache of the
+unit of work when it has one, see ee_crm.adapters.cache.QueryCache.
+The pages of a browsing (page) are never cached. The read-only methods
+(retrieve, retrieve_all, filter, page) may be served by a read replica,
+see ee_crm.adapters.routing.
+
 Classes
     BaseService # Basic implementation of CRUD methods.
 """
+from ee_crm.adapters.routing import read_only
+from ee_crm.profiling import profile_methods
 
 
 class BaseService:
@@ -22,6 +30,12 @@ class BaseService:
         self.error_cls = error_cls
         self.repo_attr = repo_attr
 
+    def __init_subclass__(cls, **kwargs):
+        """Profile the public methods of the services, see
+        ee_crm.profiling."""
+        super().__init_subclass__(**kwargs)
+        profile_methods(cls, "service")
+
     @property
     def _repo(self):
         """Property to get the specific repository name.
@@ -32,6 +46,60 @@ class BaseService:
         """
         return getattr(self.uow, self.repo_attr)
 
+    def _cached_query(self, scope, model_classes, query):
+        """Helper to serve a listing from the query cache of the unit
+        of work, the unit of work must be open.
+
+        Args
+            scope (tuple): The query name and its normalized arguments.
+            model_classes (Iterable[type]): Models read by the query.
+            query (Callable[[], tuple]): Computes the tuple of DTOs.
+
+        Returns
+            tuple: The result of the query.
+        """
+        cache = getattr(self.uow, "query_cache", None)
+        key = (self.model_cls.__name__, *scope)
+        try:
+            hash(key)
+        except TypeError:
+            cache = None
+        if cache is None:
+            return query()
+        return cache.get_or_query(self.uow.session, key, model_classes,
+                                  query)
+
+    @staticmethod
+    def _normalize_sort(sort):
+        """Helper that turns a sort iterable into a hashable tuple.
+
+        Args
+            sort (Iterable(Tuple(str, bool))|None): Sorting criteria.
+
+        Returns
+            tuple|None: The sorting criteria.
+        """
+        return None if sort is None else tuple(tuple(s) for s in sort)
+
+    def _keyset(self, obj, sort):
+        """Helper that reads the keyset cursor of an entity, the values
+        of its sorted fields then its primary key, as expected by the
+        page method of the repositories.
+
+        Args
+            obj (Any): Domain entity.
+            sort (tuple(Tuple(str, bool))|None): Sorting criteria.
+
+        Returns
+            tuple: The cursor.
+        """
+        aliases = getattr(self.model_cls, "_private_aliases", {})
+        fields = [field for field, _ in sort or ()]
+        if "id" not in fields:
+            fields.append("id")
+        return tuple(getattr(obj, aliases.get(field, field))
+                     for field in fields)
+
     def create(self, **obj_value):
         """Create and persist a new entity.
 
@@ -50,6 +118,7 @@ class BaseService:
             self.uow.commit()
             return (self.dto_cls.from_domain(obj),)
 
+    @read_only
     def retrieve(self, obj_id):
         """Retrieve an entity by primary key.
 
@@ -74,6 +143,7 @@ class BaseService:
                 raise err
             return (self.dto_cls.from_domain(obj),)
 
+    @read_only
     def retrieve_all(self, sort=None):
         """Retrieve all entities of the resource.
 
@@ -89,11 +159,13 @@ class BaseService:
             error_cls: if the sort iterable is not properly formated,
                 a class specific exception is raised.
         """
+        sort = self._normalize_sort(sort)
         with self.uow:
             try:
-                list_obj = [self.dto_cls.from_domain(obj)
-                            for obj in self._repo.list(sort=sort)]
-                return tuple(list_obj)
+                return self._cached_query(
+                    ("list", sort), (self.model_cls,),
+                    lambda: tuple([self.dto_cls.from_domain(obj)
+                                   for obj in self._repo.list(sort=sort)]))
             except AttributeError:
                 err = self.error_cls(f'wrong sort key in '
                                      f'{[key for key, _ in sort]}')
@@ -133,8 +205,18 @@ class BaseService:
             for k, v in kwargs.items():
                 if v is not None and k in self.model_cls.updatable_fields():
                     setattr(obj, k, v)
+            self._validate_modified(obj)
             self.uow.commit()
 
+    def _validate_modified(self, obj):
+        """Check the rules spanning several fields of a modified entity,
+        before it is committed. Nothing to check by default.
+
+        Args
+            obj (Any): The modified entity.
+        """
+
+    @read_only
     def filter(self, sort=None, **kwargs):
         """Retrieve entities matching the given criteria.
 
@@ -160,6 +242,62 @@ class BaseService:
                         "the provided filters are valid. "
                         "Verify input and try again")
             raise err
+        sort = self._normalize_sort(sort)
         with self.uow:
-            objs = self._repo.filter(sort=sort, **filters)
-            return tuple([self.dto_cls.from_domain(obj) for obj in objs])
+            return self._cached_query(
+                ("filter", tuple(sorted(filters.items())), sort),
+                (self.model_cls,),
+                lambda: tuple([self.dto_cls.from_domain(obj) for obj
+                               in self._repo.filter(sort=sort, **filters)]))
+
+    @read_only
+    def page(self, sort=None, after=None, limit=50, **kwargs):
+        """Retrieve a page of the entities matching the given criteria,
+        after a keyset cursor. One more entity than the limit is read to
+        know whether a next page exists.
+
+        Args
+            sort (Iterable(Tuple(str, bool)): An iterable to apply an
+                optional sorting to the queries made to the persistence
+                layer.
+            after (tuple|None): Cursor returned with the previous page,
+                None for the first page.
+            limit (int): Maximum number of entities in the page.
+            **kwargs (Any): Keyword arguments used to filter entities,
+                may be empty.
+
+        Returns
+            Tuple[Tuple[dto_cls], tuple|None]: The DTOs of the page and
+                the cursor of the next page, None if it is the last.
+
+        Raises
+            error_cls: if the sort iterable is not properly formated or
+                if none of the given filters are valid for the resource.
+        """
+        filters = {k: v for k, v in kwargs.items()
+                   if k in self.model_cls.filterable_fields()}
+        if kwargs and filters == {}:
+            err = self.error_cls(f'No valid filters for '
+                                 f'{self.model_cls.__name__} in {kwargs}')
+            err.tips = ("There was an error in the filtering methods, none of "
+                        "the provided filters are valid. "
+                        "Verify input and try again")
+            raise err
+        sort = self._normalize_sort(sort)
+        with self.uow:
+            try:
+                objs = self._repo.page(sort=sort, after=after,
+                                       limit=limit + 1, **filters)
+            except AttributeError:
+                err = self.error_cls(f'wrong sort key in '
+                                     f'{[key for key, _ in sort]}')
+                err.tips = ("There was an error in the sorting methods, one of"
+                            "the key isn't valid. Verify input and try again")
+                raise err
+            cursor = self._keyset(objs[limit - 1], sort) \
+                if len(objs) > limit else None
+            return (tuple([self.dto_cls.from_domain(obj)
+                           for obj in objs[:limit]]), cursor)
+
+
+profile_methods(BaseService, "service")
@@ -66,7 +66,6 @@ class CollaboratorService(BaseService):
                 err.tips = (f"The username {username} is taken, select a "
                             f"different one and try again.")
                 raise err
-            AuthUser.builder(username, plain_password)
             user = AuthUser.builder(username, plain_password)
             self.uow.users.add(user)
 
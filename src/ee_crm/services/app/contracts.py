@@ -3,7 +3,8 @@
 Classes
     ContractService # Business operations for contracts.
 """
-from ee_crm.domain.model import Contract, Role
+from ee_crm.adapters.routing import read_only
+from ee_crm.domain.model import Client, Contract, Event, Role
 from ee_crm.exceptions import ContractServiceError
 from ee_crm.services.app.base import BaseService
 from ee_crm.services.dto import ContractDTO
@@ -111,6 +112,7 @@ class ContractService(BaseService):
             contract.register_payment(amount)
             self.uow.commit()
 
+    @read_only
     def retrieve_collaborator_contracts(self,
                                         collaborator_id,
                                         only_unpaid=False,
@@ -138,7 +140,9 @@ class ContractService(BaseService):
         """
         filters = {k: v for k, v in kwargs.items()
                    if k in self.model_cls.filterable_fields()}
-        with self.uow:
+        sort = self._normalize_sort(sort)
+
+        def query():
             contracts = self._repo.get_contracts_collaborator(
                 collaborator_id,
                 only_unpaid=only_unpaid,
@@ -146,3 +150,9 @@ class ContractService(BaseService):
                 only_no_event=only_no_event,
                 sort=sort, **filters)
             return tuple([self.dto_cls.from_domain(c) for c in contracts])
+
+        with self.uow:
+            return self._cached_query(
+                ("collaborator", collaborator_id, only_unpaid, only_unsigned,
+                 only_no_event, tuple(sorted(filters.items())), sort),
+                (Contract, Client, Event), query)
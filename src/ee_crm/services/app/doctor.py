@@ -0,0 +1,357 @@
+"""Service functions of 'eecrm doctor', the checks explaining why the
+application is slow on a machine. Every check returns a DiagnosticDTO
+whose status is "ok", "warn" (a probable cause of slowness), "fail"
+(the check couldn't run) or "skip" (not available here).
+
+The database checks need a SQLAlchemy connection, the PostgreSQL
+specific ones (bloat, pg_stat_statements) are skipped on other
+databases.
+
+Functions
+    run_check                   # Run a check, turn its error in "fail".
+    check_connection            # Connection setup time.
+    check_round_trip            # Latency of a trivial statement.
+    check_server                # Server version and settings.
+    check_foreign_key_indexes   # Foreign keys without index.
+    check_bloat                 # Dead rows and sparse indexes.
+    check_top_statements        # Top entries of pg_stat_statements.
+    check_token_store           # Health of the token file.
+    check_password_verify       # Latency of an argon2 verification.
+"""
+import json
+import os
+import stat
+from statistics import median
+from time import perf_counter, time
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from ee_crm.exceptions import TokenError
+from ee_crm.services.auth.hashing import measure_verify
+from ee_crm.services.auth.jwt_handler import token_expirations
+from ee_crm.services.dto import DiagnosticDTO
+
+CONNECT_WARN_MS = 100
+ROUND_TRIP_WARN_MS = 5
+DEAD_ROWS_WARN_RATIO = 0.2
+DEAD_ROWS_WARN_MIN = 1000
+LEAF_DENSITY_WARN = 50
+LEAF_DENSITY_MIN_BYTES = 1 << 20
+VERIFY_WARN_MS = 500
+
+_PG_SETTINGS = ("max_connections", "shared_buffers", "work_mem",
+                "effective_cache_size", "random_page_cost",
+                "synchronous_commit", "ssl", "statement_timeout",
+                "track_io_timing", "jit")
+_SQLITE_PRAGMAS = ("journal_mode", "synchronous", "cache_size",
+                   "page_size")
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def run_check(name, check, *args, **kwargs):
+    """Run a check, a database or file error gives a "fail" result.
+
+    Args
+        name (str): Name of the check, for its failure.
+        check (callable): The check function.
+        *args: Positional arguments of the check.
+        **kwargs: Keyword arguments of the check.
+
+    Returns
+        DiagnosticDTO: Result of the check.
+    """
+    try:
+        return check(*args, **kwargs)
+    except (SQLAlchemyError, OSError) as e:
+        return DiagnosticDTO(name, "fail", f"{type(e).__name__}: "
+                             f"{str(e).splitlines()[0]}")
+
+
+def check_connection(engine, samples=5):
+    """Open and close connections, with a pool-less engine every one
+    includes the network, TLS and authentication handshakes.
+
+    Args
+        engine (sqlalchemy.engine.Engine): The engine, NullPool.
+        samples (int): Number of measured connections.
+
+    Returns
+        DiagnosticDTO: Median and maximum setup time.
+    """
+    durations = []
+    for _ in range(samples):
+        start = perf_counter()
+        engine.connect().close()
+        durations.append(perf_counter() - start)
+    details = {"median_ms": _ms(median(durations)),
+               "max_ms": _ms(max(durations)), "samples": samples}
+    status = "warn" if details["median_ms"] > CONNECT_WARN_MS else "ok"
+    return DiagnosticDTO("connection", status,
+                         f"setup {details['median_ms']:.1f} ms (median), "
+                         f"{details['max_ms']:.1f} ms (max)", details)
+
+
+def check_round_trip(conn, samples=20):
+    """Execute a trivial statement, its duration is the network and
+    driver overhead paid by every statement.
+
+    Args
+        conn (sqlalchemy.engine.Connection): Open connection.
+        samples (int): Number of measured statements.
+
+    Returns
+        DiagnosticDTO: Median and maximum round-trip.
+    """
+    durations = []
+    for _ in range(samples):
+        start = perf_counter()
+        conn.exec_driver_sql("SELECT 1").scalar()
+        durations.append(perf_counter() - start)
+    details = {"median_ms": _ms(median(durations)),
+               "max_ms": _ms(max(durations)), "samples": samples}
+    status = "warn" if details["median_ms"] > ROUND_TRIP_WARN_MS else "ok"
+    return DiagnosticDTO("round-trip", status,
+                         f"{details['median_ms']:.2f} ms (median), "
+                         f"{details['max_ms']:.2f} ms (max)", details)
+
+
+def check_server(conn):
+    """Read the version of the server and the settings that weigh on
+    the latency.
+
+    Args
+        conn (sqlalchemy.engine.Connection): Open connection.
+
+    Returns
+        DiagnosticDTO: Version and settings.
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        version = conn.execute(text("SHOW server_version")).scalar()
+        rows = conn.execute(
+            text("SELECT name, current_setting(name) FROM pg_settings "
+                 "WHERE name IN :names").bindparams(
+                bindparam("names", expanding=True)),
+            {"names": list(_PG_SETTINGS)})
+        settings = dict(rows.all())
+        label = f"PostgreSQL {version}"
+    elif dialect == "sqlite":
+        version = conn.exec_driver_sql("SELECT sqlite_version()").scalar()
+        settings = {pragma: conn.exec_driver_sql(
+            f"PRAGMA {pragma}").scalar() for pragma in _SQLITE_PRAGMAS}
+        label = f"SQLite {version}"
+    else:
+        version = ".".join(map(str, conn.dialect.server_version_info or ()))
+        settings = {}
+        label = f"{dialect} {version}"
+    return DiagnosticDTO("server", "ok", label,
+                         {"dialect": dialect, "version": version,
+                          "settings": settings})
+
+
+def check_foreign_key_indexes(conn, metadata):
+    """Find the foreign keys of the mapped tables that are not the
+    leading column of an index, a primary key or a unique constraint:
+    their joins and filters (e.g. the contracts of a salesman) scan the
+    whole table.
+
+    Args
+        conn (sqlalchemy.engine.Connection): Open connection.
+        metadata (sqlalchemy.MetaData): Tables used by the repositories.
+
+    Returns
+        DiagnosticDTO: The unindexed columns and the statements
+            creating their index.
+    """
+    inspector = inspect(conn)
+    missing, statements = [], []
+    for table in metadata.sorted_tables:
+        columns = sorted({fk.parent.name for fk in table.foreign_keys})
+        if not columns:
+            continue
+        # the inspection doesn't translate the schemas (SQLite)
+        name, schema = table.name, conn.schema_for_object(table)
+        leading = set(inspector.get_pk_constraint(
+            name, schema=schema)["constrained_columns"][:1])
+        for index in (inspector.get_indexes(name, schema=schema) +
+                      inspector.get_unique_constraints(name, schema=schema)):
+            leading.update(index["column_names"][:1])
+        qualified = f"{schema}.{name}" if schema else name
+        for column in columns:
+            if column not in leading:
+                missing.append(f"{qualified}.{column}")
+                statements.append(f"CREATE INDEX ix_{name}_{column} "
+                                  f"ON {qualified} ({column});")
+    if not missing:
+        return DiagnosticDTO("foreign-key-indexes", "ok",
+                             "every foreign key is indexed")
+    return DiagnosticDTO("foreign-key-indexes", "warn",
+                         f"{len(missing)} foreign keys without index: "
+                         f"{', '.join(missing)}",
+                         {"missing": missing, "suggested": statements})
+
+
+def _has_extension(conn, name):
+    return conn.execute(text("SELECT 1 FROM pg_extension "
+                             "WHERE extname = :name"),
+                        {"name": name}).first() is not None
+
+
+def check_bloat(conn, schemas):
+    """Estimate the bloat of the tables from their dead rows, and of
+    the B-tree indexes from their leaf density when the pgstattuple
+    extension is installed.
+
+    Args
+        conn (sqlalchemy.engine.Connection): Open connection.
+        schemas (Iterable[str]): Schemas of the application tables.
+
+    Returns
+        DiagnosticDTO: The bloated tables and indexes.
+    """
+    if conn.dialect.name != "postgresql":
+        return DiagnosticDTO("bloat", "skip", "PostgreSQL only")
+    params = {"schemas": list(schemas)}
+    tables = [dict(row._mapping) for row in conn.execute(text(
+        "SELECT schemaname || '.' || relname AS name, n_live_tup AS live, "
+        "n_dead_tup AS dead, pg_total_relation_size(relid) AS bytes, "
+        "greatest(last_vacuum, last_autovacuum) AS last_vacuum "
+        "FROM pg_stat_user_tables WHERE schemaname IN :schemas "
+        "ORDER BY n_dead_tup DESC").bindparams(
+        bindparam("schemas", expanding=True)), params)]
+    bloated = [t["name"] for t in tables
+               if t["dead"] >= DEAD_ROWS_WARN_MIN
+               and t["dead"] > DEAD_ROWS_WARN_RATIO * (t["live"] + t["dead"])]
+    details = {"tables": tables}
+
+    if _has_extension(conn, "pgstattuple"):
+        indexes = [dict(row._mapping) for row in conn.execute(text(
+            "SELECT i.schemaname || '.' || i.indexrelname AS name, "
+            "i.idx_scan AS scans, pg_relation_size(i.indexrelid) AS bytes, "
+            "s.avg_leaf_density AS leaf_density "
+            "FROM pg_stat_user_indexes i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "JOIN pg_am a ON a.oid = c.relam AND a.amname = 'btree' "
+            "CROSS JOIN LATERAL pgstatindex(i.indexrelid::regclass) s "
+            "WHERE i.schemaname IN :schemas").bindparams(
+            bindparam("schemas", expanding=True)), params)]
+        bloated += [i["name"] for i in indexes
+                    if i["bytes"] >= LEAF_DENSITY_MIN_BYTES
+                    and i["leaf_density"] < LEAF_DENSITY_WARN]
+        details["indexes"] = indexes
+    else:
+        details["indexes"] = "pgstattuple not installed"
+
+    details["bloated"] = bloated
+    if bloated:
+        return DiagnosticDTO("bloat", "warn",
+                             f"VACUUM or REINDEX: {', '.join(bloated)}",
+                             details)
+    return DiagnosticDTO("bloat", "ok", f"{len(tables)} tables, no bloat",
+                         details)
+
+
+def check_top_statements(conn, limit=5):
+    """Read the statements of the database with the highest total
+    execution time from pg_stat_statements.
+
+    Args
+        conn (sqlalchemy.engine.Connection): Open connection.
+        limit (int): Number of statements.
+
+    Returns
+        DiagnosticDTO: The top statements, skipped when the extension
+            isn't installed.
+    """
+    if conn.dialect.name != "postgresql":
+        return DiagnosticDTO("pg-stat-statements", "skip", "PostgreSQL only")
+    if not _has_extension(conn, "pg_stat_statements"):
+        return DiagnosticDTO("pg-stat-statements", "skip",
+                             "extension not installed in this database")
+    version = int(conn.execute(text("SHOW server_version_num")).scalar())
+    total, mean = (("total_exec_time", "mean_exec_time")
+                   if version >= 130000 else ("total_time", "mean_time"))
+    rows = conn.execute(text(
+        f"SELECT query, calls, {total} AS total_ms, {mean} AS mean_ms, "
+        f"rows FROM pg_stat_statements WHERE dbid = (SELECT oid FROM "
+        f"pg_database WHERE datname = current_database()) "
+        f"ORDER BY {total} DESC LIMIT :limit"), {"limit": limit})
+    top = [{**row._mapping, "query": " ".join(row.query.split())}
+           for row in rows]
+    if not top:
+        return DiagnosticDTO("pg-stat-statements", "ok",
+                             "no statement recorded")
+    return DiagnosticDTO("pg-stat-statements", "ok",
+                         f"top statement {top[0]['total_ms']:.0f} ms in "
+                         f"{top[0]['calls']} calls: "
+                         f"{top[0]['query'][:60]}", {"top": top})
+
+
+def check_token_store(path):
+    """Check the file of the session tokens: permissions, content and
+    expiration.
+
+    Args
+        path (str): Path of the token store.
+
+    Returns
+        DiagnosticDTO: Health of the file.
+    """
+    if not os.path.exists(path):
+        return DiagnosticDTO("token-store", "ok", "no session stored",
+                             {"path": path})
+    info = os.stat(path)
+    details = {"path": path, "bytes": info.st_size,
+               "mode": oct(stat.S_IMODE(info.st_mode))}
+    try:
+        with open(path, encoding="utf-8") as f:
+            expirations = token_expirations(json.load(f))
+    except ValueError:
+        return DiagnosticDTO("token-store", "fail",
+                             "unreadable JSON, log in again", details)
+    except TokenError:
+        return DiagnosticDTO("token-store", "fail",
+                             "invalid signature (SECRET_KEY changed?), log "
+                             "in again", details)
+    now = time()
+    for name, expiration in expirations.items():
+        details[f"{name}-expires-in"] = (None if expiration is None
+                                         else round(expiration - now))
+    problems = []
+    if info.st_mode & 0o077:
+        problems.append("readable by other users, chmod 600")
+    refresh = details["refresh-token-expires-in"]
+    if refresh is None or refresh <= 0:
+        problems.append("session expired, log in again")
+    if problems:
+        return DiagnosticDTO("token-store", "warn", ", ".join(problems),
+                             details)
+    return DiagnosticDTO("token-store", "ok",
+                         f"session valid for {refresh} s", details)
+
+
+def check_password_verify(time_cost, memory_cost, parallelism, samples=3):
+    """Measure the argon2 verification done by every login.
+
+    Args
+        time_cost (int): Configured number of iterations.
+        memory_cost (int): Configured memory of a hash, in KiB.
+        parallelism (int): Configured number of lanes.
+        samples (int): Number of measured verifications.
+
+    Returns
+        DiagnosticDTO: Median duration of a verification.
+    """
+    profile = measure_verify(time_cost, memory_cost, parallelism, samples)
+    details = {"median_ms": _ms(profile.seconds), "time_cost": time_cost,
+               "memory_cost": memory_cost, "parallelism": parallelism}
+    summary = f"{profile.milliseconds:.0f} ms per login"
+    if profile.milliseconds > VERIFY_WARN_MS:
+        return DiagnosticDTO("argon2-verify", "warn",
+                             f"{summary}, see 'eecrm admin calibrate-hash'",
+                             details)
+    return DiagnosticDTO("argon2-verify", "ok", summary, details)
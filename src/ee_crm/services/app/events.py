@@ -24,6 +24,18 @@ class EventService(BaseService):
             "events"
         )
 
+    def _validate_modified(self, obj):
+        """Check that the modified event doesn't end before it starts,
+        the new dates against the kept ones.
+
+        Args
+            obj (Event): The modified event.
+
+        Raises
+            EventValidatorError: If the end precedes the start.
+        """
+        obj.validate_dates_order()
+
     def create(self, contract_id=None, **kwargs):
         """Create an event for an existing signed contract.
 
@@ -0,0 +1,145 @@
+"""Service layer responsible for the bulk export of resources.
+
+Exports skip the domain model and the DTOs, rows are streamed from the
+tables straight into a gzip file. PostgreSQL uses 'COPY ... TO STDOUT',
+any other database falls back on a chunked keyset SELECT.
+
+Classes
+    ExportService   # Bulk export of clients, contracts and events.
+"""
+import gzip
+import os
+from time import perf_counter
+
+from ee_crm.adapters import bulk
+from ee_crm.adapters.orm import client_table, contract_table, event_table
+from ee_crm.exceptions import ExportServiceError
+from ee_crm.services.dto import ExportReportDTO
+
+
+class ExportService:
+    """Stream resources tables to compressed files.
+
+    Attributes
+        uow (AbstractUnitOfWork): Unit of work exposing a SQLAlchemy
+            session.
+        tables (dict): (class attribute) mapping between resource name
+            and exported table.
+    """
+    tables = {
+        "clients": client_table,
+        "contracts": contract_table,
+        "events": event_table,
+    }
+
+    def __init__(self, uow):
+        self.uow = uow
+
+    def _get_table(self, resource):
+        """Helper that returns the table linked to a resource name.
+
+        Args
+            resource (str): Name of the resource.
+
+        Returns
+            sqlalchemy.Table: The exported table.
+
+        Raises
+            ExportServiceError: If the resource can't be exported.
+        """
+        try:
+            return self.tables[resource]
+        except KeyError:
+            err = ExportServiceError(f"Unknown resource: {resource}")
+            err.tips = (f"The resource \"{resource}\" can't be exported, it "
+                        f"must be one of : {', '.join(self.tables)}.")
+            raise err
+
+    @staticmethod
+    def _export_with_keyset(connection, table, write, fmt, chunk_size):
+        """Fallback used when COPY is not available.
+
+        Args
+            connection (sqlalchemy.engine.Connection): Open connection.
+            table (sqlalchemy.Table): Table to export.
+            write (Callable[[bytes], Any]): Sink of the encoded rows.
+            fmt (str): Either "csv" or "text".
+            chunk_size (int): Number of rows read per query.
+
+        Returns
+            int: Number of exported rows.
+        """
+        rows = 0
+        header = [col.name for col in table.columns] if fmt == "csv" else None
+        for chunk in bulk.iter_table_keyset(connection, table, chunk_size):
+            write(bulk.encode_rows(chunk, fmt=fmt, header=header))
+            header = None
+            rows += len(chunk)
+        if header is not None:
+            write(bulk.encode_rows((), fmt=fmt, header=header))
+        return rows
+
+    def export(self, resource, path, fmt="csv", chunk_size=5000):
+        """Export every row of a resource table in a gzip file.
+
+        Args
+            resource (str): One of "clients", "contracts", "events".
+            path (str): Destination of the gzip file.
+            fmt (str): One of "csv", "text", "binary".
+            chunk_size (int): Number of rows read per query on the
+                keyset fallback.
+
+        Returns
+            ExportReportDTO: Summary and throughput of the export.
+
+        Raises
+            ExportServiceError: If the resource or the format isn't
+                valid, the binary format is requested on another
+                database than PostgreSQL, or the database is sharded.
+        """
+        if getattr(self.uow, "shard_map", None) is not None:
+            err = ExportServiceError("Exports aren't supported on a sharded "
+                                     "database")
+            err.tips = ("The exports stream a single database, export each "
+                        "shard of DB_SHARDS with its own settings.")
+            raise err
+        table = self._get_table(resource)
+        if fmt not in bulk.EXPORT_FORMATS:
+            err = ExportServiceError(f"Unknown export format: {fmt}")
+            err.tips = (f"The format must be one of : "
+                        f"{', '.join(bulk.EXPORT_FORMATS)}.")
+            raise err
+
+        raw_bytes = 0
+        start = perf_counter()
+        with self.uow:
+            connection = self.uow.session.connection()
+            use_copy = bulk.is_postgresql(connection)
+            if not use_copy and fmt == "binary":
+                err = ExportServiceError("Binary export requires PostgreSQL")
+                err.tips = ("The binary format is the PostgreSQL COPY binary "
+                            "format, it isn't available on this database. "
+                            "Use the csv or text format instead.")
+                raise err
+
+            with gzip.open(path, "wb") as file:
+                def write(data):
+                    nonlocal raw_bytes
+                    raw_bytes += len(data)
+                    file.write(data)
+
+                if use_copy:
+                    rows = bulk.copy_table_to(connection, table, write,
+                                              fmt=fmt)
+                else:
+                    rows = self._export_with_keyset(connection, table, write,
+                                                    fmt, chunk_size)
+        seconds = perf_counter() - start
+
+        return ExportReportDTO(resource=resource,
+                               path=str(path),
+                               fmt=fmt,
+                               rows=rows,
+                               raw_bytes=raw_bytes,
+                               file_bytes=os.path.getsize(path),
+                               seconds=seconds)
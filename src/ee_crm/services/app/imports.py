@@ -0,0 +1,701 @@
+"""Service layer responsible for the bulk import of resources.
+
+Records are read from a csv or jsonl file and validated by chunks, as
+columns, with the batch validation of the domain models, optionally in
+a process pool. Valid rows are
+loaded in a temporary staging table (COPY on PostgreSQL, multi-row
+INSERT otherwise), the referential rules of the resource services are
+checked in SQL on the staging table, then the remaining rows are merged
+in their final table with one INSERT ... SELECT ... RETURNING.
+Every rejected record is written in a jsonl rejects file along with
+the message and tips of its error. The versions of the written tables
+are bumped, so the cached query results see the imported rows.
+
+Collaborators are provisioned with their user account. Password hashing
+dominates their import, it runs in a process pool while the main
+process inserts the users and collaborators of the already hashed
+chunks, so the database and the CPU cores work at the same time.
+
+Classes
+    ImportService           # Bulk import of resources.
+
+Functions
+    validate_chunk          # Validate a chunk of records with a domain
+                            # batch validation.
+    hash_collaborator_chunk # Validate a chunk of collaborators and hash
+                            # their passwords.
+"""
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import perf_counter
+
+from sqlalchemy import delete, exists, func, insert, select
+
+from ee_crm.adapters import bulk
+from ee_crm.adapters.cache import bump_table_versions
+from ee_crm.adapters.orm import client_table, collaborator_table, \
+    contract_table, event_table, user_table, utc_now
+from ee_crm.domain.model import AuthUser, Client, Collaborator, Contract, \
+    Event, Role
+from ee_crm.exceptions import CRMException, CollaboratorServiceError, \
+    ContractServiceError, EventServiceError, ImportServiceError
+from ee_crm.services.dto import ImportReportDTO
+
+
+def _reject(line_no, error, record):
+    """Helper that describes a rejected record.
+
+    Args
+        line_no (int): Line of the record in the imported file.
+        error (CRMException): The reason of the rejection.
+        record (dict): The rejected record.
+
+    Returns
+        dict: Serializable description of the rejection.
+    """
+    return {
+        "line": line_no,
+        "error": type(error).__name__,
+        "threat": error.threat,
+        "message": error.args[0] if error.args else "",
+        "tips": error.tips,
+        "record": record,
+    }
+
+
+def _convert(record, fields, types_map):
+    """Helper that keeps the fields of a record given to a builder,
+    converted by their conversion helper.
+
+    Args
+        record (dict|Any): A record read from the file.
+        fields (set[str]): Fields given to the builder.
+        types_map (dict): mapping between field and conversion helper.
+
+    Returns
+        dict: The converted fields, without the None values.
+
+    Raises
+        ImportServiceError: If the record isn't an object (a malformed
+            jsonl line) or a conversion helper failed.
+    """
+    if not isinstance(record, dict):
+        err = ImportServiceError("Malformed record")
+        err.tips = ("Each line of a jsonl file must be a JSON object, ex: "
+                    "{\"last_name\": \"Doe\"}.")
+        raise err
+    data = {}
+    for k, v in record.items():
+        if k not in fields or v is None:
+            continue
+        try:
+            data[k] = types_map[k](v) if k in types_map else v
+        except (ValueError, TypeError) as e:
+            err = ImportServiceError(f"Invalid {k}: {e}")
+            err.tips = f"The value {v!r} can't be read as a {k}."
+            raise err from e
+    return data
+
+
+def validate_chunk(model_cls, types_map, fields, columns, forced, chunk):
+    """Validate a chunk of records as columns with the validate_batch of
+    a domain model, only the accepted rows are built into entities.
+    Module level function so it can be sent to a process pool.
+
+    Args
+        model_cls (type): Domain model class exposing validate_batch
+            and from_valid.
+        types_map (dict): mapping between field and conversion helper,
+            applied before the validation.
+        fields (set[str]): Fields of a record given to the builder,
+            the other ones are ignored.
+        columns (list[str]): Columns of the staging row, read from the
+            built entity.
+        forced (dict): Fields overriding the content of every record.
+        chunk (list[tuple[int, dict]]): Line numbers and records.
+
+    Returns
+        tuple[list[dict], list[dict]]: The staging rows and the
+            rejected records, in the order of the lines.
+    """
+    rows, rejects, converted = [], [], []
+    for line_no, record in chunk:
+        try:
+            data = _convert(record, fields, types_map)
+        except CRMException as e:
+            rejects.append(_reject(line_no, e, record))
+            continue
+        data.update(forced)
+        converted.append((line_no, record, data))
+
+    names = fields | set(forced)
+    batch = {name: [data.get(name) for _, _, data in converted]
+             for name in model_cls._batch_map if name in names}
+    mask, errors = model_cls.validate_batch(batch)
+    for (line_no, record, data), invalid, row_errors in zip(converted, mask,
+                                                            errors):
+        if invalid:
+            rejects.append(_reject(line_no, row_errors[0], record))
+            continue
+        obj = model_cls.from_valid(**data)
+        row = {col: getattr(obj, col) for col in columns}
+        row["line_no"] = line_no
+        rows.append(row)
+    rejects.sort(key=lambda reject: reject["line"])
+    return rows, rejects
+
+
+def hash_collaborator_chunk(types_map, chunk):
+    """Validate a chunk of collaborators and hash the password of their
+    user account. Module level function so it can be sent to a process
+    pool, the plain passwords never leave the chunk.
+
+    Args
+        types_map (dict): mapping between field and conversion helper,
+            applied before validation.
+        chunk (list[tuple[int, dict]]): Line numbers and records.
+
+    Returns
+        tuple[list[tuple[dict, dict]], list[dict]]: The (user,
+            collaborator) rows, the collaborator holds the line number
+            of the record, and the rejected records.
+    """
+    rows, rejects = [], []
+    for line_no, record in chunk:
+        try:
+            data = _convert(record, ImportService.collaborator_fields,
+                            types_map)
+            profile = Collaborator.validate_profile(**data)
+            user = AuthUser.builder(record.get("username"),
+                                    record.get("password"))
+        except CRMException as e:
+            rejects.append(_reject(line_no, e, _public(record)))
+            continue
+        rows.append(({"username": user.username,
+                      "password": user._password},
+                     {"last_name": profile["last_name"],
+                      "first_name": profile["first_name"],
+                      "email": profile["email"],
+                      "phone_number": profile["phone_number"],
+                      "role_id": profile["role"].value,
+                      "line_no": line_no}))
+    return rows, rejects
+
+
+def _public(record):
+    """Helper that removes the plain password of a record before it is
+    written in the rejects file.
+
+    Args
+        record (dict|Any): A collaborator record, kept as is when it
+            isn't an object.
+
+    Returns
+        dict|Any: The record without its password.
+    """
+    if not isinstance(record, dict):
+        return record
+    return {k: v for k, v in record.items() if k != "password"}
+
+
+class ImportService:
+    """Load validated resources from files.
+
+    Attributes
+        uow (AbstractUnitOfWork): Unit of work exposing a SQLAlchemy
+            session.
+        resources (dict): (class attribute) mapping between resource
+            name and (domain model, table, fields given to the builder).
+        collaborator_fields (set[str]): (class attribute) Fields of a
+            collaborator record, besides its username and password.
+    """
+    resources = {
+        "clients": (Client, client_table,
+                    {"last_name", "first_name", "email", "phone_number",
+                     "company", "salesman_id"}),
+        "contracts": (Contract, contract_table,
+                      {"total_amount", "client_id"}),
+        "events": (Event, event_table,
+                   {"title", "start_time", "end_time", "location",
+                    "attendee", "notes", "contract_id"}),
+    }
+    collaborator_fields = {"last_name", "first_name", "email",
+                           "phone_number", "role"}
+
+    def __init__(self, uow):
+        self.uow = uow
+
+    def _get_resource(self, resource):
+        """Helper that returns the definition of a resource.
+
+        Args
+            resource (str): Name of the resource.
+
+        Returns
+            tuple: Domain model, table and fields of the resource.
+
+        Raises
+            ImportServiceError: If the resource can't be imported.
+        """
+        try:
+            return self.resources[resource]
+        except KeyError:
+            err = ImportServiceError(f"Unknown resource: {resource}")
+            err.tips = (f"The resource \"{resource}\" can't be imported, it "
+                        f"must be one of : {', '.join(self.resources)}.")
+            raise err
+
+    def _verify_not_sharded(self):
+        """Check that the database isn't sharded, the imports stream a
+        single one, see ee_crm.adapters.sharding.
+
+        Raises
+            ImportServiceError: If the database is sharded.
+        """
+        if getattr(self.uow, "shard_map", None) is not None:
+            err = ImportServiceError("Imports aren't supported on a sharded "
+                                     "database")
+            err.tips = ("The imports stream a single database, import in "
+                        "each shard of DB_SHARDS with its own settings.")
+            raise err
+
+    def _verify_salesman(self, salesman_id):
+        """Check once that imported clients can be linked to the given
+        collaborator, see ClientService.create.
+
+        Args
+            salesman_id (int): Primary key of the collaborator.
+
+        Raises
+            ImportServiceError: If the collaborator isn't a salesman.
+        """
+        collaborator = self.uow.collaborators.get(salesman_id)
+        if collaborator is None or collaborator.role != Role.SALES:
+            err = ImportServiceError("Only sales people can create clients")
+            err.tips = ("The collaborator linked to the imported clients "
+                        "must be a salesman.")
+            raise err
+
+    @staticmethod
+    def _referential_checks(resource, staging):
+        """Build the SQL conditions matching the staging rows that
+        break a rule of the resource service. Mirrors the checks of
+        ContractService.create and EventService.create.
+
+        Args
+            resource (str): Name of the resource.
+            staging (sqlalchemy.Table): The staging table.
+
+        Returns
+            list[tuple[sqlalchemy.ColumnElement, CRMException]]: Failing
+                condition and the error reported for the matched rows.
+        """
+        checks = []
+        if resource == "contracts":
+            cli, col = client_table, collaborator_table
+            err = ContractServiceError("Contract must be linked to a client")
+            err.tips = ("The client_id isn't linked to a client in the "
+                        "database.")
+            checks.append((~exists().where(
+                cli.c.client_id == staging.c.client_id), err))
+            err = ContractServiceError("Associated collaborator is not in "
+                                       "SALES, must reassign client")
+            err.tips = ("The collaborator associated with the client of "
+                        "this contract is not a salesman, contact a member "
+                        "of the MANAGEMENT to resolve this issue.")
+            checks.append((~exists().where(
+                cli.c.client_id == staging.c.client_id,
+                cli.c.salesman_id == col.c.collaborator_id,
+                col.c.role_id == Role.SALES.value), err))
+
+        elif resource == "events":
+            con, eve = contract_table, event_table
+            err = EventServiceError("No contract found.")
+            err.tips = ("The contract_id isn't linked to a contract in the "
+                        "database.")
+            checks.append((~exists().where(
+                con.c.contract_id == staging.c.contract_id), err))
+            err = EventServiceError("Can't create event for unsigned "
+                                    "contracts")
+            err.tips = ("The contract linked to the event hasn't been signed "
+                        "yet. It must be signed before an event can be "
+                        "created.")
+            checks.append((~exists().where(
+                con.c.contract_id == staging.c.contract_id,
+                con.c.signed.is_(True)), err))
+            err = EventServiceError("Event already exists.")
+            err.tips = "The event for this contract already exists."
+            checks.append((exists().where(
+                eve.c.contract_id == staging.c.contract_id), err))
+            first = staging.alias("first")
+            err = EventServiceError("Event already exists.")
+            err.tips = ("An earlier line of the file already creates the "
+                        "event of this contract.")
+            checks.append((staging.c.line_no > (
+                select(func.min(first.c.line_no))
+                .where(first.c.contract_id == staging.c.contract_id)
+                .scalar_subquery()), err))
+        return checks
+
+    @staticmethod
+    def _reject_staging(connection, staging, condition, error):
+        """Remove the staging rows matching a condition.
+
+        Args
+            connection (sqlalchemy.engine.Connection): Open connection.
+            staging (sqlalchemy.Table): The staging table.
+            condition (sqlalchemy.ColumnElement): Failing condition.
+            error (CRMException): Reason of the rejection.
+
+        Returns
+            list[dict]: The rejected records.
+        """
+        rows = connection.execute(
+            select(staging).where(condition).order_by(staging.c.line_no)
+        ).mappings().all()
+        if not rows:
+            return []
+        connection.execute(delete(staging).where(condition))
+        return [_reject(row["line_no"], error,
+                        {k: v for k, v in row.items() if k != "line_no"})
+                for row in rows]
+
+    @staticmethod
+    def _validated_chunks(chunks, validate, workers):
+        """Run the validation of the chunks, in a process pool when
+        more than one worker is requested. A bounded number of chunks
+        is in flight so the file is never fully held in memory, and
+        results keep the file order.
+
+        Args
+            chunks (Iterable[list]): Chunks of records.
+            validate (Callable): Validation function of a chunk.
+            workers (int): Number of processes.
+
+        Yields
+            tuple[list[dict], list[dict]]: Result of validate.
+        """
+        if workers <= 1:
+            for chunk in chunks:
+                yield validate(chunk)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(validate, chunk))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    @staticmethod
+    def _write_rejects(rejects, rejects_path):
+        """Write the rejected records in file order, nothing is written
+        when every record has been imported.
+
+        Args
+            rejects (list[dict]): The rejected records.
+            rejects_path (str): Destination of the rejects file.
+        """
+        if not rejects:
+            return
+        rejects.sort(key=lambda reject: reject["line"])
+        with open(rejects_path, "w", encoding="utf-8") as file:
+            for reject in rejects:
+                file.write(json.dumps(reject, default=str) + "\n")
+
+    def import_file(self, resource, path, fmt="csv", types_map=None,
+                    salesman_id=None, chunk_size=1000, workers=1,
+                    rejects_path=None):
+        """Import every valid record of a file, in one transaction.
+
+        Args
+            resource (str): One of "clients", "contracts", "events".
+            path (str): Path of the csv or jsonl file.
+            fmt (str): One of "csv", "jsonl".
+            types_map (dict|None): mapping between field and conversion
+                helper applied before validation.
+            salesman_id (int|None): Salesman linked to every imported
+                client, required for clients.
+            chunk_size (int): Number of records validated and loaded
+                at once.
+            workers (int): Number of validation processes.
+            rejects_path (str|None): Destination of the rejects file.
+                (default: <path>.rejects.jsonl)
+
+        Returns
+            ImportReportDTO: Summary and throughput of the import.
+
+        Raises
+            ImportServiceError: If the resource or the format isn't
+                valid, the salesman of imported clients isn't one, or
+                the database is sharded.
+        """
+        self._verify_not_sharded()
+        model_cls, table, fields = self._get_resource(resource)
+        if fmt not in bulk.IMPORT_FORMATS:
+            err = ImportServiceError(f"Unknown import format: {fmt}")
+            err.tips = (f"The format must be one of : "
+                        f"{', '.join(bulk.IMPORT_FORMATS)}.")
+            raise err
+
+        forced = {}
+        if resource == "clients":
+            forced["salesman_id"] = salesman_id
+        columns = [col.name for col in table.columns if not col.primary_key]
+        validate = partial(validate_chunk, model_cls, types_map or {},
+                           fields, columns, forced)
+        rejects_path = rejects_path or f"{path}.rejects.jsonl"
+        rejects = []
+        rows_read = 0
+
+        start = perf_counter()
+        with self.uow:
+            if resource == "clients":
+                self._verify_salesman(salesman_id)
+            connection = self.uow.session.connection()
+            use_copy = bulk.is_postgresql(connection)
+            staging = bulk.create_staging_table(connection, table)
+
+            chunks = bulk.iter_chunks(bulk.read_records(path, fmt),
+                                      chunk_size)
+            for rows, chunk_rejects in self._validated_chunks(chunks,
+                                                              validate,
+                                                              workers):
+                rows_read += len(rows) + len(chunk_rejects)
+                rejects.extend(chunk_rejects)
+                if use_copy:
+                    bulk.copy_rows_from(connection, staging, rows)
+                else:
+                    bulk.insert_rows(connection, staging, rows)
+
+            for condition, error in self._referential_checks(resource,
+                                                             staging):
+                rejects.extend(self._reject_staging(connection, staging,
+                                                    condition, error))
+            # the database sets the change time, as for the other writes
+            stamped = ({"updated_at": utc_now()} if "updated_at" in table.c
+                       else None)
+            inserted = bulk.merge_staging(connection, staging, table,
+                                          values=stamped)
+            staging.drop(connection)
+            if inserted:
+                bump_table_versions(connection, [table.name])
+            self.uow.commit()
+        seconds = perf_counter() - start
+
+        self._write_rejects(rejects, rejects_path)
+        return ImportReportDTO(resource=resource,
+                               path=str(path),
+                               rows_read=rows_read,
+                               rows_imported=len(inserted),
+                               rows_rejected=len(rejects),
+                               rejects_path=(str(rejects_path) if rejects
+                                             else None),
+                               seconds=seconds)
+
+    @staticmethod
+    def _taken_error(username, email, taken_names, taken_mails):
+        """Build the error of a collaborator whose username or email is
+        already taken.
+
+        Args
+            username (str|None): Username of the record.
+            email (str|None): Email of the record.
+            taken_names (set[str]): The taken usernames.
+            taken_mails (set[str]): The taken emails.
+
+        Returns
+            CollaboratorServiceError|None: The error, not raised, None
+                when both are free.
+        """
+        if username is not None and username in taken_names:
+            err = CollaboratorServiceError("username taken")
+            err.tips = (f"The username {username} is taken, select a "
+                        f"different one and try again.")
+            return err
+        if email is not None and email in taken_mails:
+            err = CollaboratorServiceError("email taken")
+            err.tips = (f"The email {email} is already used by another "
+                        f"collaborator.")
+            return err
+        return None
+
+    @classmethod
+    def _unique_credentials(cls, connection, chunks, rejects):
+        """Reject the collaborators whose username or email is already
+        taken in the database, before their password is hashed. See
+        CollaboratorService.create. The duplicates within the file are
+        rejected once validated, see _first_occurrences.
+
+        Args
+            connection (sqlalchemy.engine.Connection): Open connection.
+            chunks (Iterable[list]): Chunks of records.
+            rejects (list[dict]): Receives the rejected records.
+
+        Yields
+            list[tuple[int, dict]]: Chunks of the remaining records.
+        """
+        for chunk in chunks:
+            # the malformed records are rejected by the validation
+            records = [r for _, r in chunk if isinstance(r, dict)]
+            names = {r.get("username") for r in records} - {None}
+            mails = {r.get("email") for r in records} - {None}
+            taken_names = set(connection.scalars(
+                select(user_table.c.username)
+                .where(user_table.c.username.in_(names))))
+            taken_mails = set(connection.scalars(
+                select(collaborator_table.c.email)
+                .where(collaborator_table.c.email.in_(mails))))
+            kept = []
+            for line_no, record in chunk:
+                err = None
+                if isinstance(record, dict):
+                    err = cls._taken_error(record.get("username"),
+                                           record.get("email"),
+                                           taken_names, taken_mails)
+                if err is None:
+                    kept.append((line_no, record))
+                else:
+                    rejects.append(_reject(line_no, err, _public(record)))
+            if kept:
+                yield kept
+
+    @classmethod
+    def _first_occurrences(cls, rows, usernames, emails, rejects):
+        """Reject the validated collaborators whose username or email
+        is taken by an earlier valid line of the file, so a rejected
+        line never blocks a later one.
+
+        Args
+            rows (list[tuple[dict, dict]]): The (user, collaborator)
+                rows returned by hash_collaborator_chunk.
+            usernames (set[str]): Usernames of the earlier valid lines,
+                updated.
+            emails (set[str]): Emails of the earlier valid lines,
+                updated.
+            rejects (list[dict]): Receives the rejected records.
+
+        Returns
+            list[tuple[dict, dict]]: The remaining rows.
+        """
+        kept = []
+        for user, collaborator in rows:
+            username, email = user["username"], collaborator["email"]
+            err = cls._taken_error(username, email, usernames, emails)
+            if err is not None:
+                record = {k: v for k, v in collaborator.items()
+                          if k != "line_no"}
+                rejects.append(_reject(collaborator["line_no"], err,
+                                       {"username": username, **record}))
+                continue
+            usernames.add(username)
+            if email is not None:
+                emails.add(email)
+            kept.append((user, collaborator))
+        return kept
+
+    @staticmethod
+    def _insert_collaborators(connection, rows):
+        """Insert the users then their collaborators, with one batched
+        statement each.
+
+        Args
+            connection (sqlalchemy.engine.Connection): Open connection.
+            rows (list[tuple[dict, dict]]): The (user, collaborator)
+                rows returned by hash_collaborator_chunk.
+
+        Returns
+            int: Number of created collaborators.
+        """
+        if not rows:
+            return 0
+        user_ids = connection.execute(
+            insert(user_table).returning(user_table.c.user_id,
+                                         sort_by_parameter_order=True),
+            [user for user, _ in rows]).scalars().all()
+        collaborators = [{**{k: v for k, v in collaborator.items()
+                             if k != "line_no"}, "user_id": user_id}
+                         for (_, collaborator), user_id in zip(rows,
+                                                               user_ids)]
+        return bulk.insert_rows(connection, collaborator_table,
+                                collaborators)
+
+    def import_collaborators(self, path, fmt="csv", types_map=None,
+                             chunk_size=50, workers=None, rejects_path=None,
+                             progress=None):
+        """Provision collaborators and their user account, in one
+        transaction. Every record needs a username and a password.
+
+        Args
+            path (str): Path of the csv or jsonl file.
+            fmt (str): One of "csv", "jsonl".
+            types_map (dict|None): mapping between field and conversion
+                helper applied before validation.
+            chunk_size (int): Number of records hashed by a process and
+                inserted at once.
+            workers (int|None): Number of hashing processes.
+                (default: number of CPU)
+            rejects_path (str|None): Destination of the rejects file.
+                (default: <path>.rejects.jsonl)
+            progress (Callable[[int, int], Any]|None): Called after
+                each inserted chunk with the number of created and
+                rejected collaborators so far.
+
+        Returns
+            ImportReportDTO: Summary and throughput of the import.
+
+        Raises
+            ImportServiceError: If the format isn't valid, or the
+                database is sharded.
+        """
+        self._verify_not_sharded()
+        if fmt not in bulk.IMPORT_FORMATS:
+            err = ImportServiceError(f"Unknown import format: {fmt}")
+            err.tips = (f"The format must be one of : "
+                        f"{', '.join(bulk.IMPORT_FORMATS)}.")
+            raise err
+
+        workers = workers or os.cpu_count() or 1
+        validate = partial(hash_collaborator_chunk, types_map or {})
+        rejects_path = rejects_path or f"{path}.rejects.jsonl"
+        rejects = []
+        usernames, emails = set(), set()
+        rows_read = 0
+        created = 0
+
+        start = perf_counter()
+        with self.uow:
+            connection = self.uow.session.connection()
+            chunks = bulk.iter_chunks(bulk.read_records(path, fmt),
+                                      chunk_size)
+            chunks = self._unique_credentials(connection, chunks, rejects)
+            for rows, chunk_rejects in self._validated_chunks(chunks,
+                                                              validate,
+                                                              workers):
+                rejects.extend(chunk_rejects)
+                rows = self._first_occurrences(rows, usernames, emails,
+                                               rejects)
+                created += self._insert_collaborators(connection, rows)
+                if progress is not None:
+                    progress(created, len(rejects))
+            rows_read = created + len(rejects)
+            if created:
+                bump_table_versions(connection, [user_table.name,
+                                                 collaborator_table.name])
+            self.uow.commit()
+        seconds = perf_counter() - start
+
+        self._write_rejects(rejects, rejects_path)
+        return ImportReportDTO(resource="collaborators",
+                               path=str(path),
+                               rows_read=rows_read,
+                               rows_imported=created,
+                               rows_rejected=len(rejects),
+                               rejects_path=(str(rejects_path) if rejects
+                                             else None),
+                               seconds=seconds)
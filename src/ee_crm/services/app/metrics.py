@@ -0,0 +1,99 @@
+"""Service functions summarizing the latency metrics recorded by the
+CLI, see ee_crm.metrics and ee_crm.adapters.metrics_store.
+
+Functions
+    summarize_metrics   # Quantiles per command and role.
+    prometheus_text     # Render summaries in the Prometheus format.
+    write_textfile      # Atomically write a Prometheus textfile.
+"""
+import os
+
+from ee_crm.adapters.metrics_store import Histogram
+from ee_crm.services.dto import MetricsSummaryDTO
+
+_QUANTILES = (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99"))
+
+
+def summarize_metrics(store, since=None, command=None):
+    """Merge the outcomes of each command and role, then compute the
+    quantiles of their durations.
+
+    Args
+        store (MetricsStore): Store of the recorded invocations.
+        since (float|None): Only the invocations after this epoch time.
+        command (str|None): Only the commands starting with this name.
+
+    Returns
+        tuple[MetricsSummaryDTO]: Summaries sorted by command and role.
+    """
+    grouped = {}
+    for (name, role, outcome), histograms in store.merged(since).items():
+        if command and not name.startswith(command):
+            continue
+        durations, statements, errors = grouped.setdefault(
+            (name, role), (Histogram(), Histogram(), [0]))
+        durations.merge(histograms["duration_us"])
+        statements.merge(histograms["sql"])
+        if outcome != "ok":
+            errors[0] += histograms["duration_us"].total
+    return tuple(
+        MetricsSummaryDTO(
+            command=name, role=role,
+            invocations=durations.total, errors=errors[0],
+            p50=durations.quantile(0.5) / 1e6,
+            p95=durations.quantile(0.95) / 1e6,
+            p99=durations.quantile(0.99) / 1e6,
+            seconds=durations.sum / 1e6,
+            sql_p50=statements.quantile(0.5),
+            sql_p95=statements.quantile(0.95))
+        for (name, role), (durations, statements, errors)
+        in sorted(grouped.items()))
+
+
+def prometheus_text(summaries):
+    """Render summaries in the Prometheus text exposition format.
+
+    Args
+        summaries (Iterable[MetricsSummaryDTO]): The summaries.
+
+    Returns
+        str: The exposition, ending with a new line.
+    """
+    lines = ["# HELP eecrm_command_duration_seconds Duration of the eecrm "
+             "commands.",
+             "# TYPE eecrm_command_duration_seconds summary"]
+    errors = ["# HELP eecrm_command_errors_total Failed eecrm commands.",
+              "# TYPE eecrm_command_errors_total counter"]
+    statements = ["# HELP eecrm_command_sql_statements SQL statements of "
+                  "the eecrm commands.",
+                  "# TYPE eecrm_command_sql_statements gauge"]
+    for summary in summaries:
+        labels = (f'command="{summary.command}",'
+                  f'role="{summary.role}"')
+        metric = "eecrm_command_duration_seconds"
+        for quantile, attr in _QUANTILES:
+            lines.append(f'{metric}{{{labels},quantile="{quantile}"}} '
+                         f'{getattr(summary, attr):.6f}')
+        lines.append(f"{metric}_sum{{{labels}}} {summary.seconds:.6f}")
+        lines.append(f"{metric}_count{{{labels}}} {summary.invocations}")
+        errors.append(f"eecrm_command_errors_total{{{labels}}} "
+                      f"{summary.errors}")
+        statements.append(f'eecrm_command_sql_statements{{{labels},'
+                          f'quantile="0.5"}} {summary.sql_p50:g}')
+        statements.append(f'eecrm_command_sql_statements{{{labels},'
+                          f'quantile="0.95"}} {summary.sql_p95:g}')
+    return "\n".join(lines + errors + statements) + "\n"
+
+
+def write_textfile(path, text):
+    """Write a Prometheus textfile, replaced at once so the collector
+    never reads a partial file.
+
+    Args
+        path (str): Destination, ending with '.prom'.
+        text (str): The exposition.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
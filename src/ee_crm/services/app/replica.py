@@ -0,0 +1,179 @@
+"""Service layer responsible for the local replica of the tables, see
+ee_crm.adapters.replica.
+
+A sync pulls the changes of the tables readable by a collaborator into
+the replica file, in a single transaction of the replica: a failed sync
+leaves the replica as it was. On PostgreSQL the tables are read from one
+snapshot of the database (REPEATABLE READ), a contract is never pulled
+without the client it was written with.
+
+Classes
+    ReplicaService  # Sync and state of the local replica.
+"""
+import os
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ee_crm.adapters import replica as rep
+from ee_crm.exceptions import ReplicaServiceError
+from ee_crm.services.dto import ReplicaTableDTO, SyncReportDTO
+
+
+def _latest(*times):
+    """Latest of the times which aren't None, None without time."""
+    return max((t for t in times if t is not None), default=None)
+
+
+class ReplicaService:
+    """Pull the tables of the database into a local SQLite replica.
+
+    Attributes
+        uow (AbstractUnitOfWork): Unit of work exposing a SQLAlchemy
+            session on the database.
+        replica (sqlalchemy.engine.Engine): Engine of the replica file,
+            see ee_crm.adapters.replica.create_replica_engine.
+    """
+    def __init__(self, uow, replica):
+        self.uow = uow
+        self.replica = replica
+
+    @property
+    def path(self):
+        """Path of the replica file.
+
+        Returns
+            str: The path.
+        """
+        return self.replica.url.database
+
+    def _source(self):
+        """Connection of the session of the unit of work, reading a
+        snapshot of the tables on PostgreSQL."""
+        session = self.uow.session
+        if session.get_bind().dialect.name == "postgresql":
+            return session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ"})
+        return session.connection()
+
+    @staticmethod
+    def _sync_table(source, replica, table, state, collaborator_id,
+                    full, overlap, chunk_size, synced_at):
+        """Pull the changes of a table. The table is copied in full
+        when asked, on its first sync, when it has no change column or
+        when it was synced for another collaborator.
+
+        Returns
+            ReplicaTableDTO: The sync of the table.
+        """
+        incremental = (not full and state is not None
+                       and "updated_at" in table.c
+                       and state.collaborator_id == collaborator_id)
+        if incremental:
+            margin = timedelta(seconds=overlap)
+            changed_since = (state.changed_at - margin
+                             if state.changed_at else datetime.min)
+            deleted_since = (state.deleted_at - margin
+                             if state.deleted_at else datetime.min)
+            upserted, changed_at = rep.upsert_changes(
+                source, replica, table, changed_since, chunk_size)
+            deleted, deleted_at = rep.delete_tombstoned(
+                source, replica, table, deleted_since, chunk_size)
+            changed_at = _latest(state.changed_at, changed_at)
+            deleted_at = _latest(state.deleted_at, deleted_at)
+        else:
+            upserted, changed_at = rep.copy_table(source, replica, table,
+                                                  chunk_size)
+            deleted, deleted_at = 0, rep.newest_tombstone(source, table)
+
+        rows = replica.execute(select(func.count()).select_from(table)
+                               ).scalar()
+        rep.write_replica_state(replica, table.name,
+                                collaborator_id=collaborator_id,
+                                changed_at=changed_at,
+                                deleted_at=deleted_at,
+                                synced_at=synced_at, rows=rows)
+        return ReplicaTableDTO(table=table.name, rows=rows,
+                               synced_at=synced_at, changed_at=changed_at,
+                               mode="incremental" if incremental else "full",
+                               upserted=upserted, deleted=deleted)
+
+    def sync(self, table_names, collaborator_id, full=False, overlap=300.0,
+             chunk_size=5000):
+        """Pull the changes of tables into the replica. The replicated
+        tables that aren't asked anymore are emptied.
+
+        Args
+            table_names (Iterable[str]): Names of the synced tables, see
+                ee_crm.adapters.replica.REPLICATED_TABLES.
+            collaborator_id (int): The collaborator owning the replica.
+            full (bool): Copy the tables in full instead of pulling
+                their changes.
+            overlap (float): Seconds of changes pulled again, for the
+                late commits.
+            chunk_size (int): Maximum number of rows per query.
+
+        Returns
+            SyncReportDTO: Summary of the sync.
+
+        Raises
+            ReplicaServiceError: If a table can't be replicated, the
+                database is sharded or the sync failed.
+        """
+        if getattr(self.uow, "shard_map", None) is not None:
+            err = ReplicaServiceError("The replica isn't supported on a "
+                                      "sharded database")
+            err.tips = ("The sync reads a single database, the local replica "
+                        "of the shards of DB_SHARDS isn't available.")
+            raise err
+        table_names = set(table_names)
+        unknown = table_names - set(rep.REPLICATED_TABLES)
+        if unknown:
+            err = ReplicaServiceError(f"Unknown table: "
+                                      f"{', '.join(sorted(unknown))}")
+            err.tips = (f"The replicated tables are : "
+                        f"{', '.join(rep.REPLICATED_TABLES)}.")
+            raise err
+
+        start = perf_counter()
+        synced_at = datetime.now()
+        try:
+            rep.create_replica_schema(self.replica)
+            with self.uow, self.replica.begin() as replica:
+                source = self._source()
+                states = rep.read_replica_state(replica)
+                for name in set(states) - table_names:
+                    replica.execute(delete(rep.REPLICATED_TABLES[name]))
+                    rep.write_replica_state(replica, name)
+                tables = tuple(
+                    self._sync_table(source, replica, table,
+                                     states.get(name), collaborator_id,
+                                     full, overlap, chunk_size, synced_at)
+                    for name, table in rep.REPLICATED_TABLES.items()
+                    if name in table_names)
+        except SQLAlchemyError as e:
+            err = ReplicaServiceError(f"Sync of the replica failed: "
+                                      f"{type(e).__name__}")
+            err.tips = ("The replica is left as it was. Verify the "
+                        "connection to the database and try again.")
+            raise err
+        return SyncReportDTO(path=self.path, tables=tables,
+                             seconds=perf_counter() - start)
+
+    def status(self):
+        """Read the sync state of the tables of the replica.
+
+        Returns
+            tuple[ReplicaTableDTO]: The synced tables, empty without
+                replica file.
+        """
+        if not os.path.exists(self.path):
+            return ()
+        with self.replica.connect() as replica:
+            states = rep.read_replica_state(replica)
+        return tuple(ReplicaTableDTO(table=name, rows=states[name].rows,
+                                     synced_at=states[name].synced_at,
+                                     changed_at=states[name].changed_at)
+                     for name in rep.REPLICATED_TABLES if name in states)
@@ -0,0 +1,37 @@
+"""Service functions summarizing the slow query log, see
+ee_crm.adapters.slow_queries.
+
+Functions
+    group_slow_queries  # Slow executions per normalized statement.
+"""
+from ee_crm.adapters.slow_queries import normalize_statement
+from ee_crm.services.dto import SlowQueryDTO
+
+
+def group_slow_queries(entries, limit=None):
+    """Group the entries of the log by normalized statement.
+
+    Args
+        entries (Iterable[dict]): Entries of the slow query log.
+        limit (int|None): Only the groups of the slowest total duration.
+
+    Returns
+        tuple[SlowQueryDTO]: The groups, slowest total duration first.
+    """
+    groups = {}
+    for entry in entries:
+        statement = normalize_statement(entry["statement"])
+        durations, callers = groups.setdefault(statement, ([], {}))
+        durations.append(entry["ms"])
+        caller = entry.get("caller", "?")
+        callers[caller] = callers.get(caller, 0) + 1
+    summaries = sorted(
+        (SlowQueryDTO(
+            statement=statement, count=len(durations),
+            total_ms=sum(durations), max_ms=max(durations),
+            mean_ms=sum(durations) / len(durations),
+            callers=tuple(sorted(callers.items(),
+                                 key=lambda item: -item[1])))
+         for statement, (durations, callers) in groups.items()),
+        key=lambda summary: -summary.total_ms)
+    return tuple(summaries[:limit] if limit else summaries)
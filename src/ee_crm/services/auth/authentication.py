@@ -47,7 +47,8 @@ class AuthenticationService:
 
     def authenticate(self, username, plain_password):
         """Authenticate a user from supplied credentials and return the
-        JWT ready payload.
+        JWT ready payload. A password hashed with outdated argon2
+        parameters is hashed again with the configured ones.
 
         Args
             username (str): Given username.
@@ -58,6 +59,9 @@ class AuthenticationService:
         """
         with self.uow:
             user = self.verify_identity(self.uow, username, plain_password)
+            if user.password_needs_rehash():
+                user.rehash_password(plain_password)
+                self.uow.commit()
             collaborator = self.uow.collaborators.filter_one(user_id=user.id)
             return {
                 "sub": user.username,
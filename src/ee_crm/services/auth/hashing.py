@@ -0,0 +1,103 @@
+"""Helpers functions that measure the argon2 password hasher on the
+current machine and suggest parameters for a target login latency.
+
+Argon2 latency grows linearly with the number of iterations (time
+cost) for a given memory cost, the memory is reduced only when a
+single iteration already exceeds the target.
+
+Function
+    measure_hasher  # Median latency of a hash with given parameters.
+    measure_verify  # Median latency of a verification (login).
+    calibrate       # Suggest parameters for a target latency.
+"""
+from statistics import median
+from time import perf_counter
+
+from argon2 import PasswordHasher
+
+from ee_crm.services.dto import HasherProfileDTO
+
+_CALIBRATION_PASSWORD = "Calibration1"
+_MIN_MEMORY_PER_LANE = 8
+
+
+def measure_hasher(time_cost, memory_cost, parallelism, samples=3):
+    """Hash a password several times with the given parameters.
+
+    Args
+        time_cost (int): Number of iterations.
+        memory_cost (int): Memory used by a hash, in KiB.
+        parallelism (int): Number of lanes.
+        samples (int): Number of measured hashes.
+
+    Returns
+        HasherProfileDTO: The parameters and their median latency.
+    """
+    hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost,
+                            parallelism=parallelism)
+    durations = []
+    for _ in range(samples):
+        start = perf_counter()
+        hasher.hash(_CALIBRATION_PASSWORD)
+        durations.append(perf_counter() - start)
+    return HasherProfileDTO(time_cost=time_cost,
+                            memory_cost=memory_cost,
+                            parallelism=parallelism,
+                            seconds=median(durations))
+
+
+def measure_verify(time_cost, memory_cost, parallelism, samples=3):
+    """Verify a password several times against a hash made with the
+    given parameters, as a login does.
+
+    Args
+        time_cost (int): Number of iterations.
+        memory_cost (int): Memory used by a hash, in KiB.
+        parallelism (int): Number of lanes.
+        samples (int): Number of measured verifications.
+
+    Returns
+        HasherProfileDTO: The parameters and their median latency.
+    """
+    hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost,
+                            parallelism=parallelism)
+    password_hash = hasher.hash(_CALIBRATION_PASSWORD)
+    durations = []
+    for _ in range(samples):
+        start = perf_counter()
+        hasher.verify(password_hash, _CALIBRATION_PASSWORD)
+        durations.append(perf_counter() - start)
+    return HasherProfileDTO(time_cost=time_cost,
+                            memory_cost=memory_cost,
+                            parallelism=parallelism,
+                            seconds=median(durations))
+
+
+def calibrate(target_seconds, memory_cost, parallelism, samples=3):
+    """Find the highest time cost whose latency stays under the target.
+
+    Args
+        target_seconds (float): Accepted duration of a hash.
+        memory_cost (int): Preferred memory of a hash, in KiB, halved
+            while one iteration is slower than the target.
+        parallelism (int): Number of lanes.
+        samples (int): Number of measured hashes per candidate.
+
+    Returns
+        HasherProfileDTO: The suggested parameters and their latency.
+    """
+    min_memory = _MIN_MEMORY_PER_LANE * parallelism
+    profile = measure_hasher(1, memory_cost, parallelism, samples)
+    while profile.seconds > target_seconds and memory_cost > min_memory:
+        memory_cost = max(memory_cost // 2, min_memory)
+        profile = measure_hasher(1, memory_cost, parallelism, samples)
+    if profile.seconds >= target_seconds:
+        return profile
+
+    time_cost = max(1, int(target_seconds / profile.seconds))
+    candidate = measure_hasher(time_cost, memory_cost, parallelism, samples)
+    while candidate.seconds > target_seconds and time_cost > 1:
+        time_cost -= 1
+        candidate = measure_hasher(time_cost, memory_cost, parallelism,
+                                   samples)
+    return candidate if candidate.seconds <= target_seconds else profile
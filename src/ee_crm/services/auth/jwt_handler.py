@@ -4,6 +4,7 @@ Tokens (JWT) on the client side of the application.
 Function
     create_and_store_tokens # Creates a new JWT token and store it.
     verify_token            # Decode a token and verify its validity.
+    token_expirations       # Expiration of the stored tokens.
     wipe_tokens             # Clear the storage directory of tokens
 
 All other functions are private.
@@ -226,6 +227,28 @@ def verify_token():
     return new_access_token_payload
 
 
+def token_expirations(tokens=None):
+    """Read the expiration of the stored tokens, without refreshing
+    nor deleting them.
+
+    Args
+        tokens (dict|None): Content of the token store, read from the
+            storage path when None.
+
+    Returns
+        dict: {'access-token': int|None, 'refresh-token': int|None},
+            the expiration timestamps, None for a missing token.
+
+    Raises
+        BadToken: If a stored token has an invalid signature.
+    """
+    if tokens is None:
+        tokens = _read_storage()
+    return {name: (_decode(tokens[name], verify_exp=False).get("exp")
+                   if tokens.get(name) else None)
+            for name in ("access-token", "refresh-token")}
+
+
 def wipe_tokens():
     """Delete the local stored tokens."""
     _wipe_storage()
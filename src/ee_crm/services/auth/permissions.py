@@ -2,9 +2,23 @@
 layer. If the target entity is missing or the attribute is broken, the
 service returns 'None' instead of raising an error.
 
+The attributes can be served by a SharedAttributeCache, shared by the
+processes of the application. A cached attribute is only used while the
+versions of the tables it was read from are unchanged, the versions are
+read once per service, that is once per permission check. Reading them
+costs a query, as much as a lookup by primary key: the attributes read
+by a single lookup only use the cache once the versions of the check
+are read for another attribute. The lookups may be served by a read
+replica, see ee_crm.adapters.routing.
+
 Classes
     PermissionService   # collection of methods to extract specific info
 """
+from ee_crm.adapters.attribute_cache import CLIENT_SALESMAN, \
+    CONTRACT_SALESMAN, CONTRACT_SIGNED, EVENT_SALESMAN, EVENT_SUPPORT
+from ee_crm.adapters.cache import read_table_versions
+from ee_crm.adapters.routing import read_only
+from ee_crm.domain.model import Client, Contract, Event
 
 
 class PermissionService:
@@ -13,9 +27,68 @@ class PermissionService:
     Args
         uow (AbstractUnitOfWork): Unit of work exposing 'clients',
             'contracts' and 'events' repositories.
+        cache (SharedAttributeCache|None): Cache of the attributes,
+            consulted before querying the repositories.
     """
-    def __init__(self, uow):
+    _dependencies = {
+        CLIENT_SALESMAN: ("client",),
+        CONTRACT_SALESMAN: ("contract", "client"),
+        CONTRACT_SIGNED: ("contract",),
+        EVENT_SUPPORT: ("event",),
+        EVENT_SALESMAN: ("event", "contract", "client"),
+    }
+    # Attributes read by a single lookup by primary key
+    _single_hop = {CLIENT_SALESMAN, CONTRACT_SIGNED, EVENT_SUPPORT}
+
+    def __init__(self, uow, cache=None):
         self.uow = uow
+        self.cache = cache
+        self._versions = None
+
+    def _stamp(self, kind):
+        """Stamp of the tables an attribute depends on, the versions
+        are read once per service.
+
+        Args
+            kind (int): Kind of attribute.
+
+        Returns
+            int: Sum of the versions of the tables.
+        """
+        if self._versions is None:
+            self._versions = dict(read_table_versions(
+                self.uow.session, (Client, Contract, Event)))
+        return sum(self._versions[name]
+                   for name in self._dependencies[kind])
+
+    @read_only
+    def _cached(self, kind, key, lookup):
+        """Return an attribute from the cache, or from the lookup
+        which result is then cached. A single lookup isn't worth a read
+        of the versions, it isn't cached until they are read.
+
+        Args
+            kind (int): Kind of attribute.
+            key (int): Primary key of the resource.
+            lookup (Callable[[], int|bool|None]): Read the attribute
+                from the repositories.
+
+        Returns
+            int | bool | None: The attribute.
+        """
+        if (self.cache is None or type(key) is not int
+                or (kind in self._single_hop and self._versions is None)):
+            with self.uow:
+                return lookup()
+        with self.uow:
+            stamp = self._stamp(kind)
+            found, value = self.cache.get(kind, key, stamp)
+            if not found:
+                value = lookup()
+                self.cache.put(kind, key, value, stamp)
+        if kind == CONTRACT_SIGNED and value is not None:
+            return bool(value)
+        return value
 
     def get_client_associated_salesman(self, client_id):
         """Return the ID of the salesman responsible for the given
@@ -28,11 +101,12 @@ class PermissionService:
             int | None: ID of the salesman responsible for the given
                 client or 'None' if not found.
         """
-        with self.uow:
+        def lookup():
             try:
                 return self.uow.clients.get(client_id).salesman_id
             except AttributeError:
                 return None
+        return self._cached(CLIENT_SALESMAN, client_id, lookup)
 
     def get_contract_associated_salesman(self, contract_id):
         """Return the ID of the salesman linked to the contract's
@@ -45,11 +119,12 @@ class PermissionService:
             int | None: ID of the salesman responsible for the given
                 client or 'None' if not found.
         """
-        with self.uow:
+        def lookup():
             try:
                 return self.uow.contracts.get(contract_id).client.salesman_id
             except AttributeError:
                 return None
+        return self._cached(CONTRACT_SALESMAN, contract_id, lookup)
 
     def get_contract_signed(self, contract_id):
         """Return the state of the contract as a boolean. True if
@@ -62,11 +137,12 @@ class PermissionService:
             bool | None: True if the contract is signed, False
                 otherwise and None if not found.
         """
-        with self.uow:
+        def lookup():
             try:
                 return self.uow.contracts.get(contract_id).signed
             except AttributeError:
                 return None
+        return self._cached(CONTRACT_SIGNED, contract_id, lookup)
 
     def get_event_support(self, event_id):
         """Return the collaborator assigned to support the event.
@@ -78,11 +154,12 @@ class PermissionService:
             int | None: ID of the collaborator assigned to the event or
                 None if not found.
         """
-        with self.uow:
+        def lookup():
             try:
                 return self.uow.events.get(event_id).supporter_id
             except AttributeError:
                 return None
+        return self._cached(EVENT_SUPPORT, event_id, lookup)
 
     def get_event_associated_salesman(self, event_id):
         """Return the ID of the salesman linked to the contract for the
@@ -95,9 +172,10 @@ class PermissionService:
             int | None: ID of the salesman responsible for the given
                 event or 'None' if not found.
         """
-        with self.uow:
+        def lookup():
             try:
                 return self.uow.events.get(
                     event_id).contract.client.salesman_id
             except AttributeError:
                 return None
+        return self._cached(EVENT_SALESMAN, event_id, lookup)
@@ -7,8 +7,17 @@ Classes
     ClientDTO
     ContractDTO
     EventDTO
+    ExportReportDTO
+    ImportReportDTO
+    ReplicaTableDTO
+    SyncReportDTO
+    PushReportDTO
+    HasherProfileDTO
+    MetricsSummaryDTO
+    SlowQueryDTO
+    DiagnosticDTO
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
@@ -222,3 +231,245 @@ class EventDTO:
             supporter_id=event.supporter_id,
             contract_id=event.contract_id,
         )
+
+
+@dataclass(frozen=True, slots=True)
+class ExportReportDTO:
+    """Summary of a bulk export, exposes the measured throughput.
+
+    Attributes
+        resource (str): Name of the exported resource.
+        path (str): Path of the written gzip file.
+        fmt (str): Format of the export (csv, text or binary).
+        rows (int): Number of exported rows.
+        raw_bytes (int): Size of the data before compression.
+        file_bytes (int): Size of the written file.
+        seconds (float): Duration of the export.
+    """
+    resource: str
+    path: str
+    fmt: str
+    rows: int = 0
+    raw_bytes: int = 0
+    file_bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        """Number of rows exported per second.
+
+        Returns
+            float: Rows per second.
+        """
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self):
+        """Uncompressed megabytes exported per second.
+
+        Returns
+            float: Megabytes (10^6 bytes) per second.
+        """
+        if not self.seconds:
+            return 0.0
+        return self.raw_bytes / 1_000_000 / self.seconds
+
+
+@dataclass(frozen=True, slots=True)
+class ImportReportDTO:
+    """Summary of a bulk import, exposes the measured throughput.
+
+    Attributes
+        resource (str): Name of the imported resource.
+        path (str): Path of the read file.
+        rows_read (int): Number of records read from the file.
+        rows_imported (int): Number of rows written in the database.
+        rows_rejected (int): Number of records rejected.
+        rejects_path (str|None): Path of the rejects file, None if no
+            record has been rejected.
+        seconds (float): Duration of the import.
+    """
+    resource: str
+    path: str
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_rejected: int = 0
+    rejects_path: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        """Number of records processed per second.
+
+        Returns
+            float: Rows per second.
+        """
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class ReplicaTableDTO:
+    """Sync state of a table of the local replica.
+
+    Attributes
+        table (str): Name of the table.
+        rows (int): Number of rows in the replica.
+        synced_at (datetime): Local time of the last sync.
+        changed_at (datetime|None): Newest change pulled.
+        mode (str|None): "full" or "incremental" for the table of a
+            sync report, None for the state of the replica.
+        upserted (int): Number of rows pulled by the sync.
+        deleted (int): Number of rows deleted by the sync.
+    """
+    table: str
+    rows: int
+    synced_at: datetime
+    changed_at: datetime | None = None
+    mode: str | None = None
+    upserted: int = 0
+    deleted: int = 0
+
+    def age(self, now=None):
+        """Time elapsed since the last sync.
+
+        Args
+            now (datetime|None): The current local time, now when None.
+
+        Returns
+            timedelta: Time elapsed.
+        """
+        return (now or datetime.now()) - self.synced_at
+
+
+@dataclass(frozen=True, slots=True)
+class SyncReportDTO:
+    """Summary of a sync of the local replica.
+
+    Attributes
+        path (str): Path of the replica file.
+        tables (tuple[ReplicaTableDTO]): The synced tables.
+        seconds (float): Duration of the sync.
+    """
+    path: str
+    tables: tuple = ()
+    seconds: float = 0.0
+
+    @property
+    def rows_pulled(self):
+        """Number of rows pulled from the database.
+
+        Returns
+            int: Rows upserted in the replica.
+        """
+        return sum(table.upserted for table in self.tables)
+
+
+@dataclass(frozen=True, slots=True)
+class PushReportDTO:
+    """Summary of the replay of the offline journal.
+
+    Attributes
+        applied (int): Number of writes done.
+        conflicts (tuple[dict]): The writes not done, each with the
+            'reason' of the conflict.
+        kept (int): Number of writes left in the journal, written by
+            other collaborators.
+        conflicts_path (str|None): Path of the report of the conflicts.
+        seconds (float): Duration of the replay.
+    """
+    applied: int = 0
+    conflicts: tuple = ()
+    kept: int = 0
+    conflicts_path: str | None = None
+    seconds: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class HasherProfileDTO:
+    """Argon2 parameters of the password hasher and the latency they
+    have on the measuring machine.
+
+    Attributes
+        time_cost (int): Number of iterations.
+        memory_cost (int): Memory used by a hash, in KiB.
+        parallelism (int): Number of lanes.
+        seconds (float): Median duration of a hash.
+    """
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    seconds: float = 0.0
+
+    @property
+    def milliseconds(self):
+        """Median duration of a hash, in milliseconds.
+
+        Returns
+            float: Milliseconds.
+        """
+        return self.seconds * 1000
+
+
+@dataclass(frozen=True, slots=True)
+class MetricsSummaryDTO:
+    """Latency of a command for a role, over the recorded invocations.
+
+    Attributes
+        command (str): Name of the command, e.g. "client read".
+        role (str): Role of the user, "-" when unauthenticated.
+        invocations (int): Number of recorded invocations.
+        errors (int): Number of invocations that failed.
+        p50 (float): Median duration, in seconds.
+        p95 (float): 95th percentile of the duration, in seconds.
+        p99 (float): 99th percentile of the duration, in seconds.
+        seconds (float): Total duration of the invocations.
+        sql_p50 (float): Median number of SQL statements.
+        sql_p95 (float): 95th percentile of the SQL statements.
+    """
+    command: str
+    role: str
+    invocations: int
+    errors: int
+    p50: float
+    p95: float
+    p99: float
+    seconds: float
+    sql_p50: float
+    sql_p95: float
+
+
+@dataclass(frozen=True, slots=True)
+class SlowQueryDTO:
+    """Slow executions of a normalized statement.
+
+    Attributes
+        statement (str): The statement, without its literals.
+        count (int): Number of slow executions.
+        total_ms (float): Total duration of the executions.
+        max_ms (float): Duration of the slowest execution.
+        mean_ms (float): Mean duration of the executions.
+        callers (tuple[tuple[str, int]]): Code that executed the
+            statement and its number of executions, most frequent first.
+    """
+    statement: str
+    count: int
+    total_ms: float
+    max_ms: float
+    mean_ms: float
+    callers: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class DiagnosticDTO:
+    """Result of a check of 'eecrm doctor'.
+
+    Attributes
+        name (str): Name of the check, e.g. "round-trip".
+        status (str): "ok", "warn", "fail" or "skip".
+        summary (str): One line result, for the report.
+        details (dict): Measures of the check, JSON serializable.
+    """
+    name: str
+    status: str
+    summary: str
+    details: dict = field(default_factory=dict)
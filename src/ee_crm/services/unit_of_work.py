@@ -5,6 +5,9 @@ The following classes should be used as context manager.
 Classes
     AbstractUnitOfWork      # Abstract transaction service
     SqlAlchemyUnitOfWork    # SQLAlchemy implementation
+    JoinedUnitOfWork        # Join the transaction of an open one
+    ShardedUnitOfWork       # SQLAlchemy implementation over shards
+    InMemoryUnitOfWork      # In-memory implementation, no database
 
 References
     * Architecture Patterns with Python
@@ -12,11 +15,21 @@ https://www.cosmicpython.com/book/chapter_06_uow.html
 """
 from abc import ABC, abstractmethod
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from ee_crm.adapters import repositories as repo
-from ee_crm.config import get_postgres_uri
+from ee_crm.adapters.cache import track_table_versions
+from ee_crm.adapters.database import create_database_engine, \
+    create_uri_engine
+from ee_crm.adapters.memory_store import InMemorySession, InMemoryStore
+from ee_crm.adapters.replica import track_tombstones
+from ee_crm.adapters.routing import ReplicaRouter, RoutingSession
+from ee_crm.adapters.sharding import copy_reference_writes, \
+    create_shard_map, track_reference_writes
+from ee_crm.adapters.slow_queries import SlowQueryLog
+from ee_crm.config import get_attribute_cache_settings, \
+    get_query_cache_size, get_read_replica_settings, get_shard_settings, \
+    get_slow_query_settings
 
 
 class AbstractUnitOfWork(ABC):
@@ -62,10 +75,53 @@ class AbstractUnitOfWork(ABC):
 
 
 # Executed at import time, may be better to add a factory func that yield Sess
-DEFAULT_SESSION_FACTORY = sessionmaker(
-    bind=create_engine(get_postgres_uri()),
-    autoflush=True,
-)
+# PostgreSQL or SQLite depending on DB_BACKEND, see ee_crm.adapters.database
+DEFAULT_ENGINE = create_database_engine()
+
+# The read-only operations may read the replicas, see ee_crm.adapters.routing
+_read_replica_settings = get_read_replica_settings()
+DEFAULT_ROUTER = None
+if _read_replica_settings["uris"]:
+    DEFAULT_ROUTER = ReplicaRouter(
+        DEFAULT_ENGINE,
+        [create_uri_engine(uri)
+         for uri in _read_replica_settings["uris"]],
+        max_lag=_read_replica_settings["max_lag"],
+        check_interval=_read_replica_settings["check_interval"])
+    DEFAULT_SESSION_FACTORY = sessionmaker(
+        bind=DEFAULT_ENGINE,
+        autoflush=True,
+        class_=RoutingSession,
+        router=DEFAULT_ROUTER,
+    )
+else:
+    DEFAULT_SESSION_FACTORY = sessionmaker(
+        bind=DEFAULT_ENGINE,
+        autoflush=True,
+    )
+
+# The clients are sharded by region, see ee_crm.adapters.sharding
+DEFAULT_SHARD_MAP = create_shard_map(get_shard_settings())
+
+# The change counters of the tables are only read by the query and
+# attribute caches and by the replica router, see ee_crm.adapters.cache
+TRACK_TABLE_VERSIONS = (
+    DEFAULT_SHARD_MAP is None
+    and (get_query_cache_size() > 0
+         or get_attribute_cache_settings()["ttl"] > 0
+         or DEFAULT_ROUTER is not None))
+
+_slow_query_settings = get_slow_query_settings()
+if _slow_query_settings["threshold_ms"] > 0:
+    _slow_query_log = SlowQueryLog(
+        _slow_query_settings["path"],
+        threshold_ms=_slow_query_settings["threshold_ms"],
+        explain=_slow_query_settings["explain"])
+    _slow_query_log.install(DEFAULT_ENGINE)
+    for _replica in (DEFAULT_ROUTER.replicas if DEFAULT_ROUTER else ()):
+        _slow_query_log.install(_replica)
+    for _shard in (DEFAULT_SHARD_MAP.engines if DEFAULT_SHARD_MAP else ()):
+        _slow_query_log.install(_shard)
 
 
 class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
@@ -75,20 +131,189 @@ class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
     Attributes:
         session_factory (Session): Factory returning a SQLAlchemy
             session object.
+        cache (EntityCache|None): Second-level cache of entities shared
+            with other units of work, None to disable it for this one.
+        query_cache (QueryCache|None): Cache of the services query
+            results, None to disable it for this one.
+        track_versions (bool): Whether the commits bump the change
+            counters of the written tables, always when the unit of
+            work has a query cache.
     """
-    def __init__(self, session_factory=DEFAULT_SESSION_FACTORY):
+    def __init__(self, session_factory=DEFAULT_SESSION_FACTORY, cache=None,
+                 query_cache=None, track_versions=TRACK_TABLE_VERSIONS):
         self.session_factory = session_factory
+        self.cache = cache
+        self.query_cache = query_cache
+        self.track_versions = track_versions or query_cache is not None
 
     def __enter__(self):
         """Context manager protocol start.
-        Create a new session and attach repositories to it."""
+        Create a new session and attach repositories to it. The commits
+        of the session bump the versions of the written tables when
+        they are tracked, the flushes record the deleted rows for the
+        replicas, and the entity cache tracks it to invalidate the
+        entities it writes."""
         self.session = self.session_factory()
-        self.users = repo.SqlAlchemyUserRepository(self.session)
+        if self.track_versions:
+            track_table_versions(self.session)
+        track_tombstones(self.session)
+        if self.cache is not None:
+            self.cache.track(self.session)
+        self.users = repo.SqlAlchemyUserRepository(self.session, self.cache)
         self.collaborators = repo.SqlAlchemyCollaboratorRepository(
+            self.session, self.cache)
+        self.clients = repo.SqlAlchemyClientRepository(self.session,
+                                                       self.cache)
+        self.contracts = repo.SqlAlchemyContractRepository(self.session,
+                                                           self.cache)
+        self.events = repo.SqlAlchemyEventRepository(self.session,
+                                                     self.cache)
+        return super().__enter__()
+
+    def __exit__(self, *args):
+        """Context manager protocol end.
+        Rollback uncommited changes before closing the session."""
+        super().__exit__(*args)
+        self.session.close()
+
+    def _commit(self):
+        self.session.commit()
+
+    def rollback(self):
+        self.session.rollback()
+
+
+class ShardedUnitOfWork(AbstractUnitOfWork):
+    """SQLAlchemy implementation for unit of-work over the shards of
+    the database, see ee_crm.adapters.sharding. It opens a session per
+    shard: the clients, contracts and events repositories route to
+    them, the users and collaborators ones read the first shard and
+    their writes are copied to the other shards at commit. The shards
+    are committed in turn, not atomically. The exports, imports and
+    replica syncs, which stream SQL from a single session, aren't
+    supported.
+
+    Attributes:
+        shard_map (ShardMap): The shards.
+        cache (EntityCache|None): Second-level cache of entities shared
+            with other units of work, None to disable it for this one.
+        query_cache (None): No query cache, the versions of the tables
+            are counted by shard.
+    """
+    query_cache = None
+
+    def __init__(self, shard_map, cache=None):
+        self.shard_map = shard_map
+        self.cache = cache
+        self.session_factories = [sessionmaker(bind=engine, autoflush=True)
+                                  for engine in shard_map.engines]
+
+    def __enter__(self):
+        """Context manager protocol start.
+        Create a session per shard, tracked as the session of
+        SqlAlchemyUnitOfWork without the versions of the tables, no
+        cache reads them, and attach repositories to them. The first
+        one is the session of the unit of work."""
+        self.sessions = [factory() for factory in self.session_factories]
+        for session in self.sessions:
+            track_tombstones(session)
+            if self.cache is not None:
+                self.cache.track(session)
+        self.session = self.sessions[0]
+        track_reference_writes(self.session)
+        self.users = repo.SqlAlchemyUserRepository(self.session, self.cache)
+        self.collaborators = repo.SqlAlchemyCollaboratorRepository(
+            self.session, self.cache)
+        self.clients = repo.ShardedClientRepository(
+            [repo.SqlAlchemyClientRepository(session, self.cache)
+             for session in self.sessions], self.shard_map)
+        self.contracts = repo.ShardedContractRepository(
+            [repo.SqlAlchemyContractRepository(session, self.cache)
+             for session in self.sessions], self.shard_map)
+        self.events = repo.ShardedEventRepository(
+            [repo.SqlAlchemyEventRepository(session, self.cache)
+             for session in self.sessions], self.shard_map)
+        return super().__enter__()
+
+    def __exit__(self, *args):
+        """Context manager protocol end.
+        Rollback uncommited changes before closing the sessions."""
+        super().__exit__(*args)
+        for session in self.sessions:
+            session.close()
+
+    def _commit(self):
+        copy_reference_writes(self.session, self.sessions[1:])
+        for session in self.sessions:
+            session.commit()
+
+    def rollback(self):
+        for session in self.sessions:
+            session.rollback()
+
+
+class JoinedUnitOfWork(AbstractUnitOfWork):
+    """Unit of work joining the transaction of an open one, to run
+    several services in a single transaction (ex: the replay of the
+    offline journal). Its commits only flush the session and its exits
+    keep the changes, the open unit of work commits or rolls back the
+    whole transaction.
+
+    Attributes:
+        parent (SqlAlchemyUnitOfWork): The open unit of work.
+    """
+    def __init__(self, parent):
+        self.parent = parent
+        self.cache = None
+        self.query_cache = None
+
+    def __enter__(self):
+        """Context manager protocol start.
+        Share the session and the repositories of the open unit of
+        work."""
+        self.session = self.parent.session
+        self.users = self.parent.users
+        self.collaborators = self.parent.collaborators
+        self.clients = self.parent.clients
+        self.contracts = self.parent.contracts
+        self.events = self.parent.events
+        return super().__enter__()
+
+    def __exit__(self, *args):
+        """Context manager protocol end.
+        The changes are kept for the open unit of work."""
+
+    def _commit(self):
+        self.session.flush()
+
+    def rollback(self):
+        pass
+
+
+class InMemoryUnitOfWork(AbstractUnitOfWork):
+    """In-memory implementation for unit of-work, it wires five
+    repositories to a session of an in-memory store. No database and no
+    SQL, for the tests, the demos and the simulations; the exports and
+    imports, which stream SQL, aren't supported.
+
+    Attributes:
+        store (InMemoryStore): Entities shared with the other units of
+            work built on the same store, a new empty one by default.
+    """
+    def __init__(self, store=None):
+        self.store = InMemoryStore() if store is None else store
+
+    def __enter__(self):
+        """Context manager protocol start.
+        Open a new session on the store and attach repositories to it.
+        """
+        self.session = InMemorySession(self.store)
+        self.users = repo.InMemoryUserRepository(self.session)
+        self.collaborators = repo.InMemoryCollaboratorRepository(
             self.session)
-        self.clients = repo.SqlAlchemyClientRepository(self.session)
-        self.contracts = repo.SqlAlchemyContractRepository(self.session)
-        self.events = repo.SqlAlchemyEventRepository(self.session)
+        self.clients = repo.InMemoryClientRepository(self.session)
+        self.contracts = repo.InMemoryContractRepository(self.session)
+        self.events = repo.InMemoryEventRepository(self.session)
         return super().__enter__()
 
     def __exit__(self, *args):
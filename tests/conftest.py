@@ -1,21 +1,45 @@
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import cmp_to_key
+
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, clear_mappers
 
+from ee_crm.adapters.database import create_database_engine, \
+    create_schema
 from ee_crm.adapters.orm import mapper_registry, start_mappers
 from ee_crm.adapters.orm import (user_table, role_table, collaborator_table,
-                                 client_table, contract_table, event_table)
+                                 client_table, contract_table, event_table,
+                                 table_version_table, tombstone_table)
 from ee_crm.adapters.repositories import AbstractRepository
+from ee_crm.config import get_database_settings
 from ee_crm.services.unit_of_work import (AbstractUnitOfWork,
                                           SqlAlchemyUnitOfWork)
 
 
+@pytest.fixture(autouse=True)
+def no_shared_attribute_cache(mocker):
+    """Disable the access control attributes cache file, shared by the
+    processes, tests must not read the attributes of another database.
+    """
+    mocker.patch("ee_crm.controllers.auth.permission."
+                 "DEFAULT_ATTRIBUTE_CACHE", new=None)
+
+
 @pytest.fixture
-def db_engine():
+def db_engine(tmp_path):
     """SQLite in-memory database engine and schema creation.
     Remove the PostgreSQL specific schemas ('auth.x', 'crm.x') that will
     crash when using a in-memory SQLite database.
 
+    With TEST_DB_PROFILE=sqlite-file, the database is a SQLite file
+    tuned as the embedded backend of the application (WAL, pragmas),
+    created with its roles as by 'eecrm admin init-db', see
+    ee_crm.adapters.database. The fixtures insert partial datasets, so
+    the foreign keys aren't enforced, as on the in-memory database.
+
     Yields:
         sqlalchemy.engine.Engine: Configured engine.
     """
@@ -25,10 +49,43 @@ def db_engine():
     client_table.schema = None
     contract_table.schema = None
     event_table.schema = None
+    table_version_table.schema = None
+    tombstone_table.schema = None
+
+    if os.getenv("TEST_DB_PROFILE") == "sqlite-file":
+        engine = create_database_engine({
+            **get_database_settings(), "backend": "sqlite",
+            "sqlite_path": str(tmp_path / "crm.db")})
+        event.listen(engine, "connect", lambda dbapi_conn, _: (
+            dbapi_conn.execute("PRAGMA foreign_keys=OFF")))
+        create_schema(engine)
+    else:
+        engine = create_engine('sqlite:///:memory:')
+        mapper_registry.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
 
-    engine = create_engine('sqlite:///:memory:')
-    mapper_registry.metadata.create_all(engine)
+
+@pytest.fixture
+def sqlite_profile_engine(tmp_path, monkeypatch):
+    """SQLite file engine tuned as the embedded backend of the
+    application, without table. The tables keep their PostgreSQL
+    schemas ('auth.x', 'crm.x'), translated by the engine.
+
+    Yields:
+        sqlalchemy.engine.Engine: Configured engine.
+    """
+    monkeypatch.setattr(user_table, "schema", "auth")
+    for table in (role_table, collaborator_table, client_table,
+                  contract_table, event_table, table_version_table,
+                  tombstone_table):
+        monkeypatch.setattr(table, "schema", "crm")
+    engine = create_database_engine({
+        **get_database_settings(), "backend": "sqlite",
+        "sqlite_path": str(tmp_path / "profile" / "crm.db"),
+        "busy_timeout_ms": 200})
     yield engine
+    engine.dispose()
 
 
 @pytest.fixture
@@ -93,7 +150,8 @@ def session(session_factory):
 @pytest.fixture
 def in_memory_uow(session_factory):
     """Factory that build a new SqlAlchemyUnitOfWork instance linked to
-    the in-memory SQLite database.
+    the in-memory SQLite database. Its commits bump the change counters,
+    as they do once a cache is enabled.
 
     Args:
         session_factory (sqlalchemy.orm.sessionmaker): SqlAlchemy
@@ -104,7 +162,8 @@ def in_memory_uow(session_factory):
             SqlAlchemyUnitOfWork.
     """
     def factory():
-        return SqlAlchemyUnitOfWork(session_factory=session_factory)
+        return SqlAlchemyUnitOfWork(session_factory=session_factory,
+                                    track_versions=True)
     return factory
 
 
@@ -200,6 +259,78 @@ def init_db_table_event(session):
     session.commit()
 
 
+class SqlBudget:
+    """Count the SQL statements executed on the in-memory database and
+    fail a test when a block exceeds its budget.
+
+    A statement executed several times with different parameters in the
+    same block is reported as an N+1 pattern (e.g. a lazy load of
+    'Contract.client' for every contract of a listing). The savepoints
+    opened by the sessions of the tests aren't counted.
+
+    Usage:
+        with sql_budget(3):
+            controller.read()
+    """
+    _savepoint_prefixes = ("SAVEPOINT", "RELEASE SAVEPOINT",
+                           "ROLLBACK TO SAVEPOINT")
+
+    def __init__(self):
+        self.statements = []
+
+    def record(self, conn, cursor, statement, parameters, context,
+               executemany):
+        if not statement.startswith(self._savepoint_prefixes):
+            self.statements.append((statement, parameters))
+
+    @contextmanager
+    def __call__(self, max_statements, max_repeats=2):
+        """Check the statements executed in the block.
+
+        Args:
+            max_statements (int): Budget of statements of the block.
+            max_repeats (int): Maximum executions of a same statement
+                with different parameters.
+        """
+        start = len(self.statements)
+        try:
+            yield self
+        finally:
+            self._check(self.statements[start:], max_statements,
+                        max_repeats)
+
+    @staticmethod
+    def _check(executed, max_statements, max_repeats):
+        listing = "\n".join(f"  {' '.join(statement.split())} "
+                            f"{parameters}"
+                            for statement, parameters in executed)
+        if len(executed) > max_statements:
+            pytest.fail(f"{len(executed)} SQL statements executed, budget "
+                        f"is {max_statements}:\n{listing}", pytrace=False)
+        parameters_by_statement = defaultdict(set)
+        for statement, parameters in executed:
+            parameters_by_statement[statement].add(repr(parameters))
+        for statement, parameters in parameters_by_statement.items():
+            if len(parameters) > max_repeats:
+                pytest.fail(f"N+1 pattern, statement executed with "
+                            f"{len(parameters)} different parameters: "
+                            f"{' '.join(statement.split())}\n{listing}",
+                            pytrace=False)
+
+
+@pytest.fixture
+def sql_budget(connection):
+    """Budget of SQL statements for a block, see SqlBudget.
+
+    Yields:
+        SqlBudget: Callable returning the checking context manager.
+    """
+    budget = SqlBudget()
+    event.listen(connection, "before_cursor_execute", budget.record)
+    yield budget
+    event.remove(connection, "before_cursor_execute", budget.record)
+
+
 class FakeRepository(AbstractRepository):
     """Dictionary in-memory implementation of AbstractRepository.
     No DB needed. Used for unit tests.
@@ -315,6 +446,45 @@ class FakeRepository(AbstractRepository):
             None
         )
 
+    def _page(self, sort=None, after=None, limit=50, **filters):
+        """Return a page of the filtered objects after a keyset cursor,
+        ordered as the SQLAlchemy implementation, null values last.
+
+        Args:
+            sort (list[str, bool]): list of fields and direction to
+                sort data.
+            after (tuple|None): keyset cursor, values of the sorted
+                fields then id.
+            limit (int): maximum number of objects.
+            filters (dict[str, obj]): filters to apply.
+
+        Returns:
+            list: list of objects.
+        """
+        keyset = list(sort or ())
+        if not any(field == "id" for field, _ in keyset):
+            keyset.append(("id", False))
+
+        def compare(values, others):
+            for (_, is_desc), value, other in zip(keyset, values, others):
+                if value == other:
+                    continue
+                if value is None or other is None:
+                    return 1 if value is None else -1
+                return (value > other) - (value < other) if not is_desc \
+                    else (value < other) - (value > other)
+            return 0
+
+        def values(obj):
+            return tuple(getattr(obj, field) for field, _ in keyset)
+
+        rows = sorted(self._filter(**filters),
+                      key=cmp_to_key(lambda a, b: compare(values(a),
+                                                          values(b))))
+        if after is not None:
+            rows = [obj for obj in rows if compare(values(obj), after) > 0]
+        return rows[:limit]
+
 #
 # class FakeContractRepository(FakeRepository, ContractAbstractRepository):
 #     """unused as of 2025-07-18"""
@@ -0,0 +1,140 @@
+"""Integration tests for ee_crm.adapters.database
+
+Fixtures
+    sqlite_profile_engine
+        SQLite file engine tuned as the embedded backend, the tables
+        keep their PostgreSQL schemas.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import clear_mappers, configure_mappers, sessionmaker
+
+from ee_crm.adapters.database import create_database_engine, \
+    create_schema, is_unreachable, sqlite_pragmas
+from ee_crm.adapters.orm import start_mappers
+from ee_crm.config import get_database_settings
+from ee_crm.domain.model import Client
+from ee_crm.services.unit_of_work import SqlAlchemyUnitOfWork
+
+
+@pytest.fixture
+def mappers():
+    start_mappers()
+    configure_mappers()
+    yield
+    clear_mappers()
+
+
+def test_sqlite_pragmas():
+    settings = {**get_database_settings(), "synchronous": "NORMAL",
+                "cache_size_kib": 1024, "mmap_size": 0,
+                "busy_timeout_ms": 50}
+
+    pragmas = sqlite_pragmas(settings)
+
+    assert pragmas[0] == "PRAGMA journal_mode=WAL"
+    assert "PRAGMA cache_size=-1024" in pragmas
+    assert "PRAGMA busy_timeout=50" in pragmas
+    assert "PRAGMA foreign_keys=ON" in pragmas
+    assert sqlite_pragmas(settings, memory=True) == pragmas[1:]
+    with pytest.raises(ValueError):
+        sqlite_pragmas({**settings, "synchronous": "SOMETIMES"})
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_database_engine({**get_database_settings(),
+                                "backend": "oracle"})
+
+
+def test_profile_tunes_every_connection(sqlite_profile_engine):
+    with sqlite_profile_engine.connect() as conn:
+        pragmas = {name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+                   for name in ("journal_mode", "synchronous",
+                                "busy_timeout", "foreign_keys")}
+
+    assert pragmas == {"journal_mode": "wal", "synchronous": 1,
+                       "busy_timeout": 200, "foreign_keys": 1}
+
+
+def test_create_schema_keeps_the_existing_tables(sqlite_profile_engine):
+    created = create_schema(sqlite_profile_engine)
+    again = create_schema(sqlite_profile_engine)
+
+    with sqlite_profile_engine.connect() as conn:
+        roles = conn.execute(text("SELECT role FROM role")).scalars().all()
+        counters = conn.execute(text(
+            "SELECT count(*) FROM table_version")).scalar()
+    assert set(created) == {"users", "role", "collaborator", "client",
+                            "contract", "event", "table_version",
+                            "tombstone"}
+    assert again == []
+    assert roles == ["Deactivated", "Admin", "Management", "Sales",
+                     "Support"]
+    assert counters == 5
+
+
+def test_foreign_keys_are_enforced(sqlite_profile_engine):
+    create_schema(sqlite_profile_engine)
+
+    with pytest.raises(IntegrityError):
+        with sqlite_profile_engine.begin() as conn:
+            conn.execute(text("INSERT INTO event (title, contract_id) "
+                              "VALUES ('orphan', 99)"))
+
+
+def test_units_of_work_on_translated_schemas(sqlite_profile_engine,
+                                             mappers):
+    create_schema(sqlite_profile_engine)
+    with sqlite_profile_engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (username, password) "
+                          "VALUES ('sales', 'hash')"))
+        conn.execute(text("INSERT INTO collaborator (role_id, user_id) "
+                          "VALUES (4, 1)"))
+    factory = sessionmaker(bind=sqlite_profile_engine, autoflush=True)
+    with SqlAlchemyUnitOfWork(session_factory=factory,
+                              track_versions=True) as uow:
+        for name in ("Lefebvre", "Martin", None):
+            uow.clients.add(Client.builder(last_name=name, salesman_id=1))
+        uow.commit()
+
+    with SqlAlchemyUnitOfWork(session_factory=factory) as uow:
+        first = uow.clients.page(sort=(("last_name", False),), limit=2)
+        rest = uow.clients.page(sort=(("last_name", False),),
+                                after=("Martin", first[-1].id), limit=2)
+        names = [c.last_name for c in (*first, *rest)]
+        versions = dict(uow.session.execute(text(
+            "SELECT table_name, version FROM table_version")).all())
+
+    assert names == ["Lefebvre", "Martin", None]
+    assert versions["client"] == 1
+
+
+def test_readers_dont_wait_for_the_writer(sqlite_profile_engine):
+    create_schema(sqlite_profile_engine)
+    insert = text("INSERT INTO client (last_name) VALUES ('writer')")
+
+    with sqlite_profile_engine.connect() as writer:
+        writer.execute(insert)
+        with sqlite_profile_engine.connect() as reader:
+            count = reader.execute(text(
+                "SELECT count(*) FROM client")).scalar()
+            with pytest.raises(OperationalError, match="locked"):
+                reader.execute(insert)
+        writer.commit()
+
+    assert count == 0
+
+
+def test_is_unreachable(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'crm.db'}")
+    with pytest.raises(OperationalError) as unreachable:
+        engine.connect()
+    locked = OperationalError("INSERT", {}, Exception("database is locked"))
+    constraint = IntegrityError("INSERT", {}, Exception("UNIQUE"))
+
+    assert is_unreachable(unreachable.value)
+    assert not is_unreachable(locked)
+    assert not is_unreachable(constraint)
+    assert not is_unreachable(ValueError())
@@ -14,10 +14,18 @@ Fixtures
         create and populate the table linked to the Collaborator model.
     init_db_table_client
         create and populate the table linked to the Client model.
+    init_db_table_contract
+        create and populate the table linked to the Contract model.
+    sql_budget
+        Fail a block exceeding its budget of SQL statements.
 """
 import datetime
 
-from ee_crm.domain.model import AuthUser, Collaborator, Client
+import pytest
+from sqlalchemy import select
+
+from ee_crm.adapters.orm import client_table
+from ee_crm.domain.model import AuthUser, Collaborator, Client, Contract
 
 
 class TestRelationship:
@@ -165,4 +173,66 @@ class TestRelationship:
         assert client_3.salesman_id == collaborator_2.id
         assert client_4.salesman_id == collaborator_2.id
 
+    def test_lazy_loads_flagged_as_n_plus_one(self, session, sql_budget,
+                                              init_db_table_client,
+                                              init_db_table_contract):
+        """Verify that the sql_budget fixture flags the lazy loads of a
+        relationship over a listing."""
+        contracts = session.scalars(select(Contract)).all()
+
+        with pytest.raises(pytest.fail.Exception, match=r"N\+1 pattern"):
+            with sql_budget(10):
+                [contract.client for contract in contracts]
+
+
+
+class TestUpdatedAt:
+    """Class to test that the database sets the 'updated_at' of the
+    written rows, whatever the clock of the machine."""
+
+    @staticmethod
+    def stored(session, client_id):
+        return session.execute(select(client_table.c.updated_at).where(
+            client_table.c.client_id == client_id)).scalar()
+
+    @staticmethod
+    def utc_now():
+        return datetime.datetime.now(datetime.timezone.utc).replace(
+            tzinfo=None)
+
+    def test_changed_row_stamped_by_the_database(self, session,
+                                                 init_db_table_client):
+        client = session.get(Client, 1)
+        client.last_name = "changed"
+        skewed = datetime.datetime(2000, 1, 1)
+        client._updated_at = skewed
+
+        before = self.utc_now() - datetime.timedelta(seconds=1)
+        session.commit()
+
+        assert before <= self.stored(session, 1) <= self.utc_now()
+        assert client.updated_at == self.stored(session, 1)
+
+    def test_inserted_row_stamped_by_the_database(self, session,
+                                                  init_db_table_client):
+        client = Client(last_name="new",
+                        _updated_at=datetime.datetime(2000, 1, 1))
+        session.add(client)
+
+        before = self.utc_now() - datetime.timedelta(seconds=1)
+        session.commit()
+
+        assert before <= self.stored(session, client.id) <= self.utc_now()
+
+    def test_unchanged_row_keeps_its_time(self, session,
+                                          init_db_table_client):
+        stored = self.stored(session, 1)
+        client = session.get(Client, 1)
+        client.contracts.append(Contract.builder(total_amount=10,
+                                                 client_id=1))
+
+        session.commit()
+
+        assert self.stored(session, 1) == stored
+
 # see later if it's useful to test other tables
@@ -0,0 +1,171 @@
+"""Integration tests for ee_crm.adapters.routing
+
+Two SQLite files play the primary database and its read replica, the
+replication is a copy of the tables of the primary.
+
+Fixtures
+    sqlite_profile_engine
+        SQLite file engine tuned as the embedded backend, the tables
+        keep their PostgreSQL schemas.
+"""
+import pytest
+from sqlalchemy import create_engine, delete, insert, select, text
+from sqlalchemy.orm import clear_mappers, configure_mappers, sessionmaker
+
+from ee_crm.adapters.database import create_uri_engine, \
+    create_schema
+from ee_crm.adapters.orm import mapper_registry, start_mappers
+from ee_crm.adapters.routing import ReplicaRouter, RoutingSession
+from ee_crm.services.app.clients import ClientService
+from ee_crm.services.auth.permissions import PermissionService
+from ee_crm.services.unit_of_work import SqlAlchemyUnitOfWork
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def mappers():
+    start_mappers()
+    configure_mappers()
+    yield
+    clear_mappers()
+
+
+@pytest.fixture
+def primary(sqlite_profile_engine, mappers):
+    create_schema(sqlite_profile_engine)
+    with sqlite_profile_engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (username, password) "
+                          "VALUES ('sales', 'hash')"))
+        conn.execute(text("INSERT INTO collaborator (role_id, user_id) "
+                          "VALUES (4, 1)"))
+        conn.execute(text("INSERT INTO client (last_name, salesman_id) "
+                          "VALUES ('primary', 1)"))
+    return sqlite_profile_engine
+
+
+@pytest.fixture
+def replica(tmp_path, primary):
+    engine = create_uri_engine(
+        f"sqlite:///{tmp_path / 'replica' / 'crm.db'}")
+    create_schema(engine)
+    replicate(primary, engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def router(primary, replica, clock):
+    return ReplicaRouter(primary, [replica], max_lag=5, check_interval=0,
+                         clock=clock)
+
+
+@pytest.fixture
+def uow(primary, router):
+    factory = sessionmaker(bind=primary, autoflush=True,
+                           class_=RoutingSession, router=router)
+    return lambda: SqlAlchemyUnitOfWork(session_factory=factory,
+                                        track_versions=True)
+
+
+def replicate(primary, replica):
+    """Copy the tables of the primary into the replica."""
+    tables = mapper_registry.metadata.sorted_tables
+    with primary.connect() as source, replica.begin() as target:
+        for table in reversed(tables):
+            target.execute(delete(table))
+        for table in tables:
+            rows = [row._asdict() for row in source.execute(select(table))]
+            if rows:
+                target.execute(insert(table), rows)
+
+
+def rename_on(engine, last_name):
+    """Rename the client on a database, without changing its version."""
+    with engine.begin() as conn:
+        conn.execute(text(f"UPDATE client SET last_name = '{last_name}'"))
+
+
+def last_names(uow):
+    return [c.last_name for c in ClientService(uow()).retrieve_all()]
+
+
+def test_read_only_operations_read_the_replica(uow, replica):
+    rename_on(replica, "replica")
+
+    client, = ClientService(uow()).retrieve(1)
+
+    assert client.last_name == "replica"
+    assert last_names(uow) == ["replica"]
+    assert PermissionService(uow()).get_client_associated_salesman(1) == 1
+
+
+def test_writes_go_to_the_primary(uow, primary, replica):
+    ClientService(uow()).create(salesman_id=1, last_name="new")
+    ClientService(uow()).modify(1, first_name="changed")
+
+    with primary.connect() as conn:
+        rows = conn.execute(text("SELECT last_name, first_name FROM client "
+                                 "ORDER BY client_id")).all()
+    with replica.connect() as conn:
+        count = conn.execute(text("SELECT count(*) FROM client")).scalar()
+    assert [tuple(row) for row in rows] == [("primary", "changed"),
+                                            ("new", None)]
+    assert count == 1
+
+
+def test_reads_its_writes_until_the_replica_caught_up(uow, primary,
+                                                      replica, clock):
+    rename_on(replica, "replica")
+    ClientService(uow()).create(salesman_id=1, last_name="new")
+    clock.now += 1
+
+    before = last_names(uow)
+    replicate(primary, replica)
+    rename_on(replica, "replica")
+    clock.now += 1
+    after = last_names(uow)
+
+    assert before == ["primary", "new"]
+    assert after == ["replica", "replica"]
+
+
+def test_lagging_replica_falls_back_to_the_primary(uow, primary, replica,
+                                                   clock):
+    rename_on(replica, "replica")
+    assert last_names(uow) == ["replica"]
+    writer = sessionmaker(bind=primary, autoflush=True)
+    ClientService(SqlAlchemyUnitOfWork(session_factory=writer,
+                                       track_versions=True)).modify(
+        1, first_name="other process")
+
+    clock.now += 4
+    within_lag = last_names(uow)
+    clock.now += 2
+    behind = last_names(uow)
+
+    assert within_lag == ["replica"]
+    assert behind == ["primary"]
+
+
+def test_unreachable_replica_falls_back(tmp_path, primary, replica, clock):
+    missing = create_engine(f"sqlite:///{tmp_path / 'missing' / 'crm.db'}")
+    router = ReplicaRouter(primary, [missing, replica], check_interval=0,
+                           clock=clock)
+
+    chosen = {router.choose() for _ in range(4)}
+
+    assert chosen == {replica}
+    assert router.lag(missing) is None
+    assert router.lag(replica) == 0
@@ -0,0 +1,179 @@
+"""Integration tests for ee_crm.adapters.sharding
+
+Three SQLite files are the shards 'north', 'south' and 'east', each
+salesman has its region: the clients of the salesmen 2, 3 and 4 are in
+the south, east and north shards.
+
+Fixtures
+    sqlite_profile_engine
+        SQLite file engine tuned as the embedded backend, the tables
+        keep their PostgreSQL schemas.
+    bypass_permission_sales
+        mock the payload returned by decoding a JWT representing a
+        specific SALES person.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import clear_mappers, configure_mappers
+
+from ee_crm.adapters.database import create_uri_engine
+from ee_crm.adapters.orm import start_mappers
+from ee_crm.adapters.sharding import SHARD_ID_RANGE, ShardMap
+from ee_crm.controllers.app.client import ClientManager
+from ee_crm.controllers.app.database import init_database
+from ee_crm.controllers.auth.permission import AuthorizationDenied
+from ee_crm.domain.model import Role
+from ee_crm.exceptions import ExportServiceError, ImportServiceError, \
+    ReplicaServiceError
+from ee_crm.services.app.clients import ClientService
+from ee_crm.services.app.collaborators import CollaboratorService
+from ee_crm.services.app.contracts import ContractService
+from ee_crm.services.app.events import EventService
+from ee_crm.services.app.exports import ExportService
+from ee_crm.services.app.imports import ImportService
+from ee_crm.services.app.replica import ReplicaService
+from ee_crm.services.auth.permissions import PermissionService
+from ee_crm.services.unit_of_work import ShardedUnitOfWork
+
+PASSWORD = "Secret-pass1"
+
+
+@pytest.fixture
+def mappers():
+    start_mappers()
+    configure_mappers()
+    yield
+    clear_mappers()
+
+
+@pytest.fixture
+def shard_map(tmp_path, sqlite_profile_engine, mappers):
+    engines = [sqlite_profile_engine] + [
+        create_uri_engine(f"sqlite:///{tmp_path / name / 'crm.db'}")
+        for name in ("south", "east")]
+    yield ShardMap(list(zip(("north", "south", "east"), engines)),
+                   {2: "south", 3: "east", 4: "north"})
+    for engine in engines[1:]:
+        engine.dispose()
+
+
+@pytest.fixture
+def uow(shard_map):
+    def factory():
+        return ShardedUnitOfWork(shard_map)
+
+    init_database("boss", PASSWORD, uow=factory(), shard_map=shard_map)
+    for username in ("sales_s", "sales_e", "sales_n"):
+        CollaboratorService(factory()).create(username, PASSWORD,
+                                              role=Role.SALES)
+    return factory
+
+
+def rows(engine, query):
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(text(query))]
+
+
+def create_clients(uow):
+    service = ClientService(uow())
+    return [service.create(salesman_id=salesman_id,
+                           last_name=last_name)[0].id
+            for salesman_id, last_name in ((2, "b"), (3, "a"), (4, "d"),
+                                           (2, "c"), (3, "e"))]
+
+
+def test_shard_map_routes_the_salesmen_and_the_ids():
+    shard_map = ShardMap([("north", None), ("south", None)], {7: "north"})
+
+    assert [shard_map.for_salesman(s) for s in (None, 7, 3, 4)] == \
+        [0, 0, 1, 0]
+    assert [shard_map.for_id(i) for i in
+            (1, SHARD_ID_RANGE, SHARD_ID_RANGE + 1, 2 * SHARD_ID_RANGE + 1,
+             None, "1")] == [0, 0, 1, None, None, None]
+
+
+def test_a_client_its_contracts_and_events_share_a_shard(shard_map, uow):
+    client_id, = ClientService(uow()).create(salesman_id=2,
+                                             last_name="south")[0].id,
+    contract_id = ContractService(uow()).create(client_id=client_id,
+                                                total_amount=100)[0].id
+    ContractService(uow()).sign_contract(contract_id)
+    event_id = EventService(uow()).create(contract_id=contract_id)[0].id
+
+    north, south, east = shard_map.engines
+    assert (client_id, contract_id, event_id) == (SHARD_ID_RANGE + 1,) * 3
+    assert rows(south, "SELECT client_id FROM client") == [(client_id,)]
+    assert rows(south, "SELECT event_id, contract_id FROM event") == \
+        [(event_id, contract_id)]
+    assert rows(north, "SELECT count(*) FROM contract") == [(0,)]
+    assert rows(east, "SELECT count(*) FROM client") == [(0,)]
+    client, = ClientService(uow()).retrieve(client_id)
+    assert client.last_name == "south"
+
+
+def test_lists_are_merged_across_the_shards(uow):
+    create_clients(uow)
+    service = ClientService(uow())
+
+    ordered = service.retrieve_all(sort=(("last_name", False),))
+    reverse = service.retrieve_all(sort=(("last_name", True),))
+    filtered = service.filter(sort=(("last_name", False),), salesman_id=2)
+
+    assert [c.last_name for c in ordered] == ["a", "b", "c", "d", "e"]
+    assert [c.last_name for c in reverse] == ["e", "d", "c", "b", "a"]
+    assert [c.last_name for c in filtered] == ["b", "c"]
+
+
+def test_pages_are_merged_across_the_shards(uow):
+    create_clients(uow)
+    service = ClientService(uow())
+    sort = (("last_name", True),)
+
+    first, cursor = service.page(sort=sort, limit=2)
+    second, cursor = service.page(sort=sort, after=cursor, limit=2)
+    third, cursor = service.page(sort=sort, after=cursor, limit=2)
+
+    assert [[c.last_name for c in page] for page in (first, second, third)] \
+        == [["e", "d"], ["c", "b"], ["a"]]
+    assert cursor is None
+
+
+def test_collaborators_are_copied_to_every_shard(shard_map, uow):
+    create_clients(uow)
+    CollaboratorService(uow()).assign_role(4, Role.SUPPORT)
+    CollaboratorService(uow()).remove(collaborator_id=2)
+
+    for engine in shard_map.engines:
+        assert rows(engine, "SELECT collaborator_id, role_id FROM "
+                            "collaborator ORDER BY collaborator_id") == \
+            [(1, Role.MANAGEMENT), (3, Role.SALES), (4, Role.SUPPORT)]
+        assert rows(engine, "SELECT username FROM users ORDER BY user_id"
+                    ) == [("boss",), ("sales_e",), ("sales_n",)]
+    assert rows(shard_map.engines[1], "SELECT salesman_id FROM client") == \
+        [(None,), (None,)]
+
+
+def test_managers_and_permissions_work_unchanged(mocker, uow,
+                                                 bypass_permission_sales):
+    mine, other = create_clients(uow)[:2]
+    mocker.patch("ee_crm.controllers.auth.permission.DEFAULT_UOW",
+                 side_effect=uow)
+    manager = ClientManager(ClientService(uow()))
+
+    manager.update(pk=mine, last_name="mine")
+
+    assert PermissionService(uow()).get_client_associated_salesman(
+        other) == 3
+    assert manager.read(mine)[0].last_name == "mine"
+    with pytest.raises(AuthorizationDenied):
+        manager.update(pk=other, last_name="other")
+
+
+def test_single_database_operations_are_refused(tmp_path, uow):
+    with pytest.raises(ExportServiceError, match="sharded"):
+        ExportService(uow()).export("clients", str(tmp_path / "c.gz"))
+    with pytest.raises(ImportServiceError, match="sharded"):
+        ImportService(uow()).import_file("clients", str(tmp_path / "c.csv"),
+                                         salesman_id=2)
+    with pytest.raises(ReplicaServiceError, match="sharded"):
+        ReplicaService(uow(), None).sync(["client"], collaborator_id=1)
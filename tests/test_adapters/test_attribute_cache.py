@@ -0,0 +1,90 @@
+"""Unit tests for ee_crm.adapters.attribute_cache
+
+Every test maps its own cache file in a temporary directory.
+"""
+import pytest
+
+from ee_crm.adapters.attribute_cache import SharedAttributeCache, \
+    CLIENT_SALESMAN, CONTRACT_SIGNED, EVENT_SUPPORT
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "storage" / "abac.cache"
+
+
+@pytest.fixture
+def cache(cache_path, clock):
+    attribute_cache = SharedAttributeCache(cache_path, slots=8, ttl=10,
+                                           clock=clock)
+    yield attribute_cache
+    attribute_cache.close()
+
+
+def test_put_and_get(cache):
+    cache.put(CLIENT_SALESMAN, 1, 2, stamp=5)
+    cache.put(EVENT_SUPPORT, 1, None, stamp=5)
+
+    assert cache.get(CLIENT_SALESMAN, 1, stamp=5) == (True, 2)
+    assert cache.get(EVENT_SUPPORT, 1, stamp=5) == (True, None)
+    assert cache.get(CONTRACT_SIGNED, 1, stamp=5) == (False, None)
+    assert cache.stats() == {"hits": 2, "misses": 1}
+
+
+def test_get_outdated_stamp(cache):
+    cache.put(CLIENT_SALESMAN, 1, 2, stamp=5)
+
+    assert cache.get(CLIENT_SALESMAN, 1, stamp=6) == (False, None)
+
+
+def test_get_expired(cache, clock):
+    cache.put(CLIENT_SALESMAN, 1, 2, stamp=5)
+    clock.now += 10
+
+    assert cache.get(CLIENT_SALESMAN, 1, stamp=5) == (False, None)
+
+
+def test_collision_overwrites_slot(cache):
+    cache.put(CLIENT_SALESMAN, 1, 2, stamp=0)
+    cache.put(CLIENT_SALESMAN, 9, 3, stamp=0)
+
+    assert cache.get(CLIENT_SALESMAN, 1, stamp=0) == (False, None)
+    assert cache.get(CLIENT_SALESMAN, 9, stamp=0) == (True, 3)
+
+
+def test_shared_between_instances(cache, cache_path, clock):
+    cache.put(CLIENT_SALESMAN, 1, 2, stamp=0)
+    other = SharedAttributeCache(cache_path, slots=8, ttl=10, clock=clock)
+
+    assert other.get(CLIENT_SALESMAN, 1, stamp=0) == (True, 2)
+    other.close()
+
+
+def test_file_reset_on_format_change(cache, cache_path, clock):
+    cache.put(CLIENT_SALESMAN, 1, 2, stamp=0)
+    cache.close()
+    other = SharedAttributeCache(cache_path, slots=16, ttl=10, clock=clock)
+
+    assert other.get(CLIENT_SALESMAN, 1, stamp=0) == (False, None)
+    other.close()
+
+
+def test_torn_slot_is_a_miss(cache, cache_path):
+    cache.put(CLIENT_SALESMAN, 1, 2, stamp=0)
+    offset = cache._offset(CLIENT_SALESMAN, 1)
+    cache._open()[offset + 9] ^= 0xFF
+
+    assert cache.get(CLIENT_SALESMAN, 1, stamp=0) == (False, None)
@@ -0,0 +1,116 @@
+"""Unit test for ee_crm.adapters.bulk
+
+These tests use a SQLite in-memory database, with a session created and
+populated for each test. The COPY path needs a PostgreSQL server and is
+not covered here.
+
+Fixtures
+    session
+        SQLAlchemy session object bound to the in-memory test SQLite
+        database.
+    init_db_table_client
+        create and populate the table linked to the Client model.
+"""
+import gzip
+from datetime import datetime
+
+from sqlalchemy import select
+
+from ee_crm.adapters import bulk
+from ee_crm.adapters.orm import client_table
+
+
+def test_is_postgresql_false_on_sqlite(session):
+    assert bulk.is_postgresql(session.connection()) is False
+
+
+def test_iter_table_keyset_chunks(session, init_db_table_client):
+    chunks = list(bulk.iter_table_keyset(session.connection(),
+                                         client_table, chunk_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    assert [row.client_id for chunk in chunks for row in chunk] == \
+           [1, 2, 3, 4]
+
+
+def test_iter_table_keyset_exact_chunk_size(session, init_db_table_client):
+    chunks = list(bulk.iter_table_keyset(session.connection(),
+                                         client_table, chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+
+
+def test_iter_table_keyset_empty_table(session):
+    chunks = list(bulk.iter_table_keyset(session.connection(),
+                                         client_table))
+
+    assert chunks == []
+
+
+def test_encode_rows_csv_with_header():
+    rows = [(1, "a,b", None, True, datetime(2025, 1, 1, 12, 30))]
+    encoded = bulk.encode_rows(rows, fmt="csv", header=["id", "name", "x",
+                                                        "flag", "at"])
+
+    assert encoded == (b'id,name,x,flag,at\n'
+                       b'1,"a,b",,t,2025-01-01 12:30:00\n')
+
+
+def test_encode_rows_text_escapes():
+    rows = [(1, "tab\there", None, "back\\slash\nnew", False)]
+    encoded = bulk.encode_rows(rows, fmt="text")
+
+    assert encoded == b'1\ttab\\there\t\\N\tback\\\\slash\\nnew\tf\n'
+
+
+def test_read_records_csv_empty_cells_are_none(tmp_path):
+    path = tmp_path / "clients.csv"
+    path.write_text("last_name,email\nDoe,\n\"Roe, Jr\",r@mail\n",
+                    encoding="utf-8")
+
+    records = list(bulk.read_records(path))
+
+    assert records == [(2, {"last_name": "Doe", "email": None}),
+                       (3, {"last_name": "Roe, Jr", "email": "r@mail"})]
+
+
+def test_read_records_jsonl_gzip_skips_blank_lines(tmp_path):
+    path = tmp_path / "clients.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write('{"last_name": "Doe"}\n\n{"last_name": "Roe"}\n')
+
+    records = list(bulk.read_records(path, fmt="jsonl"))
+
+    assert records == [(1, {"last_name": "Doe"}), (3, {"last_name": "Roe"})]
+
+
+def test_read_records_jsonl_malformed_lines_are_read_as_text(tmp_path):
+    path = tmp_path / "clients.jsonl"
+    path.write_text('{bad json\n[1, 2]\n', encoding="utf-8")
+
+    records = list(bulk.read_records(path, fmt="jsonl"))
+
+    assert records == [(1, "{bad json"), (2, [1, 2])]
+
+
+def test_iter_chunks():
+    assert list(bulk.iter_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_staging_insert_and_merge(session, init_db_table_client):
+    connection = session.connection()
+    staging = bulk.create_staging_table(connection, client_table)
+    columns = [col.name for col in staging.columns]
+    rows = [dict.fromkeys(columns) | {"line_no": n, "last_name": f"ln_{n}"}
+            for n in (3, 2)]
+
+    assert bulk.insert_rows(connection, staging, rows) == 2
+    inserted = bulk.merge_staging(connection, staging, client_table,
+                                  where=staging.c.line_no > 2)
+    names = connection.execute(
+        select(client_table.c.last_name)
+        .where(client_table.c.client_id.in_(inserted))).scalars().all()
+
+    assert "client_id" not in columns
+    assert inserted == [5]
+    assert names == ["ln_3"]
@@ -0,0 +1,291 @@
+"""Unit tests for ee_crm.adapters.cache
+
+The cache is plugged into units of work linked to the in-memory SQLite
+database, every unit of work opens its own session.
+
+Fixtures
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
+    connection
+        Connection to the in-memory SQLite database.
+    init_db_table_collaborator
+        create and populate the table linked to the Collaborator model.
+    init_db_table_client
+        create and populate the table linked to the Client model.
+"""
+import pytest
+from sqlalchemy import event, inspect, text
+
+from ee_crm.adapters.cache import EntityCache, QueryCache, \
+    bump_table_versions
+from ee_crm.domain.model import Client, Collaborator
+from ee_crm.services.unit_of_work import SqlAlchemyUnitOfWork
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return EntityCache(max_size=2, ttl=10, clock=clock)
+
+
+@pytest.fixture
+def cached_uow(in_memory_uow, cache):
+    """Factory of units of work sharing the same cache."""
+    def factory():
+        uow = in_memory_uow()
+        uow.cache = cache
+        return uow
+    return factory
+
+
+@pytest.fixture
+def statements(connection):
+    """List of the SQL statements executed during the test."""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(connection, "before_cursor_execute", record)
+    yield executed
+    event.remove(connection, "before_cursor_execute", record)
+
+
+def test_get_hit_served_without_query(cached_uow, cache, statements,
+                                      init_db_table_collaborator):
+    with cached_uow() as uow:
+        first = uow.collaborators.get(2)
+        last_name, role = first.last_name, first.role
+
+    statements.clear()
+    with cached_uow() as uow:
+        second = uow.collaborators.get(2)
+        assert inspect(second).persistent
+        assert second.last_name == last_name
+        assert second.role == role
+
+    assert statements == []
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cached_entity_can_be_updated(cached_uow, cache,
+                                      init_db_table_collaborator):
+    with cached_uow() as uow:
+        uow.collaborators.get(2)
+    with cached_uow() as uow:
+        collaborator = uow.collaborators.get(2)
+        collaborator.last_name = "updated"
+        uow.commit()
+
+    assert len(cache) == 0
+    with cached_uow() as uow:
+        assert uow.collaborators.get(2).last_name == "updated"
+    assert cache.invalidations == 1
+
+
+def test_rolled_back_write_is_invalidated(cached_uow, cache,
+                                          init_db_table_collaborator):
+    with cached_uow() as uow:
+        uow.collaborators.get(2)
+    with cached_uow() as uow:
+        collaborator = uow.collaborators.get(2)
+        collaborator.last_name = "not committed"
+        uow.session.flush()
+        assert uow.collaborators.get(2) is collaborator
+
+    with cached_uow() as uow:
+        assert uow.collaborators.get(2).last_name == "col_ln_two"
+
+
+def test_entity_written_in_transaction_isnt_cached(
+        cached_uow, cache, init_db_table_collaborator):
+    with cached_uow() as uow:
+        collaborator = uow.collaborators.get(2)
+        collaborator.last_name = "pending"
+        uow.session.flush()
+        uow.session.expunge(collaborator)
+        uow.collaborators.get(2)
+
+        assert len(cache) == 0
+
+
+def test_deleted_entity_is_invalidated(cached_uow, cache,
+                                       init_db_table_collaborator,
+                                       init_db_table_client):
+    with cached_uow() as uow:
+        uow.clients.get(4)
+    with cached_uow() as uow:
+        uow.clients.delete(4)
+        uow.commit()
+    with cached_uow() as uow:
+        assert uow.clients.get(4) is None
+
+
+def test_ttl_expiration(cached_uow, cache, clock,
+                        init_db_table_collaborator):
+    with cached_uow() as uow:
+        uow.collaborators.get(1)
+    clock.now = 10
+    with cached_uow() as uow:
+        uow.collaborators.get(1)
+
+    assert cache.stats()["hits"] == 0
+    assert cache.evictions == 1
+    assert len(cache) == 1
+
+
+def test_lru_eviction(cached_uow, cache, init_db_table_collaborator,
+                      init_db_table_client):
+    with cached_uow() as uow:
+        collaborator = uow.collaborators.get(1)
+        uow.clients.get(1)
+        assert uow.collaborators.get(1) is collaborator
+    with cached_uow() as uow:
+        uow.collaborators.get(1)
+        uow.collaborators.get(2)
+
+    with cached_uow() as uow:
+        uow.collaborators.get(1)
+        uow.collaborators.get(2)
+
+    assert cache.evictions == 1
+    assert cache.hits == 3
+    assert (Client, 1) not in cache._entries
+
+
+def test_uow_without_cache(in_memory_uow, cache, init_db_table_collaborator):
+    uow = in_memory_uow()
+    with uow:
+        assert isinstance(uow.collaborators.get(1), Collaborator)
+
+    assert uow.cache is None
+    assert cache.stats()["misses"] == 0
+
+
+def read_versions(connection):
+    # the counters of a database created by create_schema start at 0
+    return dict(connection.execute(text(
+        "SELECT table_name, version FROM table_version "
+        "WHERE version > 0")).all())
+
+
+def test_flush_bumps_written_tables(in_memory_uow, connection,
+                                    init_db_table_collaborator,
+                                    init_db_table_client):
+    with in_memory_uow() as uow:
+        uow.clients.get(1).last_name = "updated"
+        uow.collaborators.get(1).last_name = "col_ln_one"
+        uow.commit()
+
+    assert read_versions(connection) == {"client": 1}
+
+    with in_memory_uow() as uow:
+        uow.clients.delete(4)
+        uow.commit()
+    with in_memory_uow() as uow:
+        uow.clients.get(1).last_name = "rolled back"
+        uow.session.flush()
+
+    assert read_versions(connection) == {"client": 2}
+
+
+def test_versions_are_bumped_at_commit(in_memory_uow, connection,
+                                       init_db_table_client):
+    with in_memory_uow() as uow:
+        uow.clients.get(1).last_name = "first"
+        uow.session.flush()
+        uow.clients.get(2).last_name = "second"
+        uow.session.flush()
+
+        assert uow.session.info["written_tables"] == {"client"}
+        assert read_versions(uow.session.connection()) == {}
+        uow.commit()
+
+    assert read_versions(connection) == {"client": 1}
+
+
+def test_versions_are_not_tracked_without_reader(session_factory,
+                                                 connection,
+                                                 init_db_table_client):
+    with SqlAlchemyUnitOfWork(session_factory=session_factory,
+                              track_versions=False) as uow:
+        uow.clients.get(1).last_name = "untracked"
+        uow.commit()
+
+        assert "written_tables" not in uow.session.info
+    assert read_versions(connection) == {}
+
+
+def test_bump_table_versions(connection):
+    bump_table_versions(connection, ["client", "event", "client"])
+    bump_table_versions(connection, ["client"])
+
+    assert read_versions(connection) == {"client": 2, "event": 1}
+
+
+def test_bump_table_versions_creates_missing_counters(connection):
+    connection.execute(text("DELETE FROM table_version "
+                            "WHERE table_name = 'event'"))
+
+    bump_table_versions(connection, ["event"])
+    bump_table_versions(connection, ["event"])
+
+    assert read_versions(connection) == {"event": 2}
+
+
+def test_query_cache_checks_versions(in_memory_uow, connection):
+    query_cache = QueryCache(max_size=1)
+    calls = []
+
+    def query():
+        calls.append(1)
+        return (len(calls),)
+
+    with in_memory_uow() as uow:
+        first = query_cache.get_or_query(uow.session, "key", (Client,), query)
+        second = query_cache.get_or_query(uow.session, "key", (Client,),
+                                          query)
+    bump_table_versions(connection, ["client"])
+    with in_memory_uow() as uow:
+        third = query_cache.get_or_query(uow.session, "key", (Client,), query)
+        query_cache.get_or_query(uow.session, "other", (Client,), query)
+
+    assert (first, second, third) == ((1,), (1,), (2,))
+    assert query_cache.stats() == {"size": 1, "hits": 1, "misses": 3,
+                                   "stale": 1, "hit_ratio": 0.25}
+
+
+def test_query_cache_skipped_by_a_writing_session(in_memory_uow,
+                                                  init_db_table_client):
+    query_cache = QueryCache()
+    calls = []
+
+    def query():
+        calls.append(1)
+        return (len(calls),)
+
+    with in_memory_uow() as uow:
+        query_cache.get_or_query(uow.session, "key", (Client,), query)
+        uow.clients.get(1).last_name = "pending"
+        second = query_cache.get_or_query(uow.session, "key", (Client,),
+                                          query)
+        uow.commit()
+    with in_memory_uow() as uow:
+        third = query_cache.get_or_query(uow.session, "key", (Client,), query)
+
+    assert (second, third) == ((2,), (3,))
+    assert query_cache.stats()["stale"] == 1
@@ -0,0 +1,69 @@
+"""Unit tests for ee_crm.adapters.journal"""
+from datetime import datetime
+from threading import Thread
+
+from ee_crm.adapters.journal import WriteJournal
+
+
+def test_append_and_read_in_order(tmp_path):
+    journal = WriteJournal(str(tmp_path / "storage" / "journal.jsonl"))
+
+    first = journal.append({"call": "create",
+                            "recorded_at": datetime(2025, 1, 1, 12)})
+    second = journal.append({"call": "update"})
+
+    entries = journal.read()
+    assert [entry["id"] for entry in entries] == [first["id"],
+                                                  second["id"]]
+    assert entries[0]["recorded_at"] == "2025-01-01T12:00:00"
+    assert first["id"] != second["id"]
+
+
+def test_read_without_journal(tmp_path):
+    assert WriteJournal(str(tmp_path / "journal.jsonl")).read() == []
+
+
+def test_read_skips_the_torn_lines(tmp_path):
+    journal = WriteJournal(str(tmp_path / "journal.jsonl"))
+    journal.append({"call": "create"})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('["no id"]\n{"id": "torn", "call": "upd')
+
+    assert [entry["call"] for entry in journal.read()] == ["create"]
+
+
+def test_remove_keeps_the_other_entries(tmp_path):
+    journal = WriteJournal(str(tmp_path / "journal.jsonl"))
+    first, second, third = (journal.append({"n": n}) for n in range(3))
+
+    journal.remove([first["id"], third["id"]])
+    journal.remove([])
+
+    assert journal.read() == [second]
+    assert not (tmp_path / "journal.jsonl.tmp").exists()
+
+
+def test_append_during_a_remove_is_kept(tmp_path, monkeypatch):
+    path = str(tmp_path / "journal.jsonl")
+    journal = WriteJournal(path)
+    replayed = journal.append({"n": 0})
+    appended = []
+    read = journal.read
+
+    def read_then_append():
+        # another process appends between the read and the replacement
+        entries = read()
+        writer = Thread(target=lambda: appended.append(
+            WriteJournal(path).append({"n": 1})))
+        writer.start()
+        writer.join(0.2)
+        threads.append(writer)
+        return entries
+    threads = []
+    monkeypatch.setattr(journal, "read", read_then_append)
+
+    journal.remove([replayed["id"]])
+    threads[0].join()
+
+    assert [entry["id"] for entry in WriteJournal(path).read()] == \
+        [appended[0]["id"]]
@@ -0,0 +1,181 @@
+"""Unit tests for ee_crm.adapters.memory_store and the in-memory
+repositories of ee_crm.adapters.repositories.
+
+The parity tests load the rows of the SQLite test database in a store,
+then compare the in-memory repositories with the SQLAlchemy ones.
+"""
+from datetime import datetime
+from itertools import product
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import MultipleResultsFound
+
+import ee_crm.adapters.repositories as repository
+from ee_crm.adapters.memory_store import InMemorySession, InMemoryStore
+from ee_crm.adapters.orm import client_table, collaborator_table, \
+    contract_table, event_table, user_table
+from ee_crm.domain.model import Client, Contract, Event
+
+
+def make_store():
+    store = InMemoryStore()
+    store.load_rows("users", [{"user_id": i, "username": f"user_{i}",
+                               "password": "pwd"} for i in (1, 2)])
+    store.load_rows("collaborator", [
+        {"collaborator_id": i, "email": f"col{i}@ee.com", "role_id": 4,
+         "user_id": i} for i in (1, 2)])
+    store.load_rows("client", [
+        {"client_id": 1, "last_name": "Doe", "salesman_id": 1,
+         "updated_at": datetime(2025, 1, 1)},
+        {"client_id": 2, "last_name": "Roe", "salesman_id": 2},
+        {"client_id": 3, "last_name": None, "salesman_id": 2}])
+    store.load_rows("contract", [
+        {"contract_id": 1, "total_amount": 100.0, "paid_amount": 0.0,
+         "signed": True, "client_id": 2}])
+    store.load_rows("event", [{"event_id": 1, "title": "Gala",
+                               "contract_id": 1, "supporter_id": None}])
+    return store
+
+
+def test_store_links_the_relationships():
+    store = make_store()
+    event = store.tables["event"][1]
+
+    assert event.contract.client.salesman.user.username == "user_2"
+    assert store.tables["contract"][1].event is event
+    assert store.tables["users"][1].collaborator.email == "col1@ee.com"
+    assert store.tables["client"][1].updated_at == datetime(2025, 1, 1)
+
+
+def test_entities_referencing_a_later_entity_are_linked():
+    store = InMemoryStore()
+    store.load_rows("event", [{"event_id": 1, "contract_id": 7}])
+    assert store.tables["event"][1].contract is None
+
+    store.load_rows("contract", [{"contract_id": 7, "signed": True}])
+
+    assert store.tables["event"][1].contract is store.tables["contract"][7]
+    assert store.tables["contract"][7].event is store.tables["event"][1]
+
+
+def test_filter_uses_the_moved_buckets_after_a_change():
+    store = make_store()
+    session = InMemorySession(store)
+    event = session.get(Event, 1)
+
+    event.supporter_id = 1
+    assert session.query(Event, supporter_id=None) == []
+    session.commit()
+
+    assert store.select(Event, supporter_id=1) == [event]
+    assert event.supporter is store.tables["collaborator"][1]
+
+
+def test_rollback_restores_reads_adds_and_deletes():
+    store = make_store()
+    session = InMemorySession(store)
+    client = session.get(Client, 2)
+    client.last_name = "Changed"
+    session.delete(session.get(Contract, 1))
+    new = Client(last_name="New", _salesman_id=2)
+    session.add(new)
+    assert new.id == 4
+
+    session.rollback()
+
+    assert client.last_name == "Roe"
+    assert store.select(Client, last_name="Changed") == []
+    assert [c.id for c in store.select(Client, _salesman_id=2)] == [2, 3]
+    assert store.tables["event"][1].contract is store.tables["contract"][1]
+    assert store.tables["contract"][1].event is store.tables["event"][1]
+
+
+def test_snapshot_and_restore(tmp_path):
+    store = make_store()
+    path = tmp_path / "store.pickle"
+    store.snapshot(path)
+
+    restored = InMemoryStore()
+    restored.restore(path)
+
+    for name in store.tables:
+        assert restored.rows(name) == store.rows(name)
+    assert restored.tables["event"][1].contract.client.id == 2
+    assert restored.select(Client, _salesman_id=2)[-1].id == 3
+
+
+def test_restore_rejects_other_files(tmp_path):
+    path = tmp_path / "store.pickle"
+    path.write_bytes(b"\x80\x04K\x01.")
+
+    with pytest.raises(ValueError, match="isn't a snapshot"):
+        InMemoryStore().restore(path)
+
+
+def test_repository_sort_puts_nulls_last_and_pages():
+    repo = repository.InMemoryClientRepository(
+        InMemorySession(make_store()))
+
+    ascending = repo.list(sort=[("last_name", False)])
+    descending = repo.filter(sort=[("last_name", True)], salesman_id=2)
+    page = repo.page(sort=[("last_name", False)], after=("Doe", 1),
+                     limit=5)
+
+    assert [c.id for c in ascending] == [1, 2, 3]
+    assert [c.id for c in descending] == [2, 3]
+    assert [c.id for c in page] == [2, 3]
+    with pytest.raises(AttributeError):
+        repo.list(sort=[("nope", False)])
+    with pytest.raises(MultipleResultsFound):
+        repo.filter_one(salesman_id=2)
+
+
+@pytest.fixture
+def parity(session, init_db_table_users, init_db_table_collaborator,
+           init_db_table_client, init_db_table_contract,
+           init_db_table_event):
+    """The test database and a session of a store holding its rows."""
+    store = InMemoryStore()
+    for table in (user_table, collaborator_table, client_table,
+                  contract_table, event_table):
+        rows = session.execute(select(table)).mappings()
+        store.load_rows(table.name, [dict(row) for row in rows])
+    return session, InMemorySession(store)
+
+
+def ids(objs):
+    return [obj.id for obj in objs]
+
+
+def test_client_pages_match_sqlalchemy(parity):
+    session, memory = parity
+    sql_repo = repository.SqlAlchemyClientRepository(session)
+    memory_repo = repository.InMemoryClientRepository(memory)
+
+    for field, is_desc in product(("salesman_id", "company", "id"),
+                                  (False, True)):
+        sort = [(field, is_desc)]
+        after = None
+        for _ in range(3):
+            expected = sql_repo.page(sort=sort, after=after, limit=2)
+            assert ids(memory_repo.page(sort=sort, after=after,
+                                        limit=2)) == ids(expected)
+            if not expected:
+                break
+            last = expected[-1]
+            after = (getattr(last, field), last.id)
+
+
+def test_collaborator_contracts_match_sqlalchemy(parity):
+    session, memory = parity
+    sql_repo = repository.SqlAlchemyContractRepository(session)
+    memory_repo = repository.InMemoryContractRepository(memory)
+    sort = [("total_amount", True)]
+
+    for flags in product((False, True), repeat=3):
+        unpaid, unsigned, no_event = flags
+        expected = sql_repo.get_contracts_collaborator(
+            2, unpaid, unsigned, no_event, sort=sort)
+        assert ids(memory_repo.get_contracts_collaborator(
+            2, unpaid, unsigned, no_event, sort=sort)) == ids(expected)
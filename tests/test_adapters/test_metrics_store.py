@@ -0,0 +1,103 @@
+"""Unit tests for ee_crm.adapters.metrics_store
+
+Every test writes its state file in a temporary directory.
+"""
+import random
+
+import pytest
+
+from ee_crm.adapters.metrics_store import Histogram, MetricsStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 7200.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return MetricsStore(tmp_path / "logs" / "metrics.json", retention=7200,
+                        window=3600, clock=clock)
+
+
+def test_buckets_cover_values():
+    indexes = [Histogram.bucket_of(value) for value in range(5000)]
+    assert indexes == sorted(indexes)
+    assert set(indexes) == set(range(indexes[-1] + 1))
+    for value in (0, 31, 32, 1000, 123456, 2 ** 40):
+        low, high = Histogram.bounds_of(Histogram.bucket_of(value))
+        assert low <= value <= high
+        assert high - low <= max(value, 1) / 16
+
+
+def test_quantile_relative_error():
+    generator = random.Random(7)
+    values = sorted(int(generator.lognormvariate(11, 1)) for _ in range(5000))
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.04)
+    assert histogram.total == 5000
+    assert histogram.sum == sum(values)
+
+
+def test_merge_adds_counts():
+    first, second = Histogram(), Histogram()
+    first.record(10)
+    second.record(10)
+    second.record(1000)
+    first.merge(second)
+
+    assert first.total == 3
+    assert first.quantile(0.5) == 10
+    assert Histogram.from_dict(first.to_dict()).counts == first.counts
+
+
+def test_empty_quantile():
+    assert Histogram().quantile(0.99) == 0.0
+
+
+def test_record_and_merge_windows(store, clock):
+    store.record("client read", "SALES", "ok", 0.010, 2)
+    clock.now += 3600
+    store.record("client read", "SALES", "ok", 0.030, 4)
+    store.record("client read", "SALES", "error", 0.001, 0)
+
+    merged = store.merged()
+
+    ok = merged[("client read", "SALES", "ok")]
+    assert ok["duration_us"].total == 2
+    assert ok["sql"].sum == 6
+    assert merged[("client read", "SALES", "error")]["sql"].total == 1
+    recent = store.merged(since=clock.now)
+    assert recent[("client read", "SALES", "ok")]["duration_us"].total == 1
+
+
+def test_expired_windows_dropped(store, clock):
+    store.record("client read", "SALES", "ok", 0.010, 2)
+    clock.now += 3 * 3600
+
+    assert store.merged() == {}
+    store.record("event read", "SUPPORT", "ok", 0.010, 1)
+    assert list(store._read()) == [str(int(clock.now))]
+
+
+def test_unreadable_file_is_empty(store):
+    store.record("client read", "SALES", "ok", 0.010, 2)
+    with open(store.path, "w") as f:
+        f.write("{not json")
+
+    assert store.merged() == {}
+    store.record("client read", "SALES", "ok", 0.010, 2)
+    assert len(store.merged()) == 1
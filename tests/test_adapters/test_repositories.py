@@ -309,3 +309,38 @@ def test_can_retrieve_contracts_from_collaborator_and_sort(
                                                          sort=(("id", True),))
     assert len(contracts) == 4
     assert contracts[0].id == 6
+
+
+def _walk_pages(repo, sort, limit, **filters):
+    """Read every page of a query, return the ids per page."""
+    fields = [field for field, _ in sort] + ["id"]
+    pages, after = [], None
+    while True:
+        page = repo.page(sort=sort, after=after, limit=limit, **filters)
+        if not page:
+            return pages
+        pages.append([obj.id for obj in page])
+        after = tuple(getattr(page[-1], field) for field in fields)
+
+
+def test_event_pages_follow_the_sort_with_nulls_last(session,
+                                                     init_db_table_event):
+    """Test that the keyset pages of a mixed directions sort, on a
+    column with null values, are the sorted list cut in pages."""
+    repo = repository.SqlAlchemyEventRepository(session)
+
+    desc = _walk_pages(repo, (("supporter_id", True), ("title", True)), 1)
+    asc = _walk_pages(repo, (("supporter_id", False), ("title", False)), 3)
+
+    assert desc == [[2], [1], [3], [4]]
+    assert asc == [[1, 2, 4], [3]]
+
+
+def test_contract_pages_are_filtered(session, init_db_table_contract):
+    """Test that the keyset pages apply the filters, sorted by id when
+    no sort is given."""
+    repo = repository.SqlAlchemyContractRepository(session)
+
+    pages = _walk_pages(repo, (), 3, signed=True)
+
+    assert pages == [[1, 2, 5], [6]]
@@ -0,0 +1,169 @@
+"""Unit tests for ee_crm.adapters.slow_queries and the summary of the
+log, ee_crm.services.app.slow_queries.
+
+A threshold of 0 ms logs every statement of the test database.
+"""
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from ee_crm.adapters.repositories import SqlAlchemyClientRepository
+from ee_crm.adapters.slow_queries import SlowQueryLog, \
+    normalize_statement, read_slow_query_log
+from ee_crm.services.app.slow_queries import group_slow_queries
+
+
+def selects(path):
+    """Entries of the log without the savepoints of the test session."""
+    return [entry for entry in read_slow_query_log(path)
+            if entry["statement"].startswith("SELECT")]
+
+
+@pytest.fixture
+def slow_log(tmp_path, db_engine):
+    def install(threshold_ms=0, explain=False):
+        log = SlowQueryLog(tmp_path / "logs" / "slow.jsonl",
+                           threshold_ms=threshold_ms, explain=explain)
+        log.install(db_engine)
+        installed.append(log)
+        return log
+    installed = []
+    yield install
+    for log in installed:
+        log.uninstall(db_engine)
+
+
+def test_statement_logged_with_caller_and_redacted_params(
+        slow_log, session, init_db_table_client):
+    log = slow_log()
+    repository = SqlAlchemyClientRepository(session)
+
+    repository.filter(email="jane@example.com", salesman_id=2)
+
+    entry, = selects(log.path)
+    assert entry["caller"] == "SqlAlchemyClientRepository.filter"
+    assert entry["statement"].startswith("SELECT")
+    assert "jane@example.com" not in json.dumps(entry)
+    assert sorted(entry["parameters"], key=str) == [2, "<str>"]
+    assert "plan" not in entry
+
+
+def test_fast_statement_not_logged(slow_log, session,
+                                   init_db_table_client):
+    log = slow_log(threshold_ms=60_000)
+
+    SqlAlchemyClientRepository(session).list()
+
+    assert selects(log.path) == []
+
+
+def test_explain_captures_sqlite_plan(slow_log, session,
+                                      init_db_table_client):
+    log = slow_log(explain=True)
+
+    SqlAlchemyClientRepository(session).get(1)
+
+    entry, = selects(log.path)
+    assert entry["plan"]
+    assert any("client" in line for line in entry["plan"])
+
+
+class FakeCursor:
+    """DBAPI cursor recording its statements, the EXPLAIN fails."""
+    def __init__(self, executed, fail):
+        self.executed = executed
+        self.fail = fail
+
+    def execute(self, statement, parameters=None):
+        self.executed.append(statement)
+        if self.fail and statement.startswith("EXPLAIN"):
+            raise RuntimeError("syntax error")
+
+    def fetchall(self):
+        return [("Seq Scan on client",)]
+
+    def close(self):
+        pass
+
+
+def postgresql_connection(executed, fail=False, autocommit=False):
+    dbapi_connection = SimpleNamespace(
+        autocommit=autocommit, cursor=lambda: FakeCursor(executed, fail))
+    return SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        connection=SimpleNamespace(dbapi_connection=dbapi_connection))
+
+
+@pytest.mark.parametrize("fail, analyze, expected", [
+    (False, False, ["SAVEPOINT", "EXPLAIN SELECT", "RELEASE SAVEPOINT"]),
+    (False, True, ["SAVEPOINT", "EXPLAIN (ANALYZE, BUFFERS) SELECT",
+                   "RELEASE SAVEPOINT"]),
+    (True, False, ["SAVEPOINT", "EXPLAIN SELECT", "ROLLBACK TO SAVEPOINT"]),
+])
+def test_postgresql_plan_runs_in_a_savepoint(fail, analyze, expected):
+    executed = []
+
+    plan = SlowQueryLog._plan(postgresql_connection(executed, fail),
+                              "SELECT * FROM client", None, analyze=analyze)
+
+    assert [statement.rsplit(" ", 1)[0] if "SAVEPOINT" in statement
+            else statement.removesuffix(" * FROM client")
+            for statement in executed] == expected
+    assert plan == ("EXPLAIN failed: RuntimeError: syntax error" if fail
+                    else ["Seq Scan on client"])
+
+
+def test_postgresql_plan_without_transaction_has_no_savepoint():
+    executed = []
+
+    SlowQueryLog._plan(postgresql_connection(executed, autocommit=True),
+                       "UPDATE client SET company = NULL", None,
+                       analyze=True)
+
+    assert executed == ["EXPLAIN UPDATE client SET company = NULL"]
+
+
+def test_read_skips_broken_and_old_lines(tmp_path):
+    path = tmp_path / "slow.jsonl"
+    path.write_text(
+        '{"at": "2020-01-01T00:00:00+00:00", "ms": 1, "statement": "a"}\n'
+        'not json\n'
+        '{"at": "2030-01-01T00:00:00+00:00", "ms": 2, "statement": "b"}\n')
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    assert len(read_slow_query_log(path)) == 2
+    assert [e["statement"] for e in read_slow_query_log(path, since)] == ["b"]
+    assert read_slow_query_log(tmp_path / "missing.jsonl") == []
+
+
+def test_normalize_statement():
+    assert normalize_statement(
+        "SELECT *\n  FROM client WHERE id IN (1, 2, 3) AND name = 'O''Neil'"
+    ) == "SELECT * FROM client WHERE id IN (?, ...) AND name = ?"
+    assert normalize_statement(
+        "SELECT a FROM t WHERE a = %(a_1)s AND b = ? AND c = :c"
+    ) == "SELECT a FROM t WHERE a = ? AND b = ? AND c = ?"
+
+
+def test_group_slow_queries():
+    entries = [
+        {"statement": "SELECT * FROM t WHERE id = 1", "ms": 300,
+         "caller": "Repo.get"},
+        {"statement": "SELECT * FROM t WHERE id = 2", "ms": 500,
+         "caller": "Repo.get"},
+        {"statement": "SELECT * FROM t WHERE id = 3", "ms": 250,
+         "caller": "Repo.filter"},
+        {"statement": "UPDATE t SET a = 1", "ms": 900, "caller": "?"},
+    ]
+
+    first, second = group_slow_queries(entries)
+
+    assert (first.statement, first.count) == (
+        "SELECT * FROM t WHERE id = ?", 3)
+    assert (first.total_ms, first.max_ms) == (1050, 500)
+    assert first.mean_ms == 350
+    assert first.callers == (("Repo.get", 2), ("Repo.filter", 1))
+    assert second.statement == "UPDATE t SET a = ?"
+    assert group_slow_queries(entries, limit=1) == (first,)
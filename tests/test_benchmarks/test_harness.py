@@ -0,0 +1,71 @@
+"""Tests of the benchmarks package: the dataset generator, a complete
+run of the scenarios on a tiny SQLite dataset, and the comparison of
+results."""
+from collections import Counter
+from dataclasses import replace
+
+from benchmarks.dataset import DatasetSpec, generate_dataset
+from benchmarks.harness import compare_results, run_benchmarks
+from benchmarks.scenarios import SCENARIOS
+
+TINY = DatasetSpec(collaborators=12, clients=300, contracts=600, events=200,
+                   seed=3)
+
+
+def test_dataset_is_deterministic():
+    first, second = generate_dataset(TINY), generate_dataset(TINY)
+
+    assert first.rows == second.rows
+    assert generate_dataset(replace(TINY, seed=4)).rows != first.rows
+
+
+def test_dataset_ownership_is_skewed():
+    dataset = generate_dataset(TINY)
+    owners = Counter(c["salesman_id"] for c in dataset.rows["client"]
+                     if c["salesman_id"] is not None)
+
+    top_share = owners[dataset.top_sales_id] / sum(owners.values())
+    assert owners.most_common(1)[0][0] == dataset.top_sales_id
+    assert top_share > 1 / len(owners) * 1.5
+    assert len(dataset.own_clients) == owners[dataset.top_sales_id]
+
+
+def test_dataset_has_one_event_per_contract():
+    events = generate_dataset(TINY).rows["event"]
+    contracts = [e["contract_id"] for e in events if e["contract_id"]]
+
+    assert len(contracts) == len(set(contracts))
+
+
+def test_run_every_scenario_on_sqlite(tmp_path):
+    results = run_benchmarks(TINY, "sqlite", str(tmp_path), repeat=2,
+                             warmup=1)
+
+    assert set(results["scenarios"]) == {s.name for s in SCENARIOS}
+    for name, result in results["scenarios"].items():
+        assert result["runs"] == 2
+        assert result["min_ms"] <= result["median_ms"] <= result["p95_ms"]
+        assert result["sql_per_run"] >= 1, name
+    assert results["meta"]["spec"]["clients"] == 300
+
+
+def _results(**scenarios):
+    return {"scenarios": {
+        name: {"median_ms": ms, "sql_per_run": sql}
+        for name, (ms, sql) in scenarios.items()}}
+
+
+def test_compare_results():
+    baseline = _results(read=(10.0, 1), write=(5.0, 4), fast=(0.01, 1),
+                        gone=(1.0, 1))
+    results = _results(read=(13.0, 1), write=(5.1, 5), fast=(0.03, 1),
+                       new=(1.0, 1))
+
+    rows = {row["name"]: row for row in compare_results(baseline, results)}
+
+    assert set(rows) == {"read", "write", "fast"}
+    assert rows["read"]["regression"] and rows["read"]["ratio"] == 1.3
+    assert rows["write"]["regression"]
+    assert not rows["fast"]["regression"]
+    assert not compare_results(baseline, results, tolerance=0.5)[0][
+        "regression"]
@@ -0,0 +1,54 @@
+"""Tests of the load test: the casting of the workers, the aggregation
+of their records and a short concurrent run on SQLite."""
+import pytest
+
+from benchmarks.dataset import DatasetSpec, generate_dataset
+from benchmarks.load import cast_workers, run_load, summarize
+
+TINY = DatasetSpec(collaborators=12, clients=300, contracts=600, events=200,
+                   seed=3)
+
+
+def test_cast_workers_plays_the_busiest_collaborators_first():
+    dataset = generate_dataset(TINY)
+
+    cast = cast_workers(dataset, 10)
+
+    roles = [role for role, _ in cast]
+    assert roles.count("sales") == 5 and roles.count("support") == 4
+    assert roles.count("management") == 1
+    assert cast[0] == ("sales", dataset.top_sales_id)
+    assert cast[1] == ("support", dataset.top_support_id)
+    sales = [pk for role, pk in cast if role == "sales"]
+    assert len(set(sales)) == min(5, len(dataset.rows["collaborator"]))
+
+
+def test_summarize():
+    records = [("read", 0.0, 0.010, None), ("read", 0.1, 0.030, None),
+               ("pay", 0.2, 0.050, "OperationalError"),
+               ("pay", 0.3, 0.020, None)]
+
+    summary = summarize(records, duration=2.0)
+
+    assert summary["totals"]["operations"] == 4
+    assert summary["totals"]["throughput"] == 2.0
+    assert summary["totals"]["error_rate"] == 0.25
+    assert summary["totals"]["max_ms"] == 50.0
+    assert summary["operations"]["pay"]["errors"] == {"OperationalError": 1}
+    assert summary["operations"]["read"]["p50_ms"] == 10.0
+
+
+def test_cli_mode_needs_postgresql(tmp_path):
+    with pytest.raises(ValueError):
+        run_load(TINY, "sqlite", str(tmp_path), mode="cli")
+
+
+def test_run_concurrent_workers_on_sqlite(tmp_path):
+    report = run_load(TINY, "sqlite", str(tmp_path), workers=3,
+                      duration=0.5)
+
+    assert [w["failure"] for w in report["workers"]] == [None] * 3
+    assert report["meta"]["roles"] == {"sales": 2, "support": 1}
+    assert report["totals"]["operations"] == sum(
+        w["operations"] for w in report["workers"]) > 0
+    assert report["database"]["wait_events"] is None
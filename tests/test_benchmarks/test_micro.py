@@ -0,0 +1,56 @@
+"""Tests of the micro-benchmarks: the timer, a short run of every
+benchmark, the checked-in baseline and the comparison of results."""
+import json
+import os
+from pathlib import Path
+
+from benchmarks.micro import MICRO_BENCHMARKS, compare_micro, run_micro, \
+    time_call
+
+BASELINE = Path(__file__).parents[2] / "benchmarks" / "baselines" / \
+    "micro.json"
+
+
+def test_time_call_calibrates_the_loops():
+    calls = []
+
+    result = time_call(lambda: calls.append(1), samples=3, warmup=1,
+                       min_time=0.001)
+
+    assert result["loops"] > 1
+    assert result["samples"] == 3
+    assert 0 < result["min_us"] <= result["median_us"]
+
+
+def test_run_every_micro_benchmark(monkeypatch):
+    monkeypatch.setenv("COLUMNS", "80")
+
+    results = run_micro(samples=2, warmup=0, min_time=0.0001)
+
+    assert set(results["benchmarks"]) == {b.name for b in MICRO_BENCHMARKS}
+    assert os.environ["COLUMNS"] == "80"
+
+
+def test_baseline_covers_every_micro_benchmark():
+    baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
+
+    assert set(baseline["benchmarks"]) == {b.name for b in MICRO_BENCHMARKS}
+
+
+def test_compare_micro():
+    baseline = {"benchmarks": {
+        "a": {"median_us": 10.0, "stdev_us": 0.1},
+        "b": {"median_us": 10.0, "stdev_us": 0.1},
+        "c": {"median_us": 10.0, "stdev_us": 5.0},
+    }}
+    results = {"benchmarks": {
+        "a": {"median_us": 11.0}, "b": {"median_us": 14.0},
+        "c": {"median_us": 14.0}, "new": {"median_us": 1.0},
+    }}
+
+    rows = {row["name"]: row for row in compare_micro(baseline, results)}
+
+    assert set(rows) == {"a", "b", "c"}
+    assert not rows["a"]["regression"]
+    assert rows["b"]["regression"] and rows["b"]["ratio"] == 1.4
+    assert not rows["c"]["regression"]
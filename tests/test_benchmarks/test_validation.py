@@ -0,0 +1,28 @@
+"""Tests of the validation benchmark: the records and a short run of
+every resource."""
+from benchmarks.validation import MODELS, generate_records, \
+    run_validation, validate_columns, validate_rows
+
+
+def test_generate_records_is_deterministic():
+    assert generate_records("events", 50, seed=3) == \
+        generate_records("events", 50, seed=3)
+
+
+def test_both_ways_reject_the_same_rows():
+    for resource, model_cls in MODELS.items():
+        records = generate_records(resource, 500)
+
+        mask = validate_columns(model_cls, records)
+
+        assert mask == validate_rows(model_cls, records)
+        assert 0 < sum(mask) < 500
+
+
+def test_run_validation():
+    results = run_validation(count=200, repeat=1, only={"clients"})
+
+    assert set(results["resources"]) == {"clients"}
+    assert results["resources"]["clients"]["records"] == 200
+    assert results["resources"]["clients"]["speedup"] > 0
+    assert results["resources"]["clients"]["checks_speedup"] >= 0
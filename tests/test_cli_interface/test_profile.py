@@ -0,0 +1,93 @@
+"""Tests for the per-invocation profiler, ee_crm.profiling, and the
+'eecrm --profile' option.
+
+Fixtures
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
+    init_db_table_client
+        create and populate the table linked to the Client model.
+    bypass_permission_sales
+        mock the payload returned by decoding a JWT representing a
+        specific SALES person.
+"""
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from ee_crm.cli_interface.commands import cli
+from ee_crm.cli_interface.views.view_client import ClientCrudView
+from ee_crm.controllers.app.client import ClientManager
+from ee_crm.profiling import Profiler, profile_span, start_profiling, \
+    stop_profiling
+from ee_crm.services.app.clients import ClientService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+@pytest.fixture
+def mock_uow(mocker, in_memory_uow):
+    mocker.patch("ee_crm.controllers.auth.permission.DEFAULT_UOW",
+                 return_value=in_memory_uow())
+
+
+def test_profiler_self_time():
+    profiler = Profiler(clock=FakeClock())
+    profiler.enter("manager")
+    profiler.enter("service")
+    assert profiler.enter("service") is False
+    profiler.leave()
+    profiler.leave()
+
+    assert profiler.layers == {"service": [1, 1.0, 1.0],
+                               "manager": [1, 3.0, 2.0]}
+
+
+def test_profile_layers(mock_uow, in_memory_uow, init_db_table_client,
+                        bypass_permission_sales):
+    controller = ClientManager(ClientService(in_memory_uow()))
+
+    start_profiling()
+    controller.update(2, first_name="updated")
+    ClientCrudView().render(controller.read(pk=2))
+    report = stop_profiling()
+
+    layers = report["layers"]
+    assert set(layers) == {"permission", "manager", "service", "sql",
+                           "render"}
+    assert layers["manager"]["calls"] == 2
+    assert layers["sql"]["calls"] == report["sql"]["statements"] > 0
+    self_seconds = sum(layer["self_seconds"] for layer in layers.values())
+    assert self_seconds + report["other_seconds"] == \
+        pytest.approx(report["seconds"])
+    assert report["memory_peak_bytes"] > 0
+    assert stop_profiling() is None
+
+
+def test_profile_span_without_profiler():
+    with profile_span("manager"):
+        pass
+
+
+def test_cli_profile(mocker, tmp_path):
+    mocker.patch("ee_crm.cli_interface.app.client.cli_read",
+                 return_value=[])
+    path = tmp_path / "profile.json"
+
+    result = CliRunner().invoke(cli, ["--profile", "--profile-json",
+                                      str(path), "client", "read"])
+
+    assert result.exit_code == 0
+    assert "No client found." in result.stdout
+    assert "profile of 'eecrm client'" in result.stderr
+    report = json.loads(path.read_text())
+    assert report["command"] == "client"
+    assert report["layers"]["render"]["calls"] == 1
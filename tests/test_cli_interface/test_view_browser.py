@@ -0,0 +1,112 @@
+"""Unit tests for ee_crm.cli_interface.views.view_browser"""
+import threading
+
+import pytest
+
+from ee_crm.cli_interface.app.client import KEYS_MAP
+from ee_crm.cli_interface.views.view_browser import PageLoader, \
+    TableBrowser, parse_filters, parse_sort
+from ee_crm.cli_interface.views.view_client import ClientCrudView
+from ee_crm.exceptions import ClientManagerError
+
+
+def make_fetch(total, size, calls):
+    """Page reader of the integers below 'total', the cursor is the
+    last integer read."""
+    def fetch(after):
+        calls.append((after, threading.current_thread().name))
+        start = 0 if after is None else after + 1
+        rows = tuple(range(start, min(start + size, total)))
+        return rows, rows[-1] if start + size < total else None
+    return fetch
+
+
+def test_page_loader_prefetches_the_next_page():
+    calls = []
+    loader = PageLoader(make_fetch(10, 4, calls)).start()
+
+    loader.ensure(5)
+    prefetch = loader._pending
+    third_page = prefetch.result()
+    loader.close()
+
+    assert loader.rows == list(range(8))
+    assert not loader.done
+    assert third_page == ((8, 9), None)
+    assert [after for after, _ in calls] == [None, 3, 7]
+    assert all(name.startswith("ee_crm-browser") for _, name in calls)
+
+
+def test_page_loader_stops_after_the_last_page():
+    calls = []
+    loader = PageLoader(make_fetch(10, 4, calls)).start()
+
+    loader.ensure(100)
+    loader.close()
+
+    assert loader.rows == list(range(10)) and loader.done
+    assert len(calls) == 3
+
+
+def test_page_loader_keeps_the_rows_when_the_new_query_fails():
+    def failing(after):
+        raise ClientManagerError("bad sort")
+
+    loader = PageLoader(make_fetch(10, 4, [])).start()
+
+    with pytest.raises(ClientManagerError):
+        loader.reset(failing)
+    loader.ensure(6)
+    loader.close()
+
+    assert loader.rows == list(range(8))
+
+
+def test_parse_sort_and_filters():
+    assert parse_sort("ln:desc, fn nope", KEYS_MAP) == (
+        ("last_name", True), ("first_name", False))
+    assert parse_sort("", KEYS_MAP) is None
+    assert parse_filters("co=Skipblab, si = 4, nope=1", KEYS_MAP) == {
+        "company": "Skipblab", "salesman_id": "4"}
+    assert parse_filters("nope", KEYS_MAP) is None
+
+
+class FakeManager:
+    def __init__(self):
+        self.calls = []
+
+    def browse(self, filters=None, sort=None, after=None, limit=50):
+        self.calls.append((filters, sort, after))
+        if sort == (("email", False),):
+            raise ClientManagerError("wrong sort key")
+        return ("row",), None
+
+
+def test_sort_key_reissues_the_query(mocker):
+    manager = FakeManager()
+    browser = TableBrowser(ClientCrudView(), manager, KEYS_MAP,
+                           filters={"company": "Skipblab"})
+    browser.loader.start()
+    mocker.patch.object(browser, "_prompt", return_value="ln:desc")
+
+    assert browser.handle_key(ord("s"), 10)
+    browser.loader.close()
+
+    assert manager.calls[-1] == ({"company": "Skipblab"},
+                                 (("last_name", True),), None)
+    assert browser.sort == (("last_name", True),)
+
+
+def test_failed_sort_keeps_the_query(mocker):
+    manager = FakeManager()
+    browser = TableBrowser(ClientCrudView(), manager, KEYS_MAP)
+    browser.loader.start()
+    mocker.patch.object(browser, "_prompt", return_value="at")
+
+    assert browser.handle_key(ord("s"), 10)
+    browser.loader.close()
+
+    assert browser.sort is None
+    assert browser.loader.rows == ["row"]
+    assert "wrong sort key" in browser.message
+    assert not browser.handle_key(ord("q"), 10)
@@ -3,7 +3,8 @@ from dataclasses import dataclass
 
 import pytest
 
-from ee_crm.cli_interface.views.view_base_crud import CrudView
+from ee_crm.cli_interface.views.view_base_crud import CrudView, \
+    allocate_widths, column_lengths
 
 
 @pytest.fixture(autouse=True)
@@ -141,6 +142,17 @@ def test_construct_top_line():
     assert top_line == expected
 
 
+def test_construct_top_line_note():
+    table_width = 39
+    view = CrudView()
+    view.note = "replica, 4 min"
+    top_line = view._construct_top_line(table_width)
+
+    expected = "╔═ mock label Table (replica, 4 min) ═╗"
+
+    assert top_line == expected
+
+
 def test_transform_row_to_lines():
     view = CrudView()
     view.allocated_width = {
@@ -223,7 +235,7 @@ def test_render_empty(mocker):
 def test_render_remove_column(mocker):
     view = CrudView()
 
-    spy_create = mocker.spy(view, '_create_table')
+    spy_create = mocker.spy(view, '_iter_table')
     spy_print = mocker.spy(view, '_print')
 
     @dataclass
@@ -238,9 +250,124 @@ def test_render_remove_column(mocker):
 
     assert view.instance_columns == ['id', 'column1']
 
-    # stock the list of formatted string
+    # stock the generator of formatted string
     created_lines = spy_create.spy_return
 
-    # verify that the list is given to the _print func
+    # verify that the generator is given to the _print func
     spy_print.assert_called_once_with(created_lines)
 
+
+
+@dataclass
+class Row:
+    id: int
+    column1: str
+    column2: str
+
+
+def test_format_row_fast_path_matches_chunks():
+    view = CrudView()
+    view.allocated_width = {"id": 4, "column1": 5, "column2": 10}
+    short = Row(id=5, column1=None, column2="fits")
+    long = Row(id=5, column1="value", column2="This is a longer value")
+
+    for obj in (short, long):
+        assert view._format_row(obj) == \
+            view._transform_row_to_lines(view._prepare_object(obj))
+    assert len(view._format_row(short)) == 1
+
+
+def test_render_streams_rows(mocker, monkeypatch):
+    monkeypatch.setenv("TABLE_SAMPLE_ROWS", "2")
+    monkeypatch.setattr(
+        "ee_crm.cli_interface.views.view_base_crud._PRINT_BATCH", 10)
+    mocker.patch("ee_crm.cli_interface.views.view_base_crud.get_terminal_size",
+                 return_value=mocker.Mock(columns=40, lines=20))
+    read = []
+
+    def rows():
+        for i in range(100):
+            read.append(i)
+            yield Row(id=i, column1="value", column2="text")
+
+    read_at_echo = []
+    mocker.patch.object(CrudView, "echo",
+                        side_effect=lambda text: read_at_echo.append(
+                            len(read)))
+
+    CrudView().render(rows())
+
+    assert read_at_echo[0] < 100
+    assert len(read) == 100
+
+
+def test_render_sizes_columns_from_the_sample(mocker, monkeypatch):
+    monkeypatch.setenv("TABLE_SAMPLE_ROWS", "10")
+    mocker.patch("ee_crm.cli_interface.views.view_base_crud.get_terminal_size",
+                 return_value=mocker.Mock(columns=80, lines=20))
+    view = CrudView()
+    spy_print = mocker.patch.object(view, "_print")
+
+    view.render([Row(id=1, column1="ab", column2="short text")])
+    list(spy_print.call_args.args[0])
+
+    assert view.allocated_width == {"id": 2, "column1": 7, "column2": 10}
+
+
+def test_print_pages_tables_taller_than_the_terminal(mocker, monkeypatch):
+    monkeypatch.setenv("TABLE_PAGER", "1")
+    mocker.patch("ee_crm.cli_interface.views.view_base_crud.get_terminal_size",
+                 return_value=mocker.Mock(columns=80, lines=3))
+    mocker.patch.object(CrudView, "is_terminal", return_value=True)
+    page = mocker.patch.object(CrudView, "page")
+    echo = mocker.patch.object(CrudView, "echo")
+    view = CrudView()
+
+    view._print(["a", "b"])
+    echo.assert_called_once_with("a\nb")
+    page.assert_not_called()
+
+    view._print(iter(["a", "b", "c", "d"]))
+    assert list(page.call_args.args[0]) == ["a", "b", "c", "d"]
+
+
+def test_column_lengths():
+    rows = [Row(id=1, column1=None, column2="text"),
+            Row(id=12, column1="value", column2="")]
+
+    lengths = column_lengths(rows, ["id", "column1"])
+
+    assert lengths == {"id": [2, 1, 2], "column1": [7, 0, 5]}
+
+
+def test_allocate_widths_to_the_widest_cells_when_they_fit():
+    lengths = {"id": [2, 1, 3], "notes": [5, 40, 12]}
+
+    assert allocate_widths(lengths, 50) == {"id": 3, "notes": 40}
+    assert allocate_widths(lengths, 4) == {"id": 3, "notes": 3}
+
+
+def test_allocate_widths_within_the_available_width():
+    lengths = {"id": [2] + [3] * 50,
+               "title": [5] + [10 + i % 11 for i in range(50)],
+               "notes": [5] + [i * 7 % 120 for i in range(50)]}
+
+    for available in (20, 40, 80, 140):
+        widths = allocate_widths(lengths, available)
+        assert sum(widths.values()) == min(available, 3 + 20 + 119)
+        assert min(widths.values()) >= 3
+
+
+def test_sample_widths_wrap_fewer_lines_than_the_weights(mocker):
+    mocker.patch("ee_crm.cli_interface.views.view_base_crud.get_terminal_size",
+                 return_value=mocker.Mock(columns=40))
+    rows = [Row(id=i, column1="ab", column2="x" * 60) for i in range(5)]
+
+    static = CrudView()._create_table(rows)
+    view = CrudView()
+    sized = list(view._iter_table(rows, rows))
+
+    # 3 lines per row instead of 4, within the 33 available characters
+    assert sum(view.allocated_width.values()) == 33
+    assert len(sized) == len(static) - len(rows)
+    assert {len(line) for line in sized} == {len(sized[0])}
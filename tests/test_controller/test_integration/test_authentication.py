@@ -49,7 +49,7 @@ def patch_storage(tmp_path, mocker):
 
 
 def test_login_user_and_logout(patch_storage, in_memory_uow,
-                               bypass_permission_sales):
+                               bypass_permission_sales, sql_budget):
     username = "auth_username"
     password = "Authpassword1"
     data = {
@@ -62,7 +62,8 @@ def test_login_user_and_logout(patch_storage, in_memory_uow,
     assert service.retrieve(5)[0].last_name == "Jacob"
 
     # Use the new user credential to login
-    login(username, password)
+    with sql_budget(2):
+        login(username, password)
 
     # Verify the temporary JWT has been created
     assert patch_storage.exists()
@@ -37,9 +37,10 @@ def mock_uow(mocker, in_memory_uow):
 
 
 def test_read_all_client(init_db_table_client, bypass_permission_manager,
-                         in_memory_uow):
+                         in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
-    list_client = controller.read()
+    with sql_budget(1):
+        list_client = controller.read()
     assert list_client is not None
     assert len(list_client) == 4
     assert isinstance(list_client[0], ClientDTO)
@@ -48,10 +49,11 @@ def test_read_all_client(init_db_table_client, bypass_permission_manager,
 
 def test_filter_client_salesman_id(init_db_table_client,
                                    bypass_permission_manager,
-                                   in_memory_uow):
+                                   in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
     filters = {"salesman_id": "2"}
-    list_client = controller.read(filters=filters)
+    with sql_budget(1):
+        list_client = controller.read(filters=filters)
 
     assert list_client is not None
     assert len(list_client) == 2
@@ -60,10 +62,11 @@ def test_filter_client_salesman_id(init_db_table_client,
 
 def test_sort_client_salesman_id_reverse(init_db_table_client,
                                          bypass_permission_manager,
-                                         in_memory_uow):
+                                         in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
     sort = (("salesman_id", True),)
-    list_client = controller.read(sort=sort)
+    with sql_budget(1):
+        list_client = controller.read(sort=sort)
 
     assert list_client is not None
     assert len(list_client) == 4
@@ -75,10 +78,11 @@ def test_sort_client_salesman_id_reverse(init_db_table_client,
 
 def test_sort_client_salesman_id(init_db_table_client,
                                  bypass_permission_manager,
-                                 in_memory_uow):
+                                 in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
     sort = (("salesman_id", False),)
-    list_client = controller.read(sort=sort)
+    with sql_budget(1):
+        list_client = controller.read(sort=sort)
 
     assert list_client is not None
     assert len(list_client) == 4
@@ -91,13 +95,14 @@ def test_sort_client_salesman_id(init_db_table_client,
 def test_create_client_minimal(init_db_table_collaborator,
                                init_db_table_client,
                                bypass_permission_sales,
-                               in_memory_uow):
+                               in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
 
     list_client = controller.read()
     assert len(list_client) == 4
 
-    controller.create()
+    with sql_budget(5):
+        controller.create()
 
     list_client = controller.read()
     assert len(list_client) == 5
@@ -107,7 +112,7 @@ def test_create_client_minimal(init_db_table_collaborator,
 def test_create_client_with_data(init_db_table_collaborator,
                                  init_db_table_client,
                                  bypass_permission_sales,
-                                 in_memory_uow):
+                                 in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
 
     list_client = controller.read()
@@ -118,7 +123,8 @@ def test_create_client_with_data(init_db_table_collaborator,
             "email": "painter@mail.c",
             "phone_number": "09 65 48 98 78",
             "company": "The Company"}
-    controller.create(**data)
+    with sql_budget(5):
+        controller.create(**data)
 
     list_client = controller.read()
     assert len(list_client) == 5
@@ -132,7 +138,7 @@ def test_create_client_with_data(init_db_table_collaborator,
 def test_update_client_with_data(init_db_table_collaborator,
                                  init_db_table_client,
                                  bypass_permission_sales,
-                                 in_memory_uow):
+                                 in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
     data = {"last_name": "bob",
             "first_name": "ross",
@@ -143,7 +149,8 @@ def test_update_client_with_data(init_db_table_collaborator,
     assert client_2[0].last_name == 'cli_ln_two'
     assert client_2[0].first_name == 'cli_fn_two'
 
-    controller.update(pk=2, **data)
+    with sql_budget(5):
+        controller.update(pk=2, **data)
 
     client_2_updated = controller.read(2)
 
@@ -155,7 +162,7 @@ def test_update_client_with_data(init_db_table_collaborator,
 def test_update_client_not_my_client(init_db_table_collaborator,
                                      init_db_table_client,
                                      bypass_permission_sales,
-                                     in_memory_uow):
+                                     in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
     data = {"last_name": "bob",
             "first_name": "ross",
@@ -166,16 +173,18 @@ def test_update_client_not_my_client(init_db_table_collaborator,
             match=r"Permission error \(ABAC\) in "
                   r"\(is_client_associated_salesman or "
                   r"\(is_management and not client_has_salesman\)\)"):
-        controller.update(pk=1, **data)
+        with sql_budget(1):
+            controller.update(pk=1, **data)
 
 
 def test_update_client_empty_data(init_db_table_collaborator,
                                   init_db_table_client,
                                   bypass_permission_sales,
-                                  in_memory_uow):
+                                  in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
     client_before = controller.read(2)[0]
-    controller.update(pk=2)
+    with sql_budget(2):
+        controller.update(pk=2)
     client_after = controller.read(2)[0]
     assert client_before == client_after
 
@@ -183,12 +192,13 @@ def test_update_client_empty_data(init_db_table_collaborator,
 def test_delete_client_ok(init_db_table_collaborator,
                           init_db_table_client,
                           bypass_permission_sales,
-                          in_memory_uow):
+                          in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
     list_client_before = controller.read()
     assert len(list_client_before) == 4
 
-    controller.delete(2)
+    with sql_budget(7):
+        controller.delete(2)
 
     list_client_after = controller.read()
     assert len(list_client_after) == 3
@@ -197,7 +207,7 @@ def test_delete_client_ok(init_db_table_collaborator,
 def test_delete_not_my_client_o(init_db_table_collaborator,
                                 init_db_table_client,
                                 bypass_permission_sales,
-                                in_memory_uow):
+                                in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
     list_client_before = controller.read()
     assert len(list_client_before) == 4
@@ -206,7 +216,8 @@ def test_delete_not_my_client_o(init_db_table_collaborator,
             match=r"Permission error \(ABAC\) in "
                   r"\(is_client_associated_salesman or "
                   r"\(is_management and not client_has_salesman\)\)"):
-        controller.delete(1)
+        with sql_budget(1):
+            controller.delete(1)
 
     list_client_after = controller.read()
     assert len(list_client_after) == 4
@@ -215,9 +226,10 @@ def test_delete_not_my_client_o(init_db_table_collaborator,
 def test_user_associated_clients(init_db_table_collaborator,
                                  init_db_table_client,
                                  bypass_permission_sales,
-                                 in_memory_uow):
+                                 in_memory_uow, sql_budget):
     controller = ClientManager(ClientService(in_memory_uow()))
-    clients = controller.user_associated_resource(sort=None, filters=None)
+    with sql_budget(1):
+        clients = controller.user_associated_resource(sort=None, filters=None)
 
     assert len(clients) == 2
     assert clients[0].id == 2
@@ -227,10 +239,11 @@ def test_user_associated_clients(init_db_table_collaborator,
 def test_orphan_clients(init_db_table_collaborator,
                         init_db_table_client,
                         bypass_permission_sales,
-                        in_memory_uow):
+                        in_memory_uow, sql_budget):
 
     controller = ClientManager(ClientService(in_memory_uow()))
-    clients = controller.orphan_clients(sort=None, filters=None)
+    with sql_budget(1):
+        clients = controller.orphan_clients(sort=None, filters=None)
 
     assert len(clients) == 1
     assert clients[0].id == 4
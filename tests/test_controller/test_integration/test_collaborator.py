@@ -53,9 +53,10 @@ def mock_uow(mocker, in_memory_uow):
 
 def test_read_all_collaborator(init_db_table_collaborator,
                                bypass_permission_manager,
-                               in_memory_uow):
+                               in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
-    list_collaborator = controller.read()
+    with sql_budget(1):
+        list_collaborator = controller.read()
     assert list_collaborator is not None
     assert len(list_collaborator) == 4
     assert isinstance(list_collaborator[0], CollaboratorDTO)
@@ -65,12 +66,13 @@ def test_read_all_collaborator(init_db_table_collaborator,
 
 def test_filter_collaborator_role_explicit(init_db_table_collaborator,
                                            bypass_permission_manager,
-                                           in_memory_uow):
+                                           in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
     filters = {
         "role": "SUPPORT"
     }
-    list_collaborator = controller.read(filters=filters)
+    with sql_budget(1):
+        list_collaborator = controller.read(filters=filters)
     assert list_collaborator is not None
     assert isinstance(list_collaborator[0], CollaboratorDTO)
     assert list_collaborator[0].first_name == "col_fn_thr"
@@ -78,12 +80,13 @@ def test_filter_collaborator_role_explicit(init_db_table_collaborator,
 
 def test_filter_collaborator_role_number(init_db_table_collaborator,
                                          bypass_permission_manager,
-                                         in_memory_uow):
+                                         in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
     filters = {
         "role": "5"
     }
-    list_collaborator = controller.read(filters=filters)
+    with sql_budget(1):
+        list_collaborator = controller.read(filters=filters)
     assert list_collaborator is not None
     assert isinstance(list_collaborator[0], CollaboratorDTO)
     assert list_collaborator[0].first_name == "col_fn_thr"
@@ -91,34 +94,37 @@ def test_filter_collaborator_role_number(init_db_table_collaborator,
 
 def test_filter_collaborator_role_unknown(init_db_table_collaborator,
                                           bypass_permission_manager,
-                                          in_memory_uow):
+                                          in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
     filters = {
         "role": "UNKNOWN"
     }
-    list_collaborator = controller.read(filters=filters)
+    with sql_budget(1):
+        list_collaborator = controller.read(filters=filters)
 
     assert len(list_collaborator) == 0
 
 
 def test_filter_collaborator_unknown_filter(init_db_table_collaborator,
                                             bypass_permission_manager,
-                                            in_memory_uow):
+                                            in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
     filters = {
         "unknown": "data"
     }
     with pytest.raises(CollaboratorServiceError,
                        match="No valid filters for Collaborator in {}"):
-        controller.read(filters=filters)
+        with sql_budget(0):
+            controller.read(filters=filters)
 
 
 def test_sort_collaborator_reverse(init_db_table_collaborator,
                                    bypass_permission_manager,
-                                   in_memory_uow):
+                                   in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
     sort = (("role", True),)
-    list_collaborator = controller.read(sort=sort)
+    with sql_budget(1):
+        list_collaborator = controller.read(sort=sort)
 
     assert len(list_collaborator) == 4
     assert list_collaborator[0].first_name == "col_fn_thr"
@@ -129,12 +135,13 @@ def test_sort_collaborator_reverse(init_db_table_collaborator,
 
 def test_sort_collaborator_unknown_sort(init_db_table_collaborator,
                                         bypass_permission_manager,
-                                        in_memory_uow):
+                                        in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
     sort = (("Unknown", False),)
     with pytest.raises(CollaboratorServiceError,
                        match=r"wrong sort key in \['Unknown'\]"):
-        controller.read(sort=sort)
+        with sql_budget(0):
+            controller.read(sort=sort)
 
 
 def test_create_collaborator_minimal(init_db_table_users,
@@ -163,10 +170,11 @@ def test_create_collaborator_minimal(init_db_table_users,
 
 def test_update_collaborator(init_db_table_collaborator,
                              bypass_permission_sales,
-                             in_memory_uow):
+                             in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
     data = {"last_name": "new_last_name"}
-    controller.update(pk=2, **data)
+    with sql_budget(4):
+        controller.update(pk=2, **data)
 
     collaborator = controller.read(2)[0]
 
@@ -175,24 +183,26 @@ def test_update_collaborator(init_db_table_collaborator,
 
 def test_update_collaborator_not_self(init_db_table_collaborator,
                                       bypass_permission_sales,
-                                      in_memory_uow):
+                                      in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
     data = {"last_name": "new_last_name"}
     with pytest.raises(AuthorizationDenied,
                        match=r"Permission error \(ABAC\) in "
                              r"\(is_management or is_self\)"):
-        controller.update(pk=1, **data)
+        with sql_budget(0):
+            controller.update(pk=1, **data)
 
 
 def test_delete_collaborator(init_db_table_users,
                              init_db_table_collaborator,
                              bypass_permission_manager,
-                             in_memory_uow):
+                             in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
     list_collaborator = controller.read()
 
     assert len(list_collaborator) == 4
-    controller.delete(pk=3)
+    with sql_budget(11):
+        controller.delete(pk=3)
 
     list_collaborator = controller.read()
     assert len(list_collaborator) == 3
@@ -200,12 +210,13 @@ def test_delete_collaborator(init_db_table_users,
 
 def test_change_collaborator_role(init_db_table_collaborator,
                                   bypass_permission_manager,
-                                  in_memory_uow):
+                                  in_memory_uow, sql_budget):
     controller = CollaboratorManager(CollaboratorService(in_memory_uow()))
 
     coll_3 = controller.read(3)[0]
     assert coll_3.role == 'SUPPORT'
 
-    controller.change_collaborator_role(3, "SALES")
+    with sql_budget(4):
+        controller.change_collaborator_role(3, "SALES")
     coll_3 = controller.read(3)[0]
     assert coll_3.role == 'SALES'
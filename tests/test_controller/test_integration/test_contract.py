@@ -54,9 +54,10 @@ def mock_uow(mocker, in_memory_uow):
 
 def test_read_all_contract(init_db_table_contract,
                            bypass_permission_sales,
-                           in_memory_uow):
+                           in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
-    list_contract = controller.read()
+    with sql_budget(1):
+        list_contract = controller.read()
 
     assert len(list_contract) == 6
     assert isinstance(list_contract[0], ContractDTO)
@@ -64,9 +65,10 @@ def test_read_all_contract(init_db_table_contract,
 
 def test_read_contract_from_pk(init_db_table_contract,
                                bypass_permission_sales,
-                               in_memory_uow):
+                               in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
-    contract = controller.read(1)[0]
+    with sql_budget(1):
+        contract = controller.read(1)[0]
 
     assert contract.total_amount == 100.0
     assert contract.due_amount == 90.0
@@ -76,10 +78,11 @@ def test_read_contract_from_pk(init_db_table_contract,
 
 def test_filter_contracts_signed(init_db_table_contract,
                                  bypass_permission_sales,
-                                 in_memory_uow):
+                                 in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     filters = {"signed": "YES"}
-    signed_contracts = controller.read(filters=filters)
+    with sql_budget(1):
+        signed_contracts = controller.read(filters=filters)
 
     assert len(signed_contracts) == 4
     assert isinstance(signed_contracts[0], ContractDTO)
@@ -88,10 +91,11 @@ def test_filter_contracts_signed(init_db_table_contract,
 
 def test_filter_contracts_unsigned(init_db_table_contract,
                                    bypass_permission_sales,
-                                   in_memory_uow):
+                                   in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     filters = {"signed": "NO"}
-    signed_contracts = controller.read(filters=filters)
+    with sql_budget(1):
+        signed_contracts = controller.read(filters=filters)
 
     assert len(signed_contracts) == 2
     assert isinstance(signed_contracts[0], ContractDTO)
@@ -100,10 +104,11 @@ def test_filter_contracts_unsigned(init_db_table_contract,
 
 def test_filter_contracts_total_amount(init_db_table_contract,
                                        bypass_permission_sales,
-                                       in_memory_uow):
+                                       in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     filters = {"total_amount": 100.0}
-    signed_contracts = controller.read(filters=filters)
+    with sql_budget(1):
+        signed_contracts = controller.read(filters=filters)
 
     assert len(signed_contracts) == 5
     assert isinstance(signed_contracts[0], ContractDTO)
@@ -112,10 +117,11 @@ def test_filter_contracts_total_amount(init_db_table_contract,
 
 def test_sort_contracts_reverse_signed(init_db_table_contract,
                                        bypass_permission_sales,
-                                       in_memory_uow):
+                                       in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     sort = (("signed", True),)
-    list_contracts = controller.read(sort=sort)
+    with sql_budget(1):
+        list_contracts = controller.read(sort=sort)
 
     assert len(list_contracts) == 6
     assert list_contracts[0].id == 1
@@ -130,10 +136,11 @@ def test_create_contract_minimal(init_db_table_collaborator,
                                  init_db_table_client,
                                  init_db_table_contract,
                                  bypass_permission_manager,
-                                 in_memory_uow):
+                                 in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     data = {"client_id": 3}
-    controller.create(**data)
+    with sql_budget(6):
+        controller.create(**data)
 
     contract = controller.read(7)[0]
 
@@ -148,73 +155,81 @@ def test_create_contract_bad_data(init_db_table_collaborator,
                                   init_db_table_client,
                                   init_db_table_contract,
                                   bypass_permission_manager,
-                                  in_memory_uow):
+                                  in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     data = {"client_id": 3,
             "total_amount": "bad data type"}
 
     with pytest.raises(ContractManagerError,
                        match="Input must be a valid Float"):
-        controller.create(**data)
+        with sql_budget(0):
+            controller.create(**data)
 
 
 def test_try_create_contract_wrong_role(init_db_table_collaborator,
                                         init_db_table_client,
                                         init_db_table_contract,
                                         bypass_permission_sales,
-                                        in_memory_uow):
+                                        in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     data = {"client_id": 3}
 
     with pytest.raises(AuthorizationDenied,
                        match=r"Permission error \(RBAC\) in "
                              r"\('contract:create',\)."):
-        controller.create(**data)
+        with sql_budget(0):
+            controller.create(**data)
 
 
 def test_try_create_contract_client_no_salesman(init_db_table_collaborator,
                                                 init_db_table_client,
                                                 init_db_table_contract,
                                                 bypass_permission_manager,
-                                                in_memory_uow):
+                                                in_memory_uow, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     data = {"client_id": 4}
 
     with pytest.raises(ContractServiceError,
                        match="Client must have a designated salesman"):
-        controller.create(**data)
+        with sql_budget(1):
+            controller.create(**data)
 
 
 def test_try_create_contract_client_associated_salesman_is_not_sales(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, bypass_permission_manager, in_memory_uow):
+        init_db_table_contract, bypass_permission_manager, in_memory_uow,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     data = {"client_id": 1}
 
     with pytest.raises(ContractServiceError,
                        match="Associated collaborator is not in SALES, "
                              "must reassign client"):
-        controller.create(**data)
+        with sql_budget(2):
+            controller.create(**data)
 
 
-def test_try_update_contract_directly(init_db_table_contract, in_memory_uow):
+def test_try_update_contract_directly(init_db_table_contract, in_memory_uow,
+                                      sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     with pytest.raises(ContractManagerError,
                        match="Can't update contract directly, "
                              "use appropriate methods."):
-        controller.update(client_id=1)
+        with sql_budget(0):
+            controller.update(client_id=1)
 
 
 def test_try_delete_contract(init_db_table_collaborator, init_db_table_client,
                              init_db_table_contract, in_memory_uow,
-                             bypass_permission_sales):
+                             bypass_permission_sales, sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     list_contract = controller.read()
     assert len(list_contract) == 6
 
-    controller.delete(pk=3)
+    with sql_budget(8):
+        controller.delete(pk=3)
 
     list_contract = controller.read()
     assert len(list_contract) == 5
@@ -222,36 +237,42 @@ def test_try_delete_contract(init_db_table_collaborator, init_db_table_client,
 
 def test_try_delete_contract_not_my_client(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     with pytest.raises(
             AuthorizationDenied,
             match=r"Permission error \(ABAC\) in "
                   r"\(is_contract_associated_salesman or "
                   r"\(is_management and not contract_has_salesman\)\)"):
-        controller.delete(pk=1)
+        with sql_budget(2):
+            controller.delete(pk=1)
 
 
 def test_manager_try_delete_contract_of_salesman(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_manager):
+        init_db_table_contract, in_memory_uow, bypass_permission_manager,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     with pytest.raises(
             AuthorizationDenied,
             match=r"Permission error \(ABAC\) in "
                   r"\(is_contract_associated_salesman or "
                   r"\(is_management and not contract_has_salesman\)\)"):
-        controller.delete(pk=3)
+        with sql_budget(4):
+            controller.delete(pk=3)
 
 
 def test_manager_delete_contract_client_without_salesman(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_manager):
+        init_db_table_contract, in_memory_uow, bypass_permission_manager,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
     list_contract = controller.read()
     assert len(list_contract) == 6
 
-    controller.delete(pk=4)
+    with sql_budget(10):
+        controller.delete(pk=4)
 
     list_contract = controller.read()
     assert len(list_contract) == 5
@@ -259,13 +280,15 @@ def test_manager_delete_contract_client_without_salesman(
 
 def test_salesman_sign_contract(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract_unsigned = controller.read(3)[0]
     assert contract_unsigned.signed is False
 
-    controller.sign(3)
+    with sql_budget(6):
+        controller.sign(3)
 
     contract_signed = controller.read(3)[0]
     assert contract_signed.signed is True
@@ -273,7 +296,8 @@ def test_salesman_sign_contract(
 
 def test_salesman_try_sign_contract_of_not_his_client(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract_unsigned = controller.read(4)[0]
@@ -283,12 +307,14 @@ def test_salesman_try_sign_contract_of_not_his_client(
             AuthorizationDenied,
             match=r"Permission error \(ABAC\) in "
                   r"is_contract_associated_salesman"):
-        controller.sign(4)
+        with sql_budget(2):
+            controller.sign(4)
 
 
 def test_salesman_sign_contract_already_signed(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract_signed = controller.read(2)[0]
@@ -296,7 +322,8 @@ def test_salesman_sign_contract_already_signed(
 
     with pytest.raises(ContractServiceError,
                        match="This contract is already signed"):
-        controller.sign(2)
+        with sql_budget(3):
+            controller.sign(2)
 
     # nothing happens
     contract_signed = controller.read(2)[0]
@@ -305,13 +332,15 @@ def test_salesman_sign_contract_already_signed(
 
 def test_salesman_change_total(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract = controller.read(3)[0]
     assert contract.total_amount == 100.0
 
-    controller.change_total(pk=3, total=300)
+    with sql_budget(7):
+        controller.change_total(pk=3, total=300)
 
     contract = controller.read(3)[0]
     assert contract.total_amount == 300.0
@@ -319,7 +348,8 @@ def test_salesman_change_total(
 
 def test_salesman_try_change_total_contract_signed(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract = controller.read(2)[0]
@@ -331,12 +361,14 @@ def test_salesman_try_change_total_contract_signed(
         match=r"Permission error \(ABAC\) in "
               r"\(is_contract_associated_salesman "
               r"and not contract_is_signed\)"):
-        controller.change_total(pk=2, total=300)
+        with sql_budget(3):
+            controller.change_total(pk=2, total=300)
 
 
 def test_salesman_try_change_total_wrong_type(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract = controller.read(3)[0]
@@ -345,7 +377,8 @@ def test_salesman_try_change_total_wrong_type(
     with pytest.raises(
             ContractManagerError,
             match="Input must be a valid Float"):
-        controller.change_total(pk=3, total="wrong data type")
+        with sql_budget(3):
+            controller.change_total(pk=3, total="wrong data type")
 
     contract = controller.read(3)[0]
     assert contract.total_amount == 100.0
@@ -353,13 +386,15 @@ def test_salesman_try_change_total_wrong_type(
 
 def test_salesman_pay(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract = controller.read(2)[0]
     assert contract.due_amount == 80.0
 
-    controller.pay(2, 80.0)
+    with sql_budget(7):
+        controller.pay(2, 80.0)
 
     contract = controller.read(2)[0]
     assert contract.due_amount == 0
@@ -367,7 +402,8 @@ def test_salesman_pay(
 
 def test_salesman_pay_too_much(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract = controller.read(2)[0]
@@ -375,7 +411,8 @@ def test_salesman_pay_too_much(
 
     with pytest.raises(ContractDomainError,
                        match="Payment : 100.0 exceed due. Still due : 80.0"):
-        controller.pay(2, 100.0)
+        with sql_budget(4):
+            controller.pay(2, 100.0)
 
     contract = controller.read(2)[0]
     assert contract.due_amount == 80.0
@@ -383,14 +420,16 @@ def test_salesman_pay_too_much(
 
 def test_salesman_pay_wrong_type(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract = controller.read(2)[0]
     assert contract.due_amount == 80.0
     with pytest.raises(ContractManagerError,
                        match="Input must be a valid Float"):
-        controller.pay(2, "wrong type")
+        with sql_budget(3):
+            controller.pay(2, "wrong type")
 
     contract = controller.read(2)[0]
     assert contract.due_amount == 80.0
@@ -398,7 +437,8 @@ def test_salesman_pay_wrong_type(
 
 def test_salesman_pay_contract_not_signed(
         init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, in_memory_uow, bypass_permission_sales):
+        init_db_table_contract, in_memory_uow, bypass_permission_sales,
+        sql_budget):
     controller = ContractManager(ContractService(in_memory_uow()))
 
     contract = controller.read(3)[0]
@@ -409,4 +449,30 @@ def test_salesman_pay_contract_not_signed(
                        match=r"Permission error \(ABAC\) in "
                              r"\(is_contract_associated_salesman "
                              r"and contract_is_signed\)"):
-        controller.pay(3, 100.0)
+        with sql_budget(3):
+            controller.pay(3, 100.0)
+
+
+def test_user_associated_contracts(
+        init_db_table_collaborator, init_db_table_client,
+        init_db_table_contract, init_db_table_event, in_memory_uow,
+        bypass_permission_sales, sql_budget):
+    controller = ContractManager(ContractService(in_memory_uow()))
+
+    with sql_budget(1):
+        contracts = controller.user_associated_contracts(
+            only_unpaid=False, only_unsigned=False, only_no_event=False,
+            filters=None, sort=None)
+
+    assert [contract.id for contract in contracts] == [2, 3, 5, 6]
+
+
+def test_orphan_contracts(init_db_table_collaborator, init_db_table_client,
+                          init_db_table_contract, in_memory_uow,
+                          bypass_permission_sales, sql_budget):
+    controller = ContractManager(ContractService(in_memory_uow()))
+
+    with sql_budget(1):
+        contracts = controller.orphan_contracts(filters=None, sort=None)
+
+    assert contracts == ()
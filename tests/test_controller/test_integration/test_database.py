@@ -0,0 +1,38 @@
+"""Integration tests for ee_crm.controllers.app.database
+
+Fixtures
+    sqlite_profile_engine
+        SQLite file engine tuned as the embedded backend, the tables
+        keep their PostgreSQL schemas.
+"""
+import pytest
+from sqlalchemy.orm import clear_mappers, sessionmaker
+
+from ee_crm.adapters.orm import start_mappers
+from ee_crm.controllers.app.database import init_database
+from ee_crm.exceptions import CollaboratorManagerError
+from ee_crm.services.unit_of_work import SqlAlchemyUnitOfWork
+
+
+@pytest.fixture
+def uow(sqlite_profile_engine):
+    start_mappers()
+    yield SqlAlchemyUnitOfWork(
+        session_factory=sessionmaker(bind=sqlite_profile_engine))
+    clear_mappers()
+
+
+def test_init_database_creates_the_first_account(sqlite_profile_engine,
+                                                 uow):
+    created, account = init_database("boss", "Secret-pass1",
+                                     engine=sqlite_profile_engine, uow=uow)
+
+    assert "client" in created
+    assert (account.id, account.role) == (1, "MANAGEMENT")
+
+    created, account = init_database(engine=sqlite_profile_engine, uow=uow)
+    assert (created, account) == ((), None)
+
+    with pytest.raises(CollaboratorManagerError):
+        init_database("other", "Secret-pass1",
+                      engine=sqlite_profile_engine, uow=uow)
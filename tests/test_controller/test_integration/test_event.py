@@ -46,10 +46,11 @@ def mock_uow(mocker, in_memory_uow):
 
 def test_read_all_events(init_db_table_event,
                          in_memory_uow,
-                         bypass_permission_manager):
+                         bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
 
-    list_event = controller.read()
+    with sql_budget(1):
+        list_event = controller.read()
 
     assert len(list_event) == 4
     assert isinstance(list_event[0], EventDTO)
@@ -57,11 +58,12 @@ def test_read_all_events(init_db_table_event,
 
 def test_filter_events(init_db_table_event,
                        in_memory_uow,
-                       bypass_permission_manager):
+                       bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     filters = {"location": "location_fou"}
 
-    events = controller.read(filters=filters)
+    with sql_budget(1):
+        events = controller.read(filters=filters)
 
     assert len(events) == 1
     assert events[0].id == 4
@@ -69,10 +71,11 @@ def test_filter_events(init_db_table_event,
 
 def test_filter_events_supporter_id(init_db_table_event,
                                     in_memory_uow,
-                                    bypass_permission_manager):
+                                    bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     filters = {"supporter_id": "3"}
-    events = controller.read(filters=filters)
+    with sql_budget(1):
+        events = controller.read(filters=filters)
 
     assert len(events) == 2
     assert events[0].id == 1
@@ -81,10 +84,11 @@ def test_filter_events_supporter_id(init_db_table_event,
 
 def test_sort_events_supporter_id(init_db_table_event,
                                   in_memory_uow,
-                                  bypass_permission_manager):
+                                  bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     sort = (('supporter_id', False),)
-    events = controller.read(sort=sort)
+    with sql_budget(1):
+        events = controller.read(sort=sort)
 
     assert len(events) == 4
     assert events[0].id == 3
@@ -98,13 +102,14 @@ def test_create_event_minimal(init_db_table_collaborator,
                               init_db_table_contract,
                               init_db_table_event,
                               in_memory_uow,
-                              bypass_permission_sales):
+                              bypass_permission_sales, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     data = {"contract_id": "6"}
 
     assert len(controller.read()) == 4
 
-    controller.create(**data)
+    with sql_budget(6):
+        controller.create(**data)
 
     assert len(controller.read()) == 5
     assert controller.read()[4].contract_id == 6
@@ -115,7 +120,7 @@ def test_create_event_bad_date(init_db_table_collaborator,
                                init_db_table_contract,
                                init_db_table_event,
                                in_memory_uow,
-                               bypass_permission_sales):
+                               bypass_permission_sales, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     data = {"contract_id": "6",
             "start_time": "bad date"}
@@ -123,7 +128,8 @@ def test_create_event_bad_date(init_db_table_collaborator,
     assert len(controller.read()) == 4
     with pytest.raises(EventManagerError,
                        match="Input must be a valid Datetime"):
-        controller.create(**data)
+        with sql_budget(0):
+            controller.create(**data)
 
 
 def test_create_event_bad_int(init_db_table_collaborator,
@@ -131,7 +137,7 @@ def test_create_event_bad_int(init_db_table_collaborator,
                               init_db_table_contract,
                               init_db_table_event,
                               in_memory_uow,
-                              bypass_permission_sales):
+                              bypass_permission_sales, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     data = {"contract_id": "6",
             "attendee": "bad value"}
@@ -139,12 +145,14 @@ def test_create_event_bad_int(init_db_table_collaborator,
     assert len(controller.read()) == 4
     with pytest.raises(EventManagerError,
                        match="Input must be a valid positive Integer"):
-        controller.create(**data)
+        with sql_budget(0):
+            controller.create(**data)
 
 
 def test_sales_update_event_without_support(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, init_db_table_event, bypass_permission_sales):
+        init_db_table_contract, init_db_table_event, bypass_permission_sales,
+        sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     data = {"title": "new_title"}
 
@@ -152,7 +160,8 @@ def test_sales_update_event_without_support(
     assert event.title == "title_thr"
     assert event.supporter_id is None
 
-    controller.update(3, **data)
+    with sql_budget(8):
+        controller.update(3, **data)
 
     event = controller.read(3)[0]
     assert event.title == "new_title"
@@ -160,7 +169,8 @@ def test_sales_update_event_without_support(
 
 def test_sales_cant_update_event_with_support(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
-        init_db_table_contract, init_db_table_event, bypass_permission_sales):
+        init_db_table_contract, init_db_table_event, bypass_permission_sales,
+        sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     data = {"title": "new_title"}
 
@@ -174,20 +184,22 @@ def test_sales_cant_update_event_with_support(
                   r"\(\(not event_has_support and "
                   r"is_event_associated_salesman\) or "
                   r"is_event_associated_support\)"):
-        controller.update(2, **data)
+        with sql_budget(2):
+            controller.update(2, **data)
 
 
 def test_support_can_update_his_event(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_support):
+        bypass_permission_support, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     data = {"title": "new_title"}
     contract = controller.read(2)[0]
     assert contract.title == "title_two"
     assert contract.supporter_id == 3
 
-    controller.update(2, **data)
+    with sql_budget(6):
+        controller.update(2, **data)
 
     contract = controller.read(2)[0]
     assert contract.title == "new_title"
@@ -196,7 +208,7 @@ def test_support_can_update_his_event(
 def test_support_cant_update_other_events(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_support):
+        bypass_permission_support, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     data = {"title": "new_title"}
     contract = controller.read(3)[0]
@@ -209,18 +221,20 @@ def test_support_cant_update_other_events(
                   r"\(\(not event_has_support and "
                   r"is_event_associated_salesman\) or "
                   r"is_event_associated_support\)"):
-        controller.update(3, **data)
+        with sql_budget(5):
+            controller.update(3, **data)
 
 
 def test_manager_can_delete_any_event(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_manager):
+        bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     list_event = controller.read()
     assert len(list_event) == 4
 
-    controller.delete(2)
+    with sql_budget(6):
+        controller.delete(2)
 
     list_event = controller.read()
     assert len(list_event) == 3
@@ -229,12 +243,13 @@ def test_manager_can_delete_any_event(
 def test_associated_salesman_can_delete_event_without_support(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_sales):
+        bypass_permission_sales, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     list_event = controller.read()
     assert len(list_event) == 4
 
-    controller.delete(3)
+    with sql_budget(9):
+        controller.delete(3)
 
     list_event = controller.read()
     assert len(list_event) == 3
@@ -243,12 +258,13 @@ def test_associated_salesman_can_delete_event_without_support(
 def test_manager_can_assign_support_to_event(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_manager):
+        bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     event = controller.read(3)[0]
     assert event.supporter_id is None
 
-    controller.change_support(pk=3, support_id=3)
+    with sql_budget(5):
+        controller.change_support(pk=3, support_id=3)
 
     event = controller.read(3)[0]
     assert event.supporter_id == 3
@@ -257,25 +273,27 @@ def test_manager_can_assign_support_to_event(
 def test_manager_cant_assign_sales_to_event(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_manager):
+        bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     event = controller.read(3)[0]
     assert event.supporter_id is None
 
     with pytest.raises(EventServiceError,
                        match="Can only assign supports to event"):
-        controller.change_support(pk=3, support_id=2)
+        with sql_budget(1):
+            controller.change_support(pk=3, support_id=2)
 
 
 def test_manager_can_modify_event_support(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_manager):
+        bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     event = controller.read(2)[0]
     assert event.supporter_id == 3
 
-    controller.change_support(pk=2, support_id=4)
+    with sql_budget(5):
+        controller.change_support(pk=2, support_id=4)
 
     event = controller.read(2)[0]
     assert event.supporter_id == 4
@@ -284,25 +302,27 @@ def test_manager_can_modify_event_support(
 def test_manager_cant_assign_sales_as_event_support(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_manager):
+        bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     event = controller.read(2)[0]
     assert event.supporter_id == 3
 
     with pytest.raises(EventServiceError,
                        match="Can only assign supports to event"):
-        controller.change_support(pk=3, support_id=2)
+        with sql_budget(1):
+            controller.change_support(pk=3, support_id=2)
 
 
 def test_manager_can_unassign_support_from_event(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_manager):
+        bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
     event = controller.read(2)[0]
     assert event.supporter_id == 3
 
-    controller.change_support(pk=2, unassign_flag=True)
+    with sql_budget(4):
+        controller.change_support(pk=2, unassign_flag=True)
 
     event = controller.read(2)[0]
     assert event.supporter_id is None
@@ -311,9 +331,10 @@ def test_manager_can_unassign_support_from_event(
 def test_user_associated_events(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_support):
+        bypass_permission_support, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
-    events = controller.user_associated_resource(filters=None, sort=None)
+    with sql_budget(1):
+        events = controller.user_associated_resource(filters=None, sort=None)
     assert len(events) == 2
     assert events[0].id == 1
     assert events[1].id == 2
@@ -322,9 +343,10 @@ def test_user_associated_events(
 def test_unassigned_events(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_manager):
+        bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
-    events = controller.unassigned_events(filters=None, sort=None)
+    with sql_budget(1):
+        events = controller.unassigned_events(filters=None, sort=None)
     assert len(events) == 2
     assert events[0].id == 3
     assert events[1].id == 4
@@ -333,8 +355,9 @@ def test_unassigned_events(
 def test_orphan_events(
         in_memory_uow, init_db_table_collaborator, init_db_table_client,
         init_db_table_contract, init_db_table_event,
-        bypass_permission_manager):
+        bypass_permission_manager, sql_budget):
     controller = EventManager(EventService(in_memory_uow()))
-    events = controller.orphan_events(filters=None, sort=None)
+    with sql_budget(1):
+        events = controller.orphan_events(filters=None, sort=None)
     assert len(events) == 1
     assert events[0].id == 4
@@ -0,0 +1,59 @@
+"""Integration tests for ee_crm.controllers.app.export
+
+Fixtures
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
+    init_db_table_client
+        create and populate the table linked to the Client model.
+    bypass_permission_sales
+        mock the payload returned by decoding a JWT representing a
+        specific SALES person.
+"""
+import gzip
+
+import pytest
+
+from ee_crm.controllers.app.export import ExportManager
+from ee_crm.exceptions import ExportManagerError
+from ee_crm.services.app.exports import ExportService
+
+
+@pytest.fixture(autouse=True)
+def mock_uow(mocker, in_memory_uow):
+    """Fixture to replace the Unit of Work class imported by the
+    permission module for one connected to the SQLite in-memory
+    database.
+    """
+    mocker.patch("ee_crm.controllers.auth.permission.DEFAULT_UOW",
+                 return_value=in_memory_uow())
+
+
+def test_export_clients(tmp_path, init_db_table_client,
+                        bypass_permission_sales, in_memory_uow, sql_budget):
+    controller = ExportManager(ExportService(in_memory_uow()))
+    path = tmp_path / "clients.csv.gz"
+    with sql_budget(3):
+        report = controller.export_clients(path, fmt="CSV", chunk_size="2")
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        lines = file.read().splitlines()
+
+    assert report.rows == 4
+    assert len(lines) == 5
+
+
+def test_export_invalid_format(tmp_path, bypass_permission_sales,
+                              in_memory_uow, sql_budget):
+    controller = ExportManager(ExportService(in_memory_uow()))
+    with pytest.raises(ExportManagerError, match="Invalid format <xml>"):
+        with sql_budget(0):
+            controller.export_clients(tmp_path / "c.gz", fmt="xml")
+
+
+def test_export_invalid_chunk_size(tmp_path, bypass_permission_sales,
+                                  in_memory_uow, sql_budget):
+    controller = ExportManager(ExportService(in_memory_uow()))
+    with pytest.raises(ExportManagerError, match="chunk_size"):
+        with sql_budget(0):
+            controller.export_clients(tmp_path / "c.gz", chunk_size="-3")
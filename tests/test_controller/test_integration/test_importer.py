@@ -0,0 +1,122 @@
+"""Integration tests for ee_crm.controllers.app.importer
+
+Fixtures
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
+    session
+        SQLAlchemy session object bound to the in-memory test SQLite
+        database.
+    init_db_table_collaborator
+        create and populate the table linked to the Collaborator model.
+    bypass_permission_sales
+        mock the payload returned by decoding a JWT representing a
+        specific SALES person.
+    bypass_permission_support
+        mock the payload returned by decoding a JWT representing a
+        specific SUPPORT person.
+"""
+import gzip
+import json
+
+import pytest
+from sqlalchemy import text
+
+from ee_crm.controllers.app.importer import ImportManager
+from ee_crm.controllers.auth.permission import AuthorizationDenied
+from ee_crm.exceptions import ImportManagerError
+from ee_crm.services.app.imports import ImportService
+
+
+@pytest.fixture(autouse=True)
+def mock_logger(mocker):
+    """Fixture to disable the loggers during tests."""
+    mocker.patch('ee_crm.controllers.app.importer.setup_file_logger',
+                 return_value=mocker.Mock())
+
+
+@pytest.fixture(autouse=True)
+def mock_uow(mocker, in_memory_uow):
+    """Fixture to replace the Unit of Work class imported by the
+    permission module for one connected to the SQLite in-memory
+    database.
+    """
+    mocker.patch("ee_crm.controllers.auth.permission.DEFAULT_UOW",
+                 return_value=in_memory_uow())
+
+
+def test_import_clients_links_user(tmp_path, session, in_memory_uow,
+                                   init_db_table_collaborator,
+                                   bypass_permission_sales, sql_budget):
+    path = tmp_path / "clients.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write(json.dumps({"last_name": "Doe", "salesman_id": 4}) + "\n")
+        file.write(json.dumps({"last_name": "Roe", "id": 50}) + "\n")
+
+    controller = ImportManager(ImportService(in_memory_uow()))
+    with sql_budget(7):
+        report = controller.import_clients(path)
+
+    rows = session.execute(text(
+        "SELECT client_id, last_name, salesman_id FROM client")).all()
+    assert rows == [(1, "Doe", 2), (2, "Roe", 2)]
+    assert report.rows_imported == 2
+
+
+def test_import_clients_denied_for_support(tmp_path, in_memory_uow,
+                                           bypass_permission_support,
+                                           sql_budget):
+    controller = ImportManager(ImportService(in_memory_uow()))
+    with pytest.raises(AuthorizationDenied):
+        with sql_budget(0):
+            controller.import_clients(tmp_path / "clients.csv")
+
+
+def test_import_invalid_workers(tmp_path, in_memory_uow,
+                                bypass_permission_sales, sql_budget):
+    controller = ImportManager(ImportService(in_memory_uow()))
+    with pytest.raises(ImportManagerError, match="workers"):
+        with sql_budget(0):
+            controller.import_events(tmp_path / "events.csv", workers="two")
+
+
+def test_import_invalid_format(tmp_path, in_memory_uow,
+                               bypass_permission_sales, sql_budget):
+    controller = ImportManager(ImportService(in_memory_uow()))
+    with pytest.raises(ImportManagerError, match="Invalid format <xml>"):
+        with sql_budget(0):
+            controller.import_events(tmp_path / "events.xml", fmt="xml")
+
+
+def test_import_collaborators_requires_management(tmp_path, in_memory_uow,
+                                                  bypass_permission_sales,
+                                                  sql_budget):
+    path = tmp_path / "collaborators.csv"
+    path.write_text("username,password\nnew_one,Password1\n",
+                    encoding="utf-8")
+
+    controller = ImportManager(ImportService(in_memory_uow()))
+    with pytest.raises(AuthorizationDenied):
+        with sql_budget(0):
+            controller.import_collaborators(path)
+
+
+def test_import_collaborators(tmp_path, session, in_memory_uow,
+                              init_db_table_users,
+                              init_db_table_collaborator,
+                              bypass_permission_manager, sql_budget):
+    path = tmp_path / "collaborators.jsonl"
+    path.write_text(json.dumps({"username": "new_one",
+                                "password": "Password1",
+                                "role": "support"}) + "\n",
+                    encoding="utf-8")
+
+    controller = ImportManager(ImportService(in_memory_uow()))
+    with sql_budget(8):
+        report = controller.import_collaborators(path, workers=1)
+
+    role = session.execute(text(
+        "SELECT role_id FROM collaborator WHERE collaborator_id = 5"
+    )).scalar_one()
+    assert role == 5
+    assert report.rows_imported == 1
@@ -0,0 +1,216 @@
+"""Integration test for ee_crm.controllers.app.journal and the push of
+the journal, ee_crm.controllers.app.replica.ReplicaManager.push
+
+The in-memory SQLite database is the source, the replica is a SQLite
+file synced from it. The database is unreachable for the services
+built on an offline unit of work, whose session can't be opened.
+
+Fixtures
+    session_factory
+        SQLAlchemy sessionmaker object bound to the in-memory
+        test SQLite database.
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
+    init_db_table_collaborator, init_db_table_client,
+    init_db_table_contract, init_db_table_event
+        create and populate the tables linked to the models.
+    bypass_permission_sales
+        mock the payload returned by decoding a JWT representing a
+        specific SALES person.
+"""
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from ee_crm.adapters.journal import WriteJournal
+from ee_crm.adapters.orm import client_table
+from ee_crm.adapters.replica import create_replica_engine
+from ee_crm.controllers.app.client import ClientManager
+from ee_crm.controllers.app.replica import ReplicaManager
+from ee_crm.controllers.auth.permission import AuthorizationDenied
+from ee_crm.exceptions import ClientManagerError
+from ee_crm.services.app.clients import ClientService
+from ee_crm.services.app.replica import ReplicaService
+from ee_crm.services.unit_of_work import SqlAlchemyUnitOfWork
+
+
+def offline_session():
+    raise OperationalError(None, None, Exception("connection refused"))
+
+
+@pytest.fixture
+def replica(tmp_path, in_memory_uow, init_db_table_collaborator,
+            init_db_table_client, init_db_table_contract,
+            init_db_table_event):
+    engine = create_replica_engine(str(tmp_path / "replica.db"))
+    ReplicaService(in_memory_uow(), engine).sync(
+        ("collaborator", "client", "contract", "event"), collaborator_id=2)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    monkeypatch.setenv("OFFLINE_JOURNAL", "1")
+    monkeypatch.setenv("OFFLINE_JOURNAL_PATH",
+                       str(tmp_path / "journal.jsonl"))
+    monkeypatch.setenv("OFFLINE_CONFLICTS_PATH",
+                       str(tmp_path / "conflicts.jsonl"))
+    return WriteJournal(str(tmp_path / "journal.jsonl"))
+
+
+@pytest.fixture(autouse=True)
+def mock_uow(mocker, in_memory_uow, replica):
+    """Fixture to replace the units of work imported by the modules,
+    the database for one connected to the SQLite in-memory database and
+    the replica for the synced one."""
+    replica_factory = sessionmaker(bind=replica)
+    mocker.patch("ee_crm.controllers.auth.permission.DEFAULT_UOW",
+                 return_value=in_memory_uow())
+    for module in ("ee_crm.controllers.auth.permission",
+                   "ee_crm.controllers.app.journal"):
+        mocker.patch(f"{module}.REPLICA_UOW", lambda: SqlAlchemyUnitOfWork(
+            session_factory=replica_factory))
+    mocker.patch("ee_crm.controllers.app.journal.REPLICA_ENGINE", replica)
+
+
+@pytest.fixture
+def offline_manager():
+    return ClientManager(ClientService(
+        SqlAlchemyUnitOfWork(session_factory=offline_session)))
+
+
+@pytest.fixture
+def pusher(in_memory_uow, replica, journal):
+    return ReplicaManager(ReplicaService(in_memory_uow(), replica),
+                          journal=journal)
+
+
+def first_name(in_memory_uow, client_id):
+    client, = ClientService(in_memory_uow()).retrieve(client_id)
+    return client.first_name
+
+
+def test_offline_write_is_journaled(offline_manager, journal,
+                                    bypass_permission_sales):
+    with pytest.raises(ClientManagerError, match="journaled") as warning:
+        offline_manager.update(2, first_name="offline")
+
+    entry, = journal.read()
+    assert warning.value.threat == "warning"
+    assert (entry["call"], entry["args"], entry["kwargs"]) == \
+        ("update", [2], {"first_name": "offline"})
+    assert (entry["write"], entry["write_kwargs"]) == \
+        ("modify", {"obj_id": 2, "first_name": "offline"})
+    assert (entry["c_id"], entry["row_id"]) == (2, 2)
+    assert (entry["expected"], entry["expected_read"]) == \
+        ("2025-02-01T00:00:02", True)
+
+
+def test_offline_write_is_checked_on_the_replica(offline_manager, journal,
+                                                 mocker,
+                                                 bypass_permission_sales):
+    offline_uow = SqlAlchemyUnitOfWork(session_factory=offline_session)
+    mocker.patch("ee_crm.controllers.auth.permission.DEFAULT_UOW",
+                 return_value=offline_uow)
+
+    with pytest.raises(AuthorizationDenied, match="ABAC"):
+        offline_manager.update(1, first_name="not mine")
+    mocker.patch("ee_crm.controllers.auth.permission.REPLICA_UOW",
+                 return_value=offline_uow)
+    with pytest.raises(ClientManagerError, match="can't be checked"):
+        offline_manager.update(2, first_name="offline")
+
+    assert journal.read() == []
+
+
+def test_offline_write_without_journal(offline_manager, journal,
+                                       monkeypatch, bypass_permission_sales):
+    monkeypatch.setenv("OFFLINE_JOURNAL", "0")
+
+    with pytest.raises(OperationalError):
+        offline_manager.update(2, first_name="offline")
+
+
+def test_push_replays_the_journal(offline_manager, pusher, journal,
+                                  in_memory_uow, bypass_permission_sales):
+    for write in (lambda: offline_manager.update(2, first_name="offline"),
+                  lambda: offline_manager.update(2, company="offline co"),
+                  lambda: offline_manager.create(last_name="new")):
+        with pytest.raises(ClientManagerError):
+            write()
+
+    report = pusher.push()
+
+    clients = ClientService(in_memory_uow()).retrieve_all()
+    client, = [c for c in clients if c.id == 2]
+    assert (report.applied, report.conflicts, report.kept) == (3, (), 0)
+    assert (client.first_name, client.company) == ("offline", "offline co")
+    assert [c.salesman_id for c in clients if c.last_name == "new"] == [2]
+    assert journal.read() == []
+
+
+def test_push_reports_the_conflicts(offline_manager, pusher, journal,
+                                    in_memory_uow, bypass_permission_sales):
+    for client_id in (2, 2, 3):
+        with pytest.raises(ClientManagerError):
+            offline_manager.update(client_id, first_name="offline")
+    ClientService(in_memory_uow()).modify(2, last_name="changed online")
+    journal.append({"resource": "Client", "table": "client",
+                    "call": "delete", "args": [1], "kwargs": {},
+                    "c_id": 1, "row_id": 1, "expected": None})
+
+    report = pusher.push()
+
+    assert (report.applied, report.kept) == (1, 1)
+    assert [c["reason"] for c in report.conflicts] == \
+        ["the row was changed", "a previous write of the row failed"]
+    assert first_name(in_memory_uow, 2) == "cli_fn_two"
+    assert first_name(in_memory_uow, 3) == "offline"
+    assert len(WriteJournal(report.conflicts_path).read()) == 2
+    assert [entry["c_id"] for entry in journal.read()] == [1]
+
+
+def test_push_checks_the_rows_without_version(offline_manager, pusher,
+                                              journal, replica,
+                                              session_factory, in_memory_uow,
+                                              bypass_permission_sales):
+    # rows written before the 'updated_at' column, in both databases
+    legacy = (update(client_table)
+              .where(client_table.c.client_id.in_((2, 3)))
+              .values(updated_at=None))
+    with session_factory() as session:
+        session.execute(legacy)
+        session.commit()
+    with replica.begin() as conn:
+        conn.execute(legacy)
+    for client_id in (2, 3):
+        with pytest.raises(ClientManagerError):
+            offline_manager.update(client_id, first_name="offline")
+    assert [(e["expected"], e["expected_read"]) for e in journal.read()] \
+        == [(None, True), (None, True)]
+    ClientService(in_memory_uow()).modify(2, last_name="changed online")
+
+    report = pusher.push()
+
+    assert report.applied == 1
+    assert [(c["row_id"], c["reason"]) for c in report.conflicts] == \
+        [(2, "the row was changed")]
+    assert first_name(in_memory_uow, 2) == "cli_fn_two"
+    assert first_name(in_memory_uow, 3) == "offline"
+
+
+def test_push_refuses_the_rows_not_read_in_the_replica(
+        offline_manager, pusher, journal, mocker, bypass_permission_sales):
+    mocker.patch("ee_crm.controllers.app.journal._replica_version",
+                 return_value=(False, None))
+    with pytest.raises(ClientManagerError):
+        offline_manager.update(2, first_name="offline")
+
+    report = pusher.push()
+
+    assert report.applied == 0
+    assert [c["reason"] for c in report.conflicts] == \
+        ["the row wasn't read in the replica"]
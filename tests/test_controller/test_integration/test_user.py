@@ -41,9 +41,11 @@ def bypass_password(mocker):
 
 
 def test_who_am_i_return_ok(init_db_table_users, init_db_table_collaborator,
-                            bypass_permission_manager, in_memory_uow):
+                            bypass_permission_manager, in_memory_uow,
+                            sql_budget):
     controller = UserManager(UserService(in_memory_uow()))
-    auth_dto, coll_dto = controller.who_am_i()
+    with sql_budget(2):
+        auth_dto, coll_dto = controller.who_am_i()
 
     assert isinstance(auth_dto, AuthUserDTO)
     assert isinstance(coll_dto, CollaboratorDTO)
@@ -52,30 +54,35 @@ def test_who_am_i_return_ok(init_db_table_users, init_db_table_collaborator,
 
 
 def test_update_username_ok(init_db_table_users, bypass_permission_manager,
-                            in_memory_uow, bypass_password, mocker):
+                            in_memory_uow, bypass_password, mocker,
+                            sql_budget):
     controller = UserManager(UserService(in_memory_uow()))
     mocker.patch("ee_crm.controllers.app.user.AuthenticationService."
                  "authenticate",
                  return_value={"c_id": 1})
-    controller.update_username("user_one", "password", "new_username")
+    with sql_budget(5):
+        controller.update_username("user_one", "password", "new_username")
 
     assert controller.read(pk=1)[0].id == 1
     assert controller.read(pk=1)[0].username == "new_username"
 
 
 def test_update_username_fail(init_db_table_users, bypass_permission_manager,
-                              in_memory_uow, bypass_password, mocker):
+                              in_memory_uow, bypass_password, mocker,
+                              sql_budget):
     controller = UserManager(UserService(in_memory_uow()))
     mocker.patch("ee_crm.controllers.app.user.AuthenticationService."
                  "authenticate",
                  return_value={"c_id": 2})
     with pytest.raises(UserManagerError,
                        match="You can't modify someone else username."):
-        controller.update_username("user_one", "password", "new_username")
+        with sql_budget(0):
+            controller.update_username("user_one", "password", "new_username")
 
 
 def test_update_password_ok(init_db_table_users, bypass_permission_manager,
-                            in_memory_uow, bypass_password, mocker):
+                            in_memory_uow, bypass_password, mocker,
+                            sql_budget):
 
     def mock_set_password(self, plain_password):
         self._password = plain_password
@@ -90,7 +97,8 @@ def test_update_password_ok(init_db_table_users, bypass_permission_manager,
 
     spy_service = mocker.spy(service, "modify_password")
 
-    controller.update_password("user_one", "oldPASSWORD1", "newPASSWORD1")
+    with sql_budget(4):
+        controller.update_password("user_one", "oldPASSWORD1", "newPASSWORD1")
 
     assert spy_service.call_count == 1
 
@@ -100,14 +108,16 @@ def test_update_password_ok(init_db_table_users, bypass_permission_manager,
 
 
 def test_update_password_fail(init_db_table_users, bypass_permission_manager,
-                              in_memory_uow, bypass_password, mocker):
+                              in_memory_uow, bypass_password, mocker,
+                              sql_budget):
     controller = UserManager(UserService(in_memory_uow()))
     mocker.patch("ee_crm.controllers.app.user.AuthenticationService."
                  "authenticate",
                  return_value={"c_id": 2})
     with pytest.raises(UserManagerError,
                        match="You can't modify someone else password."):
-        controller.update_password("user_one", "oldPASSWORD1", "newPASSWORD1")
+        with sql_budget(0):
+            controller.update_password("user_one", "oldPASSWORD1", "newPASSWORD1")
 
 
 def test_verify_plain_password():
@@ -2,13 +2,15 @@
 
 Tests focus on the .builder() factory methods happy paths.
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 import pytest
+from argon2 import PasswordHasher
 
 from ee_crm.domain.model import AuthUser, Collaborator, Contract, Client, \
     Event, Role
-from ee_crm.exceptions import AuthUserDomainError
+from ee_crm.exceptions import AuthUserDomainError, CRMException, \
+    EventValidatorError
 
 
 def test_auth_user_builder_success():
@@ -24,10 +26,31 @@ def test_auth_user_builder_success():
         user.verify_password("wrong_password")
 
 
+def test_auth_user_rehash_outdated_password():
+    """A hash made with other parameters than the configured hasher
+    needs a rehash, the new hash still verifies the password."""
+    weak_hash = PasswordHasher(time_cost=1, memory_cost=8,
+                               parallelism=1).hash("Password1")
+    user = AuthUser(_username="user_one", _password=weak_hash)
+
+    assert user.password_needs_rehash()
+    user.rehash_password("Password1")
+
+    assert user._password != weak_hash
+    assert not user.password_needs_rehash()
+    user.verify_password("Password1")
+
+
+def test_auth_user_unreadable_hash_needs_no_rehash():
+    user = AuthUser(_username="user_one", _password="password_one")
+
+    assert not user.password_needs_rehash()
+
+
 def is_recent(time_to_test, time_delta=300):
-    """Helper, to test if a given time is in a timeframe off more or
-    less than 5 minutes."""
-    now = datetime.now()
+    """Helper, to test if a given UTC time is in a timeframe off more
+    or less than 5 minutes."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     delta = timedelta(seconds=time_delta)
     return now - delta <= time_to_test <= now + delta
 
@@ -98,3 +121,71 @@ def test_event_builder_success():
     assert event.notes is None
     assert event.supporter_id is None
     assert event.contract_id == 1
+
+
+@pytest.mark.parametrize("model_cls", [Client, Contract, Event])
+def test_timestamps_are_stamped_at_each_build(mocker, model_cls):
+    """The timestamps of an entity are its build time in UTC, not the
+    import time of the module."""
+    clock = mocker.patch("ee_crm.domain.model.datetime")
+    clock.now.return_value = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    entity = model_cls()
+
+    assert entity.updated_at == datetime(2030, 1, 1)
+    if model_cls is not Event:
+        assert entity.created_at == datetime(2030, 1, 1)
+
+
+@pytest.mark.parametrize("model_cls, data", [
+    (Client, {"last_name": "a"}),
+    (Contract, {"total_amount": 10, "client_id": 1}),
+])
+def test_from_valid_stamps_once(model_cls, data):
+    entity = model_cls.from_valid(**data)
+
+    assert entity.created_at == entity.updated_at
+    assert is_recent(entity.updated_at)
+
+
+def test_event_builder_dates_order():
+    """'Event.builder' refuses an event ending before it starts."""
+    with pytest.raises(EventValidatorError, match="ends before it starts"):
+        Event.builder(start_time=datetime(2025, 1, 2),
+                      end_time=datetime(2025, 1, 1),
+                      contract_id=1)
+
+
+@pytest.mark.parametrize(
+    "model, columns",
+    [
+        (Client, {"last_name": ["a", "b", 3, "d"],
+                  "email": ["a@b", "bad", "c@d", None],
+                  "salesman_id": [1, 1, 1, None]}),
+        (Contract, {"total_amount": [10, -1, "x", 5],
+                    "client_id": [1, 2, 3, 0]}),
+        (Event, {"title": ["a", "b", "c", "d"],
+                 "start_time": [datetime(2025, 1, 1), None,
+                                datetime(2025, 1, 2), datetime(2025, 1, 2)],
+                 "end_time": [datetime(2025, 1, 1), datetime(2025, 1, 1),
+                              datetime(2025, 1, 1), None],
+                 "contract_id": [1, "x", 1, None]}),
+    ]
+)
+def test_validate_batch_matches_builder(model, columns):
+    """'validate_batch' rejects the same rows as the builder."""
+    size = len(next(iter(columns.values())))
+    rows = [{k: values[i] for k, values in columns.items()}
+            for i in range(size)]
+    expected = []
+    for row in rows:
+        try:
+            model.builder(**row)
+            expected.append(False)
+        except CRMException:
+            expected.append(True)
+
+    mask, errors = model.validate_batch(columns)
+
+    assert mask == expected
+    assert [e is None for e in errors] == [not m for m in mask]
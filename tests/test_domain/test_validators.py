@@ -2,7 +2,7 @@
 
 Tests try to exhaust happy and sad path using pytest parametrization.
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
 
@@ -314,3 +314,67 @@ def test_validate_notes_fail_too_long():
     err_msg = "Notes too long, must be less than 9999 characters"
     with pytest.raises(v.EventValidatorError, match=err_msg):
         v.EventValidator.validate_notes("x" * 10000)
+
+
+def test_validate_dates_order_success():
+    """Test happy paths, same or later end, missing date."""
+    start = datetime(2025, 1, 1, 10)
+    v.EventValidator.validate_dates_order(start, start)
+    v.EventValidator.validate_dates_order(start, None)
+
+
+def test_validate_dates_order_fail():
+    """Test sad paths, end before start."""
+    err_msg = "Invalid dates, the event ends before it starts"
+    with pytest.raises(v.EventValidatorError, match=err_msg):
+        v.EventValidator.validate_dates_order(datetime(2025, 1, 2),
+                                              datetime(2025, 1, 1))
+
+
+@pytest.mark.parametrize(
+    "check, values, failing_rows",
+    [
+        (v.ClientValidator.batch_str, ["a", None, "b" * 256, 12], [2, 3]),
+        (v.ClientValidator.batch_str, ["a", "b"], []),
+        (v.ClientValidator.batch_email, ["a@b", None, "ab", "a@b@c"], [2, 3]),
+        (v.ClientValidator.batch_phone_number, ["01", "0" * 21], [1]),
+        (v.ClientValidator.batch_positive_int, [1, None, 0, "2", True], [2, 3]),
+        (v.ContractValidator.batch_price, [0, 1.5, -1, "3"], [2, 3]),
+        (v.EventValidator.batch_date, [datetime.now(), "2025-01-01"], [1]),
+        (v.EventValidator.batch_notes, ["", "x" * 9999, 3], [1, 2]),
+    ]
+)
+def test_batch_checks(check, values, failing_rows):
+    """Batch checks return the same errors as the single validators,
+    keyed by row."""
+    failures = check(values)
+
+    assert sorted(failures) == failing_rows
+    for row, error in failures.items():
+        assert isinstance(error, v.ValidatorError)
+        assert error.tips
+
+
+def test_batch_dates_order():
+    """Rows where the end precedes the start are reported."""
+    day = datetime(2025, 1, 1)
+    starts = [day, day, None, day + timedelta(days=1)]
+    ends = [day, day + timedelta(hours=1), day, day]
+
+    assert list(v.EventValidator.batch_dates_order(starts, ends)) == [3]
+
+
+def test_validate_batch_mask_and_errors():
+    """Errors of several columns are grouped by row."""
+    columns = {"last_name": ["ok", 1, "ok"],
+               "email": ["a@b", "bad", "a@b"],
+               "unknown": [1, 2, 3]}
+    rules = {"last_name": v.ClientValidator.batch_str,
+             "email": v.ClientValidator.batch_email}
+
+    mask, errors = v.ClientValidator.validate_batch(columns, rules)
+
+    assert mask == [False, True, False]
+    assert errors[0] is None
+    assert [e.args[0] for e in errors[1]] == ["Wrong type must be a string",
+                                              "Email format invalid"]
@@ -0,0 +1,77 @@
+"""Integration tests for ee_crm.services.app.exports
+
+The exports run against the in-memory SQLite database, so they go
+through the keyset fallback.
+
+Fixtures
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
+    init_db_table_contract
+        create and populate the table linked to the Contract model.
+"""
+import csv
+import gzip
+import io
+
+import pytest
+
+from ee_crm.exceptions import ExportServiceError
+from ee_crm.services.app.exports import ExportService
+
+
+def test_export_contracts_csv(tmp_path, in_memory_uow,
+                              init_db_table_contract):
+    path = tmp_path / "contracts.csv.gz"
+    report = ExportService(in_memory_uow()).export("contracts", path,
+                                                   chunk_size=4)
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        rows = list(csv.reader(io.StringIO(file.read())))
+
+    assert rows[0] == ["contract_id", "total_amount", "paid_amount",
+                       "created_at", "updated_at", "signed", "client_id"]
+    assert len(rows) == 7
+    assert rows[1][0] == "1"
+    assert rows[1][5] == "t"
+    assert report.rows == 6
+    assert report.raw_bytes > report.file_bytes > 0
+    assert report.rows_per_second > 0
+
+
+def test_export_contracts_text(tmp_path, in_memory_uow,
+                               init_db_table_contract):
+    path = tmp_path / "contracts.tsv.gz"
+    report = ExportService(in_memory_uow()).export("contracts", path,
+                                                   fmt="text")
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        lines = file.read().splitlines()
+
+    assert len(lines) == 6
+    assert lines[1].split("\t")[0] == "2"
+    assert report.fmt == "text"
+
+
+def test_export_empty_table_writes_header(tmp_path, in_memory_uow):
+    path = tmp_path / "events.csv.gz"
+    report = ExportService(in_memory_uow()).export("events", path)
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        content = file.read()
+
+    assert content.startswith("event_id,title")
+    assert report.rows == 0
+
+
+def test_export_binary_requires_postgresql(tmp_path, in_memory_uow):
+    path = tmp_path / "clients.bin.gz"
+    with pytest.raises(ExportServiceError,
+                       match="Binary export requires PostgreSQL"):
+        ExportService(in_memory_uow()).export("clients", path, fmt="binary")
+    assert not path.exists()
+
+
+def test_export_unknown_resource(tmp_path, in_memory_uow):
+    with pytest.raises(ExportServiceError, match="Unknown resource"):
+        ExportService(in_memory_uow()).export("users", tmp_path / "u.gz")
@@ -0,0 +1,322 @@
+"""Integration tests for ee_crm.services.app.imports
+
+The imports run against the in-memory SQLite database, so the staging
+table is loaded with multi-row INSERT.
+
+Fixtures
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
+    session
+        SQLAlchemy session object bound to the in-memory test SQLite
+        database.
+    init_db_table_collaborator
+        create and populate the table linked to the Collaborator model.
+    init_db_table_client
+        create and populate the table linked to the Client model.
+    init_db_table_contract
+        create and populate the table linked to the Contract model.
+    init_db_table_event
+        create and populate the table linked to the Event model.
+"""
+import json
+
+import pytest
+from sqlalchemy import text
+
+from ee_crm.controllers.utils import verify_datetime, \
+    verify_positive_float, verify_positive_int, verify_string
+from ee_crm.exceptions import ImportServiceError
+from ee_crm.services.app.imports import ImportService, \
+    hash_collaborator_chunk, validate_chunk
+from ee_crm.domain.model import AuthUser, Client, Contract
+
+CLIENT_TYPES = {
+    "last_name": verify_string,
+    "email": verify_string,
+    "phone_number": verify_string,
+}
+
+CONTRACT_TYPES = {
+    "total_amount": verify_positive_float,
+    "client_id": verify_positive_int,
+}
+
+COLLABORATOR_TYPES = {
+    "last_name": verify_string,
+    "email": verify_string,
+    "role": verify_string,
+}
+
+EVENT_TYPES = {
+    "title": verify_string,
+    "start_time": verify_datetime,
+    "attendee": verify_positive_int,
+    "contract_id": verify_positive_int,
+}
+
+
+def read_rejects(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_validate_chunk_splits_valid_and_rejected():
+    chunk = [(2, {"last_name": "Doe", "email": "doe@mail"}),
+             (3, {"last_name": "Roe", "email": "not-an-email"}),
+             (4, {"last_name": "x" * 256})]
+    rows, rejects = validate_chunk(Client, CLIENT_TYPES,
+                                   {"last_name", "email", "salesman_id"},
+                                   ["last_name", "email", "salesman_id"],
+                                   {"salesman_id": 2}, chunk)
+
+    assert rows == [{"last_name": "Doe", "email": "doe@mail",
+                     "salesman_id": 2, "line_no": 2}]
+    assert [reject["line"] for reject in rejects] == [3, 4]
+    assert rejects[0]["error"] == "ClientValidatorError"
+    assert "@" in rejects[0]["tips"]
+
+
+def test_validate_chunk_keeps_the_order_of_the_lines():
+    chunk = [(2, {"total_amount": -5, "client_id": 1}),
+             (3, {"total_amount": "abc", "client_id": 1}),
+             (4, {"total_amount": 10.555}),
+             (5, {"total_amount": 10.555, "client_id": 1})]
+    rows, rejects = validate_chunk(Contract, {"total_amount": float},
+                                   {"total_amount", "client_id"},
+                                   ["total_amount", "client_id"], {}, chunk)
+
+    assert rows == [{"total_amount": 10.55, "client_id": 1, "line_no": 5}]
+    assert [(reject["line"], reject["error"]) for reject in rejects] == [
+        (2, "ContractValidatorError"), (3, "ImportServiceError"),
+        (4, "ContractDomainError")]
+
+
+def test_import_clients_csv(tmp_path, session, in_memory_uow,
+                            init_db_table_collaborator):
+    path = tmp_path / "clients.csv"
+    path.write_text("last_name,email,phone_number,salesman_id\n"
+                    "Doe,doe@mail,0101,4\n"
+                    "Roe,roe-mail,0202,\n"
+                    "Poe,poe@mail,,\n", encoding="utf-8")
+
+    report = ImportService(in_memory_uow()).import_file(
+        "clients", path, types_map=CLIENT_TYPES, salesman_id=2,
+        chunk_size=2)
+
+    rows = session.execute(text(
+        "SELECT last_name, salesman_id FROM client ORDER BY client_id")).all()
+    assert rows == [("Doe", 2), ("Poe", 2)]
+    assert report.rows_read == 3
+    assert report.rows_imported == 2
+    assert report.rows_rejected == 1
+    assert read_rejects(report.rejects_path)[0]["line"] == 3
+
+
+def test_import_clients_requires_salesman(tmp_path, in_memory_uow,
+                                          init_db_table_collaborator):
+    path = tmp_path / "clients.csv"
+    path.write_text("last_name\nDoe\n", encoding="utf-8")
+
+    with pytest.raises(ImportServiceError,
+                       match="Only sales people can create clients"):
+        ImportService(in_memory_uow()).import_file(
+            "clients", path, types_map=CLIENT_TYPES, salesman_id=1)
+
+
+def test_import_contracts_referential_rejects(tmp_path, session,
+                                              in_memory_uow,
+                                              init_db_table_collaborator,
+                                              init_db_table_client):
+    path = tmp_path / "contracts.jsonl"
+    records = [{"total_amount": "150.555", "client_id": 2},
+               {"total_amount": 10, "client_id": 1},
+               {"total_amount": 10, "client_id": 99},
+               {"total_amount": "abc", "client_id": 2},
+               {"total_amount": 20, "client_id": "3"}]
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n",
+                    encoding="utf-8")
+
+    report = ImportService(in_memory_uow()).import_file(
+        "contracts", path, fmt="jsonl", types_map=CONTRACT_TYPES)
+
+    rows = session.execute(text(
+        "SELECT total_amount, client_id FROM contract")).all()
+    rejects = read_rejects(report.rejects_path)
+    assert rows == [(150.55, 2), (20.0, 3)]
+    assert [r["line"] for r in rejects] == [2, 3, 4]
+    assert rejects[0]["message"].startswith("Associated collaborator")
+    assert rejects[1]["message"] == "Contract must be linked to a client"
+    assert rejects[2]["error"] == "InputError"
+
+
+def test_import_rejects_malformed_records(tmp_path, session, in_memory_uow,
+                                          init_db_table_collaborator,
+                                          init_db_table_client):
+    path = tmp_path / "contracts.jsonl"
+    path.write_text('{"total_amount": 10, "client_id": 2}\n'
+                    '{bad json\n'
+                    '[1, 2]\n'
+                    '{"total_amount": 10, "client_id": "two"}\n',
+                    encoding="utf-8")
+
+    report = ImportService(in_memory_uow()).import_file(
+        "contracts", path, fmt="jsonl", types_map={"client_id": int})
+
+    rejects = read_rejects(report.rejects_path)
+    assert report.rows_imported == 1
+    assert [(r["line"], r["message"]) for r in rejects] == [
+        (2, "Malformed record"), (3, "Malformed record"),
+        (4, "Invalid client_id: invalid literal for int() with base 10: "
+            "'two'")]
+    assert rejects[0]["record"] == "{bad json"
+    assert "JSON object" in rejects[1]["tips"]
+
+
+def test_import_events_referential_rejects(tmp_path, session, in_memory_uow,
+                                           init_db_table_contract,
+                                           init_db_table_event):
+    path = tmp_path / "events.csv"
+    path.write_text("title,start_time,attendee,contract_id\n"
+                    "ok,2025-09-01 10:00:00,10,2\n"
+                    "first,2025-09-02,5,6\n"
+                    "duplicate,2025-09-03,5,6\n"
+                    "unsigned,2025-09-04,5,4\n"
+                    "exists,2025-09-05,5,1\n"
+                    "missing,2025-09-06,5,99\n"
+                    "bad date,yesterday,5,2\n", encoding="utf-8")
+
+    report = ImportService(in_memory_uow()).import_file(
+        "events", path, types_map=EVENT_TYPES, chunk_size=3)
+
+    rows = session.execute(text(
+        "SELECT title, contract_id FROM event WHERE event_id > 4 "
+        "ORDER BY event_id")).all()
+    rejects = read_rejects(report.rejects_path)
+    assert rows == [("ok", 2), ("first", 6)]
+    assert [r["line"] for r in rejects] == [4, 5, 6, 7, 8]
+    assert rejects[0]["tips"].startswith("An earlier line")
+    assert report.rows_rejected == 5
+
+
+def test_import_without_rejects_writes_no_file(tmp_path, in_memory_uow,
+                                               init_db_table_contract):
+    path = tmp_path / "events.csv"
+    path.write_text("title,contract_id\nok,2\n", encoding="utf-8")
+
+    report = ImportService(in_memory_uow()).import_file(
+        "events", path, types_map=EVENT_TYPES)
+
+    assert report.rejects_path is None
+    assert not (tmp_path / "events.csv.rejects.jsonl").exists()
+
+
+def test_import_with_process_pool(tmp_path, session, in_memory_uow,
+                                  init_db_table_contract):
+    path = tmp_path / "events.csv"
+    lines = ["title,contract_id", "a,2", "b,6", "c,5", "d,4"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    report = ImportService(in_memory_uow()).import_file(
+        "events", path, types_map=EVENT_TYPES, chunk_size=1, workers=2)
+
+    assert report.rows_imported == 3
+    assert report.rows_rejected == 1
+
+
+def test_import_unknown_format(tmp_path, in_memory_uow):
+    with pytest.raises(ImportServiceError, match="Unknown import format"):
+        ImportService(in_memory_uow()).import_file(
+            "events", tmp_path / "e.xml", fmt="xml")
+
+
+def test_hash_collaborator_chunk_hides_passwords():
+    chunk = [(2, {"username": "new_one", "password": "Password1",
+                  "email": "new@one", "role": "SALES"}),
+             (3, {"username": "new_two", "password": "weak"}),
+             (4, {"username": "new_thr", "password": "Password1",
+                  "role": "KING"})]
+    rows, rejects = hash_collaborator_chunk(COLLABORATOR_TYPES, chunk)
+
+    (user, collaborator), = rows
+    assert user["username"] == "new_one"
+    assert user["password"] != "Password1"
+    AuthUser(_username="new_one", _password=user["password"]) \
+        .verify_password("Password1")
+    assert collaborator["role_id"] == 4
+    assert collaborator["line_no"] == 2
+    assert [reject["line"] for reject in rejects] == [3, 4]
+    assert all("password" not in reject["record"] for reject in rejects)
+
+
+def test_hash_collaborator_chunk_rejects_malformed_records():
+    chunk = [(2, "{bad json"),
+             (3, {"username": "new_one", "password": "Password1",
+                  "role": ["SALES"]})]
+
+    rows, rejects = hash_collaborator_chunk({"role": int}, chunk)
+
+    assert rows == []
+    assert [r["message"] for r in rejects] == [
+        "Malformed record", "Invalid role: int() argument must be a "
+                            "string, a bytes-like object or a real number, "
+                            "not 'list'"]
+    assert "password" not in rejects[1]["record"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_collaborators(tmp_path, session, in_memory_uow,
+                              init_db_table_users,
+                              init_db_table_collaborator, workers):
+    path = tmp_path / "collaborators.csv"
+    path.write_text("username,password,last_name,email,role\n"
+                    "new_one,Password1,One,new@one,SALES\n"
+                    "user_one,Password1,Taken,,SUPPORT\n"
+                    "new_two,Password1,Two,col_email@one,SUPPORT\n"
+                    "new_one,Password1,Again,,SUPPORT\n"
+                    "new_thr,Password1,Thr,,SUPPORT\n", encoding="utf-8")
+    progress = []
+
+    report = ImportService(in_memory_uow()).import_collaborators(
+        path, types_map=COLLABORATOR_TYPES, chunk_size=2, workers=workers,
+        progress=lambda *counts: progress.append(counts))
+
+    rows = session.execute(text(
+        "SELECT u.username, c.last_name, c.role_id FROM collaborator c "
+        "JOIN users u ON u.user_id = c.user_id "
+        "WHERE c.collaborator_id > 4 ORDER BY c.collaborator_id")).all()
+    assert rows == [("new_one", "One", 4), ("new_thr", "Thr", 5)]
+    assert report.rows_read == 5
+    assert report.rows_imported == 2
+    assert progress[-1] == (2, 3)
+    rejects = read_rejects(report.rejects_path)
+    assert [r["line"] for r in rejects] == [3, 4, 5]
+    assert [r["message"] for r in rejects] == ["username taken",
+                                               "email taken",
+                                               "username taken"]
+    assert "Password1" not in path.with_name(
+        "collaborators.csv.rejects.jsonl").read_text(encoding="utf-8")
+
+
+def test_import_collaborators_rejected_line_frees_its_credentials(
+        tmp_path, session, in_memory_uow, init_db_table_users,
+        init_db_table_collaborator):
+    path = tmp_path / "collaborators.csv"
+    path.write_text("username,password,last_name,email,role\n"
+                    "new_one,weak,Weak,new@one,SALES\n"
+                    "new_one,Password1,One,new@one,SALES\n"
+                    "new_two,Password1,Two,new@one,SUPPORT\n",
+                    encoding="utf-8")
+
+    report = ImportService(in_memory_uow()).import_collaborators(
+        path, types_map=COLLABORATOR_TYPES, chunk_size=1, workers=1)
+
+    rows = session.execute(text(
+        "SELECT u.username, c.last_name FROM collaborator c "
+        "JOIN users u ON u.user_id = c.user_id "
+        "WHERE c.collaborator_id > 4")).all()
+    assert rows == [("new_one", "One")]
+    rejects = read_rejects(report.rejects_path)
+    assert [(r["line"], r["message"]) for r in rejects] == [
+        (2, "password too weak"), (4, "email taken")]
+    assert rejects[1]["record"]["username"] == "new_two"
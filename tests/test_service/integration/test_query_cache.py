@@ -0,0 +1,87 @@
+"""Integration tests for the query cache of the services listings.
+
+Readers share a QueryCache, writers are units of work without it, so
+the results only stay fresh through the table versions.
+
+Fixtures
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
+    init_db_table_collaborator
+        create and populate the table linked to the Collaborator model.
+    init_db_table_client
+        create and populate the table linked to the Client model.
+    init_db_table_contract
+        create and populate the table linked to the Contract model.
+    init_db_table_event
+        create and populate the table linked to the Event model.
+"""
+import pytest
+
+from ee_crm.adapters.cache import QueryCache
+from ee_crm.services.app.clients import ClientService
+from ee_crm.services.app.contracts import ContractService
+from ee_crm.services.app.imports import ImportService
+
+
+@pytest.fixture
+def query_cache():
+    return QueryCache()
+
+
+@pytest.fixture
+def reader_uow(in_memory_uow, query_cache):
+    uow = in_memory_uow()
+    uow.query_cache = query_cache
+    return uow
+
+
+def test_filter_served_until_table_is_written(reader_uow, in_memory_uow,
+                                              query_cache,
+                                              init_db_table_collaborator,
+                                              init_db_table_client):
+    service = ClientService(reader_uow)
+    first = service.filter(salesman_id=2, sort=[("id", True)])
+    second = service.filter(sort=(("id", True),), salesman_id=2)
+
+    assert second is first
+    assert query_cache.hits == 1
+
+    ClientService(in_memory_uow()).modify(2, last_name="updated")
+    third = service.filter(salesman_id=2, sort=[("id", True)])
+
+    assert [c.last_name for c in third] == ["cli_ln_thr", "updated"]
+    assert query_cache.stale == 1
+
+
+def test_retrieve_all_sees_imported_rows(tmp_path, reader_uow, in_memory_uow,
+                                         init_db_table_collaborator,
+                                         init_db_table_client):
+    service = ClientService(reader_uow)
+    before = service.retrieve_all()
+    path = tmp_path / "clients.csv"
+    path.write_text("last_name\nDoe\n", encoding="utf-8")
+    ImportService(in_memory_uow()).import_file("clients", path,
+                                               salesman_id=2)
+
+    assert len(service.retrieve_all()) == len(before) + 1
+
+
+def test_collaborator_contracts_depend_on_events(reader_uow, in_memory_uow,
+                                                 query_cache,
+                                                 init_db_table_collaborator,
+                                                 init_db_table_client,
+                                                 init_db_table_contract,
+                                                 init_db_table_event):
+    service = ContractService(reader_uow)
+    before = service.retrieve_collaborator_contracts(2, only_no_event=True)
+    assert service.retrieve_collaborator_contracts(
+        2, only_no_event=True) is before
+
+    with in_memory_uow() as uow:
+        uow.events.delete(1)
+        uow.commit()
+
+    after = service.retrieve_collaborator_contracts(2, only_no_event=True)
+    assert query_cache.stale == 1
+    assert after is not before
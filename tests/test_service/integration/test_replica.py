@@ -0,0 +1,196 @@
+"""Integration tests for ee_crm.services.app.replica
+
+The in-memory SQLite database is the source, the replica is a SQLite
+file in the temporary directory of the test.
+
+Fixtures
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
+    init_db_table_collaborator, init_db_table_client,
+    init_db_table_contract, init_db_table_event
+        create and populate the tables linked to the models.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from ee_crm.adapters.orm import client_table, event_table
+from ee_crm.adapters.replica import create_replica_engine, \
+    write_replica_state
+from ee_crm.controllers.app.client import ClientManager
+from ee_crm.controllers.app.replica import replica_reader
+from ee_crm.exceptions import ReplicaServiceError
+from ee_crm.services.app.clients import ClientService
+from ee_crm.services.app.events import EventService
+from ee_crm.services.app.replica import ReplicaService
+from ee_crm.services.unit_of_work import SqlAlchemyUnitOfWork
+
+ALL_TABLES = ("collaborator", "client", "contract", "event")
+
+
+@pytest.fixture
+def replica(tmp_path):
+    engine = create_replica_engine(str(tmp_path / "replica.db"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def unreachable(tmp_path):
+    # the directory of the file is missing, a connection can't be opened
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'crm.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def populated(init_db_table_collaborator, init_db_table_client,
+              init_db_table_contract, init_db_table_event):
+    pass
+
+
+def count(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(table)
+                            ).scalar()
+
+
+def test_sync_copies_the_tables_in_full(in_memory_uow, replica, populated):
+    service = ReplicaService(in_memory_uow(), replica)
+
+    report = service.sync(ALL_TABLES, collaborator_id=1)
+
+    tables = {table.table: table for table in report.tables}
+    assert [table.table for table in report.tables] == list(ALL_TABLES)
+    assert {table.mode for table in report.tables} == {"full"}
+    assert {name: table.rows for name, table in tables.items()} == \
+        {"collaborator": 4, "client": 4, "contract": 6, "event": 4}
+    assert report.rows_pulled == 18
+    assert tables["client"].changed_at == datetime(2025, 2, 1, 0, 0, 4)
+    assert [state.table for state in service.status()] == list(ALL_TABLES)
+
+
+def test_sync_pulls_the_changes_and_the_deletions(in_memory_uow, replica,
+                                                  populated):
+    service = ReplicaService(in_memory_uow(), replica)
+    service.sync(ALL_TABLES, collaborator_id=1, overlap=0)
+
+    ClientService(in_memory_uow()).modify(2, first_name="changed")
+    EventService(in_memory_uow()).remove(4)
+    report = service.sync(ALL_TABLES, collaborator_id=1, overlap=0)
+
+    tables = {table.table: table for table in report.tables}
+    assert tables["collaborator"].mode == "full"
+    assert tables["client"].mode == "incremental"
+    assert (tables["client"].upserted, tables["client"].deleted) == (1, 0)
+    assert (tables["event"].upserted, tables["event"].deleted) == (0, 1)
+    assert count(replica, event_table) == 3
+    with replica.connect() as conn:
+        first_name = conn.execute(
+            select(client_table.c.first_name)
+            .where(client_table.c.client_id == 2)).scalar()
+    assert first_name == "changed"
+
+
+def test_sync_for_another_collaborator_copies_in_full(in_memory_uow,
+                                                      replica, populated):
+    service = ReplicaService(in_memory_uow(), replica)
+    service.sync(ALL_TABLES, collaborator_id=1)
+
+    report = service.sync(ALL_TABLES, collaborator_id=2)
+
+    assert {table.mode for table in report.tables} == {"full"}
+
+
+def test_sync_empties_the_tables_out_of_scope(in_memory_uow, replica,
+                                              populated):
+    service = ReplicaService(in_memory_uow(), replica)
+    service.sync(ALL_TABLES, collaborator_id=1)
+
+    service.sync(["client"], collaborator_id=1)
+
+    assert [state.table for state in service.status()] == ["client"]
+    assert count(replica, client_table) == 4
+    assert count(replica, event_table) == 0
+
+
+def test_sync_unknown_table(in_memory_uow, replica):
+    service = ReplicaService(in_memory_uow(), replica)
+
+    with pytest.raises(ReplicaServiceError, match="users"):
+        service.sync(["client", "users"], collaborator_id=1)
+
+
+def test_status_without_replica(replica):
+    assert ReplicaService(None, replica).status() == ()
+
+
+def test_replica_is_read_by_the_services(in_memory_uow, replica,
+                                         populated):
+    ReplicaService(in_memory_uow(), replica).sync(ALL_TABLES, 1)
+
+    uow = SqlAlchemyUnitOfWork(session_factory=sessionmaker(bind=replica))
+    client, = ClientService(uow).retrieve(3)
+
+    assert client.last_name == "cli_ln_thr"
+
+
+def test_replica_reader_reads_the_fresh_replica_when_unreachable(
+        in_memory_uow, replica, unreachable, populated):
+    service = ReplicaService(in_memory_uow(), replica)
+    service.sync(ALL_TABLES, collaborator_id=1)
+
+    manager, state = replica_reader(ClientManager, max_age=60,
+                                    service=service, engine=unreachable)
+
+    assert state.table == "client"
+    assert manager.service is not ClientManager._default_service
+
+
+def test_replica_reader_reads_the_reachable_database(in_memory_uow, replica,
+                                                     populated):
+    service = ReplicaService(in_memory_uow(), replica)
+    service.sync(ALL_TABLES, collaborator_id=1)
+
+    manager, state = replica_reader(ClientManager, max_age=60,
+                                    service=service, engine=replica)
+
+    assert state is None
+    assert manager.service is ClientManager._default_service
+
+
+def test_replica_reader_offline_reads_the_replica_whatever_its_age(
+        in_memory_uow, replica, populated):
+    service = ReplicaService(in_memory_uow(), replica)
+    service.sync(ALL_TABLES, collaborator_id=1)
+    with replica.begin() as conn:
+        write_replica_state(conn, "event", collaborator_id=1,
+                            synced_at=datetime.now() - timedelta(hours=1))
+
+    manager, state = replica_reader(ClientManager, max_age=0,
+                                    service=service, offline=True,
+                                    engine=replica)
+
+    assert state.table == "client"
+    assert manager.service is not ClientManager._default_service
+
+
+def test_replica_reader_falls_back_to_the_database(in_memory_uow, replica,
+                                                   unreachable, populated):
+    service = ReplicaService(in_memory_uow(), replica)
+    service.sync(ALL_TABLES, collaborator_id=1)
+    with replica.begin() as conn:
+        write_replica_state(conn, "event", collaborator_id=1,
+                            synced_at=datetime.now() - timedelta(hours=1))
+
+    stale = replica_reader(ClientManager, max_age=60, service=service,
+                           engine=unreachable)
+    disabled = replica_reader(ClientManager, max_age=0, service=service,
+                              engine=unreachable)
+
+    for manager, state in (stale, disabled):
+        assert state is None
+        assert manager.service is ClientManager._default_service
@@ -10,6 +10,7 @@ Fixtures
 
 """
 import pytest
+from argon2 import PasswordHasher
 
 from ee_crm.domain.model import AuthUser, Collaborator, AuthUserDomainError
 from ee_crm.services.auth.authentication import AuthenticationService, \
@@ -76,3 +77,31 @@ class TestAuthenticate:
 
         with pytest.raises(AuthUserDomainError, match="Password mismatch"):
             service.authenticate("user_b", "not_pwd")
+
+    def test_authenticate_rehash_outdated_password(self, fake_uow,
+                                                   fake_repo):
+        weak_hash = PasswordHasher(time_cost=1, memory_cost=8,
+                                   parallelism=1).hash("Password1")
+        user = AuthUser(_username="user_b", _password=weak_hash)
+        user.id = 1
+        fake_uow.users = fake_repo(init=(user,))
+        collaborator = Collaborator(_user_id=1)
+        fake_uow.collaborators = fake_repo(init=(collaborator,))
+
+        AuthenticationService(fake_uow).authenticate("user_b", "Password1")
+
+        assert fake_uow.commited
+        assert user._password != weak_hash
+        user.verify_password("Password1")
+
+    def test_authenticate_keep_current_hash(self, fake_uow, fake_repo):
+        user = AuthUser.builder("user_b", "Password1")
+        user.id = 1
+        current_hash = user._password
+        fake_uow.users = fake_repo(init=(user,))
+        fake_uow.collaborators = fake_repo(init=(Collaborator(_user_id=1),))
+
+        AuthenticationService(fake_uow).authenticate("user_b", "Password1")
+
+        assert not fake_uow.commited
+        assert user._password == current_hash
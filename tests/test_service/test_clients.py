@@ -186,3 +186,25 @@ def test_sort_clients_by_wrong_key(init_uow):
     with pytest.raises(ClientServiceError,
                        match=r"wrong sort key in \['unknown_key'\]"):
         service.retrieve_all(sort=(('unknown_key', True),))
+
+
+def test_client_page_returns_the_cursor_of_the_next_page(init_uow):
+    """Browse the clients two by two, the last page has no cursor."""
+    service = ClientService(init_uow)
+
+    first, cursor = service.page(sort=(("last_name", True),), limit=2)
+    second, cursor = service.page(sort=(("last_name", True),),
+                                  after=cursor, limit=2)
+    last, end = service.page(sort=(("last_name", True),), after=cursor,
+                             limit=2)
+
+    assert [dto.id for dto in first + second + last] == [5, 4, 3, 2, 1]
+    assert cursor == ("cl_ln_b", 2)
+    assert end is None
+
+
+def test_client_page_with_invalid_filters_raise_error(init_uow):
+    service = ClientService(init_uow)
+
+    with pytest.raises(ClientServiceError):
+        service.page(not_a_field=1)
@@ -0,0 +1,143 @@
+"""Unit tests for ee_crm.services.app.doctor and the diagnostics of
+ee_crm.controllers.app.doctor, on SQLite databases.
+
+The PostgreSQL specific checks are only tested for their skip.
+"""
+import json
+import os
+import time
+
+import jwt
+import pytest
+from sqlalchemy import create_engine
+
+from ee_crm.adapters.orm import mapper_registry
+from ee_crm.controllers.app import doctor as doctor_controller
+from ee_crm.services.app import doctor
+
+
+@pytest.fixture
+def token_file(tmp_path, mocker):
+    mocker.patch("ee_crm.services.auth.jwt_handler.get_secret_key",
+                 return_value="doctor-secret-key-of-32-bytes!!!")
+
+    def write(refresh_in=3600, secret="doctor-secret-key-of-32-bytes!!!",
+              mode=0o600):
+        now = int(time.time())
+        path = tmp_path / "jwt.json"
+        path.write_text(json.dumps({
+            "access-token": jwt.encode({"exp": now + 60}, secret),
+            "refresh-token": jwt.encode({"exp": now + refresh_in}, secret),
+        }))
+        os.chmod(path, mode)
+        return str(path)
+    return write
+
+
+def test_connection_and_round_trip(db_engine, connection):
+    setup = doctor.check_connection(db_engine, samples=2)
+    round_trip = doctor.check_round_trip(connection, samples=3)
+
+    assert setup.status == "ok"
+    assert setup.details["samples"] == 2
+    assert round_trip.status == "ok"
+    assert round_trip.details["median_ms"] <= round_trip.details["max_ms"]
+
+
+def test_server_sqlite(connection):
+    check = doctor.check_server(connection)
+
+    assert check.summary.startswith("SQLite ")
+    assert set(check.details["settings"]) == {
+        "journal_mode", "synchronous", "cache_size", "page_size"}
+
+
+def test_foreign_key_indexes(connection):
+    check = doctor.check_foreign_key_indexes(connection,
+                                             mapper_registry.metadata)
+
+    assert check.status == "warn"
+    assert "client.salesman_id" in check.details["missing"]
+    assert "event.contract_id" in check.details["missing"]
+    # unique constraint on the foreign key
+    assert "collaborator.user_id" not in check.details["missing"]
+    assert "CREATE INDEX ix_client_salesman_id ON client (salesman_id);" \
+        in check.details["suggested"]
+
+
+def test_foreign_key_indexes_ok_once_created(connection):
+    metadata = mapper_registry.metadata
+    for statement in doctor.check_foreign_key_indexes(
+            connection, metadata).details["suggested"]:
+        connection.exec_driver_sql(statement)
+
+    assert doctor.check_foreign_key_indexes(
+        connection, metadata).status == "ok"
+
+
+def test_postgresql_checks_skipped(connection):
+    assert doctor.check_bloat(connection, ["crm"]).status == "skip"
+    assert doctor.check_top_statements(connection).status == "skip"
+
+
+def test_run_check_turns_errors_into_fail(connection):
+    check = doctor.run_check("server", connection.exec_driver_sql,
+                             "SELECT * FROM missing")
+
+    assert check.status == "fail"
+    assert "no such table" in check.summary
+
+
+def test_token_store_healthy(token_file):
+    check = doctor.check_token_store(token_file())
+
+    assert check.status == "ok"
+    assert 3500 < check.details["refresh-token-expires-in"] <= 3600
+
+
+def test_token_store_problems(token_file, tmp_path):
+    assert doctor.check_token_store(str(tmp_path / "none")).status == "ok"
+    warn = doctor.check_token_store(token_file(refresh_in=-5, mode=0o644))
+    assert warn.status == "warn"
+    assert "chmod 600" in warn.summary and "expired" in warn.summary
+    bad = doctor.check_token_store(token_file(secret="x" * 32))
+    assert (bad.status, bad.summary[:17]) == ("fail", "invalid signature")
+
+
+def test_password_verify():
+    check = doctor.check_password_verify(1, 64, 1, samples=1)
+
+    assert check.status == "ok"
+    assert check.details["median_ms"] > 0
+
+
+def test_run_diagnostics(db_engine, tmp_path, mocker):
+    uri = f"sqlite:///{tmp_path / 'crm.db'}"
+    mapper_registry.metadata.create_all(create_engine(uri))
+    mocker.patch.object(doctor_controller, "get_token_store_path",
+                        return_value=str(tmp_path / "jwt.json"))
+    mocker.patch.object(doctor_controller, "get_password_hasher_parameters",
+                        return_value={"time_cost": 1, "memory_cost": 64,
+                                      "parallelism": 1})
+
+    checks = doctor_controller.run_diagnostics(1, uri=uri)
+
+    assert [(c.name, c.status) for c in checks] == [
+        ("connection", "ok"), ("round-trip", "ok"), ("server", "ok"),
+        ("foreign-key-indexes", "warn"), ("bloat", "skip"),
+        ("pg-stat-statements", "skip"), ("token-store", "ok"),
+        ("argon2-verify", "ok")]
+
+
+def test_run_diagnostics_without_database(mocker, tmp_path):
+    mocker.patch.object(doctor_controller, "get_token_store_path",
+                        return_value=str(tmp_path / "jwt.json"))
+    mocker.patch.object(doctor_controller, "get_password_hasher_parameters",
+                        return_value={"time_cost": 1, "memory_cost": 64,
+                                      "parallelism": 1})
+
+    checks = doctor_controller.run_diagnostics(
+        1, uri=f"sqlite:///{tmp_path / 'missing' / 'crm.db'}")
+
+    assert checks[0].status == "fail"
+    assert {c.status for c in checks[1:6]} == {"skip"}
@@ -13,6 +13,7 @@ from datetime import datetime
 import pytest
 
 from ee_crm.domain.model import Collaborator, Role, Contract, Event, Client
+from ee_crm.exceptions import EventValidatorError
 from ee_crm.services.app.events import EventService, EventServiceError
 
 
@@ -158,3 +159,23 @@ def test_assign_support_remove_support(init_uow):
 
     support_id_after = service.retrieve(1)[0].supporter_id
     assert support_id_after is None
+
+
+def test_modify_event_dates_success(init_uow):
+    service = EventService(init_uow)
+
+    service.modify(1, end_time=datetime(2025, 1, 3))
+
+    assert service.retrieve(1)[0].end_time == datetime(2025, 1, 3)
+
+
+@pytest.mark.parametrize("dates", [
+    {"end_time": datetime(2024, 12, 31)},
+    {"start_time": datetime(2025, 1, 3)},
+    {"start_time": datetime(2025, 2, 2), "end_time": datetime(2025, 2, 1)},
+])
+def test_modify_event_ending_before_it_starts_fail(init_uow, dates):
+    service = EventService(init_uow)
+
+    with pytest.raises(EventValidatorError, match="ends before it starts"):
+        service.modify(1, **dates)
@@ -0,0 +1,46 @@
+"""Unit tests for ee_crm.services.auth.hashing
+
+The measured hashes use tiny memory costs to keep the tests fast.
+"""
+from ee_crm.services.auth import hashing
+from ee_crm.services.dto import HasherProfileDTO
+
+
+def test_measure_hasher():
+    profile = hashing.measure_hasher(2, 64, 1, samples=2)
+
+    assert (profile.time_cost, profile.memory_cost, profile.parallelism) \
+        == (2, 64, 1)
+    assert profile.seconds > 0
+    assert profile.milliseconds == profile.seconds * 1000
+
+
+def test_calibrate_highest_time_cost_under_target(mocker):
+    mocker.patch.object(hashing, "measure_hasher",
+                        side_effect=lambda t, m, p, samples: HasherProfileDTO(
+                            t, m, p, seconds=0.03 * t))
+
+    profile = hashing.calibrate(0.25, 1024, 2)
+
+    assert (profile.time_cost, profile.memory_cost) == (8, 1024)
+
+
+def test_calibrate_reduce_memory_when_one_iteration_is_too_slow(mocker):
+    mocker.patch.object(hashing, "measure_hasher",
+                        side_effect=lambda t, m, p, samples: HasherProfileDTO(
+                            t, m, p, seconds=m / 1000 * t))
+
+    profile = hashing.calibrate(0.3, 1024, 1)
+
+    assert (profile.time_cost, profile.memory_cost) == (1, 256)
+    assert profile.seconds <= 0.3
+
+
+def test_calibrate_unreachable_target(mocker):
+    mocker.patch.object(hashing, "measure_hasher",
+                        side_effect=lambda t, m, p, samples: HasherProfileDTO(
+                            t, m, p, seconds=1.0))
+
+    profile = hashing.calibrate(0.1, 64, 2)
+
+    assert (profile.time_cost, profile.memory_cost) == (1, 16)
@@ -0,0 +1,73 @@
+"""Unit tests for the InMemoryUnitOfWork, the services run on an
+in-memory store: no database, no SQLAlchemy session."""
+import pytest
+
+from ee_crm.adapters.memory_store import InMemoryStore
+from ee_crm.domain.model import Role
+from ee_crm.exceptions import ContractServiceError
+from ee_crm.services.app.clients import ClientService
+from ee_crm.services.app.collaborators import CollaboratorService
+from ee_crm.services.app.contracts import ContractService
+from ee_crm.services.app.events import EventService
+from ee_crm.services.unit_of_work import InMemoryUnitOfWork
+
+
+@pytest.fixture
+def store():
+    """Store with a salesman (1) and a support (2) and their users."""
+    store = InMemoryStore()
+    store.load_rows("users", [{"user_id": 1, "username": "sales",
+                               "password": "pwd"},
+                              {"user_id": 2, "username": "support",
+                               "password": "pwd"}])
+    store.load_rows("collaborator", [
+        {"collaborator_id": 1, "role_id": Role.SALES, "user_id": 1},
+        {"collaborator_id": 2, "role_id": Role.SUPPORT, "user_id": 2}])
+    return store
+
+
+def test_services_share_the_store(store):
+    client, = ClientService(InMemoryUnitOfWork(store)).create(
+        salesman_id=1, last_name="Doe")
+    contracts = ContractService(InMemoryUnitOfWork(store))
+    contract, = contracts.create(client_id=client.id, total_amount=100)
+    contracts.sign_contract(contract.id)
+    EventService(InMemoryUnitOfWork(store)).create(contract_id=contract.id,
+                                                   title="Gala")
+
+    assert contracts.retrieve_collaborator_contracts(
+        1, only_unpaid=True)[0].signed is True
+    assert contracts.retrieve_collaborator_contracts(
+        1, only_no_event=True) == ()
+    assert store.tables["contract"][contract.id].event.title == "Gala"
+
+
+def test_collaborator_creation_flushes_the_user(store):
+    collaborator, = CollaboratorService(InMemoryUnitOfWork(store)).create(
+        "manager", "Password1", role=Role.MANAGEMENT)
+
+    assert collaborator.user_id == 3
+    assert store.tables["users"][3].collaborator.id == collaborator.id
+
+
+def test_uncommitted_changes_are_rolled_back(store):
+    uow = InMemoryUnitOfWork(store)
+    with uow:
+        uow.collaborators.get(2).role = Role.SALES
+        uow.clients.add(ClientService(uow).model_cls.builder(
+            salesman_id=2, last_name="Roe"))
+
+    with uow:
+        assert uow.collaborators.get(2).role == Role.SUPPORT
+        assert uow.clients.list() == []
+
+
+def test_contract_needs_a_salesman(store):
+    client, = ClientService(InMemoryUnitOfWork(store)).create(
+        salesman_id=1, last_name="Doe")
+    CollaboratorService(InMemoryUnitOfWork(store)).assign_role(
+        1, Role.SUPPORT)
+
+    with pytest.raises(ContractServiceError, match="not in SALES"):
+        ContractService(InMemoryUnitOfWork(store)).create(
+            client_id=client.id, total_amount=100)
@@ -0,0 +1,74 @@
+"""Unit tests for ee_crm.services.app.metrics and the recording of the
+invocations, ee_crm.metrics."""
+import pytest
+from sqlalchemy import create_engine, text
+
+from ee_crm import metrics
+from ee_crm.adapters.metrics_store import MetricsStore
+from ee_crm.cli_interface.commands import command_path
+from ee_crm.services.app.metrics import prometheus_text, \
+    summarize_metrics, write_textfile
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MetricsStore(tmp_path / "metrics.json")
+    for ms in range(1, 101):
+        store.record("client read", "SALES", "ok", ms / 1000, 1)
+    store.record("client read", "SALES", "error", 0.5, 0)
+    store.record("client read", "MANAGEMENT", "ok", 0.02, 1)
+    store.record("event read", "SUPPORT", "ok", 0.02, 3)
+    return store
+
+
+def test_summarize_metrics(store):
+    summaries = summarize_metrics(store)
+
+    assert [(s.command, s.role) for s in summaries] == [
+        ("client read", "MANAGEMENT"), ("client read", "SALES"),
+        ("event read", "SUPPORT")]
+    sales = summaries[1]
+    assert (sales.invocations, sales.errors) == (101, 1)
+    assert sales.p50 == pytest.approx(0.051, rel=0.04)
+    assert sales.p99 == pytest.approx(0.1, rel=0.04)
+    assert sales.sql_p50 == 1
+    assert summarize_metrics(store, command="event")[0].sql_p95 == 3
+
+
+def test_prometheus_textfile(store, tmp_path):
+    path = tmp_path / "eecrm.prom"
+    write_textfile(path, prometheus_text(summarize_metrics(store)))
+
+    lines = path.read_text().splitlines()
+    assert ('eecrm_command_duration_seconds_count{command="client read",'
+            'role="SALES"} 101') in lines
+    assert ('eecrm_command_errors_total{command="client read",'
+            'role="SALES"} 1') in lines
+    assert "# TYPE eecrm_command_duration_seconds summary" in lines
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "eecrm.prom", "metrics.json", "metrics.json.lock"]
+
+
+def test_record_invocation(tmp_path):
+    store = MetricsStore(tmp_path / "metrics.json")
+    engine = create_engine("sqlite://")
+
+    metrics.start_invocation()
+    metrics.note_role("SUPPORT")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    metrics.finish_invocation("event read", "ok", store=store)
+    metrics.finish_invocation("event read", "ok", store=store)
+
+    histograms = store.merged()[("event read", "SUPPORT", "ok")]
+    assert histograms["sql"].sum == 2
+    assert histograms["duration_us"].total == 1
+
+
+def test_command_path():
+    assert command_path(["--profile", "client", "read", "-pk", "3"]) == \
+        "client read"
+    assert command_path(["admin", "calibrate-hash", "read"]) == \
+        "admin calibrate-hash"
+    assert command_path(["--help"]) is None
@@ -1,13 +1,20 @@
 """Unit tests for ee_crm.services.auth.permissions
 
 Each test confirms that the service returns 'None' when the requested
-resource is missing.
+resource is missing, then that the attributes cache is consulted and
+validated by the versions of the tables.
 
 Fixtures
     fake_uow
         Fake unit of work to interact with a faked persistence layer
         in an in-memory dict.
+    in_memory_uow
+        Factory that returns a SqlAlchemyUnitOfWork instance linked to
+        the in-memory SQLite database.
 """
+import pytest
+
+from ee_crm.adapters.attribute_cache import SharedAttributeCache
 from ee_crm.services.auth.permissions import PermissionService
 
 
@@ -34,3 +41,59 @@ def test_get_event_support_fail(fake_uow):
 def test_get_event_associated_salesman_fail(fake_uow):
     service = PermissionService(fake_uow)
     assert service.get_event_associated_salesman(12) is None
+
+
+@pytest.fixture
+def attribute_cache(tmp_path):
+    attribute_cache = SharedAttributeCache(tmp_path / "abac.cache", slots=64)
+    yield attribute_cache
+    attribute_cache.close()
+
+
+def test_attributes_served_by_cache(in_memory_uow, attribute_cache,
+                                    init_db_table_collaborator,
+                                    init_db_table_client,
+                                    init_db_table_contract,
+                                    init_db_table_event):
+    readings = []
+    for _ in range(2):
+        service = PermissionService(in_memory_uow(), cache=attribute_cache)
+        readings.append((service.get_client_associated_salesman(2),
+                         service.get_contract_associated_salesman(1),
+                         service.get_contract_signed(3),
+                         service.get_event_support(1),
+                         service.get_event_associated_salesman(1),
+                         service.get_client_associated_salesman(99)))
+
+    assert readings[0] == readings[1]
+    assert readings[0][2] is False
+    assert readings[0][5] is None
+    # the first attribute is read before the versions, it isn't cached
+    assert attribute_cache.stats() == {"hits": 5, "misses": 5}
+
+
+def test_single_lookup_reads_no_versions(in_memory_uow, attribute_cache,
+                                         init_db_table_collaborator,
+                                         init_db_table_client):
+    for _ in range(2):
+        service = PermissionService(in_memory_uow(), cache=attribute_cache)
+        assert service.get_client_associated_salesman(2) == 2
+
+    assert service._versions is None
+    assert attribute_cache.stats() == {"hits": 0, "misses": 0}
+
+
+def test_cached_attribute_checked_by_version(in_memory_uow, attribute_cache,
+                                             init_db_table_collaborator,
+                                             init_db_table_client,
+                                             init_db_table_contract):
+    service = PermissionService(in_memory_uow(), cache=attribute_cache)
+    assert service.get_contract_associated_salesman(1) == 1
+
+    with in_memory_uow() as uow:
+        uow.clients.get(uow.contracts.get(1).client_id)._salesman_id = 3
+        uow.commit()
+
+    service = PermissionService(in_memory_uow(), cache=attribute_cache)
+    assert service.get_contract_associated_salesman(1) == 3
+    assert attribute_cache.stats()["hits"] == 0